@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+대용량 테이블 온라인 백필 CLI (shared/backfill.py)
+
+PK(id) 범위 청크마다 짧은 트랜잭션으로 커밋하므로 운영 중에도 실행할 수 있고,
+중단(Ctrl+C) 후 다시 실행하면 backfill_checkpoints에 저장된 위치부터 이어서 처리한다.
+
+사용법:
+    python backfill.py list                                   # 등록된 작업 목록
+    python backfill.py status                                 # 작업별 진행 현황
+    python backfill.py run shots_bay_number                   # 작업 실행 (중단 지점부터 재개)
+    python backfill.py run shots_bay_number --batch-size 20000 --sleep 0.05
+    python backfill.py run shots_bay_number --reset           # 체크포인트 무시하고 처음부터
+    python backfill.py run shots_bay_number --dry-run         # 청크마다 롤백 (속도/변경 건수만 확인)
+
+DB 연결은 shared.database(DATABASE_URL 환경 변수)를 사용한다.
+"""
+import argparse
+import sys
+
+from shared import database
+from shared.backfill import JOBS, DEFAULT_BATCH_SIZE, DEFAULT_LOCK_TIMEOUT, run_backfill, list_checkpoints
+from shared.migrate import load_migrations, migrate
+
+if sys.stdout.encoding != 'utf-8':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+
+def cmd_list(args):
+    for name, job in sorted(JOBS.items()):
+        print(f"{name:<28} {job.table:<12} {job.description}")
+
+
+def cmd_status(args):
+    conn = database.get_db_connection()
+    try:
+        rows = list_checkpoints(conn)
+    finally:
+        conn.close()
+    if not rows:
+        print("실행된 백필 작업 없음")
+        return
+    for job, table, min_id, last_id, max_id, rows_done, rows_changed, started_at, updated_at, finished_at in rows:
+        min_id = min_id or 0
+        percent = 100.0 * (last_id - min_id) / (max_id - min_id) if max_id and max_id > min_id else 100.0
+        state = f"완료 {finished_at}" if finished_at else f"진행 {percent:.1f}% (최근 {updated_at})"
+        print(f"{job:<28} {table:<12} id {last_id}/{max_id}  처리 {rows_done} / 변경 {rows_changed}  {state}")
+
+
+def cmd_run(args):
+    job = JOBS.get(args.job)
+    if job is None:
+        print(f"❌ 알 수 없는 작업: {args.job} (python backfill.py list 참고)")
+        sys.exit(1)
+
+    conn = database.get_db_connection()
+    try:
+        # 체크포인트 테이블/대상 컬럼이 아직 없으면 먼저 적용 (서비스 배포 전에 실행하는 경우)
+        migrate(conn, load_migrations())
+
+        print("=" * 80)
+        print(f"백필: {job.name} - {job.description}")
+        print("=" * 80)
+        changed = run_backfill(conn, job, batch_size=args.batch_size, sleep_sec=args.sleep,
+                               reset=args.reset, lock_timeout=args.lock_timeout, dry_run=args.dry_run)
+        print("=" * 80)
+        print(f"✅ {job.name}: {changed}개 변경")
+        print("=" * 80)
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="대용량 테이블 온라인 청크 백필")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("list", help="등록된 작업 목록").set_defaults(func=cmd_list)
+    sub.add_parser("status", help="작업별 진행 현황").set_defaults(func=cmd_status)
+
+    run = sub.add_parser("run", help="작업 실행 (중단 지점부터 재개)")
+    run.add_argument("job", help="작업 이름 (list 참고)")
+    run.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                     help=f"id 범위 청크 크기 (기본 {DEFAULT_BATCH_SIZE})")
+    run.add_argument("--sleep", type=float, default=0.0, help="청크 사이 대기 시간(초) - 피크 시간대 부하 완화")
+    run.add_argument("--lock-timeout", default=DEFAULT_LOCK_TIMEOUT,
+                     help=f"청크별 잠금 대기 한도 (기본 {DEFAULT_LOCK_TIMEOUT}, 초과 시 양보 후 재시도)")
+    run.add_argument("--reset", action="store_true", help="체크포인트 무시하고 처음부터")
+    run.add_argument("--dry-run", action="store_true", help="청크마다 롤백 (DB에 쓰지 않고 속도/변경 건수만 확인)")
+    run.set_defaults(func=cmd_run)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
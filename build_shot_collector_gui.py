@@ -24,6 +24,7 @@ build_options = [
 # 추가 파일 포함 (기준: golf_trainer/config/)
 build_options.extend([
     "--add-data", "client/core/pc_identifier.py;client/core",
+    "--add-data", "client/core/criteria_engine.py;client/core",
     # 프로젝트 루트의 config 파일들을 번들링 (실행 시 실행 경로로 복사됨)
     "--add-data", "config/criteria.json;config/criteria.json",
     "--add-data", "config/feedback_messages.json;config/feedback_messages.json",
@@ -43,8 +44,11 @@ hidden_imports = [
     "PIL",
     "PIL.Image",
     "PIL.ImageDraw",
+    "PIL.ImageGrab",  # 캡처 백엔드 pyautogui: 보조 디스플레이 캡처 (지연 import)
+    "mss",  # 캡처 백엔드 mss (config.json "capture": {"type": "mss"}, 지연 import)
     "client.shot_collector.main",  # main.py를 import하므로 포함
     "client.core.pc_identifier",  # pc_identifier 포함
+    "client.core.criteria_engine",  # 샷 기준표 평가 엔진 포함
 ]
 
 for imp in hidden_imports:
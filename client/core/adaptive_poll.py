@@ -0,0 +1,94 @@
+# ===== client/core/adaptive_poll.py (유휴 감지 적응형 폴링) =====
+"""
+샷 감지 루프용 적응형 폴링 간격
+
+런 텍스트 감지를 하루 종일 50ms마다 하면 타석이 비어 있거나 시뮬레이터가 연습 화면이 아닐 때도
+같은 CPU를 쓴다 (시뮬레이터와 같은 PC에서 실행됨).
+
+- 활동(런 텍스트 변화, 샷 처리)이 있으면 즉시 빠른 간격(fast)으로 복귀
+- idle_after초 동안 활동이 없으면 간격을 ramp배씩 늘려 idle 간격(약 1Hz)까지 감속
+- 샷 진행 중(텍스트 사라짐 → 재등장)은 수 초 안에 끝나므로 idle_after 안에서는 항상 빠른 간격
+- 작업 시간/대기 시간을 누적해 duty cycle(작업 비율) 통계 제공
+
+사용법:
+    poller = AdaptivePoller(fast=0.05, idle=1.0, idle_after=30.0)
+    while True:
+        changed = ...
+        if changed:
+            poller.activity()
+        poller.sleep()
+"""
+import time
+
+
+class AdaptivePoller:
+    def __init__(self, fast=0.05, idle=1.0, idle_after=30.0, ramp=1.5, clock=time.monotonic, sleeper=time.sleep):
+        self.fast = fast
+        self.idle = idle
+        self.idle_after = idle_after
+        self.ramp = ramp
+        self._clock = clock
+        self._sleep = sleeper
+        now = clock()
+        self.interval = fast
+        self.last_activity = now
+        self._tick_started = now
+        self._started = now
+        self.ticks = 0
+        self.idle_ticks = 0
+        self.busy_sec = 0.0
+        self.sleep_sec = 0.0
+        self.wakeups = 0  # idle → fast 복귀 횟수
+
+    def activity(self):
+        """활동 감지 → 다음 대기부터 빠른 간격"""
+        if self.interval > self.fast:
+            self.wakeups += 1
+        self.interval = self.fast
+        self.last_activity = self._clock()
+
+    @property
+    def is_idle(self):
+        return self.interval > self.fast
+
+    def next_interval(self):
+        """다음 대기 간격 계산 (활동 없는 시간이 idle_after를 넘으면 점진적으로 감속)"""
+        if self._clock() - self.last_activity < self.idle_after:
+            self.interval = self.fast
+        else:
+            self.interval = min(self.idle, max(self.interval, self.fast) * self.ramp)
+        return self.interval
+
+    def sleep(self):
+        """틱 종료: 작업 시간 기록 후 다음 간격만큼 대기"""
+        start = self._clock()
+        self.busy_sec += max(0.0, start - self._tick_started)
+        interval = self.next_interval()
+        self.ticks += 1
+        if self.is_idle:
+            self.idle_ticks += 1
+        self._sleep(interval)
+        end = self._clock()
+        self.sleep_sec += max(0.0, end - start)
+        self._tick_started = end
+
+    def stats(self):
+        """duty cycle 통계 (시작 이후 누적)"""
+        elapsed = max(1e-9, self._clock() - self._started)
+        total = self.busy_sec + self.sleep_sec
+        return {
+            "ticks": self.ticks,
+            "ticks_per_sec": round(self.ticks / elapsed, 2),
+            "duty_cycle": round(self.busy_sec / total, 4) if total > 0 else 0.0,
+            "busy_sec": round(self.busy_sec, 1),
+            "idle_tick_ratio": round(self.idle_ticks / self.ticks, 4) if self.ticks else 0.0,
+            "interval": round(self.interval, 3),
+            "wakeups": self.wakeups,
+        }
+
+    def format_stats(self):
+        st = self.stats()
+        mode = "IDLE" if self.is_idle else "ACTIVE"
+        return (f"mode={mode}, interval={st['interval']}s, ticks/s={st['ticks_per_sec']}, "
+                f"duty={st['duty_cycle'] * 100:.1f}%, idle_ticks={st['idle_tick_ratio'] * 100:.0f}%, "
+                f"wakeups={st['wakeups']}")
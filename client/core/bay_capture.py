@@ -0,0 +1,179 @@
+# ===== client/core/bay_capture.py (타석별 캡처 소스) =====
+"""
+타석 1개의 화면 캡처 소스 + 샷 감지 상태 머신 (캡처/OCR 작업 안에서 타석마다 1개)
+
+상태 전이는 client/core/shot_detector.py의 ShotDetector가 담당하고,
+여기서는 디스플레이 캡처(grab/has_text/fingerprints)와 OCR 풀 연결만 한다.
+OCR을 읽는 동안(READING)에도 다른 타석은 계속 감지한다.
+
+화면은 캡처 백엔드(client/core/capture_backends.py)로만 읽으므로 main.py 없이도 실행된다
+(리눅스에서 파일/합성 화면으로 파이프라인 실행: run_headless.py).
+
+사용법:
+    bay = BayCapture(0, {"regions": regions, "display": 0}, backend, log=log)
+    active = bay.tick(events, ocr_pool, ring)     # events: ("shot", {...}) / ("logout", (타석, 사유))
+"""
+import time
+
+import cv2
+
+from client.core.change_detector import ChangeGatedClassifier
+from client.core.metrics_ocr import METRIC_FIELDS, read_metrics
+from client.core.readiness import ReadinessDetector, region_fingerprints
+from client.core.region_layout import compile_layout
+from client.core.shot_detector import ShotDetector
+from client.core.stage_timer import timings
+
+METRIC_KEYS = tuple(key for key, _, _ in METRIC_FIELDS)
+
+
+def has_text_pixels(img):
+    """런 텍스트 영역에 텍스트(어두운 픽셀)가 있는지 전체 판정 (적응형 threshold)"""
+    # 픽셀 비율로 텍스트 존재 여부 확인 (더 빠르고 안정적)
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+
+    # 적응형 threshold로 텍스트 영역 감지
+    bw = cv2.adaptiveThreshold(
+        gray, 255,
+        cv2.ADAPTIVE_THRESH_MEAN_C,
+        cv2.THRESH_BINARY_INV,
+        11, 2
+    )
+
+    # 검은 픽셀(텍스트) 비율 계산
+    black_pixels = cv2.countNonZero(bw)
+    total_pixels = bw.shape[0] * bw.shape[1]
+    text_ratio = black_pixels / total_pixels if total_pixels > 0 else 0
+
+    # 텍스트가 있다고 판단하는 임계값 (2% 이상이면 텍스트 존재)
+    return text_ratio >= 0.02
+
+
+def _print_log(message):
+    print(message)
+
+
+class BayCapture:
+    def __init__(self, index, binding, backend, tagged=False, log=_print_log, read=read_metrics,
+                 stable_frames=4, tolerance=3.0, max_wait=1.5, fixed_delay=1.0, idle_after=30.0,
+                 logout_no_screen=5 * 60, logout_no_shot=20 * 60, layout_check=5.0):
+        self.index = index
+        self.regions = binding.get("regions") or {}
+        self.display = int(binding.get("display") or 0)
+        self.tag = f"[BAY {binding.get('bay_number') or index + 1}] " if tagged else ""
+        self.backend = backend
+        self._log = log
+        self.read = read                 # (layout, frame, texts) → 지표 dict (OCR 풀에서 실행)
+        self.layout_check = layout_check  # 디스플레이 크기/위치 확인 간격 (초)
+        self.reading = None  # OCR 풀 작업 (future)
+        # 화면이 이전 판정 때와 거의 같으면(축소 이미지 MAD ≤ margin) 적응형 threshold 생략
+        self.text_detector = ChangeGatedClassifier(has_text_pixels, margin=6.0, downsample=4, max_age=2.0)
+        # 결과 화면 안정 감지: 지표 영역 지문이 stable_frames 연속으로 같으면 바로 OCR
+        self.readiness = ReadinessDetector(stable_frames=stable_frames, tolerance=tolerance, max_wait=max_wait)
+        self.detector = ShotDetector(
+            self, self.readiness, clock=time.time, log=self.log,
+            fixed_delay=fixed_delay, idle_after=idle_after,
+            logout_no_screen=logout_no_screen, logout_no_shot=logout_no_shot,
+        )
+        self._layout = None
+        self._layout_checked_at = 0.0
+        self._frame_layout = None  # 마지막으로 캡처한 프레임의 레이아웃
+        self._frame_full = False   # 마지막 프레임이 bbox 전체인지 (런 텍스트 영역만이면 False)
+        self._read_layout = None   # OCR 요청한 프레임의 레이아웃
+        self._read_texts = None    # OCR 원문 (read가 채움)
+
+    def log(self, message):
+        self._log(self.tag + message)
+
+    # ------------------------------------------------
+    # 캡처 소스 (ShotDetector가 호출)
+    # ------------------------------------------------
+    def layout(self):
+        """이 타석 디스플레이의 픽셀 레이아웃 (디스플레이 크기/위치가 바뀔 때만 다시 컴파일)"""
+        now = time.monotonic()
+        if self._layout is not None and now - self._layout_checked_at < self.layout_check:
+            return self._layout
+        self._layout_checked_at = now
+        monitors = self.backend.monitors()
+        if self.display < len(monitors):
+            x, y, w, h = monitors[self.display]
+        else:
+            if self._layout is None:
+                self.log(f"⚠️ 디스플레이 {self.display}번이 없습니다 (연결된 디스플레이 {len(monitors)}개) → 주 디스플레이 사용")
+            x, y, w, h = monitors[0]
+        layout = self._layout
+        if layout is None or layout.screen_size != (w, h) or layout.origin != (x, y):
+            layout = compile_layout(self.regions, (w, h), origin=(x, y))
+            self.log(f"[LAYOUT] 좌표 레이아웃 컴파일: 디스플레이 {self.display} ({w}x{h}, 위치 {x},{y}), {len(layout.rects)}개 영역")
+            self._layout = layout
+        return layout
+
+    def grab(self, full):
+        """full=True: 모든 영역 bbox 프레임, False: 런 텍스트 영역만 (영역이 없으면 None)"""
+        layout = self._frame_layout = self.layout()
+        self._frame_full = full
+        if full:
+            with timings.time("capture.full"):
+                return self.backend.grab(layout.bbox)
+        if "run_text" not in layout:
+            return None
+        with timings.time("capture.text"):
+            return self.backend.grab(layout.rects["run_text"])
+
+    def has_text(self, frame):
+        """런 텍스트 존재 여부 (영역이 없으면 None) - bbox 프레임이면 런 텍스트 영역만 잘라서 판정"""
+        layout = self._frame_layout
+        if frame is None or "run_text" not in layout:
+            return None
+        if self._frame_full:
+            frame = layout.crop(frame, "run_text")
+        return self.text_detector.check(frame, time.monotonic())
+
+    def fingerprints(self, frame):
+        return region_fingerprints(self._frame_layout, frame, METRIC_KEYS)
+
+    # ------------------------------------------------
+    # 틱 처리
+    # ------------------------------------------------
+    def tick(self, events, ocr_pool, ring):
+        """한 틱 처리 → 활동(런 텍스트 변화, OCR 대기/진행) 여부"""
+        if self.reading is not None:
+            if not self.reading.done():
+                return True
+            future, self.reading = self.reading, None
+            try:
+                metrics = future.result()
+            except Exception as e:
+                self.log(f"[CAPTURE] OCR error: {e}")
+                self.detector.cancel_read()
+                return True
+            self._forward(self.detector.read_done(metrics), events, ocr_pool, ring)
+            return True
+        active, detector_events = self.detector.step()
+        self._forward(detector_events, events, ocr_pool, ring)
+        return active
+
+    def _forward(self, detector_events, events, ocr_pool, ring):
+        for kind, data in detector_events:
+            if kind == "read":
+                # OCR은 풀에서 (읽는 동안 다른 타석 감지는 계속)
+                # OCR 원문/레이아웃은 샷 이벤트에 실어 보냄 (GUI 프로세스의 OCR 녹화용)
+                self._read_layout, self._read_texts = self._frame_layout, {}
+                self.reading = ocr_pool.submit(self.read, self._read_layout, data, self._read_texts)
+            elif kind == "shot":
+                # 샷 확정/업로드는 GUI 프로세스 (프레임은 링에 기록하고 번호만 전달)
+                frame = data.pop("frame")
+                data["frame_seq"] = ring.write(frame, data["read_at"]) if ring is not None else None
+                data["bay"] = self.index
+                data["layout"], data["texts"] = self._read_layout, self._read_texts
+                events.put(("shot", data))
+            elif kind == "logout":
+                # 활성 사용자 확인/세션 종료는 GUI 프로세스 (서버 호출)
+                events.put(("logout", (self.index, data)))
+            # text/shot_start/idle: 폴링 감속은 AdaptivePoller가 담당하므로 전달하지 않음
+
+    def reset(self):
+        """OCR/캡처 오류 후 진행 중이던 읽기 취소"""
+        self.reading = None
+        self._read_texts = None
+        self.detector.cancel_read()
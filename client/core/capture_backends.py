@@ -0,0 +1,322 @@
+# ===== client/core/capture_backends.py (화면 캡처 백엔드) =====
+"""
+화면 캡처 백엔드 (config.json "capture" 또는 환경 변수 CAPTURE_BACKEND로 선택)
+
+감지/OCR 파이프라인은 캡처를 grab_rect() 하나로만 했고, 그 안에 pyautogui.screenshot이 고정되어 있어
+화면이 없는 리눅스 CI에서는 파이프라인을 돌리거나 프로파일링할 수 없었다.
+백엔드는 두 가지만 제공한다.
+
+    monitors()  → 디스플레이 사각형 [(x, y, w, h)] (0번이 주 디스플레이, 가상 화면 좌표)
+    grab(rect)  → 사각형 (x, y, w, h)의 BGR 이미지
+
+- pyautogui: 기존 방식 (주 디스플레이는 pyautogui, 보조 디스플레이는 PIL ImageGrab all_screens)
+- mss: mss 라이브러리 (Windows GDI / X11 / macOS, pyautogui보다 빠름, 스레드마다 인스턴스)
+- files: 이미지 디렉터리(이름 순) 또는 동영상 파일 재생 (fps를 주면 시간 기준, 없으면 grab마다 다음 프레임)
+- synthetic: client/core/synthetic_screens.py 합성 화면 (shot_every초마다 샷 1개, 정답 값은 expected())
+
+config.json 예:
+    "capture": {"type": "mss"}
+    "capture": {"type": "files", "path": "recordings/bay1.mp4", "fps": 30}
+    "capture": {"type": "synthetic", "coordinates": "SGGOLF_1920x1080_v1.json", "shot_every": 8}
+
+사용법:
+    backend = create_backend(config.get("capture"), regions=REGIONS)
+    x, y, w, h = backend.monitors()[0]
+    img = backend.grab(layout.bbox)
+"""
+import os
+import threading
+import time
+
+import numpy as np
+
+from client.core.displays import list_monitors
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+
+class CaptureBackend:
+    name = "base"
+
+    def monitors(self):
+        raise NotImplementedError
+
+    def grab(self, rect):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def describe(self):
+        return self.name
+
+
+class PyAutoGuiBackend(CaptureBackend):
+    """기존 캡처 경로 (pyautogui는 주 디스플레이만 캡처하므로 보조 디스플레이는 ImageGrab all_screens)"""
+
+    name = "pyautogui"
+
+    def __init__(self):
+        import cv2
+        import pyautogui
+        from PIL import ImageGrab
+
+        self._cv2 = cv2
+        self._pyautogui = pyautogui
+        self._image_grab = ImageGrab
+
+    def monitors(self):
+        return list_monitors(self._pyautogui.size())
+
+    def grab(self, rect):
+        x, y, w, h = rect
+        sw, sh = self._pyautogui.size()
+        if x < 0 or y < 0 or x + w > sw or y + h > sh:
+            img = self._image_grab.grab(bbox=(x, y, x + w, y + h), all_screens=True)
+        else:
+            img = self._pyautogui.screenshot(region=tuple(rect))
+        return self._cv2.cvtColor(np.array(img), self._cv2.COLOR_RGB2BGR)
+
+
+class MssBackend(CaptureBackend):
+    """mss 캡처 (BGRA → BGR, 인스턴스는 스레드마다 따로 - Windows에서 스레드 간 공유 불가)"""
+
+    name = "mss"
+
+    def __init__(self):
+        import mss
+
+        self._mss = mss
+        self._local = threading.local()
+
+    def _sct(self):
+        sct = getattr(self._local, "sct", None)
+        if sct is None:
+            sct = self._local.sct = self._mss.mss()
+        return sct
+
+    def monitors(self):
+        rects = [(m["left"], m["top"], m["width"], m["height"]) for m in self._sct().monitors[1:]]
+        if not rects:
+            return [(0, 0, 0, 0)]
+        primary = next((r for r in rects if r[:2] == (0, 0)), rects[0])
+        return [primary] + sorted(r for r in rects if r is not primary)
+
+    def grab(self, rect):
+        x, y, w, h = rect
+        shot = self._sct().grab({"left": int(x), "top": int(y), "width": int(w), "height": int(h)})
+        return np.ascontiguousarray(np.asarray(shot)[:, :, :3])
+
+    def close(self):
+        sct = getattr(self._local, "sct", None)
+        if sct is not None:
+            sct.close()
+            self._local.sct = None
+
+
+class FileBackend(CaptureBackend):
+    """
+    이미지 디렉터리 / 동영상 파일을 화면처럼 재생 (한 화면 = 주 디스플레이 1개)
+
+    fps: 주면 재생 시작 후 경과 시간 기준 프레임, 없으면 grab() 호출마다 다음 프레임 (틱 단위 재현)
+    loop: 끝나면 처음부터 다시 (False면 마지막 프레임 유지)
+    """
+
+    name = "files"
+
+    def __init__(self, path, fps=None, loop=True, clock=time.monotonic):
+        import cv2
+
+        self._cv2 = cv2
+        self.path = path
+        self.fps = float(fps) if fps else None
+        self.loop = loop
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._images = None
+        self._video = None
+        if os.path.isdir(path):
+            self._images = [os.path.join(path, n) for n in sorted(os.listdir(path))
+                            if n.lower().endswith(IMAGE_EXTENSIONS)]
+            if not self._images:
+                raise ValueError(f"이미지가 없습니다: {path}")
+        elif not os.path.isfile(path):
+            raise ValueError(f"캡처 파일이 없습니다: {path}")
+        self._index = -1
+        self._frame = None
+        self._started = None
+        self.frames_read = 0
+        self._advance(0)
+
+    def describe(self):
+        return f"files({self.path})"
+
+    def _read_image(self, index):
+        data = np.fromfile(self._images[index], dtype=np.uint8)  # 한글 경로 (cv2.imread는 실패)
+        return self._cv2.imdecode(data, self._cv2.IMREAD_COLOR)
+
+    def _read_video(self, index):
+        # 동영상은 순서대로만 읽음 (되돌아가야 하면 다시 열기)
+        if self._video is None or index < self._index:
+            if self._video is not None:
+                self._video.release()
+            self._video = self._cv2.VideoCapture(self.path)
+            self._index = -1
+        frame = None
+        while self._index < index:
+            ok, frame = self._video.read()
+            if not ok:
+                return None
+            self._index += 1
+        return frame
+
+    def _advance(self, index):
+        if self._images is not None:
+            count = len(self._images)
+            if index >= count:
+                index = index % count if self.loop else count - 1
+            if index != self._index or self._frame is None:
+                self._frame = self._read_image(index)
+                self._index = index
+                self.frames_read += 1
+            return
+        frame = self._read_video(index)
+        if frame is None:
+            if not self.loop:
+                return  # 마지막 프레임 유지
+            self._started = None if self.fps else self._started
+            frame = self._read_video(0)
+            if frame is None:
+                raise ValueError(f"동영상을 읽을 수 없습니다: {self.path}")
+        self._frame = frame
+        self.frames_read += 1
+
+    def monitors(self):
+        h, w = self._frame.shape[:2]
+        return [(0, 0, w, h)]
+
+    def grab(self, rect):
+        with self._lock:
+            if self.fps:
+                now = self.clock()
+                if self._started is None:
+                    self._started = now
+                index = int((now - self._started) * self.fps)
+                if index != self._index:
+                    self._advance(index)
+            else:
+                self._advance(self._index + 1)
+            frame = self._frame
+        x, y, w, h = rect
+        return frame[max(0, y):y + h, max(0, x):x + w].copy()
+
+    def close(self):
+        if self._video is not None:
+            self._video.release()
+            self._video = None
+
+
+class SyntheticBackend(CaptureBackend):
+    """
+    합성 결과 화면 (shot_every초 주기: 런 텍스트 사라짐 flight초 → 재등장 후 settle초 동안 숫자 변화 → 고정)
+
+    expected(): 지금 화면에 고정된 정답 값 (감지된 샷의 OCR 값과 비교용)
+    """
+
+    name = "synthetic"
+
+    def __init__(self, regions=None, coordinates=None, resolution=None, shot_every=8.0, flight=3.0,
+                 settle=0.4, seed=0, style=None, clock=time.monotonic):
+        from client.core.synthetic_screens import ScreenStyle, SyntheticScreens, load_coordinate_file
+
+        brand = None
+        size = (1920, 1080)
+        if coordinates:
+            regions, size, brand = load_coordinate_file(coordinates)
+        if not regions:
+            raise ValueError("synthetic 캡처에는 좌표(regions 또는 coordinates)가 필요합니다")
+        if resolution:
+            w, _, h = str(resolution).lower().partition("x")
+            size = (int(w), int(h))
+        # 노이즈가 있으면 빈 런 텍스트 영역도 적응형 threshold에 텍스트로 잡히므로 기본은 노이즈 없음
+        style = dict({"noise": 0}, **(style or {}))
+        self.screens = SyntheticScreens(regions, size, ScreenStyle.for_brand(brand, **style), seed=seed)
+        self.shot_every = float(shot_every)
+        self.flight = float(flight)
+        self.settle = float(settle)
+        self.clock = clock
+        self._started = clock()
+        self._lock = threading.Lock()
+        self._values = {}                  # 샷 번호 → 정답 값
+        self._cache_key = None
+        self._screen = None
+        self.shots_shown = 0
+
+    def describe(self):
+        w, h = self.screens.screen_size
+        return f"synthetic({w}x{h}, {self.shot_every:.0f}초마다 샷)"
+
+    def _shot_values(self, n):
+        if n not in self._values:
+            self._values = {k: v for k, v in self._values.items() if k >= n - 1}
+            self._values[n] = self.screens.sample_values()
+            self.shots_shown = max(self.shots_shown, n)
+        return self._values[n]
+
+    def _state(self):
+        """지금 화면 → (캐시 키, 값, 런 텍스트 표시 여부)"""
+        elapsed = self.clock() - self._started
+        n, t = int(elapsed // self.shot_every), elapsed % self.shot_every
+        if t < self.flight:
+            # 비행 중: 직전 결과 화면에서 런 텍스트만 사라짐
+            return ("flight", n), self._shot_values(n - 1) if n else self._shot_values(-1), False
+        if t < self.flight + self.settle:
+            # 숫자 그려지는 중: 틱마다 다른 값 (캐시하지 않음)
+            return None, self.screens.sample_values(), True
+        return ("result", n), self._shot_values(n), True
+
+    def expected(self):
+        """지금 화면에 고정된 결과 값 (비행/숫자 변화 중이면 직전 샷 값)"""
+        with self._lock:
+            elapsed = self.clock() - self._started
+            n, t = int(elapsed // self.shot_every), elapsed % self.shot_every
+            return dict(self._shot_values(n if t >= self.flight + self.settle else n - 1))
+
+    def monitors(self):
+        w, h = self.screens.screen_size
+        return [(0, 0, w, h)]
+
+    def grab(self, rect):
+        with self._lock:
+            key, values, run_text = self._state()
+            if key is None or key != self._cache_key:
+                self._screen = self.screens.render(values, run_text=run_text)[0]
+                self._cache_key = key
+            screen = self._screen
+        x, y, w, h = rect
+        return screen[max(0, y):y + h, max(0, x):x + w].copy()
+
+
+BACKENDS = {
+    "pyautogui": PyAutoGuiBackend,
+    "mss": MssBackend,
+    "files": FileBackend,
+    "synthetic": SyntheticBackend,
+}
+
+
+def create_backend(config=None, regions=None):
+    """
+    캡처 백엔드 생성
+
+    config: 백엔드 이름 또는 {"type": 이름, 옵션...} (없으면 pyautogui)
+    regions: synthetic 백엔드 기본 좌표 (config에 coordinates가 없을 때)
+    선택한 백엔드의 라이브러리가 없으면 ImportError (호출하는 쪽에서 pyautogui로 대체)
+    """
+    options = {"type": config} if isinstance(config, str) else dict(config or {})
+    kind = str(options.pop("type", None) or "pyautogui").lower()
+    if kind not in BACKENDS:
+        raise ValueError(f"알 수 없는 캡처 백엔드: {kind} ({', '.join(BACKENDS)})")
+    if kind == "synthetic" and "coordinates" not in options:
+        options["regions"] = regions
+    return BACKENDS[kind](**options)
@@ -0,0 +1,74 @@
+# ===== client/core/change_detector.py (영역 변화 감지) =====
+"""
+런 텍스트 존재 여부 판정 앞단의 저비용 변화 감지
+
+런 텍스트 영역은 매 틱(50ms) cvtColor + 11x11 adaptiveThreshold + countNonZero로 판정했는데,
+대부분의 틱에서 화면은 이전 판정 때와 같다.
+
+- 판정할 때의 영역을 축소(간격 downsample 픽셀 샘플링, 한 채널)해서 기준 이미지로 보관
+- 새 프레임은 같은 방식으로 축소해 기준과 평균 절대 차이(MAD) 비교
+  행 묶음 단위로 누적하다가 margin을 넘는 순간 중단 (early exit)
+- 차이가 margin 이하면 이전 판정을 그대로 사용, 넘으면 전체 판정(classify) 실행 후 기준 교체
+- 기준은 매 틱이 아니라 판정할 때만 바뀌므로 천천히 변하는 화면도 누적 차이로 감지됨
+- max_age초마다 한 번은 전체 판정 (오판 누적 방지)
+
+사용법:
+    detector = ChangeGatedClassifier(classify=has_text_pixels, margin=6.0)
+    has_text = detector.check(img, now)
+"""
+import numpy as np
+
+
+class ChangeGatedClassifier:
+    def __init__(self, classify, margin=6.0, downsample=4, max_age=2.0, chunks=4):
+        self.classify = classify
+        self.margin = margin
+        self.downsample = downsample
+        self.max_age = max_age
+        self.chunks = chunks
+        self._ref = None
+        self._result = None
+        self._checked_at = 0.0
+        # 통계
+        self.skipped = 0
+        self.full_checks = 0
+
+    def reset(self):
+        self._ref = None
+        self._result = None
+
+    def _sample(self, img):
+        step = self.downsample
+        channel = img[::step, ::step, 1] if img.ndim == 3 else img[::step, ::step]
+        return channel.astype(np.int16)
+
+    def _changed(self, sample):
+        """기준 대비 MAD > margin 이면 True (행 묶음 단위 early exit)"""
+        ref = self._ref
+        if ref is None or ref.shape != sample.shape:
+            return True
+        limit = self.margin * sample.size
+        rows = sample.shape[0]
+        step = max(1, -(-rows // self.chunks))
+        total = 0
+        for start in range(0, rows, step):
+            total += int(np.abs(sample[start:start + step] - ref[start:start + step]).sum())
+            if total > limit:
+                return True
+        return False
+
+    def check(self, img, now):
+        sample = self._sample(img)
+        if (self._result is not None and now - self._checked_at < self.max_age
+                and not self._changed(sample)):
+            self.skipped += 1
+            return self._result
+        self.full_checks += 1
+        self._result = self.classify(img)
+        self._ref = sample
+        self._checked_at = now
+        return self._result
+
+    def skip_ratio(self):
+        total = self.skipped + self.full_checks
+        return self.skipped / total if total else 0.0
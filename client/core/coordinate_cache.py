@@ -0,0 +1,193 @@
+# ===== client/core/coordinate_cache.py (좌표 파일 로컬 캐시) =====
+"""
+좌표 파일 로컬 캐시 (샷 수집 프로그램 / 좌표 표시 공용)
+
+수집 프로그램은 시작할 때마다 /api/coordinates/<brand>/<filename>을 받아야 했고,
+서버가 느리거나 끊겨 있으면 시작 자체가 안 됐다.
+
+- 좌표 파일은 (brand, resolution, version) 단위로 디스크에 저장
+  regions/cache/<BRAND>_<resolution>_v<version>.json
+- index.json: (brand, filename) → 캐시 파일, ETag, 받은 시각 / 브랜드별 파일 목록
+- 캐시가 있으면 디스크에서 바로 반환하고, 백그라운드에서 If-None-Match로 재검증
+  (304면 그대로, 200이면 새 버전 저장 후 on_update 콜백)
+- 캐시가 없을 때만 네트워크를 기다림
+
+사용법:
+    cache = CoordinateCache(api_base_url, cache_dir)
+    payload = cache.get_file(brand, filename, on_update=lambda p: ...)
+    files = cache.list_files(brand, on_update=lambda files: ...)
+"""
+import json
+import os
+import re
+import threading
+import time
+
+import requests
+
+REQUEST_TIMEOUT = 10
+INDEX_FILE = "index.json"
+
+
+class CoordinateCache:
+    def __init__(self, api_base_url, cache_dir, log=print):
+        self.api_base_url = api_base_url.rstrip("/")
+        self.cache_dir = cache_dir
+        self.log = log
+        self._lock = threading.Lock()
+        self._revalidating = set()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._index = self._read_json(os.path.join(cache_dir, INDEX_FILE)) or {}
+        self._index.setdefault("files", {})
+        self._index.setdefault("lists", {})
+
+    # ------------------------------------------------
+    # 디스크
+    # ------------------------------------------------
+    @staticmethod
+    def _read_json(path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _write_json(path, data):
+        # 쓰는 도중 종료돼도 기존 파일이 깨지지 않도록 임시 파일 → 교체
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+
+    def _save_index(self):
+        self._write_json(os.path.join(self.cache_dir, INDEX_FILE), self._index)
+
+    @staticmethod
+    def _file_key(brand, filename):
+        return f"{brand.upper()}/{filename}"
+
+    @staticmethod
+    def _payload_name(brand, payload):
+        resolution = re.sub(r"[^0-9A-Za-z_.-]", "_", str(payload.get("resolution") or "unknown"))
+        return f"{brand.upper()}_{resolution}_v{payload.get('version', 0)}.json"
+
+    def cached_file(self, brand, filename):
+        """디스크 캐시의 좌표 파일 (없거나 깨졌으면 None)"""
+        with self._lock:
+            entry = self._index["files"].get(self._file_key(brand, filename))
+        if not entry:
+            return None
+        return self._read_json(os.path.join(self.cache_dir, entry["path"]))
+
+    # ------------------------------------------------
+    # 네트워크 (조건부 GET)
+    # ------------------------------------------------
+    def _conditional_get(self, url, etag):
+        headers = {"If-None-Match": etag} if etag else {}
+        response = requests.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+        if response.status_code == 304:
+            return None, etag
+        if response.status_code != 200:
+            try:
+                error = response.json().get("error")
+            except ValueError:
+                error = None
+            raise RuntimeError(error or f"서버 오류 ({response.status_code})")
+        data = response.json()
+        if not data.get("success"):
+            raise RuntimeError(data.get("error", "다운로드 실패"))
+        return data, (response.headers.get("ETag") or "").strip() or None
+
+    def fetch_file(self, brand, filename):
+        """
+        서버에서 좌표 파일 재검증/다운로드
+        Returns: (payload, changed) - 304면 (디스크 캐시, False)
+        """
+        key = self._file_key(brand, filename)
+        with self._lock:
+            entry = self._index["files"].get(key)
+        cached = self.cached_file(brand, filename) if entry else None
+        url = f"{self.api_base_url}/api/coordinates/{brand.upper()}/{filename}"
+        data, etag = self._conditional_get(url, entry.get("etag") if cached is not None else None)
+        if data is None:
+            return cached, False
+
+        payload = data.get("data") or {}
+        path = self._payload_name(brand, payload)
+        self._write_json(os.path.join(self.cache_dir, path), payload)
+        with self._lock:
+            self._index["files"][key] = {
+                "brand": brand.upper(),
+                "filename": filename,
+                "resolution": payload.get("resolution", ""),
+                "version": payload.get("version", 0),
+                "path": path,
+                "etag": etag,
+                "fetched_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            }
+            self._save_index()
+        return payload, cached != payload
+
+    def fetch_list(self, brand):
+        """서버에서 좌표 파일 목록 재검증 Returns: (files, changed)"""
+        brand = brand.upper()
+        with self._lock:
+            entry = self._index["lists"].get(brand)
+        url = f"{self.api_base_url}/api/coordinates/{brand}"
+        data, etag = self._conditional_get(url, entry.get("etag") if entry else None)
+        if data is None:
+            return entry["files"], False
+        files = data.get("files", [])
+        with self._lock:
+            self._index["lists"][brand] = {"files": files, "etag": etag,
+                                           "fetched_at": time.strftime("%Y-%m-%d %H:%M:%S")}
+            self._save_index()
+        return files, entry is None or entry["files"] != files
+
+    # ------------------------------------------------
+    # 캐시 우선 조회 + 백그라운드 재검증
+    # ------------------------------------------------
+    def _revalidate(self, key, fetch, on_update):
+        with self._lock:
+            if key in self._revalidating:
+                return
+            self._revalidating.add(key)
+
+        def worker():
+            try:
+                value, changed = fetch()
+                if changed and on_update:
+                    on_update(value)
+            except Exception as e:
+                self.log(f"⚠️ 좌표 캐시 재검증 실패 (캐시 사용 유지): {key} - {e}")
+            finally:
+                with self._lock:
+                    self._revalidating.discard(key)
+
+        threading.Thread(target=worker, name="coord-revalidate", daemon=True).start()
+
+    def get_file(self, brand, filename, on_update=None):
+        """
+        좌표 파일 조회: 디스크 캐시가 있으면 즉시 반환 + 백그라운드 재검증,
+        없으면 서버에서 받아 저장 후 반환 (실패 시 예외)
+
+        on_update(payload): 재검증 결과 내용이 바뀌었을 때 호출 (백그라운드 스레드)
+        """
+        cached = self.cached_file(brand, filename)
+        if cached is not None:
+            self._revalidate(("file", brand.upper(), filename),
+                             lambda: self.fetch_file(brand, filename), on_update)
+            return cached
+        payload, _ = self.fetch_file(brand, filename)
+        return payload
+
+    def list_files(self, brand, on_update=None):
+        """좌표 파일 목록 조회 (get_file과 같은 방식, on_update(files))"""
+        with self._lock:
+            entry = self._index["lists"].get(brand.upper())
+        if entry is not None:
+            self._revalidate(("list", brand.upper()), lambda: self.fetch_list(brand), on_update)
+            return entry["files"]
+        files, _ = self.fetch_list(brand)
+        return files
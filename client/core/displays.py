@@ -0,0 +1,45 @@
+# ===== client/core/displays.py (디스플레이 목록) =====
+"""
+연결된 디스플레이(모니터) 사각형 조회
+
+한 PC에 시뮬레이터 화면이 2개인 매장은 타석마다 디스플레이 번호를 지정한다 (config.json "bays").
+- 0번: 주 디스플레이 (항상 (0, 0)에서 시작)
+- 1번 이후: 나머지 디스플레이를 가상 화면 좌표 (x, y) 순으로 정렬
+- Windows 외 환경이나 조회 실패 시 주 디스플레이만 반환
+
+사용법:
+    monitors = list_monitors(pyautogui.size())
+    x, y, w, h = monitors[display]
+"""
+import os
+
+
+def _enum_windows_monitors():
+    import ctypes
+    from ctypes import wintypes
+
+    rects = []
+    MonitorEnumProc = ctypes.WINFUNCTYPE(
+        ctypes.c_int, wintypes.HMONITOR, wintypes.HDC, ctypes.POINTER(wintypes.RECT), wintypes.LPARAM
+    )
+
+    def callback(hmonitor, hdc, rect_ptr, lparam):
+        r = rect_ptr.contents
+        rects.append((r.left, r.top, r.right - r.left, r.bottom - r.top))
+        return 1
+
+    ctypes.windll.user32.EnumDisplayMonitors(None, None, MonitorEnumProc(callback), 0)
+    return rects
+
+
+def list_monitors(primary_size):
+    """디스플레이 사각형 [(x, y, w, h)] (0번이 주 디스플레이)"""
+    primary = (0, 0, int(primary_size[0]), int(primary_size[1]))
+    if os.name != "nt":
+        return [primary]
+    try:
+        rects = _enum_windows_monitors()
+    except Exception:
+        return [primary]
+    others = sorted(r for r in rects if r[:2] != (0, 0))
+    return [primary] + others
@@ -0,0 +1,105 @@
+# ===== client/core/frame_ring.py (프로세스 간 프레임 링 버퍼) =====
+"""
+캡처 프로세스 → GUI 프로세스 프레임 전달용 공유 메모리 링 버퍼
+
+캡처/OCR 작업 프로세스가 OCR에 쓴 bbox 프레임(수 MB)을 Queue로 보내면 매번 pickle 복사가 일어난다.
+프레임은 multiprocessing.shared_memory 링에 쓰고, Queue로는 슬롯 번호(seq)만 보낸다.
+
+- 작성자 1개(캡처 프로세스), 읽는 쪽은 여러 개 가능
+- 슬롯 수만큼만 보관: 오래된 프레임은 덮어써지며, 읽을 때 seq가 바뀌었으면 None
+- 슬롯 헤더 [seq, h, w, c, timestamp_us]를 프레임 복사 전후에 비교 (seqlock 방식, 락 없음)
+- 공유 메모리는 만든 쪽(GUI 프로세스)이 close() + unlink()로 해제
+
+사용법:
+    ring = FrameRing.create(slot_bytes=w * h * 3, slots=3)       # GUI 프로세스
+    ring = FrameRing.attach(ring.name, ring.slots, ring.slot_bytes)  # 캡처 프로세스
+    seq = ring.write(frame)
+    frame, ts = ring.read(seq)
+"""
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+HEADER_FIELDS = 5  # seq, h, w, c, timestamp_us
+WRITING = -1
+
+
+class FrameRing:
+    def __init__(self, shm, slots, slot_bytes, owner=False):
+        self.shm = shm
+        self.slots = slots
+        self.slot_bytes = slot_bytes
+        self.owner = owner
+        header_bytes = (slots + 1) * HEADER_FIELDS * 8
+        # 헤더 0행: [다음 seq, ...], 1~slots행: 슬롯별 헤더
+        self._header = np.ndarray((slots + 1, HEADER_FIELDS), dtype=np.int64, buffer=shm.buf)
+        self._data = np.ndarray((slots, slot_bytes), dtype=np.uint8, buffer=shm.buf, offset=header_bytes)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    @staticmethod
+    def _size(slots, slot_bytes):
+        return (slots + 1) * HEADER_FIELDS * 8 + slots * slot_bytes
+
+    @classmethod
+    def create(cls, slot_bytes, slots=3):
+        shm = shared_memory.SharedMemory(create=True, size=cls._size(slots, slot_bytes))
+        ring = cls(shm, slots, slot_bytes, owner=True)
+        ring._header[:] = 0
+        ring._header[1:, 0] = WRITING  # 아직 쓴 적 없는 슬롯
+        return ring
+
+    @classmethod
+    def attach(cls, name, slots, slot_bytes):
+        return cls(shared_memory.SharedMemory(name=name), slots, slot_bytes)
+
+    def write(self, frame, timestamp=None):
+        """프레임 기록 → seq (슬롯보다 큰 프레임은 기록하지 않고 None)"""
+        frame = np.ascontiguousarray(frame, dtype=np.uint8)
+        if frame.nbytes > self.slot_bytes or frame.ndim not in (2, 3):
+            return None
+        seq = int(self._header[0, 0])
+        header = self._header[1 + seq % self.slots]
+        header[0] = WRITING
+        self._data[seq % self.slots, :frame.nbytes] = frame.reshape(-1)
+        h, w = frame.shape[:2]
+        header[1:5] = (h, w, frame.shape[2] if frame.ndim == 3 else 0,
+                       int((timestamp if timestamp is not None else time.time()) * 1_000_000))
+        header[0] = seq
+        self._header[0, 0] = seq + 1
+        return seq
+
+    def read(self, seq):
+        """seq 프레임 복사본 → (frame, timestamp), 이미 덮어써졌거나 쓰는 중이면 None"""
+        if seq is None or seq < 0:
+            return None
+        header = self._header[1 + seq % self.slots]
+        if int(header[0]) != seq:
+            return None
+        h, w, c, ts_us = (int(v) for v in header[1:5])
+        shape = (h, w, c) if c else (h, w)
+        size = h * w * (c or 1)
+        frame = self._data[seq % self.slots, :size].copy().reshape(shape)
+        if int(header[0]) != seq:  # 복사 중에 덮어써짐
+            return None
+        return frame, ts_us / 1_000_000
+
+    def latest(self):
+        """가장 최근 프레임 → (seq, frame, timestamp), 없으면 None"""
+        seq = int(self._header[0, 0]) - 1
+        result = self.read(seq)
+        return (seq,) + result if result else None
+
+    def close(self):
+        # numpy view가 버퍼를 잡고 있으면 close()가 실패하므로 먼저 해제
+        self._header = None
+        self._data = None
+        self.shm.close()
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,507 @@
+# ===== client/core/metrics_ocr.py (지표 영역 OCR/파싱) =====
+"""
+지표 영역 이미지 → OCR 문자열 → 숫자 변환
+
+main.py에 있던 ocr_text_region()/parse_value()/read_metrics()의 OCR 부분을 화면 캡처와 분리했다.
+pyautogui/트레이 없이 import되므로 녹화한 영역 이미지로 리눅스에서도 OCR을 재생/측정할 수 있다
+(replay_ocr.py, client/core/ocr_archive.py).
+
+- ocr_image(key, img, scale): 영역 이미지 1개 OCR → 문자열 (threshold/PSM 조합 순서대로 시도)
+- parse_value(text, mode, key): OCR 문자열 → 부호 적용된 숫자
+- METRIC_FIELDS: 지표별 (키, 파싱 모드, 파싱 key) - read_metrics()의 OCR 순서
+- read_metrics(layout, frame, texts): bbox 프레임 → 지표 dict (+ 스매쉬팩터)
+- 전처리/tesseract 호출/파싱 소요 시간은 영역별로 client/core/stage_timer.py timings에 기록
+
+사용법:
+    texts = {}
+    metrics = read_metrics(layout, frame, texts)      # texts: 지표별 OCR 원문 (녹화용)
+    value = parse_value(ocr_image("carry", img, 4.0), mode="plain")
+"""
+import re
+import time
+
+import cv2
+import pytesseract
+
+from client.core.stage_timer import timings
+
+OCR_TIMEOUT_SEC = 1
+
+# 지표별 (키, 파싱 모드, parse_value key)
+# 각도/이격: R/L 로 방향 결정, 스핀류: 백스핀은 부호 없음, 사이드스핀은 '-' 부호 가능 (4자리 숫자 우선 추출)
+METRIC_FIELDS = (
+    ("total_distance",  "plain", None),
+    ("carry",           "plain", None),
+    ("ball_speed",      "plain", None),
+    ("club_speed",      "plain", None),
+    ("launch_angle",    "plain", None),
+    ("back_spin",       "plain", "back_spin"),
+    ("club_path",       "minus", None),
+    ("lateral_offset",  "RL",    None),
+    ("direction_angle", "RL",    None),
+    ("side_spin",       "minus", "side_spin"),
+    ("face_angle",      "RL",    None),
+)
+
+
+def _tesseract(key, img, config):
+    """tesseract 1회 호출 (영역별 소요 시간 기록, 시간 초과/오류는 호출하는 쪽에서 처리)"""
+    with timings.time(f"tesseract.{key}"):
+        return pytesseract.image_to_string(img, lang="eng", config=config, timeout=OCR_TIMEOUT_SEC)
+
+
+def ocr_image(key, img, scale=None):
+    """
+    숫자 + 부호(+/- 또는 R/L) + 단위 전체가 들어있는 영역 이미지를 읽어서
+    그대로 문자열로 반환.
+    개선: 이미지 전처리 강화 및 여러 threshold 시도
+    백스핀 특별 처리: 4자리 숫자 인식 강화
+
+    img: 영역 BGR 이미지 (확대 전), scale: OCR 전 확대 배율 (RegionLayout.scales, 없으면 None)
+    """
+    started = time.perf_counter()
+    # 작은 영역은 확대 (배율은 레이아웃 컴파일 시 계산 - region_layout.UPSCALE_RULES)
+    # 백스핀/사이드스핀: 4자리 숫자 인식, 볼스피드/클럽스피드: 소수점 인식을 위해 더 크게 확대
+    if scale:
+        img = cv2.resize(img, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC)
+    
+    # 전처리
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    
+    # 백스핀/사이드스핀은 더 강한 전처리
+    if key in ["back_spin", "side_spin"]:
+        # 대비 강화 (CLAHE 사용)
+        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8,8))
+        gray = clahe.apply(gray)
+    
+    # 방법 1: 정규화 + 블러 + 일반 threshold (가장 빠르고 효과적)
+    gray1 = cv2.normalize(gray, None, 0, 255, cv2.NORM_MINMAX)
+    gray1 = cv2.GaussianBlur(gray1, (3, 3), 0)
+    timings.record(f"preprocess.{key}", (time.perf_counter() - started) * 1000.0)
+    
+    # 백스핀과 사이드스핀은 더 많은 threshold 값 시도
+    # 볼스피드/클럽스피드는 소수점 인식을 위해 더 많은 시도
+    if key in ["back_spin", "side_spin"]:
+        priority_combinations = [
+            (gray1, 145, 8),  # PSM 8 (단일 단어) 우선 시도
+            (gray1, 150, 8),
+            (gray1, 140, 8),
+            (gray1, 145, 7),
+            (gray1, 150, 7),
+            (gray1, 140, 7),
+            (gray1, 135, 7),  # 스핀 항목 추가
+            (gray1, 155, 7),  # 스핀 항목 추가
+            (gray1, 145, 6),  # PSM 6도 시도
+            (gray1, 160, 8),  # 추가 threshold
+            (gray1, 130, 8),  # 추가 threshold
+        ]
+        # 여러 결과를 수집하여 가장 정확한 것 선택
+        candidate_texts = []
+    elif key in ["ball_speed", "club_speed"]:
+        # 볼스피드/클럽스피드는 소수점 인식을 위해 더 많은 시도
+        priority_combinations = [
+            (gray1, 145, 7),  # 가장 일반적인 조합
+            (gray1, 150, 7),
+            (gray1, 140, 7),
+            (gray1, 145, 8),  # PSM 8도 시도
+            (gray1, 150, 8),
+            (gray1, 140, 8),
+            (gray1, 135, 7),  # 추가 threshold
+            (gray1, 155, 7),  # 추가 threshold
+        ]
+    else:
+        priority_combinations = [
+            (gray1, 145, 7),  # 가장 일반적인 조합
+            (gray1, 150, 7),
+            (gray1, 140, 7),
+            (gray1, 145, 8),  # PSM 8도 시도
+        ]
+    
+    best_text = None
+    best_thresh_img = None
+    candidate_texts = []  # 백스핀/사이드스핀용 후보 텍스트들
+    
+    for processed, thresh_val, psm_mode in priority_combinations:
+        try:
+            thresh = cv2.threshold(processed, thresh_val, 255, cv2.THRESH_BINARY)[1]
+            text = _tesseract(
+                key, thresh,
+                f"--psm {psm_mode} -c tessedit_char_whitelist=0123456789.,-RL /mps°"
+            ).upper().strip()
+            if text and any(c.isdigit() for c in text):
+                # 볼스피드/클럽스피드는 소수점이 있는 결과를 우선 선택
+                if key in ["ball_speed", "club_speed"]:
+                    if "." in text:
+                        # 소수점이 있으면 즉시 반환 (디버그 이미지는 샷 감지 시 저장)
+                        if best_thresh_img is None:
+                            best_thresh_img = thresh
+                        return text
+                    elif best_text is None:
+                        # 소수점이 없어도 일단 저장 (나중에 사용)
+                        best_text = text
+                        if best_thresh_img is None:
+                            best_thresh_img = thresh
+                # 백스핀과 사이드스핀은 특별 처리
+                elif key == "back_spin":
+                    # 백스핀: 4자리 숫자 우선
+                    digits = sum(c.isdigit() for c in text)
+                    if digits == 4:
+                        candidate_texts.append(text)
+                    elif digits >= 4:
+                        candidate_texts.append(text)
+                    elif digits >= 3:
+                        candidate_texts.append(text)
+                elif key == "side_spin":
+                    # 사이드 스핀: 4자리 또는 3자리 숫자 우선 (부호 포함)
+                    digits = sum(c.isdigit() for c in text)
+                    if digits == 4:
+                        # 정확히 4자리면 즉시 반환
+                        return text
+                    elif digits == 3:
+                        # 정확히 3자리면 즉시 반환
+                        return text
+                    elif digits >= 4:
+                        # 4자리 이상이면 후보에 추가 (나중에 파싱에서 앞 4자리만 추출)
+                        candidate_texts.append(text)
+                    elif digits >= 3:
+                        # 3자리 이상이면 후보에 추가 (나중에 파싱에서 앞 3자리만 추출)
+                        candidate_texts.append(text)
+                    elif digits >= 2:
+                        candidate_texts.append(text)
+                else:
+                    return text  # 즉시 반환 (조기 종료)
+        except Exception:
+            continue
+    
+    # 백스핀: 여러 후보 중 가장 정확한 것 선택 (4자리 우선)
+    if key == "back_spin" and candidate_texts:
+        # 정확히 4자리 숫자가 있는 결과 우선 선택
+        for candidate in candidate_texts:
+            digits = sum(c.isdigit() for c in candidate)
+            if digits == 4:
+                return candidate
+        # 4자리가 없으면 첫 번째 후보 반환 (파싱에서 처리)
+        if candidate_texts:
+            return candidate_texts[0]
+    
+    # 사이드 스핀: 여러 후보 중 가장 정확한 것 선택 (4자리 우선, 그 다음 3자리)
+    if key == "side_spin" and candidate_texts:
+        # 정확히 4자리 숫자가 있는 결과 우선 선택
+        for candidate in candidate_texts:
+            digits = sum(c.isdigit() for c in candidate)
+            if digits == 4:
+                return candidate
+        # 4자리가 없으면 3자리 선택
+        for candidate in candidate_texts:
+            digits = sum(c.isdigit() for c in candidate)
+            if digits == 3:
+                return candidate
+        # 3자리도 없으면 첫 번째 후보 반환 (파싱에서 처리)
+        if candidate_texts:
+            return candidate_texts[0]
+    
+    # 볼스피드/클럽스피드는 소수점이 없는 경우에도 반환 (디버그 이미지는 샷 감지 시 저장)
+    if key in ["ball_speed", "club_speed"] and best_text:
+        return best_text
+    
+    # 실패 시 적응형 threshold 시도 (1회만)
+    try:
+        gray2 = cv2.adaptiveThreshold(
+            gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, 
+            cv2.THRESH_BINARY_INV, 11, 2
+        )
+        text = _tesseract(
+            key, gray2,
+            "--psm 7 -c tessedit_char_whitelist=0123456789.,-RL /mps°"
+        ).upper().strip()
+        if text and any(c.isdigit() for c in text):
+            if key == "back_spin":
+                digits = sum(c.isdigit() for c in text)
+                if digits >= 3:
+                    return text
+            elif key == "side_spin":
+                digits = sum(c.isdigit() for c in text)
+                if digits >= 2:  # 사이드 스핀은 3자리지만 2자리 이상이면 일단 반환
+                    return text
+            else:
+                return text
+    except Exception:
+        pass
+    
+    # 마지막 시도: whitelist 없이
+    try:
+        thresh = cv2.threshold(gray1, 145, 255, cv2.THRESH_BINARY)[1]
+        text = _tesseract(key, thresh, "--psm 7").upper().strip()
+        return text
+    except Exception:
+        return ""
+
+
+def parse_value(text, mode="plain", key=None):
+    """
+    text: OCR로 읽은 전체 문자열 (예: "L 3.0°", "10,000 rpm", "-866 rpm", "47.55 m/s", "1662-", "--1070-", "22981")
+    mode:
+      - "plain"  : 부호 없는 순수 숫자 (볼스피드, 클럽스피드, 발사각 등)
+      - "minus"  : '-' 기호 기준 부호 (클럽패스, 사이드스핀, 백스핀 등)
+      - "RL"     : R/L 기준 부호 (페이스각, 방향각, 좌우이격 등)
+    key: 항목 이름 (back_spin, side_spin 등) - 4자리 숫자 우선 추출용
+    
+    개선: 쉼표가 포함된 숫자(10,000)도 처리하고, 부호 인식을 더 정확하게
+    4자리 숫자도 정확히 추출하도록 개선
+    """
+    if not text:
+        return None
+
+    # OCR 결과에서 불필요한 문자 제거 (뒤에 붙은 '-' 등)
+    # 예: "1662-" → "1662", "--1070-" → "-1070"
+    text_clean = text.strip()
+    
+    # 연속된 '-' 정리 (맨 앞의 '-'만 유지)
+    if text_clean.startswith("-"):
+        # 맨 앞의 '-' 유지하고 나머지 '-' 제거
+        text_clean = "-" + text_clean[1:].replace("-", "")
+    else:
+        # 앞에 '-'가 없으면 모든 '-' 제거
+        text_clean = text_clean.replace("-", "")
+
+    # 백스핀: 정확히 4자리 숫자를 우선적으로 찾기
+    if key == "back_spin":
+        # 모든 숫자 추출 (순서대로)
+        all_digits = re.findall(r'\d', text_clean)
+        
+        if len(all_digits) >= 4:
+            # 앞의 4자리 숫자만 사용
+            # 예: "22981" → "2298", "2981" → "2981" (이미 4자리)
+            num_str = ''.join(all_digits[:4])
+            try:
+                v = float(num_str)
+                return abs(v)  # 백스핀은 부호 없음
+            except ValueError:
+                pass
+        
+        # 정규표현식으로도 시도 (기존 방식)
+        m = re.search(r"\d{4}(?!\d)", text_clean)  # 4자리 숫자 뒤에 숫자가 없는 경우
+        if m:
+            num_str = m.group(0).replace(",", "")
+            try:
+                v = float(num_str)
+                return abs(v)
+            except ValueError:
+                pass
+        
+        # 4자리 숫자 뒤에 숫자가 있어도 앞의 4자리만 추출 (22981 → 2298)
+        m = re.search(r"(\d{4})\d+", text_clean)
+        if m:
+            num_str = m.group(1)
+            try:
+                v = float(num_str)
+                return abs(v)
+            except ValueError:
+                pass
+    
+    # 사이드 스핀: 3자리 또는 4자리 숫자 처리 (부호 포함)
+    if key == "side_spin":
+        # 원본 텍스트에서 부호 확인 (OCR 오류로 인한 잘못된 부호 제거)
+        original_text = text.strip()
+        has_minus_sign = False
+        
+        # 명확한 부호 확인: 텍스트 시작 부분에 "-"가 있고, 그 뒤에 숫자가 오는 경우만
+        if original_text.startswith("-") and len(original_text) > 1 and original_text[1].isdigit():
+            has_minus_sign = True
+        
+        # 모든 숫자 추출 (순서대로)
+        all_digits = re.findall(r'\d', text_clean)
+        
+        # 4자리 숫자 우선 처리 (-1070 같은 경우)
+        if len(all_digits) >= 4:
+            # 앞의 4자리 숫자 사용
+            # 예: "10706" → "1070", "1070" → "1070"
+            num_str = ''.join(all_digits[:4])
+            try:
+                v = float(num_str)
+                if mode == "minus":
+                    # 명확한 부호가 있을 때만 음수로 처리
+                    if has_minus_sign:
+                        return -abs(v)
+                    return abs(v)
+                return abs(v)
+            except ValueError:
+                pass
+        
+        # 3자리 숫자 처리 (655 같은 경우)
+        if len(all_digits) >= 3:
+            # 앞의 3자리 숫자만 사용
+            # 예: "6556" → "655", "655" → "655"
+            num_str = ''.join(all_digits[:3])
+            try:
+                v = float(num_str)
+                if mode == "minus":
+                    # 명확한 부호가 있을 때만 음수로 처리
+                    if has_minus_sign:
+                        return -abs(v)
+                    return abs(v)
+                return abs(v)
+            except ValueError:
+                pass
+        
+        # 정규표현식으로도 시도: 4자리 숫자 우선, 그 다음 3자리
+        m = re.search(r"\d{4}(?!\d)", text_clean)  # 4자리 숫자 뒤에 숫자가 없는 경우 (부호 제외)
+        if m:
+            num_str = m.group(0).replace(",", "")
+            try:
+                v = float(num_str)
+                if mode == "minus":
+                    if has_minus_sign:
+                        return -abs(v)
+                    return abs(v)
+                return abs(v)
+            except ValueError:
+                pass
+        
+        m = re.search(r"\d{3}(?!\d)", text_clean)  # 3자리 숫자 뒤에 숫자가 없는 경우 (부호 제외)
+        if m:
+            num_str = m.group(0).replace(",", "")
+            try:
+                v = float(num_str)
+                if mode == "minus":
+                    if has_minus_sign:
+                        return -abs(v)
+                    return abs(v)
+                return abs(v)
+            except ValueError:
+                pass
+        
+        # 4자리 이상 숫자 뒤에 숫자가 있어도 앞의 4자리만 추출 (10706 → 1070)
+        m = re.search(r"(\d{4})\d+", text_clean)  # 부호 제외하고 숫자만
+        if m:
+            num_str = m.group(1)
+            try:
+                v = float(num_str)
+                if mode == "minus":
+                    if has_minus_sign:
+                        return -abs(v)
+                    return abs(v)
+                return abs(v)
+            except ValueError:
+                pass
+        
+        # 3자리 숫자 뒤에 숫자가 있어도 앞의 3자리만 추출 (6556 → 655)
+        m = re.search(r"(\d{3})\d+", text_clean)  # 부호 제외하고 숫자만
+        if m:
+            num_str = m.group(1)
+            try:
+                v = float(num_str)
+                if mode == "minus":
+                    if has_minus_sign:
+                        return -abs(v)
+                    return abs(v)
+                return abs(v)
+            except ValueError:
+                pass
+
+    # 숫자 추출 (4자리 이상도 포함, 쉼표 포함 가능, 소수점 포함 가능)
+    # 예: "1662", "10,000", "47.55", "60.62", "-1070", "L 3.0", "-4.7" 등
+    # 소수점이 있는 숫자를 우선적으로 찾기 (볼스피드/클럽스피드/클럽패스 등)
+    # 소수점 인식 강화: 소수점 앞뒤로 숫자가 있는 패턴 우선
+    m = re.search(r"-?\d+\.\d+", text_clean)
+    if not m:
+        # 소수점이 없으면 정수만 찾기
+        # 먼저 쉼표 포함 숫자 시도
+        m = re.search(r"-?\d{1,3}(?:,\d{3})+", text_clean)
+    if not m:
+        # 정확히 4자리 숫자 우선 시도 (백스핀용)
+        m = re.search(r"-?\d{4}", text_clean)
+    if not m:
+        # 쉼표 없는 4자리 이상 숫자 시도
+        m = re.search(r"-?\d{4,}", text_clean)
+    if not m:
+        # 일반 숫자 (1자리 이상)
+        m = re.search(r"-?\d+", text_clean)
+    if not m:
+        return None
+
+    # 쉼표 제거 후 숫자 변환
+    num_str = m.group(0).replace(",", "")
+    
+    # 소수점이 있는 경우와 없는 경우를 구분하여 처리
+    has_decimal = "." in num_str
+    try:
+        v = float(num_str)
+    except ValueError:
+        return None
+
+    if mode == "plain":
+        # 부호 없는 순수 숫자 (볼스피드, 클럽스피드 등)
+        # 단, 소수점이 있는 경우 원래 값 유지 (음수면 음수, 양수면 양수)
+        # 볼스피드/클럽스피드는 항상 양수이므로 abs 사용
+        return abs(v)
+
+    if mode == "minus":
+        # '-' 기호가 있으면 음수, 없으면 양수
+        # 예: "-866 rpm" → -866, "989 rpm" → 989, "-4.7" → -4.7, "4.7" → 4.7
+        # 원본 text에서 명확한 부호 확인 (텍스트 시작 부분에 "-"가 있고 그 뒤에 숫자가 오는 경우만)
+        original_text = text.strip()
+        has_minus_sign = False
+        if original_text.startswith("-") and len(original_text) > 1:
+            # "-" 뒤에 숫자나 소수점이 오는 경우만 부호로 인정
+            next_char = original_text[1]
+            if next_char.isdigit() or next_char == ".":
+                has_minus_sign = True
+        
+        # 소수점이 있는 경우: 원본 텍스트의 부호를 정확히 반영
+        if has_decimal:
+            if has_minus_sign or num_str.startswith("-"):
+                return -abs(v)
+            return abs(v)
+        
+        # 소수점이 없는 경우: 기존 로직
+        if has_minus_sign or num_str.startswith("-"):
+            return -abs(v)
+        return abs(v)
+
+    if mode == "RL":
+        # R/L 기준 부호 (L이 우선, 그다음 R)
+        # 예: "L 3.0°" → -3.0, "R 5.31 m" → 5.31
+        text_upper = text.upper()
+        if "L" in text_upper:
+            return -abs(v)
+        if "R" in text_upper:
+            return abs(v)
+        # 부호가 없으면 원래 값 반환 (음수면 음수, 양수면 양수)
+        return v
+
+    return v
+
+def parse_metrics(texts):
+    """지표별 OCR 문자열 dict → 지표 dict (+ 스매쉬팩터)"""
+    metrics = {}
+    with timings.time("parse"):
+        for key, mode, parse_key in METRIC_FIELDS:
+            with timings.time(f"parse.{key}"):
+                metrics[key] = parse_value(texts.get(key), mode=mode, key=parse_key)
+
+    ball_speed = metrics["ball_speed"]
+    club_speed = metrics["club_speed"]
+    smash_factor = None
+    try:
+        if ball_speed is not None and club_speed not in (None, 0, 0.0):
+            smash_factor = round(ball_speed / club_speed, 2)
+    except Exception:
+        smash_factor = None
+    metrics["smash_factor"] = smash_factor
+    return metrics
+
+
+def read_metrics(layout, frame, texts=None):
+    """
+    bbox 프레임의 지표 영역 OCR → 지표 dict (+ 스매쉬팩터)
+
+    texts: dict를 넘기면 지표별 OCR 원문을 채워 줌 (녹화/진단용)
+    """
+    if texts is None:
+        texts = {}
+    with timings.time("ocr"):
+        for key, _, _ in METRIC_FIELDS:
+            with timings.time(f"ocr.{key}"):
+                texts[key] = ocr_image(key, layout.crop(frame, key), layout.scales.get(key))
+    return parse_metrics(texts)
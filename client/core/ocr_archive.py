@@ -0,0 +1,135 @@
+# ===== client/core/ocr_archive.py (OCR 녹화 아카이브) =====
+"""
+샷별 지표 영역 이미지 + OCR 결과 녹화/읽기
+
+OCR threshold/PSM 조합을 바꿀 때마다 현장 타석에서 직접 쳐 보며 확인했다.
+녹화 모드에서는 샷마다 OCR에 쓴 지표 영역 원본(확대 전)과 OCR 원문/파싱 값을 저장해 두고,
+replay_ocr.py로 같은 이미지를 다시 OCR해 속도와 일치율을 비교한다.
+
+- 하루 1개 zip (YYYYMMDD.zip), 샷마다 <shot_id>/<key>.png + <shot_id>/meta.json
+- PNG는 이미 압축되어 있으므로 zip은 무압축 저장 (추가 기록이 빠름)
+- meta.json: 레이아웃(해상도, 영역 사각형, 확대 배율), 지표별 OCR 원문, 파싱 값, 타이밍
+- keep_days보다 오래된 zip은 기록할 때 삭제
+
+사용법:
+    recorder = OcrRecorder(os.path.join(LOG_DIR, "ocr_record"))
+    recorder.record(layout, frame, metrics, texts, {"bay": 0, "read_at": ts})
+
+    for shot in iter_shots(["ocr_record"]):
+        img = shot.crop("carry")
+        shot.scales["carry"], shot.texts["carry"], shot.metrics["carry"]
+"""
+import json
+import os
+import time
+import zipfile
+from datetime import datetime
+
+import numpy as np
+
+META_NAME = "meta.json"
+
+
+class OcrRecorder:
+    def __init__(self, directory, keep_days=14):
+        self.directory = directory
+        self.keep_days = keep_days
+        self.recorded = 0
+        self._pruned_day = None
+
+    def record(self, layout, frame, metrics, texts, info=None):
+        """샷 1개 기록 → shot_id (영역 이미지는 OCR한 지표만, info["shot_id"]가 없으면 시각 + 타석 번호)"""
+        import cv2  # 녹화 모드에서만 필요
+
+        info = dict(info or {})
+        ts = info.get("read_at") or time.time()
+        when = datetime.fromtimestamp(ts)
+        shot_id = info.get("shot_id")
+        if not shot_id:
+            shot_id = when.strftime("%H%M%S_%f")[:10]
+            if info.get("bay") is not None:
+                shot_id += f"_b{info['bay']}"
+        keys = [key for key in texts if key in layout]
+        meta = dict(info)
+        meta.update({
+            "shot_id": shot_id,
+            "recorded_at": when.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3],
+            "screen_size": list(layout.screen_size),
+            "rects": {key: list(layout.rects[key]) for key in keys},
+            "scales": {key: layout.scales.get(key) for key in keys},
+            "texts": {key: texts[key] for key in keys},
+            "metrics": metrics,
+        })
+
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, when.strftime("%Y%m%d") + ".zip")
+        with zipfile.ZipFile(path, "a", compression=zipfile.ZIP_STORED) as zf:
+            for key in keys:
+                ok, png = cv2.imencode(".png", np.ascontiguousarray(layout.crop(frame, key)))
+                if ok:
+                    zf.writestr(f"{shot_id}/{key}.png", png.tobytes())
+            zf.writestr(f"{shot_id}/{META_NAME}", json.dumps(meta, ensure_ascii=False, indent=1))
+        self.recorded += 1
+        self._prune(when.strftime("%Y%m%d"))
+        return shot_id
+
+    def _prune(self, today):
+        # 하루에 한 번만 오래된 아카이브 정리
+        if self._pruned_day == today or not self.keep_days:
+            return
+        self._pruned_day = today
+        cutoff = time.time() - self.keep_days * 86400
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name.endswith(".zip") and os.path.getmtime(path) < cutoff:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+
+class RecordedShot:
+    """녹화된 샷 1개 (영역 이미지는 crop() 호출 시 디코딩)"""
+
+    def __init__(self, archive, zf, meta):
+        self.archive = archive
+        self._zf = zf
+        self.meta = meta
+        self.shot_id = meta["shot_id"]
+        self.scales = meta.get("scales", {})
+        self.texts = meta.get("texts", {})
+        self.metrics = meta.get("metrics") or {}
+
+    @property
+    def keys(self):
+        return list(self.texts)
+
+    def crop(self, key):
+        """지표 영역 BGR 이미지 (확대 전, 녹화되지 않았으면 None)"""
+        import cv2
+
+        try:
+            data = self._zf.read(f"{self.shot_id}/{key}.png")
+        except KeyError:
+            return None
+        return cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+
+
+def archive_paths(paths):
+    """zip 파일/디렉터리 목록 → zip 파일 경로 (디렉터리는 그 안의 *.zip, 이름 순)"""
+    result = []
+    for path in paths:
+        if os.path.isdir(path):
+            result.extend(os.path.join(path, name) for name in sorted(os.listdir(path)) if name.endswith(".zip"))
+        else:
+            result.append(path)
+    return result
+
+
+def iter_shots(paths):
+    """아카이브의 샷을 기록 순서대로 → RecordedShot"""
+    for path in archive_paths(paths):
+        with zipfile.ZipFile(path) as zf:
+            for name in zf.namelist():
+                if name.endswith("/" + META_NAME):
+                    yield RecordedShot(path, zf, json.loads(zf.read(name).decode("utf-8")))
@@ -0,0 +1,96 @@
+# ===== client/core/readiness.py (샷 결과 화면 안정 감지) =====
+"""
+런 텍스트 재등장 후 OCR 시점 결정
+
+이전에는 런 텍스트가 다시 나타나면 항상 1.0초를 기다린 뒤 read_metrics()를 호출했다.
+결과 숫자는 대부분 그보다 훨씬 빨리 화면에 고정되므로, 지표 영역의 작은 지문(fingerprint)을
+프레임마다 비교해 N프레임 연속으로 변화가 없으면 바로 OCR을 시작한다.
+
+- 지문: 영역을 흑백으로 바꿔 16x8로 축소한 배열 (영역당 128픽셀, 비교 비용 무시 가능)
+- 안정 판단: 모든 지표 영역의 평균 절대 차이가 tolerance 이하인 프레임이 stable_frames회 연속
+- min_wait: 재등장 직후 빈 화면/전환 효과를 안정으로 오인하지 않도록 최소 대기
+- max_wait: 숫자가 계속 바뀌는 화면(애니메이션 등)에서도 이 시간이 지나면 OCR (안전 상한)
+
+사용법:
+    detector = ReadinessDetector(stable_frames=4, max_wait=1.5)
+    detector.start(now)
+    ...매 틱...
+    if detector.update(now, region_fingerprints(layout, frame, keys)) or detector.timed_out(now):
+        metrics = read_metrics(layout, frame)
+"""
+import numpy as np
+
+FINGERPRINT_SIZE = (16, 8)  # (w, h)
+
+
+def region_fingerprints(layout, frame, keys):
+    """bbox 프레임에서 영역별 지문 계산 {key: int16 배열}"""
+    import cv2  # 감지기만 쓰는 시뮬레이션(shot_simulation.py)은 OpenCV 없이 실행
+    result = {}
+    for key in keys:
+        if key not in layout:
+            continue
+        img = layout.crop(frame, key)
+        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+        result[key] = cv2.resize(gray, FINGERPRINT_SIZE, interpolation=cv2.INTER_AREA).astype(np.int16)
+    return result
+
+
+class ReadinessDetector:
+    def __init__(self, stable_frames=4, tolerance=3.0, min_wait=0.15, max_wait=1.5):
+        self.stable_frames = stable_frames
+        self.tolerance = tolerance
+        self.min_wait = min_wait
+        self.max_wait = max_wait
+        self.started_at = None
+        self._prev = None
+        self._stable = 0
+        self.max_diff = 0.0
+        # 누적 통계
+        self.fired = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+
+    @property
+    def armed(self):
+        return self.started_at is not None
+
+    def start(self, now):
+        """런 텍스트 재등장 시 호출"""
+        self.started_at = now
+        self._prev = None
+        self._stable = 0
+        self.max_diff = 0.0
+
+    def cancel(self):
+        self.started_at = None
+        self._prev = None
+
+    def timed_out(self, now):
+        return self.armed and now - self.started_at >= self.max_wait
+
+    def update(self, now, fingerprints):
+        """새 프레임 지문 반영 → 안정 조건을 만족하면 True"""
+        if not self.armed:
+            return False
+        prev, self._prev = self._prev, fingerprints
+        if prev is None or prev.keys() != fingerprints.keys() or not fingerprints:
+            self._stable = 0
+            return False
+        diff = max(float(np.abs(fingerprints[k] - prev[k]).mean()) for k in fingerprints)
+        self.max_diff = max(self.max_diff, diff)
+        self._stable = self._stable + 1 if diff <= self.tolerance else 0
+        return self._stable >= self.stable_frames and now - self.started_at >= self.min_wait
+
+    def finish(self, now, timed_out=False):
+        """OCR 시작 시 호출 → 재등장 후 대기 시간(초) 반환"""
+        waited = now - self.started_at if self.armed else 0.0
+        self.fired += 1
+        self.total_wait += waited
+        if timed_out:
+            self.timeouts += 1
+        self.cancel()
+        return waited
+
+    def average_wait(self):
+        return self.total_wait / self.fired if self.fired else 0.0
@@ -0,0 +1,98 @@
+# ===== client/core/region_layout.py (좌표 영역 픽셀 레이아웃) =====
+"""
+좌표 파일(비율 영역)을 화면 해상도 기준 픽셀 레이아웃으로 한 번만 변환
+
+이전에는 영역을 캡처할 때마다 pyautogui.size()를 호출하고 비율 → 픽셀 변환,
+OCR 확대 배율 계산을 반복했다 (20Hz 루프 × 영역 수).
+
+- rects: 영역별 정수 픽셀 사각형 (x, y, w, h)
+- bbox: 전체 영역을 감싸는 사각형 (한 번의 캡처로 모든 영역을 얻을 때 사용)
+- slices: bbox 프레임 안에서의 영역 위치 (numpy 슬라이스, 복사 없이 자르기)
+- scales: OCR 전 확대 배율 (확대가 필요 없으면 None)
+
+해상도가 바뀌거나 새 좌표 파일을 로드했을 때만 compile_layout()을 다시 호출한다.
+보조 디스플레이는 origin(가상 화면 기준 모니터 좌상단)만큼 사각형을 옮긴다.
+
+사용법:
+    layout = compile_layout(regions, (screen_w, screen_h))
+    frame = grab(layout.bbox)            # bbox 크기의 BGR 이미지
+    img = layout.crop(frame, "carry")
+"""
+
+# OCR 확대 규칙: (최소 너비, 최소 높이, 최소 배율) - 작은 영역은 확대해야 숫자/소수점이 읽힘
+UPSCALE_RULES = {
+    "back_spin": (250, 70, 7.0),    # 4자리 숫자 인식 강화
+    "side_spin": (250, 70, 7.0),
+    "ball_speed": (150, 50, 5.0),   # 소수점 인식 강화
+    "club_speed": (150, 50, 5.0),
+}
+DEFAULT_UPSCALE_RULE = (100, 40, 4.0)
+
+
+def upscale_factor(key, w, h):
+    """OCR 확대 배율 (영역이 충분히 크면 None)"""
+    min_w, min_h, min_scale = UPSCALE_RULES.get(key, DEFAULT_UPSCALE_RULE)
+    if w <= 0 or h <= 0:
+        return None
+    if w < min_w or h < min_h:
+        return max(min_scale, float(min_w) / w, float(min_h) / h)
+    return None
+
+
+class RegionLayout:
+    """컴파일된 영역 레이아웃 (불변, 스레드 간 공유 가능)"""
+
+    __slots__ = ("screen_size", "origin", "regions", "rects", "bbox", "slices", "scales")
+
+    def __init__(self, screen_size, regions, rects, origin=(0, 0)):
+        self.screen_size = screen_size
+        self.origin = origin
+        self.regions = regions
+        self.rects = rects
+        if rects:
+            x0 = min(x for x, _, _, _ in rects.values())
+            y0 = min(y for _, y, _, _ in rects.values())
+            x1 = max(x + w for x, _, w, _ in rects.values())
+            y1 = max(y + h for _, y, _, h in rects.values())
+            self.bbox = (x0, y0, x1 - x0, y1 - y0)
+        else:
+            self.bbox = (0, 0, 0, 0)
+        bx, by = self.bbox[0], self.bbox[1]
+        self.slices = {
+            key: (slice(y - by, y - by + h), slice(x - bx, x - bx + w))
+            for key, (x, y, w, h) in rects.items()
+        }
+        self.scales = {key: upscale_factor(key, w, h) for key, (x, y, w, h) in rects.items()}
+
+    def __contains__(self, key):
+        return key in self.rects
+
+    def crop(self, frame, key):
+        """bbox 프레임에서 영역 자르기 (복사 없는 view)"""
+        rows, cols = self.slices[key]
+        return frame[rows, cols]
+
+
+def compile_layout(regions, screen_size, origin=(0, 0)):
+    """
+    비율 영역 dict → RegionLayout
+
+    Args:
+        regions: {key: {"x", "y", "w", "h"}} (0~1 비율)
+        screen_size: (width, height) 픽셀 (영역이 있는 디스플레이 크기)
+        origin: 디스플레이 좌상단 (가상 화면 좌표, 주 디스플레이는 (0, 0))
+    """
+    sw, sh = screen_size
+    ox, oy = origin
+    rects = {}
+    for key, region in (regions or {}).items():
+        try:
+            x = ox + int(region["x"] * sw)
+            y = oy + int(region["y"] * sh)
+            w = int(region["w"] * sw)
+            h = int(region["h"] * sh)
+        except (KeyError, TypeError):
+            continue
+        if w > 0 and h > 0:
+            rects[key] = (x, y, w, h)
+    return RegionLayout((sw, sh), regions, rects, (ox, oy))
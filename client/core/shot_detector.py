@@ -0,0 +1,230 @@
+# ===== client/core/shot_detector.py (샷 감지 상태 머신) =====
+"""
+타석 1개의 샷 감지 상태 머신 (시계/캡처 주입형)
+
+예전에는 run()의 400줄 루프가 전역 변수, time.time(), time.sleep()에 묶여 있었다.
+그래서 타이밍을 바꾸면 실제 화면 없이는 확인하거나 측정할 수 없었다.
+이 클래스는 화면도 시간도 직접 건드리지 않는다.
+
+- clock(): 현재 시각 (기본 time.time, 시뮬레이션에서는 가상 시계)
+- source: 캡처 소스
+    grab(full)          → 프레임 (full=True: 모든 영역 bbox, False: 런 텍스트 영역만)
+    has_text(frame)     → 런 텍스트 존재 여부 (영역이 없으면 None)
+    fingerprints(frame) → 지표 영역 지문 {key: 배열} (full 프레임에서만 호출)
+- readiness: ReadinessDetector (결과 화면 안정 감지)
+
+step()이 한 틱을 처리하고 이벤트 목록을 돌려준다. OCR은 호출하는 쪽에서 실행한다
+(작업 프로세스에서는 OCR 스레드 풀, 시뮬레이션에서는 즉시).
+
+    ("text", has_text)      런 텍스트 상태 변화
+    ("shot_start", 시각)     런 텍스트 사라짐 (샷 시작)
+    ("read", frame)         OCR 요청 → 결과를 read_done(metrics)로 전달
+    ("shot", info)          샷 확정 {"metrics", "frame", "read_at", "reappear_at"}
+    ("idle", bool)          idle_after초 동안 활동 없음 / 활동 재개
+    ("logout", 사유)         자동 세션 종료 기준 도달 ("no_screen" / "no_shot")
+
+상태: WAITING (대기, 런 텍스트 있음) → COLLECTING (샷 진행 중, 런 텍스트 없음)
+      → WAITING (결과 화면 안정 대기) → READING (OCR 결과 대기) → WAITING
+"""
+import time
+
+WAITING = "WAITING"
+COLLECTING = "COLLECTING"
+READING = "READING"
+
+
+def _no_log(message):
+    pass
+
+
+class ShotDetector:
+    def __init__(self, source, readiness, clock=time.time, log=_no_log,
+                 fixed_delay=1.0, min_ball_speed=5.0, idle_after=30.0,
+                 logout_no_screen=5 * 60, logout_no_shot=20 * 60):
+        self.source = source
+        self.readiness = readiness
+        self.clock = clock
+        self.log = log
+        self.fixed_delay = fixed_delay          # 조기 OCR 값이 무효일 때 재시도 시점 (재등장 후 초)
+        self.min_ball_speed = min_ball_speed    # 이보다 느리면 무효 값 (숫자가 그려지기 전 화면)
+        self.idle_after = idle_after
+        self.logout_no_screen = logout_no_screen
+        self.logout_no_shot = logout_no_shot
+
+        now = clock()
+        self.state = WAITING
+        self.pending_read_at = None     # OCR 읽기 상한 시간 (텍스트 재등장 시 now + max_wait, 화면이 안정되면 더 일찍 읽음)
+        self.text_reappear_time = None  # 텍스트 재등장 시간 (조기 OCR 재시도 기준)
+        self.early_read = False         # 고정 대기보다 일찍 OCR 했는지 (값이 무효면 고정 대기 시점에 재시도)
+        self.prev_run_detected = None
+        self.sent_has_text = None
+        self.idle = False
+        self.last_activity = now
+        self.last_screen_time = now     # 마지막으로 연습 화면이 감지된 시간
+        self.last_shot_time = now       # 마지막 샷 시간
+        self._reading = None            # OCR 요청 (frame, 요청 시각)
+
+    # ------------------------------------------------
+    # 틱 처리
+    # ------------------------------------------------
+    def step(self):
+        """한 틱 처리 → (활동 여부, 이벤트 목록)"""
+        now = self.clock()
+        events = []
+        if self.state == READING:
+            active = True
+        elif self.state == COLLECTING:
+            active = self._step_collecting(now, events)
+        else:
+            active = self._step_waiting(now, events)
+        if active:
+            self.last_activity = now
+        self._check_idle(now, events)
+        self._check_logout(now, events)
+        return active, events
+
+    def _report_text(self, has_text, events):
+        if has_text != self.sent_has_text:
+            events.append(("text", has_text))
+            self.sent_has_text = has_text
+
+    def _step_waiting(self, now, events):
+        # OCR 대기 중이면 전체 프레임 1회 캡처 → 런 텍스트 감지/화면 안정 감지/OCR 공용
+        full = self.pending_read_at is not None
+        frame = self.source.grab(full)
+        has_text = self.source.has_text(frame)
+        active = has_text != self.prev_run_detected or full
+        self._report_text(has_text, events)
+        if has_text:
+            self.last_screen_time = now
+
+        if has_text is None:
+            # 텍스트 영역이 없으면 기존 방식으로 동작 (샷 감지 없음)
+            self.log("⚠️ 텍스트 영역이 설정되지 않았습니다. 기존 방식으로 전환합니다.")
+            self.state = COLLECTING
+            return active
+
+        if self.prev_run_detected is None:
+            self.prev_run_detected = has_text
+            return active
+
+        # 텍스트가 사라지면 (샷 시작)
+        # prev_run_detected가 True이고 현재 has_text가 False일 때만 샷 시작으로 판단
+        if self.prev_run_detected is True and has_text is False:
+            self.log("🎯 텍스트 사라짐 → 샷 시작 감지")
+            self.log("💡 상태: COLLECTING (샷 진행 중)")
+            self.state = COLLECTING
+            self.pending_read_at = None  # 이전 예약 시간 초기화
+            self.readiness.cancel()
+            self.prev_run_detected = False  # COLLECTING 상태에서는 텍스트가 없는 상태
+            events.append(("shot_start", now))
+            return active
+
+        self.prev_run_detected = has_text
+        if not full:
+            return active
+
+        # 샷 종료 후: 지표 영역 지문 비교 (이 프레임을 그대로 OCR에 사용)
+        ready = self.readiness.update(now, self.source.fingerprints(frame))
+        if not (ready or now >= self.pending_read_at):
+            return active
+
+        # 화면 안정 또는 상한 도달 → OCR 요청
+        if self.readiness.armed:
+            waited = self.readiness.finish(now, timed_out=not ready)
+            self.early_read = ready and waited < self.fixed_delay
+            if ready:
+                self.log(f"📊 OCR 읽기 시작 (화면 안정, 재등장 후 {waited:.2f}초 - "
+                         f"고정 {self.fixed_delay:.1f}초 대비 {self.fixed_delay - waited:.2f}초 단축)")
+            else:
+                self.log(f"📊 OCR 읽기 시작 (안정 감지 상한 {self.readiness.max_wait:.1f}초 도달, "
+                         f"최대 변화={self.readiness.max_diff:.1f})")
+        else:
+            self.early_read = False
+            self.log("📊 OCR 읽기 시작 (고정 대기 시점 재시도)")
+        self.pending_read_at = None  # 예약 시간 초기화
+        self.state = READING
+        self._reading = (frame, now)
+        events.append(("read", frame))
+        return True
+
+    def _step_collecting(self, now, events):
+        # 텍스트 상태만 확인 (데이터는 수집하지 않음)
+        has_text = self.source.has_text(self.source.grab(False))
+        active = has_text != self.prev_run_detected
+        self._report_text(has_text, events)
+        if has_text:
+            self.last_screen_time = now
+
+        # 텍스트가 다시 나타났는지 확인 (샷 종료 이벤트)
+        # prev_run_detected가 False이고 현재 has_text가 True일 때만 샷 종료로 판단
+        if self.prev_run_detected is False and has_text is True:
+            # Run Text 재등장 → 결과 화면이 안정되면 OCR (최대 max_wait초)
+            self.log("✅ 텍스트 재등장 → 샷 종료 감지")
+            self.text_reappear_time = now
+            self.pending_read_at = now + self.readiness.max_wait  # 안정 감지 상한
+            self.early_read = False
+            self.readiness.start(now)
+            self.state = WAITING  # WAITING 상태로 전환하여 pending_read_at 체크
+            self.log(f"⏳ 결과 화면 안정 대기 후 OCR (최대 {self.readiness.max_wait:.1f}초)")
+
+        # 상태 업데이트
+        if self.prev_run_detected is not None:
+            self.prev_run_detected = has_text
+        return active
+
+    def read_done(self, metrics):
+        """OCR 결과 전달 → 이벤트 목록 (조기 값이 무효면 고정 대기 시점에 1회 재시도)"""
+        if self.state != READING:
+            return []
+        frame, read_at = self._reading
+        self._reading = None
+        self.state = WAITING
+        now = self.clock()
+        if metrics is None:
+            return []
+
+        ball_speed = _safe_number(metrics.get("ball_speed"))
+        if (ball_speed is None or ball_speed < self.min_ball_speed) and self.early_read:
+            # 숫자가 그려지기 전 화면을 안정으로 본 경우 → 이전 고정 대기 시점에 한 번 더 읽기
+            self.log(f"⚠️ 조기 OCR 값 무효 (ball_speed={ball_speed}) → 재등장 후 {self.fixed_delay:.1f}초 시점에 재시도")
+            self.pending_read_at = max(now, self.text_reappear_time + self.fixed_delay)
+            self.early_read = False
+            return []
+
+        self.last_shot_time = now
+        self.last_screen_time = now
+        self.last_activity = now
+        return [("shot", {"metrics": metrics, "frame": frame,
+                          "read_at": read_at, "reappear_at": self.text_reappear_time})]
+
+    def cancel_read(self):
+        """OCR 실패 등으로 결과가 없을 때 WAITING으로 복귀"""
+        self._reading = None
+        if self.state == READING:
+            self.state = WAITING
+
+    # ------------------------------------------------
+    # 유휴 / 자동 세션 종료
+    # ------------------------------------------------
+    def _check_idle(self, now, events):
+        idle = now - self.last_activity >= self.idle_after
+        if idle != self.idle:
+            self.idle = idle
+            events.append(("idle", idle))
+
+    def _check_logout(self, now, events):
+        # 기준에 도달하면 한 번 알리고 타이머를 다시 시작 (재체크 방지)
+        if self.sent_has_text is False and now - self.last_screen_time >= self.logout_no_screen:
+            events.append(("logout", "no_screen"))
+            self.last_screen_time = now
+        if now - self.last_shot_time >= self.logout_no_shot:
+            events.append(("logout", "no_shot"))
+            self.last_shot_time = now
+
+
+def _safe_number(value):
+    try:
+        return None if value is None else float(value)
+    except (TypeError, ValueError):
+        return None
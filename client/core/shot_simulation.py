@@ -0,0 +1,258 @@
+# ===== client/core/shot_simulation.py (샷 감지 시뮬레이션) =====
+"""
+가상 시계로 ShotDetector + AdaptivePoller를 실행하는 시뮬레이션 하네스
+
+실제 화면 없이 타이밍 설정(폴링 간격, 화면 안정 감지, 자동 세션 종료 기준)을 바꿔 보고
+감지 지연과 CPU 사용량을 측정한다. 대기(sleep)는 가상 시계를 앞으로 돌리기만 하므로
+몇 시간 분량을 수 초 안에 재생한다.
+
+- Timeline: 샷 목록 (런 텍스트 사라짐 → 재등장 → 결과 숫자 애니메이션 → 고정) + 연습 화면이 아닌 구간
+- ScriptedSource: 시각별 화면 상태를 돌려주는 캡처 소스 (캡처/판정 비용만큼 가상 시계 진행)
+- simulate(): 감지 결과를 타임라인과 비교해 지연/누락/오독/CPU 통계 반환
+
+사용법 (루트 CLI: simulate_shots.py):
+    timeline = Timeline.generate(hours=2, shots_per_hour=40, seed=1)
+    report = simulate(timeline, SimSettings(max_wait=1.5))
+"""
+import json
+import random
+
+import numpy as np
+
+from client.core.adaptive_poll import AdaptivePoller
+from client.core.readiness import ReadinessDetector
+from client.core.shot_detector import ShotDetector
+from client.core.stage_timer import percentile
+
+FINGERPRINT_SHAPE = (8, 16)
+
+
+class SimClock:
+    """가상 시계 (sleep = 시각만 앞으로)"""
+
+    def __init__(self, start=0.0):
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += max(0.0, seconds)
+
+
+class SimSettings:
+    """시뮬레이션 설정 (기본값 = 수집 프로그램 현재 값) + 연산별 비용 모델 (초)"""
+
+    def __init__(self, **overrides):
+        # 폴링 (main.py POLL_INTERVAL / IDLE_POLL_INTERVAL / IDLE_AFTER_SEC)
+        self.fast = 0.05
+        self.idle = 1.0
+        self.idle_after = 30.0
+        # 화면 안정 감지 (STABLE_FRAMES / OCR_STABLE_TOLERANCE / OCR_MAX_WAIT / OCR_FIXED_DELAY)
+        self.stable_frames = 4
+        self.tolerance = 3.0
+        self.min_wait = 0.15
+        self.max_wait = 1.5
+        self.fixed_delay = 1.0
+        # 자동 세션 종료 (SESSION_AUTO_LOGOUT_NO_SCREEN / SESSION_AUTO_LOGOUT_NO_SHOT)
+        self.logout_no_screen = 5 * 60
+        self.logout_no_shot = 20 * 60
+        # 비용 모델 (실측값으로 바꿔서 사용)
+        self.cost_grab_text = 0.004   # 런 텍스트 영역 캡처 + 판정
+        self.cost_grab_full = 0.012   # bbox 전체 캡처 + 지문 계산
+        self.cost_ocr = 0.45          # 지표 11개 OCR
+        for key, value in overrides.items():
+            if not hasattr(self, key):
+                raise KeyError(f"알 수 없는 설정: {key}")
+            setattr(self, key, type(getattr(self, key))(value))
+
+    def as_dict(self):
+        return dict(vars(self))
+
+
+class Timeline:
+    """
+    시뮬레이션 화면 타임라인 (시각 단위: 초)
+
+    shots: [{"start", "reappear", "settle", "metrics"}]
+        start: 런 텍스트 사라짐, reappear: 재등장, settle: 재등장 후 결과 숫자가 고정되기까지 걸린 시간
+    off_screen: [(시작, 끝)] 연습 화면이 아닌 구간 (런 텍스트 없음, 샷 아님)
+    """
+
+    def __init__(self, duration, shots, off_screen=()):
+        self.duration = duration
+        self.shots = sorted(shots, key=lambda s: s["start"])
+        self.off_screen = sorted(tuple(r) for r in off_screen)
+
+    @classmethod
+    def generate(cls, hours=1.0, shots_per_hour=40, seed=0, flight=(2.5, 6.0), settle=(0.1, 0.9),
+                 breaks_per_hour=0.5, break_len=(60, 600)):
+        """무작위 타임라인 (샷 간격은 지수 분포, 가끔 연습 화면이 아닌 휴식 구간)"""
+        rng = random.Random(seed)
+        duration = hours * 3600.0
+        shots, off_screen = [], []
+        t = rng.uniform(5, 30)
+        while t < duration:
+            if rng.random() < breaks_per_hour / max(1.0, shots_per_hour):
+                length = rng.uniform(*break_len)
+                off_screen.append((t, min(duration, t + length)))
+                t += length + rng.uniform(5, 20)
+                continue
+            fly = rng.uniform(*flight)
+            shot = {
+                "start": t,
+                "reappear": t + fly,
+                "settle": rng.uniform(*settle),
+                "metrics": {"ball_speed": round(rng.uniform(90, 160), 1),
+                            "club_speed": round(rng.uniform(70, 110), 1)},
+            }
+            shots.append(shot)
+            t = shot["reappear"] + shot["settle"] + rng.expovariate(shots_per_hour / 3600.0) + 3.0
+        return cls(duration, [s for s in shots if s["reappear"] + s["settle"] < duration], off_screen)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["duration"], data["shots"], data.get("off_screen", []))
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"duration": self.duration, "shots": self.shots,
+                       "off_screen": [list(r) for r in self.off_screen]}, f, ensure_ascii=False, indent=2)
+
+    def state_at(self, t):
+        """시각 t의 화면 → (런 텍스트 있음, 진행 중 샷 또는 직전 샷, 결과 숫자 고정 여부)"""
+        for start, end in self.off_screen:
+            if start <= t < end:
+                return False, None, False
+        shot = self._shot_at(t)
+        if shot is None:
+            return True, None, True
+        if t < shot["reappear"]:
+            return False, shot, False
+        return True, shot, t >= shot["reappear"] + shot["settle"]
+
+    def _shot_at(self, t):
+        # 시각 t 이전에 시작한 마지막 샷 (샷 목록은 시작 순 정렬)
+        lo, hi = 0, len(self.shots)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.shots[mid]["start"] <= t:
+                lo = mid + 1
+            else:
+                hi = mid
+        return self.shots[lo - 1] if lo else None
+
+
+class ScriptedSource:
+    """Timeline을 화면으로 보여주는 캡처 소스 (캡처/판정 비용만큼 가상 시계 진행)"""
+
+    def __init__(self, timeline, clock, settings):
+        self.timeline = timeline
+        self.clock = clock
+        self.settings = settings
+        self.grabs_text = 0
+        self.grabs_full = 0
+
+    def grab(self, full):
+        if full:
+            self.grabs_full += 1
+            self.clock.advance(self.settings.cost_grab_full)
+        else:
+            self.grabs_text += 1
+            self.clock.advance(self.settings.cost_grab_text)
+        return (self.clock.now, full)
+
+    def has_text(self, frame):
+        return self.timeline.state_at(frame[0])[0]
+
+    def fingerprints(self, frame):
+        # 결과 숫자 애니메이션 중에는 매 프레임 지문이 크게 바뀌고, 고정되면 같은 값
+        t = frame[0]
+        _, shot, settled = self.timeline.state_at(t)
+        if shot is None or settled:
+            level = 200 if shot is None else 100 + int(shot["metrics"]["ball_speed"]) % 50
+        else:
+            level = int((t - shot["reappear"]) * 1000) % 200
+        return {"ball_speed": np.full(FINGERPRINT_SHAPE, level, dtype=np.int16)}
+
+    def read(self, frame):
+        """OCR 결과 (숫자가 고정되기 전이면 0 - 그려지는 중인 화면)"""
+        self.clock.advance(self.settings.cost_ocr)
+        _, shot, settled = self.timeline.state_at(frame[0])
+        if shot is None:
+            return {"ball_speed": None}
+        if not settled:
+            return {"ball_speed": 0.0}
+        return dict(shot["metrics"])
+
+
+def simulate(timeline, settings=None):
+    """
+    타임라인 재생 → 통계 dict
+
+    latency: 결과 숫자가 고정된 시점 → OCR 읽기 시점 (초, 음수면 고정 전에 읽음)
+    cpu_sec: 비용 모델 기준 작업 시간 합 (캡처 + OCR), duty: cpu_sec / 재생 시간
+    """
+    settings = settings or SimSettings()
+    clock = SimClock()
+    source = ScriptedSource(timeline, clock, settings)
+    readiness = ReadinessDetector(stable_frames=settings.stable_frames, tolerance=settings.tolerance,
+                                  min_wait=settings.min_wait, max_wait=settings.max_wait)
+    detector = ShotDetector(source, readiness, clock=clock, fixed_delay=settings.fixed_delay,
+                            idle_after=settings.idle_after, logout_no_screen=settings.logout_no_screen,
+                            logout_no_shot=settings.logout_no_shot)
+    poller = AdaptivePoller(fast=settings.fast, idle=settings.idle, idle_after=settings.idle_after,
+                            clock=clock, sleeper=clock.advance)
+
+    detected = {}      # 샷 시작 시각 → 읽기 결과
+    ocr_calls = 0
+    logouts = []
+    while clock.now < timeline.duration:
+        active, events = detector.step()
+        while events:
+            kind, data = events.pop(0)
+            if kind == "read":
+                ocr_calls += 1
+                events.extend(detector.read_done(source.read(data)))
+            elif kind == "shot":
+                _, shot, _ = timeline.state_at(data["read_at"])
+                if shot is not None:
+                    detected.setdefault(shot["start"], (data, shot))
+            elif kind == "logout":
+                logouts.append((round(clock.now, 1), data))
+        if active:
+            poller.activity()
+        poller.sleep()
+
+    latencies, wrong = [], 0
+    for data, shot in detected.values():
+        latencies.append(data["read_at"] - (shot["reappear"] + shot["settle"]))
+        if data["metrics"].get("ball_speed") != shot["metrics"]["ball_speed"]:
+            wrong += 1
+    cpu_sec = (source.grabs_text * settings.cost_grab_text + source.grabs_full * settings.cost_grab_full
+               + ocr_calls * settings.cost_ocr)
+    poll = poller.stats()
+    return {
+        "duration_sec": round(timeline.duration, 1),
+        "shots": len(timeline.shots),
+        "detected": len(detected),
+        "missed": len(timeline.shots) - len(detected),
+        "wrong_values": wrong,
+        "latency_p50": _round(percentile(latencies, 50)),
+        "latency_p95": _round(percentile(latencies, 95)),
+        "latency_max": _round(max(latencies) if latencies else None),
+        "ocr_calls": ocr_calls,
+        "grabs_text": source.grabs_text,
+        "grabs_full": source.grabs_full,
+        "cpu_sec": round(cpu_sec, 1),
+        "duty": round(cpu_sec / timeline.duration, 4) if timeline.duration else 0.0,
+        "ticks": poll["ticks"],
+        "idle_tick_ratio": poll["idle_tick_ratio"],
+        "logouts": logouts,
+    }
+
+
+def _round(value):
+    return None if value is None else round(value, 3)
@@ -0,0 +1,124 @@
+# ===== client/core/stage_timer.py (단계별 소요 시간 통계) =====
+"""
+샷 처리 단계별 소요 시간 (단계마다 최근 window개 기록의 p50/p95/p99)
+
+느린 샷이 어디서 시간을 썼는지 log() 문장만으로는 알 수 없어서, 단계별로 소요 시간을 쌓는다.
+단계 이름은 "분류.영역" 형태로 지표 영역별로도 나눈다.
+
+- capture.full / capture.text: 화면 캡처 (bbox 전체 / 런 텍스트 영역만)
+- preprocess.<영역>: OCR 전처리 (확대, 흑백, CLAHE, 정규화/블러)
+- tesseract.<영역>: tesseract 호출 1회 (영역마다 threshold/PSM 조합 수만큼 기록)
+- ocr.<영역> / ocr: 영역 1개 OCR 전체 / 샷 1개 전체 지표 OCR
+- parse.<영역> / parse: parse_value 1회 / 전체 지표 파싱
+- active_user / upload / shot_total: 활성 사용자 조회 / 서버 전송 / 런 텍스트 재등장 → 전송 완료
+
+프로세스마다 모듈 전역 timings 1개 (캡처/OCR 작업 프로세스의 값은 main.py가 이벤트로 받아 합침).
+기록은 잠금 + deque append뿐이라 OCR 스레드/감지 루프 어디서 불러도 된다.
+
+사용법:
+    from client.core.stage_timer import timings
+    with timings.time("capture.full"):
+        frame = backend.grab(rect)
+    timings.record("upload", 182.4)                       # ms
+    snapshot = timings.snapshot()                         # {"upload": {"count", "p50", "p95", "p99", "max"}, ...}
+    summary = summarize(snapshot, ("ocr", "upload"))      # 서버 heartbeat용 요약
+"""
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+DEFAULT_WINDOW = 500        # 단계별 보관 기록 수 (최근 값 기준 백분위)
+PERCENTILES = (50, 95, 99)
+
+
+def _nearest_rank(sorted_values, p):
+    rank = max(1, -(-len(sorted_values) * p // 100))
+    return sorted_values[min(len(sorted_values), int(rank)) - 1]
+
+
+def percentile(values, p):
+    """
+    p 백분위 (nearest-rank, 값이 없으면 None)
+
+    run_headless.py / replay_ocr.py / simulate_shots.py 지연 통계가 모두 이 정의를 쓴다
+    (같은 데이터면 도구마다 같은 p95).
+    """
+    if not values:
+        return None
+    return _nearest_rank(sorted(values), p)
+
+
+class StageTimes:
+    def __init__(self, window=DEFAULT_WINDOW, clock=time.perf_counter):
+        self.window = window
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._samples = {}   # 단계 → deque(ms, maxlen=window)
+        self._counts = {}    # 단계 → 누적 횟수 (window 밖 기록 포함)
+
+    def record(self, stage, ms):
+        with self._lock:
+            samples = self._samples.get(stage)
+            if samples is None:
+                samples = self._samples[stage] = deque(maxlen=self.window)
+            samples.append(ms)
+            self._counts[stage] = self._counts.get(stage, 0) + 1
+
+    @contextmanager
+    def time(self, stage):
+        """with 블록 소요 시간 기록 (예외가 나도 기록)"""
+        started = self._clock()
+        try:
+            yield
+        finally:
+            self.record(stage, (self._clock() - started) * 1000.0)
+
+    def snapshot(self):
+        """단계별 {count, p50, p95, p99, max} (ms, 소수 둘째 자리)"""
+        with self._lock:
+            items = [(stage, sorted(samples), self._counts[stage]) for stage, samples in self._samples.items()]
+        result = {}
+        for stage, values, count in sorted(items):
+            stats = {"count": count}
+            for p in PERCENTILES:
+                stats[f"p{p}"] = round(_nearest_rank(values, p), 2)
+            stats["max"] = round(values[-1], 2)
+            result[stage] = stats
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._counts.clear()
+
+
+def summarize(snapshot, stages, region_prefix="ocr.", top=3):
+    """
+    서버 heartbeat용 요약 → {단계: {p50, p95, p99, count}, "slow_regions": [[영역, p95], ...]}
+
+    stages: 요약에 넣을 주요 단계 (기록이 없는 단계는 생략)
+    region_prefix/top: 영역별 단계 중 p95가 가장 큰 top개 (느린 지표 영역 확인용)
+    """
+    summary = {}
+    for stage in stages:
+        stats = snapshot.get(stage)
+        if stats:
+            summary[stage] = {key: stats[key] for key in ("p50", "p95", "p99", "count")}
+    regions = sorted(
+        ((stage[len(region_prefix):], stats["p95"]) for stage, stats in snapshot.items()
+         if stage.startswith(region_prefix)),
+        key=lambda item: item[1], reverse=True,
+    )
+    if regions:
+        summary["slow_regions"] = [list(item) for item in regions[:top]]
+    return summary
+
+
+def format_stages(snapshot, stages, key="p95"):
+    """한 줄 표시용 ("ocr 412ms, upload 95ms") - 기록이 없는 단계는 생략"""
+    parts = [f"{stage} {snapshot[stage][key]:.0f}ms" for stage in stages if stage in snapshot]
+    return ", ".join(parts)
+
+
+timings = StageTimes()
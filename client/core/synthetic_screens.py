@@ -0,0 +1,214 @@
+# ===== client/core/synthetic_screens.py (합성 결과 화면 생성) =====
+"""
+좌표 파일에 맞춘 합성 런치모니터 결과 화면 생성 (OCR 벤치마크용 정답 데이터)
+
+OCR 정확도는 현장 타석 캡처나 녹화(client/core/ocr_archive.py)로만 확인할 수 있었고,
+녹화에는 정답이 없다 (녹화 당시 OCR 값과 비교할 뿐). 이 모듈은 좌표 파일의 영역마다
+알고 있는 값을 그려 넣은 화면을 만들어, 그 값과 OCR 결과를 비교할 수 있게 한다.
+
+- 값: 지표별 현실적인 범위에서 무작위 (seed 고정 시 재현 가능), 표시 자릿수로 반올림한 값이 정답
+- 표기: parse_value() 모드에 맞춘 부호 ("-866 rpm", "L 3.0°", "R 5.3 m"), 단위/천 단위 쉼표 선택
+- 화면: ScreenStyle (배경/글자색, OpenCV Hershey 글꼴, 굵기, 글자 크기 비율, 위치 흔들림, 블러, 노이즈,
+  저해상도 렌더링 후 확대 = 스케일러 뭉개짐), 좌표 파일 브랜드별 기본 스타일은 BRAND_STYLES
+- 실제 브랜드 글꼴은 없으므로 Hershey 글꼴로 근사한다 (굵기/크기/색 조합으로 변형)
+
+사용법 (루트 CLI: synth_screens.py):
+    regions, size, brand = load_coordinate_file("SGGOLF_1920x1080_v1.json")
+    screens = SyntheticScreens(regions, size, ScreenStyle.for_brand(brand, noise=6), seed=1)
+    layout, frame, truth, texts = screens.shot()      # frame: layout.bbox 크기 (read_metrics 입력)
+"""
+import json
+import random
+
+import cv2
+import numpy as np
+
+from client.core.region_layout import compile_layout
+
+# 지표별 (최소, 최대, 소수 자릿수, 단위, 부호 표기) - 부호 표기는 metrics_ocr.METRIC_FIELDS 파싱 모드와 같음
+METRIC_SPECS = {
+    "total_distance":  (120.0, 300.0, 1, "m", "plain"),
+    "carry":           (100.0, 280.0, 1, "m", "plain"),
+    "ball_speed":      (30.0, 80.0, 2, "m/s", "plain"),
+    "club_speed":      (25.0, 55.0, 2, "m/s", "plain"),
+    "launch_angle":    (4.0, 25.0, 1, "°", "plain"),
+    "back_spin":       (1200, 9000, 0, "rpm", "plain"),
+    "club_path":       (-8.0, 8.0, 1, "°", "minus"),
+    "lateral_offset":  (-30.0, 30.0, 1, "m", "RL"),
+    "direction_angle": (-12.0, 12.0, 1, "°", "RL"),
+    "side_spin":       (-1500, 1500, 0, "rpm", "minus"),
+    "face_angle":      (-8.0, 8.0, 1, "°", "RL"),
+}
+RUN_TEXT = "RUN"
+
+FONTS = {
+    "simplex": cv2.FONT_HERSHEY_SIMPLEX,
+    "duplex": cv2.FONT_HERSHEY_DUPLEX,
+    "complex": cv2.FONT_HERSHEY_COMPLEX,
+    "triplex": cv2.FONT_HERSHEY_TRIPLEX,
+    "plain": cv2.FONT_HERSHEY_PLAIN,
+}
+
+# 좌표 파일 brand별 기본 스타일 (ScreenStyle 설정 이름 → 값)
+BRAND_STYLES = {
+    "SGGOLF": {"background": "20,30,45", "panel": "35,45,65", "font": "duplex", "thickness": 2},
+}
+
+
+def load_coordinate_file(path):
+    """좌표 파일 → (regions, (w, h), brand) - resolution이 없으면 1920x1080"""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    regions = data.get("regions", data)
+    size = (1920, 1080)
+    resolution = str(data.get("resolution") or "")
+    if "x" in resolution:
+        w, _, h = resolution.partition("x")
+        if w.isdigit() and h.isdigit():
+            size = (int(w), int(h))
+    return regions, size, data.get("brand")
+
+
+def _color(value):
+    if isinstance(value, str):
+        return tuple(int(v) for v in value.split(","))
+    return tuple(value)
+
+
+class ScreenStyle:
+    """합성 화면 스타일 (simulate_shots.py SimSettings처럼 설정 이름=값으로 변경)"""
+
+    def __init__(self, **overrides):
+        self.background = "15,15,15"    # 화면 배경 BGR
+        self.panel = "40,40,40"         # 지표 영역 배경 BGR
+        self.text_color = "255,255,255"
+        self.font = "simplex"           # FONTS 이름
+        self.thickness = 2
+        self.fill = 0.6                 # 영역 높이 대비 글자 높이
+        self.jitter = 0.05              # 영역 크기 대비 글자 위치 흔들림
+        self.units = True               # 단위 표기 (m/s, rpm, °, m)
+        self.thousands = True           # 천 단위 쉼표 (2,450 rpm)
+        self.rl = "prefix"              # R/L 위치: prefix ("L 3.0") / suffix ("3.0 L")
+        self.blur = 0                   # 가우시안 블러 커널 (0이면 없음, 홀수)
+        self.noise = 3.0                # 가우시안 노이즈 표준편차
+        self.render_scale = 1.0         # 1 미만이면 작게 그린 뒤 확대 (스케일러 뭉개짐)
+        for key, value in overrides.items():
+            if not hasattr(self, key):
+                raise KeyError(f"알 수 없는 스타일: {key}")
+            default = getattr(self, key)
+            if isinstance(default, bool):
+                value = value if isinstance(value, bool) else str(value).lower() in ("1", "true", "yes")
+            setattr(self, key, type(default)(value))
+        if self.font not in FONTS:
+            raise KeyError(f"알 수 없는 글꼴: {self.font} ({', '.join(FONTS)})")
+
+    @classmethod
+    def for_brand(cls, brand, **overrides):
+        return cls(**dict(BRAND_STYLES.get((brand or "").upper(), {}), **overrides))
+
+    def as_dict(self):
+        return dict(vars(self))
+
+
+def format_value(key, value, style):
+    """정답 값 → 화면 표기 문자열 (parse_value가 같은 값으로 읽어야 하는 형태)"""
+    _, _, decimals, unit, sign = METRIC_SPECS[key]
+    magnitude = abs(value)
+    if decimals:
+        number = f"{magnitude:.{decimals}f}"
+    elif style.thousands:
+        number = f"{int(magnitude):,}"
+    else:
+        number = str(int(magnitude))
+    if sign == "minus" and value < 0:
+        number = "-" + number
+    elif sign == "RL" and value != 0:
+        side = "L" if value < 0 else "R"
+        number = f"{side} {number}" if style.rl == "prefix" else f"{number} {side}"
+    if style.units:
+        number += unit if unit == "°" else " " + unit
+    return number
+
+
+class SyntheticScreens:
+    def __init__(self, regions, screen_size, style=None, seed=0):
+        self.style = style or ScreenStyle()
+        self.rng = random.Random(seed)
+        self.np_rng = np.random.default_rng(seed)
+        self.screen_size = tuple(screen_size)
+        self.layout = compile_layout(regions, self.screen_size)
+        self.keys = [key for key in METRIC_SPECS if key in self.layout]
+
+    def sample_values(self):
+        """지표별 무작위 정답 값 (표시 자릿수로 반올림)"""
+        values = {}
+        for key in self.keys:
+            low, high, decimals, _, _ = METRIC_SPECS[key]
+            value = round(self.rng.uniform(low, high), decimals)
+            values[key] = float(int(value)) if not decimals else value
+        return values
+
+    def render(self, values, run_text=True):
+        """정답 값 → (전체 화면 BGR, 지표별 표기 문자열) - run_text=False면 런 텍스트 영역은 빈 칸 (샷 진행 중)"""
+        style = self.style
+        scale = max(0.1, min(1.0, style.render_scale))
+        w, h = self.screen_size
+        rw, rh = max(1, int(w * scale)), max(1, int(h * scale))
+        screen = np.empty((rh, rw, 3), dtype=np.uint8)
+        screen[:] = _color(style.background)
+
+        texts = {key: format_value(key, value, style) for key, value in values.items()}
+        labels = dict(texts)
+        if "run_text" in self.layout:
+            labels["run_text"] = RUN_TEXT if run_text else ""
+        for key, text in labels.items():
+            x, y, rw_, rh_ = (int(v * scale) for v in self.layout.rects[key])
+            cv2.rectangle(screen, (x, y), (x + rw_ - 1, y + rh_ - 1), _color(style.panel), -1)
+            if text:
+                self._draw_text(screen, text, (x, y, rw_, rh_))
+
+        if scale < 1.0:
+            screen = cv2.resize(screen, (w, h), interpolation=cv2.INTER_LINEAR)
+        if style.blur and style.blur > 1:
+            k = style.blur | 1
+            screen = cv2.GaussianBlur(screen, (k, k), 0)
+        if style.noise > 0:
+            noise = self.np_rng.normal(0, style.noise, screen.shape)
+            screen = np.clip(screen.astype(np.float32) + noise, 0, 255).astype(np.uint8)
+        return screen, texts
+
+    def _draw_text(self, screen, text, rect):
+        style = self.style
+        x, y, w, h = rect
+        font = FONTS[style.font]
+        degree = text.endswith("°")
+        body = text[:-1] if degree else text
+        thickness = max(1, int(style.thickness))
+        # 글자 높이 = 영역 높이 × fill, 너비가 넘치면 줄임 (° 자리는 글자 높이의 0.4배)
+        (tw, th), _ = cv2.getTextSize(body, font, 1.0, thickness)
+        font_scale = style.fill * h / max(1, th)
+        extra = 0.4 * th if degree else 0
+        font_scale = min(font_scale, 0.92 * w / max(1.0, tw + extra))
+        (tw, th), baseline = cv2.getTextSize(body, font, font_scale, thickness)
+        dx = int(self.rng.uniform(-style.jitter, style.jitter) * w)
+        dy = int(self.rng.uniform(-style.jitter, style.jitter) * h)
+        tx = x + max(0, (w - tw - int(extra * font_scale)) // 2) + dx
+        ty = y + (h + th) // 2 + dy
+        color = _color(style.text_color)
+        cv2.putText(screen, body, (tx, ty), font, font_scale, color, thickness, cv2.LINE_AA)
+        if degree:
+            radius = max(1, int(th * 0.15))
+            cv2.circle(screen, (tx + tw + radius + thickness, ty - th + radius), radius, color,
+                       max(1, thickness // 2), cv2.LINE_AA)
+
+    def shot(self, values=None):
+        """샷 1개 → (layout, bbox 프레임, 정답 값, 표기 문자열) - 프레임은 capture_frame()과 같은 bbox 크기"""
+        values = values or self.sample_values()
+        screen, texts = self.render(values)
+        x, y, w, h = self.layout.bbox
+        return self.layout, screen[y:y + h, x:x + w], values, texts
+
+    def screen(self, values=None):
+        """전체 화면 1장 (눈으로 확인용) → (화면, 정답 값)"""
+        values = values or self.sample_values()
+        return self.render(values)[0], values
@@ -38,6 +38,8 @@ import re
 import threading
 import subprocess
 import queue
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
 import pyautogui
@@ -257,6 +259,11 @@ class ShotCollectorGUI:
         # API URL
         self.api_base_url = get_api_base_url()
         
+        # 좌표 파일 로컬 캐시 (디스크에서 즉시 시작, 서버 재검증은 백그라운드)
+        from client.core.coordinate_cache import CoordinateCache
+        self.coordinate_cache = CoordinateCache(
+            self.api_base_url, os.path.join(get_base_path(), "regions", "cache"), log=log)
+        
         # 선택된 값
         self.selected_brand = None
         self.selected_filename = None
@@ -325,6 +332,16 @@ class ShotCollectorGUI:
         )
         self.last_shot_time_label.pack(side=tk.LEFT, padx=10, pady=5)
         
+        # 단계별 지연 (p95, 캡처/OCR 작업 통계가 올 때마다 갱신)
+        self.latency_label = tk.Label(
+            stats_frame,
+            text="지연 p95: -",
+            font=("맑은 고딕", 9),
+            bg="#f0f0f0",
+            fg="#666666"
+        )
+        self.latency_label.pack(side=tk.LEFT, padx=10, pady=5)
+        
         # 브랜드 선택
         brand_frame = tk.Frame(self.root, pady=10)
         brand_frame.pack(fill=tk.X, padx=20)
@@ -476,34 +493,18 @@ class ShotCollectorGUI:
         threading.Thread(target=self.load_coordinate_files, args=(brand_code,), daemon=True).start()
     
     def load_coordinate_files(self, brand_code):
-        """서버에서 좌표 파일 목록 가져오기"""
+        """좌표 파일 목록 가져오기 (캐시된 목록 즉시 표시, 서버 목록이 바뀌면 갱신)"""
+        def on_update(files):
+            if self.selected_brand == brand_code and not self.is_running:
+                self.coordinate_files = files
+                self.root.after(0, self.update_file_listbox, files)
+        
         try:
-            url = f"{self.api_base_url}/api/coordinates/{brand_code}"
-            response = requests.get(url, timeout=10)
+            files = self.coordinate_cache.list_files(brand_code, on_update=on_update)
+            self.coordinate_files = files
             
-            if response.status_code == 200:
-                data = response.json()
-                
-                if data.get("success"):
-                    files = data.get("files", [])
-                    self.coordinate_files = files
-                    
-                    # UI 업데이트 (메인 스레드)
-                    self.root.after(0, self.update_file_listbox, files)
-                    return
-                else:
-                    error_msg = data.get("error", "알 수 없는 오류")
-                    self.root.after(0, lambda: self.status_label.config(
-                        text=f"오류: {error_msg}",
-                        fg="red"
-                    ))
-                    return
-            else:
-                error_text = response.text[:100] if response.text else "알 수 없는 오류"
-                self.root.after(0, lambda: self.status_label.config(
-                    text=f"서버 오류 ({response.status_code}): {error_text}",
-                    fg="red"
-                ))
+            # UI 업데이트 (메인 스레드)
+            self.root.after(0, self.update_file_listbox, files)
         except Exception as e:
             self.root.after(0, lambda: self.status_label.config(
                 text=f"연결 오류: {str(e)}",
@@ -557,24 +558,18 @@ class ShotCollectorGUI:
     def start_collection(self):
         """샷 수집 시작"""
         try:
-            # 좌표 파일 다운로드
-            url = f"{self.api_base_url}/api/coordinates/{self.selected_brand}/{self.selected_filename}"
-            response = requests.get(url, timeout=10)
+            # 좌표 파일 (로컬 캐시 우선 - 서버 응답을 기다리지 않고 시작)
+            brand, filename = self.selected_brand, self.selected_filename
             
-            if response.status_code != 200:
-                data = response.json()
-                error = data.get("error", "다운로드 실패")
-                # GUI가 보이는 상태일 때만 오류 팝업 표시
-                if root and root.winfo_viewable():
-                    self.root.after(0, lambda: messagebox.showerror("오류", f"좌표 파일 다운로드 실패: {error}"))
-                else:
-                    log(f"⚠️ 좌표 파일 다운로드 실패: {error}")
-                self.root.after(0, lambda: self.status_label.config(text="다운로드 실패", fg="red"))
-                return
+            def on_update(payload):
+                log(f"[INFO] 서버 좌표 파일 변경 감지 ({filename} v{payload.get('version')}) - 다음 시작부터 적용")
             
-            data = response.json()
-            if not data.get("success"):
-                error = data.get("error", "다운로드 실패")
+            try:
+                coordinate_data = self.coordinate_cache.get_file(brand, filename, on_update=on_update)
+                # 한 PC 여러 타석 (config.json "bays") - 없으면 선택한 좌표 파일로 타석 1개
+                bindings = load_bay_bindings(load_config(), self.coordinate_cache, default_brand=brand)
+            except Exception as e:
+                error = str(e)
                 # GUI가 보이는 상태일 때만 오류 팝업 표시
                 if root and root.winfo_viewable():
                     self.root.after(0, lambda: messagebox.showerror("오류", f"좌표 파일 다운로드 실패: {error}"))
@@ -583,7 +578,6 @@ class ShotCollectorGUI:
                 self.root.after(0, lambda: self.status_label.config(text="다운로드 실패", fg="red"))
                 return
             
-            coordinate_data = data.get("data")
             regions = coordinate_data.get("regions", {})
             
             # 좌표를 메모리에 저장
@@ -605,7 +599,7 @@ class ShotCollectorGUI:
             run_started = False  # run_started 플래그 리셋
             main_thread = threading.Thread(
                 target=run,
-                args=(regions,),
+                args=(regions, bindings),
                 daemon=False
             )
             main_thread.start()
@@ -701,30 +695,9 @@ class ShotCollectorGUI:
             
             log(f"좌표 파일 로드 중: {self.selected_filename}")
             
-            # 선택한 좌표 파일 다운로드
+            # 선택한 좌표 파일 (로컬 캐시 우선)
             try:
-                url = f"{self.api_base_url}/api/coordinates/{self.selected_brand}/{self.selected_filename}"
-                response = requests.get(url, timeout=10)
-                
-                if response.status_code != 200:
-                    # GUI가 보이는 상태일 때만 오류 팝업 표시
-                    if root and root.winfo_viewable():
-                        messagebox.showerror("오류", f"좌표 파일 다운로드 실패: {response.status_code}")
-                    else:
-                        log(f"⚠️ 좌표 파일 다운로드 실패: {response.status_code}")
-                    return
-                
-                data = response.json()
-                if not data.get("success"):
-                    error = data.get("error", "다운로드 실패")
-                    # GUI가 보이는 상태일 때만 오류 팝업 표시
-                    if root and root.winfo_viewable():
-                        messagebox.showerror("오류", f"좌표 파일 다운로드 실패: {error}")
-                    else:
-                        log(f"⚠️ 좌표 파일 다운로드 실패: {error}")
-                    return
-                
-                coordinate_data = data.get("data", {})
+                coordinate_data = self.coordinate_cache.get_file(self.selected_brand, self.selected_filename)
                 regions = coordinate_data.get("regions", {})
                 resolution = coordinate_data.get("resolution", "")
                 
@@ -895,20 +868,37 @@ MAX_SPEED     = 120.0
 # ===== 하이브리드 샷 감지 기준 =====
 STABLE_TOL    = 0.25   # 안정 상태 허용 오차
 ACTIVE_DELTA  = 1.0    # 샷 시작으로 보는 최소 변화
-STABLE_FRAMES = 4      # 안정 복귀 프레임 수
+STABLE_FRAMES = 4      # 안정 복귀 프레임 수 (결과 화면 지문이 이 프레임 수만큼 연속으로 같으면 OCR)
 # ===== 런 텍스트 감지 기준 =====
 WAITING_POLL_INTERVAL = 0.05    # 대기 상태에서 런 텍스트 체크 간격 (초) - 속도 개선 (0.3 -> 0.05)
 RUN_DETECTION_FRAMES = 2        # 런 텍스트가 연속으로 감지되어야 하는 프레임 수
 TEXT_REAPPEAR_MIN_TIME = 1.0    # 텍스트가 다시 나타난 후 최소 유지 시간 (초) - 이 시간 이하면 데이터 수집 안함
+# ===== 적응형 폴링 (빈 타석/연습 화면 아님 → 감속) =====
+IDLE_POLL_INTERVAL = 1.0        # 유휴 상태 최대 폴링 간격 (초)
+IDLE_AFTER_SEC = 30.0           # 런 텍스트 변화가 이 시간 동안 없으면 유휴로 판단 (샷 1회는 수 초 안에 끝남)
+POLL_STATS_INTERVAL = 10 * 60   # 폴링 duty cycle 통계 로그 간격 (초)
+# ===== OCR 시점 (결과 화면 안정 감지) =====
+OCR_FIXED_DELAY = 1.0           # 이전 고정 대기 시간 (단축 시간 로그 기준, 조기 OCR 값이 무효일 때 재시도 시점)
+OCR_MAX_WAIT = 1.5              # 화면이 계속 바뀌어도 이 시간이 지나면 OCR (안전 상한)
+OCR_STABLE_TOLERANCE = 3.0      # 지표 영역 지문 평균 절대 차이 허용치 (0~255)
 
 # =========================
 # 로그 제어 (실매장용: DEBUG = False)
 # =========================
 DEBUG = False
+_worker_events = None  # 캡처/OCR 작업 프로세스에서 log()를 GUI 프로세스로 보내는 이벤트 Queue
 
 def log(*args):
     """로그 출력 (GUI 로그 브리지로 전달, 파일 저장, cmd 깜빡임 방지)"""
     message = " ".join(str(arg) for arg in args)
+    
+    # 0. 캡처/OCR 작업 프로세스: GUI 프로세스가 파일/GUI 로그로 기록
+    if _worker_events is not None:
+        try:
+            _worker_events.put(("log", message))
+            return
+        except Exception:
+            pass
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     log_line = f"[{timestamp}] {message}\n"
     
@@ -947,8 +937,6 @@ def log(*args):
 SESSION_AUTO_LOGOUT_NO_SHOT = 20 * 60  # 20분 동안 샷이 없으면 자동 종료 (초)
 SESSION_AUTO_LOGOUT_NO_SCREEN = 5 * 60  # 5분 동안 연습 화면이 아니면 자동 종료 (초)
 
-OCR_TIMEOUT_SEC = 1
-
 # store_id, bay_number 결정 로직
 # 우선순위: 1) PC STATUS API 응답 2) 캐시된 값 3) config.json 4) None (에러)
 def get_store_id():
@@ -1016,6 +1004,27 @@ except ImportError:
         unique_id = hashlib.sha256(f"{hostname}{uuid.getnode()}".encode()).hexdigest()[:32].upper()
         return {"unique_id": unique_id, "hostname": hostname}
 
+# 샷 기준표 평가 엔진 (서버와 동일한 criteria.json 컴파일/평가 로직)
+try:
+    from client.core.criteria_engine import (
+        get_engine, KIND_NONE, KIND_RANGE, KIND_GOOD_BAD, KIND_GOOD_WARN,
+    )
+except ImportError as e:
+    early_log(f"criteria_engine import failed: {e}")
+    get_engine = None
+
+from client.core.adaptive_poll import AdaptivePoller
+from client.core.frame_ring import FrameRing
+from client.core.bay_capture import BayCapture
+from client.core.capture_backends import PyAutoGuiBackend, create_backend
+from client.core import metrics_ocr
+from client.core.metrics_ocr import OCR_TIMEOUT_SEC, ocr_image, parse_value
+from client.core.ocr_archive import OcrRecorder
+from client.core.stage_timer import format_stages, summarize, timings
+
+# 좌표 영역 픽셀 레이아웃 (비율 → 픽셀 변환/확대 배율을 좌표 파일·해상도 변경 시에만 계산)
+from client.core.region_layout import compile_layout
+
 # 매장별 좌표 파일 (매장마다 화면 레이아웃이 다를 수 있음)
 # 각 매장의 좌표 파일을 regions/ 폴더에 만들어서 사용
 # 예: regions/gaja.json, regions/sg_golf.json, regions/golfzone.json 등
@@ -1177,12 +1186,12 @@ def load_feedback_messages():
 
 # 초기화를 지연시키기 위해 전역 변수만 선언 (실제 초기화는 main() 또는 필요 시 호출)
 REGIONS = {}
-CRITERIA = {}
+CRITERIA_ENGINE = None  # criteria.json 컴파일 결과 (파일 변경 시 자동 재컴파일)
 FEEDBACK_MESSAGES = {}
 
 def init_module_if_needed():
     """모듈 초기화 (한 번만 실행) - GUI 모드에서는 필요 시에만 호출"""
-    global REGIONS, CRITERIA, FEEDBACK_MESSAGES
+    global REGIONS, CRITERIA_ENGINE, FEEDBACK_MESSAGES
     
     # 이미 초기화되었으면 건너뜀
     if hasattr(init_module_if_needed, '_initialized'):
@@ -1213,14 +1222,16 @@ def init_module_if_needed():
 
     # 샷 기준표 파일 로드
     early_log("before load criteria")
-    try:
-        CRITERIA = load_config_json("criteria.json")
-        log(f"✅ 샷 기준표 로드 완료: criteria.json")
+    criteria_path = os.path.join(get_runtime_base_dir(), "config", "criteria.json")
+    if get_engine is None:
+        log(f"⚠️ 샷 기준표 엔진을 불러올 수 없습니다 (client/core/criteria_engine.py 확인)")
+    elif not os.path.exists(criteria_path):
+        log(f"⚠️ 샷 기준표 파일을 찾을 수 없습니다: {criteria_path}")
+        early_log(f"criteria file not found: {criteria_path}")
+    else:
+        CRITERIA_ENGINE = get_engine(criteria_path)
+        log(f"✅ 샷 기준표 로드 완료: criteria.json (version={CRITERIA_ENGINE.current().version})")
         early_log("criteria file loaded")
-    except FileNotFoundError as e:
-        log(f"⚠️ 샷 기준표 파일을 찾을 수 없습니다: {e}")
-        early_log(f"criteria file not found: {e}")
-        CRITERIA = {}
 
     # 피드백 메시지 파일 로드
     early_log("before load feedback messages")
@@ -1232,14 +1243,63 @@ def init_module_if_needed():
         log(f"⚠️ 피드백 메시지 파일이 없거나 비어있습니다.")
         early_log("feedback messages file not found or empty")
 
-def capture_region_ratio(region):
-    sw, sh = pyautogui.size()
-    x = int(region["x"] * sw)
-    y = int(region["y"] * sh)
-    w = int(region["w"] * sw)
-    h = int(region["h"] * sh)
-    img = pyautogui.screenshot(region=(x, y, w, h))
-    return cv2.cvtColor(np.array(img), cv2.COLOR_RGB2BGR)
+LAYOUT_SIZE_CHECK_SEC = 5.0  # 화면 해상도 변경 확인 간격 (초) - 매 캡처마다 디스플레이 크기를 조회하지 않음
+_layout_state = {"layout": None, "regions": None, "checked_at": 0.0}
+
+def get_region_layout():
+    """현재 REGIONS의 픽셀 레이아웃 (좌표 파일이 바뀌거나 해상도가 바뀔 때만 다시 컴파일)"""
+    state = _layout_state
+    layout = state["layout"]
+    now = time.monotonic()
+    if (layout is not None and state["regions"] is REGIONS
+            and now - state["checked_at"] < LAYOUT_SIZE_CHECK_SEC):
+        return layout
+    
+    screen_size = tuple(get_capture_backend().monitors()[0][2:])
+    state["checked_at"] = now
+    if layout is None or state["regions"] is not REGIONS or layout.screen_size != screen_size:
+        layout = compile_layout(REGIONS, screen_size)
+        log(f"[LAYOUT] 좌표 레이아웃 컴파일: {screen_size[0]}x{screen_size[1]}, {len(layout.rects)}개 영역")
+        state["layout"] = layout
+        state["regions"] = REGIONS
+    return layout
+
+capture_backend = None
+
+def capture_backend_config():
+    """config.json "capture" (없으면 pyautogui) - 환경 변수 CAPTURE_BACKEND가 있으면 종류만 덮어씀"""
+    config = load_config().get("capture") or {}
+    if isinstance(config, str):
+        config = {"type": config}
+    if os.environ.get("CAPTURE_BACKEND"):
+        config = dict(config, type=os.environ["CAPTURE_BACKEND"])
+    return config
+
+def get_capture_backend():
+    """화면 캡처 백엔드 (프로세스마다 1개, client/core/capture_backends.py) - 만들 수 없으면 pyautogui"""
+    global capture_backend
+    if capture_backend is None:
+        config = capture_backend_config()
+        try:
+            capture_backend = create_backend(config, regions=REGIONS)
+        except Exception as e:
+            log(f"⚠️ 캡처 백엔드 {config.get('type')} 사용 불가 ({e}) → pyautogui 사용")
+            capture_backend = PyAutoGuiBackend()
+        log(f"[CAPTURE] 캡처 백엔드: {capture_backend.describe()}")
+    return capture_backend
+
+def grab_rect(rect):
+    """화면의 픽셀 사각형 (x, y, w, h) 캡처 → BGR 이미지 (보조 디스플레이는 가상 화면 좌표)"""
+    return get_capture_backend().grab(rect)
+
+def capture_region(key):
+    """영역 하나만 캡처 (런 텍스트 감지 등 매 틱 호출용)"""
+    return grab_rect(get_region_layout().rects[key])
+
+def capture_frame():
+    """모든 영역을 감싸는 bbox를 한 번에 캡처 → (layout, frame), 영역은 layout.crop(frame, key)"""
+    layout = get_region_layout()
+    return layout, grab_rect(layout.bbox)
 
 def preprocess(img):
     gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
@@ -1288,449 +1348,21 @@ def ocr_number(img):
     return None
 
 
-def ocr_text_region(key):
+def ocr_text_region(key, frame=None, layout=None):
     """
     숫자 + 부호(+/- 또는 R/L) + 단위 전체가 들어있는 영역을 읽어서
-    그대로 문자열로 반환.
-    개선: 이미지 전처리 강화 및 여러 threshold 시도
-    백스핀 특별 처리: 4자리 숫자 인식 강화
-    """
-    img = capture_region_ratio(REGIONS[key])
-    
-    # 백스핀과 사이드스핀은 4자리 숫자가 많아서 더 크게 확대
-    # 볼스피드/클럽스피드는 소수점 인식을 위해 더 크게 확대
-    h, w = img.shape[:2]
-    if key in ["back_spin", "side_spin"]:
-        # 백스핀/사이드스핀은 더 크게 확대 (4자리 숫자 인식 강화)
-        # 최소 250px 너비로 확대하여 4자리 숫자 전체 인식 (범위를 넓게 잡아서 첫 숫자도 인식)
-        if w < 250 or h < 70:
-            scale = max(7.0, 250.0 / w, 70.0 / h)
-            img = cv2.resize(img, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC)
-    elif key in ["ball_speed", "club_speed"]:
-        # 볼스피드/클럽스피드는 소수점 인식을 위해 더 크게 확대
-        # 최소 150px 너비로 확대하여 소수점 포함 숫자 전체 인식
-        if w < 150 or h < 50:
-            scale = max(5.0, 150.0 / w, 50.0 / h)
-            img = cv2.resize(img, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC)
-    else:
-        if w < 100 or h < 40:
-            scale = max(4.0, 100.0 / w, 40.0 / h)
-            img = cv2.resize(img, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC)
-    
-    # 전처리
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-    
-    # 백스핀/사이드스핀은 더 강한 전처리
-    if key in ["back_spin", "side_spin"]:
-        # 대비 강화 (CLAHE 사용)
-        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8,8))
-        gray = clahe.apply(gray)
-    
-    # 방법 1: 정규화 + 블러 + 일반 threshold (가장 빠르고 효과적)
-    gray1 = cv2.normalize(gray, None, 0, 255, cv2.NORM_MINMAX)
-    gray1 = cv2.GaussianBlur(gray1, (3, 3), 0)
-    
-    # 백스핀과 사이드스핀은 더 많은 threshold 값 시도
-    # 볼스피드/클럽스피드는 소수점 인식을 위해 더 많은 시도
-    if key in ["back_spin", "side_spin"]:
-        priority_combinations = [
-            (gray1, 145, 8),  # PSM 8 (단일 단어) 우선 시도
-            (gray1, 150, 8),
-            (gray1, 140, 8),
-            (gray1, 145, 7),
-            (gray1, 150, 7),
-            (gray1, 140, 7),
-            (gray1, 135, 7),  # 스핀 항목 추가
-            (gray1, 155, 7),  # 스핀 항목 추가
-            (gray1, 145, 6),  # PSM 6도 시도
-            (gray1, 160, 8),  # 추가 threshold
-            (gray1, 130, 8),  # 추가 threshold
-        ]
-        # 여러 결과를 수집하여 가장 정확한 것 선택
-        candidate_texts = []
-    elif key in ["ball_speed", "club_speed"]:
-        # 볼스피드/클럽스피드는 소수점 인식을 위해 더 많은 시도
-        priority_combinations = [
-            (gray1, 145, 7),  # 가장 일반적인 조합
-            (gray1, 150, 7),
-            (gray1, 140, 7),
-            (gray1, 145, 8),  # PSM 8도 시도
-            (gray1, 150, 8),
-            (gray1, 140, 8),
-            (gray1, 135, 7),  # 추가 threshold
-            (gray1, 155, 7),  # 추가 threshold
-        ]
-    else:
-        priority_combinations = [
-            (gray1, 145, 7),  # 가장 일반적인 조합
-            (gray1, 150, 7),
-            (gray1, 140, 7),
-            (gray1, 145, 8),  # PSM 8도 시도
-        ]
-    
-    best_text = None
-    best_thresh_img = None
-    candidate_texts = []  # 백스핀/사이드스핀용 후보 텍스트들
-    
-    for processed, thresh_val, psm_mode in priority_combinations:
-        try:
-            thresh = cv2.threshold(processed, thresh_val, 255, cv2.THRESH_BINARY)[1]
-            text = pytesseract.image_to_string(
-                thresh,
-                lang="eng",
-                config=f"--psm {psm_mode} -c tessedit_char_whitelist=0123456789.,-RL /mps°",
-                timeout=OCR_TIMEOUT_SEC
-            ).upper().strip()
-            if text and any(c.isdigit() for c in text):
-                # 볼스피드/클럽스피드는 소수점이 있는 결과를 우선 선택
-                if key in ["ball_speed", "club_speed"]:
-                    if "." in text:
-                        # 소수점이 있으면 즉시 반환 (디버그 이미지는 샷 감지 시 저장)
-                        if best_thresh_img is None:
-                            best_thresh_img = thresh
-                        return text
-                    elif best_text is None:
-                        # 소수점이 없어도 일단 저장 (나중에 사용)
-                        best_text = text
-                        if best_thresh_img is None:
-                            best_thresh_img = thresh
-                # 백스핀과 사이드스핀은 특별 처리
-                elif key == "back_spin":
-                    # 백스핀: 4자리 숫자 우선
-                    digits = sum(c.isdigit() for c in text)
-                    if digits == 4:
-                        candidate_texts.append(text)
-                    elif digits >= 4:
-                        candidate_texts.append(text)
-                    elif digits >= 3:
-                        candidate_texts.append(text)
-                elif key == "side_spin":
-                    # 사이드 스핀: 4자리 또는 3자리 숫자 우선 (부호 포함)
-                    digits = sum(c.isdigit() for c in text)
-                    if digits == 4:
-                        # 정확히 4자리면 즉시 반환
-                        return text
-                    elif digits == 3:
-                        # 정확히 3자리면 즉시 반환
-                        return text
-                    elif digits >= 4:
-                        # 4자리 이상이면 후보에 추가 (나중에 파싱에서 앞 4자리만 추출)
-                        candidate_texts.append(text)
-                    elif digits >= 3:
-                        # 3자리 이상이면 후보에 추가 (나중에 파싱에서 앞 3자리만 추출)
-                        candidate_texts.append(text)
-                    elif digits >= 2:
-                        candidate_texts.append(text)
-                else:
-                    return text  # 즉시 반환 (조기 종료)
-        except Exception:
-            continue
-    
-    # 백스핀: 여러 후보 중 가장 정확한 것 선택 (4자리 우선)
-    if key == "back_spin" and candidate_texts:
-        # 정확히 4자리 숫자가 있는 결과 우선 선택
-        for candidate in candidate_texts:
-            digits = sum(c.isdigit() for c in candidate)
-            if digits == 4:
-                return candidate
-        # 4자리가 없으면 첫 번째 후보 반환 (파싱에서 처리)
-        if candidate_texts:
-            return candidate_texts[0]
-    
-    # 사이드 스핀: 여러 후보 중 가장 정확한 것 선택 (4자리 우선, 그 다음 3자리)
-    if key == "side_spin" and candidate_texts:
-        # 정확히 4자리 숫자가 있는 결과 우선 선택
-        for candidate in candidate_texts:
-            digits = sum(c.isdigit() for c in candidate)
-            if digits == 4:
-                return candidate
-        # 4자리가 없으면 3자리 선택
-        for candidate in candidate_texts:
-            digits = sum(c.isdigit() for c in candidate)
-            if digits == 3:
-                return candidate
-        # 3자리도 없으면 첫 번째 후보 반환 (파싱에서 처리)
-        if candidate_texts:
-            return candidate_texts[0]
-    
-    # 볼스피드/클럽스피드는 소수점이 없는 경우에도 반환 (디버그 이미지는 샷 감지 시 저장)
-    if key in ["ball_speed", "club_speed"] and best_text:
-        return best_text
-    
-    # 실패 시 적응형 threshold 시도 (1회만)
-    try:
-        gray2 = cv2.adaptiveThreshold(
-            gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, 
-            cv2.THRESH_BINARY_INV, 11, 2
-        )
-        text = pytesseract.image_to_string(
-            gray2,
-            lang="eng",
-            config="--psm 7 -c tessedit_char_whitelist=0123456789.,-RL /mps°",
-            timeout=OCR_TIMEOUT_SEC
-        ).upper().strip()
-        if text and any(c.isdigit() for c in text):
-            if key == "back_spin":
-                digits = sum(c.isdigit() for c in text)
-                if digits >= 3:
-                    return text
-            elif key == "side_spin":
-                digits = sum(c.isdigit() for c in text)
-                if digits >= 2:  # 사이드 스핀은 3자리지만 2자리 이상이면 일단 반환
-                    return text
-            else:
-                return text
-    except Exception:
-        pass
+    그대로 문자열로 반환 (OCR/전처리는 client/core/metrics_ocr.py ocr_image)
     
-    # 마지막 시도: whitelist 없이
-    try:
-        thresh = cv2.threshold(gray1, 145, 255, cv2.THRESH_BINARY)[1]
-        text = pytesseract.image_to_string(
-            thresh,
-            lang="eng",
-            config="--psm 7",
-            timeout=OCR_TIMEOUT_SEC
-        ).upper().strip()
-        return text
-    except Exception:
-        return ""
-
-
-def parse_value(text, mode="plain", key=None):
-    """
-    text: OCR로 읽은 전체 문자열 (예: "L 3.0°", "10,000 rpm", "-866 rpm", "47.55 m/s", "1662-", "--1070-", "22981")
-    mode:
-      - "plain"  : 부호 없는 순수 숫자 (볼스피드, 클럽스피드, 발사각 등)
-      - "minus"  : '-' 기호 기준 부호 (클럽패스, 사이드스핀, 백스핀 등)
-      - "RL"     : R/L 기준 부호 (페이스각, 방향각, 좌우이격 등)
-    key: 항목 이름 (back_spin, side_spin 등) - 4자리 숫자 우선 추출용
-    
-    개선: 쉼표가 포함된 숫자(10,000)도 처리하고, 부호 인식을 더 정확하게
-    4자리 숫자도 정확히 추출하도록 개선
+    frame/layout: capture_frame() 결과 (없으면 이 영역만 캡처)
     """
-    if not text:
-        return None
-
-    # OCR 결과에서 불필요한 문자 제거 (뒤에 붙은 '-' 등)
-    # 예: "1662-" → "1662", "--1070-" → "-1070"
-    text_clean = text.strip()
-    
-    # 연속된 '-' 정리 (맨 앞의 '-'만 유지)
-    if text_clean.startswith("-"):
-        # 맨 앞의 '-' 유지하고 나머지 '-' 제거
-        text_clean = "-" + text_clean[1:].replace("-", "")
+    if frame is None:
+        layout = get_region_layout()
+        img = grab_rect(layout.rects[key])
     else:
-        # 앞에 '-'가 없으면 모든 '-' 제거
-        text_clean = text_clean.replace("-", "")
-
-    # 백스핀: 정확히 4자리 숫자를 우선적으로 찾기
-    if key == "back_spin":
-        # 모든 숫자 추출 (순서대로)
-        all_digits = re.findall(r'\d', text_clean)
-        
-        if len(all_digits) >= 4:
-            # 앞의 4자리 숫자만 사용
-            # 예: "22981" → "2298", "2981" → "2981" (이미 4자리)
-            num_str = ''.join(all_digits[:4])
-            try:
-                v = float(num_str)
-                return abs(v)  # 백스핀은 부호 없음
-            except ValueError:
-                pass
-        
-        # 정규표현식으로도 시도 (기존 방식)
-        m = re.search(r"\d{4}(?!\d)", text_clean)  # 4자리 숫자 뒤에 숫자가 없는 경우
-        if m:
-            num_str = m.group(0).replace(",", "")
-            try:
-                v = float(num_str)
-                return abs(v)
-            except ValueError:
-                pass
-        
-        # 4자리 숫자 뒤에 숫자가 있어도 앞의 4자리만 추출 (22981 → 2298)
-        m = re.search(r"(\d{4})\d+", text_clean)
-        if m:
-            num_str = m.group(1)
-            try:
-                v = float(num_str)
-                return abs(v)
-            except ValueError:
-                pass
-    
-    # 사이드 스핀: 3자리 또는 4자리 숫자 처리 (부호 포함)
-    if key == "side_spin":
-        # 원본 텍스트에서 부호 확인 (OCR 오류로 인한 잘못된 부호 제거)
-        original_text = text.strip()
-        has_minus_sign = False
-        
-        # 명확한 부호 확인: 텍스트 시작 부분에 "-"가 있고, 그 뒤에 숫자가 오는 경우만
-        if original_text.startswith("-") and len(original_text) > 1 and original_text[1].isdigit():
-            has_minus_sign = True
-        
-        # 모든 숫자 추출 (순서대로)
-        all_digits = re.findall(r'\d', text_clean)
-        
-        # 4자리 숫자 우선 처리 (-1070 같은 경우)
-        if len(all_digits) >= 4:
-            # 앞의 4자리 숫자 사용
-            # 예: "10706" → "1070", "1070" → "1070"
-            num_str = ''.join(all_digits[:4])
-            try:
-                v = float(num_str)
-                if mode == "minus":
-                    # 명확한 부호가 있을 때만 음수로 처리
-                    if has_minus_sign:
-                        return -abs(v)
-                    return abs(v)
-                return abs(v)
-            except ValueError:
-                pass
-        
-        # 3자리 숫자 처리 (655 같은 경우)
-        if len(all_digits) >= 3:
-            # 앞의 3자리 숫자만 사용
-            # 예: "6556" → "655", "655" → "655"
-            num_str = ''.join(all_digits[:3])
-            try:
-                v = float(num_str)
-                if mode == "minus":
-                    # 명확한 부호가 있을 때만 음수로 처리
-                    if has_minus_sign:
-                        return -abs(v)
-                    return abs(v)
-                return abs(v)
-            except ValueError:
-                pass
-        
-        # 정규표현식으로도 시도: 4자리 숫자 우선, 그 다음 3자리
-        m = re.search(r"\d{4}(?!\d)", text_clean)  # 4자리 숫자 뒤에 숫자가 없는 경우 (부호 제외)
-        if m:
-            num_str = m.group(0).replace(",", "")
-            try:
-                v = float(num_str)
-                if mode == "minus":
-                    if has_minus_sign:
-                        return -abs(v)
-                    return abs(v)
-                return abs(v)
-            except ValueError:
-                pass
-        
-        m = re.search(r"\d{3}(?!\d)", text_clean)  # 3자리 숫자 뒤에 숫자가 없는 경우 (부호 제외)
-        if m:
-            num_str = m.group(0).replace(",", "")
-            try:
-                v = float(num_str)
-                if mode == "minus":
-                    if has_minus_sign:
-                        return -abs(v)
-                    return abs(v)
-                return abs(v)
-            except ValueError:
-                pass
-        
-        # 4자리 이상 숫자 뒤에 숫자가 있어도 앞의 4자리만 추출 (10706 → 1070)
-        m = re.search(r"(\d{4})\d+", text_clean)  # 부호 제외하고 숫자만
-        if m:
-            num_str = m.group(1)
-            try:
-                v = float(num_str)
-                if mode == "minus":
-                    if has_minus_sign:
-                        return -abs(v)
-                    return abs(v)
-                return abs(v)
-            except ValueError:
-                pass
-        
-        # 3자리 숫자 뒤에 숫자가 있어도 앞의 3자리만 추출 (6556 → 655)
-        m = re.search(r"(\d{3})\d+", text_clean)  # 부호 제외하고 숫자만
-        if m:
-            num_str = m.group(1)
-            try:
-                v = float(num_str)
-                if mode == "minus":
-                    if has_minus_sign:
-                        return -abs(v)
-                    return abs(v)
-                return abs(v)
-            except ValueError:
-                pass
-
-    # 숫자 추출 (4자리 이상도 포함, 쉼표 포함 가능, 소수점 포함 가능)
-    # 예: "1662", "10,000", "47.55", "60.62", "-1070", "L 3.0", "-4.7" 등
-    # 소수점이 있는 숫자를 우선적으로 찾기 (볼스피드/클럽스피드/클럽패스 등)
-    # 소수점 인식 강화: 소수점 앞뒤로 숫자가 있는 패턴 우선
-    m = re.search(r"-?\d+\.\d+", text_clean)
-    if not m:
-        # 소수점이 없으면 정수만 찾기
-        # 먼저 쉼표 포함 숫자 시도
-        m = re.search(r"-?\d{1,3}(?:,\d{3})+", text_clean)
-    if not m:
-        # 정확히 4자리 숫자 우선 시도 (백스핀용)
-        m = re.search(r"-?\d{4}", text_clean)
-    if not m:
-        # 쉼표 없는 4자리 이상 숫자 시도
-        m = re.search(r"-?\d{4,}", text_clean)
-    if not m:
-        # 일반 숫자 (1자리 이상)
-        m = re.search(r"-?\d+", text_clean)
-    if not m:
-        return None
-
-    # 쉼표 제거 후 숫자 변환
-    num_str = m.group(0).replace(",", "")
+        img = layout.crop(frame, key)
     
-    # 소수점이 있는 경우와 없는 경우를 구분하여 처리
-    has_decimal = "." in num_str
-    try:
-        v = float(num_str)
-    except ValueError:
-        return None
+    return ocr_image(key, img, layout.scales.get(key))
 
-    if mode == "plain":
-        # 부호 없는 순수 숫자 (볼스피드, 클럽스피드 등)
-        # 단, 소수점이 있는 경우 원래 값 유지 (음수면 음수, 양수면 양수)
-        # 볼스피드/클럽스피드는 항상 양수이므로 abs 사용
-        return abs(v)
-
-    if mode == "minus":
-        # '-' 기호가 있으면 음수, 없으면 양수
-        # 예: "-866 rpm" → -866, "989 rpm" → 989, "-4.7" → -4.7, "4.7" → 4.7
-        # 원본 text에서 명확한 부호 확인 (텍스트 시작 부분에 "-"가 있고 그 뒤에 숫자가 오는 경우만)
-        original_text = text.strip()
-        has_minus_sign = False
-        if original_text.startswith("-") and len(original_text) > 1:
-            # "-" 뒤에 숫자나 소수점이 오는 경우만 부호로 인정
-            next_char = original_text[1]
-            if next_char.isdigit() or next_char == ".":
-                has_minus_sign = True
-        
-        # 소수점이 있는 경우: 원본 텍스트의 부호를 정확히 반영
-        if has_decimal:
-            if has_minus_sign or num_str.startswith("-"):
-                return -abs(v)
-            return abs(v)
-        
-        # 소수점이 없는 경우: 기존 로직
-        if has_minus_sign or num_str.startswith("-"):
-            return -abs(v)
-        return abs(v)
-
-    if mode == "RL":
-        # R/L 기준 부호 (L이 우선, 그다음 R)
-        # 예: "L 3.0°" → -3.0, "R 5.31 m" → 5.31
-        text_upper = text.upper()
-        if "L" in text_upper:
-            return -abs(v)
-        if "R" in text_upper:
-            return abs(v)
-        # 부호가 없으면 원래 값 반환 (음수면 음수, 양수면 양수)
-        return v
-
-    return v
 
 # =========================
 # 픽셀 감지 (자동 보정)
@@ -1767,103 +1399,23 @@ class StableValue:
 
 def read_value(key):
     """숫자 감지용 간단 리더 (볼스피드/클럽스피드 샷 감지에만 사용)"""
-    img = capture_region_ratio(REGIONS[key])
+    img = capture_region(key)
     return ocr_number(img)
 
-def detect_text_presence():
-    """텍스트 존재 여부 감지 (샷 시작/종료 판단용)
-    Returns: True if text/pixels are detected in the region, False otherwise
-    """
-    if "run_text" not in REGIONS:
-        return None
-    
-    img = capture_region_ratio(REGIONS["run_text"])
-    
-    # 픽셀 비율로 텍스트 존재 여부 확인 (더 빠르고 안정적)
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-    
-    # 적응형 threshold로 텍스트 영역 감지
-    bw = cv2.adaptiveThreshold(
-        gray, 255,
-        cv2.ADAPTIVE_THRESH_MEAN_C,
-        cv2.THRESH_BINARY_INV,
-        11, 2
-    )
-    
-    # 검은 픽셀(텍스트) 비율 계산
-    black_pixels = cv2.countNonZero(bw)
-    total_pixels = bw.shape[0] * bw.shape[1]
-    text_ratio = black_pixels / total_pixels if total_pixels > 0 else 0
-    
-    # 텍스트가 있다고 판단하는 임계값 (2% 이상이면 텍스트 존재)
-    has_text = text_ratio >= 0.02
-    
-    return has_text
-
-
-def read_metrics():
+def read_metrics(layout=None, frame=None, texts=None):
     """
     실제 DB에 저장할 항목들 + 스매쉬팩터 계산.
+    layout/frame: capture_frame() 결과 (화면 안정 감지에 쓴 프레임 재사용, 없으면 새로 캡처)
+    texts: dict를 넘기면 지표별 OCR 원문을 채워 줌 (OCR 녹화용)
     필요한 키(모두 숫자+부호+단위 포함 영역):
       - total_distance, carry (총거리, 캐리)
       - ball_speed, club_speed, launch_angle, back_spin
       - club_path, lateral_offset, direction_angle, side_spin, face_angle
     """
-    # 총거리, 캐리
-    td_txt  = ocr_text_region("total_distance")
-    cr_txt  = ocr_text_region("carry")
-    
-    bs_txt  = ocr_text_region("ball_speed")
-    cs_txt  = ocr_text_region("club_speed")
-    la_txt  = ocr_text_region("launch_angle")
-    bk_txt  = ocr_text_region("back_spin")
-
-    cp_txt  = ocr_text_region("club_path")
-    lo_txt  = ocr_text_region("lateral_offset")
-    da_txt  = ocr_text_region("direction_angle")
-    ss_txt  = ocr_text_region("side_spin")
-    fa_txt  = ocr_text_region("face_angle")
-
-    # 총거리, 캐리 파싱
-    total_distance = parse_value(td_txt, mode="plain")
-    carry = parse_value(cr_txt, mode="plain")
-
-    # OCR 파싱 (모든 값 동일하게 처리)
-    ball_speed = parse_value(bs_txt, mode="plain")
-    club_speed = parse_value(cs_txt, mode="plain")
-    launch_angle = parse_value(la_txt, mode="plain")
-
-    # 스핀류: 백스핀은 부호 없음, 사이드스핀은 '-' 부호 가능 (4자리 숫자 우선 추출)
-    back_spin    = parse_value(bk_txt, mode="plain", key="back_spin")
-    side_spin    = parse_value(ss_txt, mode="minus", key="side_spin")
-
-    # 각도/이격 : R/L 로 방향 결정
-    club_path    = parse_value(cp_txt, mode="minus")
-    lateral      = parse_value(lo_txt, mode="RL")
-    direction    = parse_value(da_txt, mode="RL")
-    face_angle   = parse_value(fa_txt, mode="RL")
-
-    smash_factor = None
-    try:
-        if ball_speed is not None and club_speed not in (None, 0, 0.0):
-            smash_factor = round(ball_speed / club_speed, 2)
-    except Exception:
-        smash_factor = None
-
-    return {
-        "total_distance":   total_distance,
-        "carry":            carry,
-        "ball_speed":       ball_speed,
-        "club_speed":       club_speed,
-        "launch_angle":     launch_angle,
-        "back_spin":        back_spin,
-        "club_path":        club_path,
-        "lateral_offset":   lateral,
-        "direction_angle":  direction,
-        "side_spin":        side_spin,
-        "face_angle":       face_angle,
-        "smash_factor":     smash_factor,
-    }
+    # 전체 영역을 한 번에 캡처 (영역별 캡처 11회 → 1회, 모든 값이 같은 순간의 화면)
+    if frame is None:
+        layout, frame = capture_frame()
+    return metrics_ocr.read_metrics(layout, frame, texts)
 
 # =========================
 # 감지 보조
@@ -1905,18 +1457,17 @@ if USE_GPT_FEEDBACK and OPENAI_API_KEY:
 # =========================
 # 샷 평가 및 음성 안내
 # =========================
-def get_criteria_rule(club_id, metric):
-    """criteria.json에서 클럽/지표별 기준값 가져오기"""
-    cid = (club_id or "").lower()
-    club_cfg = CRITERIA.get(cid, {})
-    if metric in club_cfg:
-        return club_cfg[metric]
-    default_cfg = CRITERIA.get("default", {})
-    return default_cfg.get(metric)
+def get_criteria():
+    """현재 샷 기준표 컴파일 결과 (없으면 None)"""
+    if CRITERIA_ENGINE is None:
+        return None
+    criteria = CRITERIA_ENGINE.current()
+    return criteria if criteria.criteria else None
 
 def evaluate_shot(metrics, club_id="Driver"):
     """샷 데이터를 기준표와 비교하여 평가"""
-    if not CRITERIA:
+    criteria = get_criteria()
+    if not criteria:
         return []
     
     evaluations = []
@@ -1952,17 +1503,14 @@ def evaluate_shot(metrics, club_id="Driver"):
         except (ValueError, TypeError):
             continue
         
-        rule = get_criteria_rule(club_id, metric_key)
-        if not rule:
+        # 컴파일된 규칙 (kind, a, b) - 클럽/성별 키 → default 병합 완료
+        kind, a, b = criteria.rule(club_id, metric_key)
+        if kind == KIND_NONE:
             continue
         
-        good = rule.get("good")
-        bad = rule.get("bad")
-        warn = rule.get("warn")
-        
         # 범위값 처리 (예: [12, 16])
-        if isinstance(good, (list, tuple)) and len(good) == 2:
-            low, high = float(good[0]), float(good[1])
+        if kind == KIND_RANGE:
+            low, high = a, b
             if low <= v <= high:
                 evaluations.append({"metric": metric_name, "value": v, "status": "good", "priority": 1, "metric_key": metric_key})
             else:
@@ -1973,9 +1521,8 @@ def evaluate_shot(metrics, club_id="Driver"):
             continue
         
         # good/bad 기준 처리
-        if good is not None and bad is not None:
-            g = float(good)
-            b = float(bad)
+        if kind == KIND_GOOD_BAD:
+            g = a
             if v >= g:
                 evaluations.append({"metric": metric_name, "value": v, "status": "good", "priority": 1, "metric_key": metric_key})
             elif v <= b:
@@ -1985,9 +1532,8 @@ def evaluate_shot(metrics, club_id="Driver"):
             continue
         
         # good/warn 기준 처리 (절대값 기준)
-        if good is not None and warn is not None:
-            g = float(good)
-            w = float(warn)
+        if kind == KIND_GOOD_WARN:
+            g, w = a, b
             abs_v = abs(v)
             if abs_v <= g:
                 evaluations.append({"metric": metric_name, "value": v, "status": "good", "priority": 1, "metric_key": metric_key})
@@ -1998,12 +1544,11 @@ def evaluate_shot(metrics, club_id="Driver"):
             continue
         
         # good만 있는 경우
-        if good is not None:
-            g = float(good)
-            if v >= g:
-                evaluations.append({"metric": metric_name, "value": v, "status": "good", "priority": 1, "metric_key": metric_key})
-            else:
-                evaluations.append({"metric": metric_name, "value": v, "status": "bad", "message": f"{metric_name} {v:.1f}, 낮습니다. {g:.1f} 이상이 좋습니다.", "priority": _get_priority(metric_key), "metric_key": metric_key, "target": g})
+        g = a
+        if v >= g:
+            evaluations.append({"metric": metric_name, "value": v, "status": "good", "priority": 1, "metric_key": metric_key})
+        else:
+            evaluations.append({"metric": metric_name, "value": v, "status": "bad", "message": f"{metric_name} {v:.1f}, 낮습니다. {g:.1f} 이상이 좋습니다.", "priority": _get_priority(metric_key), "metric_key": metric_key, "target": g})
     
     return evaluations
 
@@ -2047,8 +1592,10 @@ def get_gpt_feedback(metrics, club_id="Driver"):
         
         # 기준표 정보 가져오기
         criteria_info = ""
-        if club_id.lower() == "driver" and CRITERIA.get("driver"):
-            driver_criteria = CRITERIA["driver"]
+        criteria = get_criteria()
+        driver_key = criteria.key_for("driver") if criteria else None
+        if club_id.lower() == "driver" and criteria and criteria.criteria.get(driver_key):
+            driver_criteria = criteria.criteria[driver_key]
             criteria_info = f"""
 드라이버 기준:
 - 스매시팩터: {driver_criteria.get('smash_factor', {}).get('good', 'N/A')} 이상이 좋음
@@ -2205,16 +1752,16 @@ def clear_active_session(store_id, bay_id):
 # =========================
 # 중복 샷 차단
 # =========================
-last_shot_signature = None
-last_shot_time = None
+last_shot_by_bay = {}  # (store_id, bay_id) → (ball_speed, club_speed, launch_angle), 시간 (타석별 중복 판단)
 MIN_SHOT_INTERVAL = 2.0  # 최소 샷 간격 (초) - 테스트 환경에서 같은 캡처본 사용 시에도 기록되도록
 
 def is_same_shot(shot_data):
-    """중복 샷 차단 (ball_speed, club_speed, launch_angle 비교 + 시간 간격 체크)"""
-    global last_shot_signature, last_shot_time
+    """중복 샷 차단 (타석별 ball_speed, club_speed, launch_angle 비교 + 시간 간격 체크)"""
     import time
     
     now = time.time()
+    bay_key = (shot_data.get("store_id"), shot_data.get("bay_id"))
+    last_shot_signature, last_shot_time = last_shot_by_bay.get(bay_key, (None, None))
     
     # 최소 시간 간격 체크 (테스트 환경 대응)
     if last_shot_time is not None:
@@ -2236,8 +1783,7 @@ def is_same_shot(shot_data):
             return True
     
     # 새로운 샷으로 기록
-    last_shot_signature = sig
-    last_shot_time = now
+    last_shot_by_bay[bay_key] = (sig, now)
     return False
 
 # =========================
@@ -2317,21 +1863,425 @@ def update_pc_last_seen():
         pc_unique_id = pc_info.get("unique_id")
         
         headers = get_auth_headers()
+        body = {"pc_unique_id": pc_unique_id}
+        # 단계별 소요 시간 요약 (슈퍼 관리자 PC 관리 화면에서 느린 타석 확인용)
+        latency = summarize(stage_snapshot(), LATENCY_HEARTBEAT_STAGES)
+        if latency:
+            body["latency"] = latency
         response = requests.post(
             f"{DEFAULT_SERVER_URL}/api/update_pc_last_seen",
-            json={"pc_unique_id": pc_unique_id},
+            json=body,
             headers=headers,
             timeout=5
         )
     except Exception:
         pass  # 조용히 실패 (주기적 업데이트이므로)
 
-def run(regions=None):
+# =========================
+# 캡처/OCR 작업 프로세스
+# =========================
+# tkinter/pystray/로그 브리지와 같은 프로세스에서 OpenCV/OCR을 돌리면 OCR 중 GUI가 멈칫하고
+# GUI 작업이 감지 지연에 섞인다 → 캡처/감지/OCR은 별도 프로세스, GUI 프로세스는 표시와 업로드만 담당
+# - 작업 프로세스 → GUI: 이벤트 Queue (log, text, shot, stats) / OCR에 쓴 프레임은 공유 메모리 링 (client/core/frame_ring.py)
+# - GUI → 작업 프로세스: 명령 Queue (pause, stop)
+# - 한 PC에 시뮬레이터 화면이 여러 개면 작업 하나가 타석별 상태(BayCapture)를 모두 돌리고 OCR 스레드 풀을 공유
+CAPTURE_PROCESS_ENABLED = os.environ.get("CAPTURE_PROCESS", "true").lower() == "true"  # false면 같은 프로세스의 스레드로 실행
+CAPTURE_RING_SLOTS = 3          # 프레임 링 슬롯 수 (샷당 1프레임 기록)
+CAPTURE_EVENT_WAIT = 0.5        # GUI 프로세스 이벤트 대기 간격 (초) - PC 승인/자동 세션 종료 체크 주기
+CAPTURE_STATS_INTERVAL = 10     # 작업 프로세스 → GUI 폴링 통계 전달 간격 (초, 상태 보기용)
+CAPTURE_STOP_TIMEOUT = 3.0      # 종료 명령 후 작업 프로세스 대기 시간 (초)
+OCR_POOL_SIZE = 2               # OCR 스레드 수 상한 (타석 수보다 많이 만들지 않음, tesseract는 별도 프로세스라 병렬 실행됨)
+OCR_SKIP_FRAME_KEEP = 20        # 무효 샷(ball_speed < 5) 진단용 프레임 보관 개수 (logs/ocr_skip)
+# OCR 녹화: 샷마다 지표 영역 이미지 + OCR 원문/값을 ocr_record/YYYYMMDD.zip에 저장 (replay_ocr.py로 오프라인 재생)
+OCR_RECORD_ENABLED = os.environ.get("OCR_RECORD", "false").lower() == "true"
+OCR_RECORD_KEEP_DAYS = 14       # 녹화 아카이브 보관 일수
+# 단계별 소요 시간 (client/core/stage_timer.py): 작업 프로세스 값은 CAPTURE_STATS_INTERVAL마다 GUI 프로세스로 전달
+STAGE_TIMINGS_DUMP_INTERVAL = 60    # logs/stage_timings.json 저장 간격 (초)
+LATENCY_DISPLAY_STAGES = ("capture.full", "ocr", "upload", "shot_total")   # GUI/상태 보기 p95 한 줄
+LATENCY_HEARTBEAT_STAGES = ("capture.full", "capture.text", "ocr", "parse", "active_user", "upload", "shot_total")
+
+def capture_loop(bindings, events, commands, ring=None, paused=False):
     """
-    샷 수집 루프 실행
+    타석별 런 텍스트 감지 → 결과 화면 안정 대기 → OCR (작업 프로세스 또는 스레드에서 실행)
+    
+    Args:
+        bindings: [{"regions", "display", "store_id", "bay_number"}] 타석 목록
+        events: ("log", 메시지) / ("shot", {...}) / ("logout", (타석 번호, 사유)) / ("stats", 문자열)
+                / ("timings", 단계별 소요 시간 스냅샷)
+        commands: ("pause", bool) - PC 승인 전에는 감지 중지 / ("stop",)
+        ring: OCR에 쓴 프레임을 기록할 FrameRing (shot 이벤트의 frame_seq)
+    """
+    global poller
+    backend = get_capture_backend()
+    bays = [
+        BayCapture(
+            i, binding, backend, tagged=len(bindings) > 1, log=log,
+            stable_frames=STABLE_FRAMES, tolerance=OCR_STABLE_TOLERANCE, max_wait=OCR_MAX_WAIT,
+            fixed_delay=OCR_FIXED_DELAY, idle_after=IDLE_AFTER_SEC,
+            logout_no_screen=SESSION_AUTO_LOGOUT_NO_SCREEN, logout_no_shot=SESSION_AUTO_LOGOUT_NO_SHOT,
+            layout_check=LAYOUT_SIZE_CHECK_SEC,
+        )
+        for i, binding in enumerate(bindings)
+    ]
+    ocr_workers = max(1, min(OCR_POOL_SIZE, len(bays)))
+    ocr_pool = ThreadPoolExecutor(max_workers=ocr_workers, thread_name_prefix="ocr")
+
+    # 적응형 폴링: 모든 타석에서 런 텍스트 변화가 없으면 1Hz까지 감속, 변화 즉시 50ms로 복귀
+    poller = AdaptivePoller(fast=POLL_INTERVAL, idle=IDLE_POLL_INTERVAL, idle_after=IDLE_AFTER_SEC)
+    last_poll_stats_time = time.time()
+    last_stats_sent = 0.0
+    
+    log(f"🟢 텍스트 존재 여부 기반 샷 감지 시작 (타석 {len(bays)}개, OCR 스레드 {ocr_workers}개)")
+    log("💡 상태: WAITING (텍스트 대기 중)")
+    
+    try:
+        while True:
+            try:
+                # GUI 프로세스 명령 처리
+                try:
+                    while True:
+                        command = commands.get_nowait()
+                        if command[0] == "stop":
+                            log("[CAPTURE] 종료 명령 수신")
+                            return
+                        if command[0] == "pause":
+                            paused = command[1]
+                except queue.Empty:
+                    pass
+                
+                # 폴링 통계 (유휴 감속 효과 확인용 로그 + 상태 보기용 전달)
+                now = time.time()
+                if now - last_poll_stats_time >= POLL_STATS_INTERVAL:
+                    skipped = sum(bay.text_detector.skipped for bay in bays)
+                    checked = skipped + sum(bay.text_detector.full_checks for bay in bays)
+                    log(f"[POLL] {poller.format_stats()}, run_text 판정 생략={skipped / max(1, checked) * 100:.0f}%")
+                    for bay in bays:
+                        if bay.readiness.fired:
+                            bay.log(f"[READY] OCR {bay.readiness.fired}회, 재등장 후 평균 {bay.readiness.average_wait():.2f}초 "
+                                    f"(고정 {OCR_FIXED_DELAY:.1f}초), 상한 도달 {bay.readiness.timeouts}회")
+                    last_poll_stats_time = now
+                if now - last_stats_sent >= CAPTURE_STATS_INTERVAL:
+                    events.put(("stats", poller.format_stats()))
+                    events.put(("timings", timings.snapshot()))
+                    last_stats_sent = now
+                
+                # PC 승인 전에는 샷 감지 비활성화
+                if paused:
+                    poller.sleep()
+                    continue
+                
+                active = False
+                for bay in bays:
+                    try:
+                        active = bay.tick(events, ocr_pool, ring) or active
+                    except Exception as e:
+                        # 한 타석의 캡처/OCR 오류가 다른 타석 감지를 멈추지 않도록
+                        bay.log(f"[CAPTURE] loop error: {e}")
+                        bay.reset()
+                if active:
+                    poller.activity()
+                poller.sleep()
+            except Exception as e:
+                # OCR 오류 등은 루프 내부에서 처리 (감지 루프는 계속 살아있음)
+                log(f"[CAPTURE] loop error: {e}")
+                time.sleep(0.5)
+    finally:
+        ocr_pool.shutdown(wait=False)
+
+def capture_worker_main(bindings, events, commands, ring_name, ring_slots, ring_slot_bytes, paused):
+    """캡처/OCR 작업 프로세스 진입점 (spawn으로 시작, 타석별 좌표는 인자로 전달)"""
+    global REGIONS, _worker_events
+    _worker_events = events  # 이 프로세스의 log()는 GUI 프로세스로 전달
+    REGIONS = bindings[0]["regions"]
+    ring = FrameRing.attach(ring_name, ring_slots, ring_slot_bytes)
+    try:
+        log(f"[CAPTURE] 작업 프로세스 시작 (pid={os.getpid()})")
+        capture_loop(bindings, events, commands, ring, paused)
+    except Exception as e:
+        log(f"[CAPTURE] fatal error: {e}")
+    finally:
+        ring.close()
+
+class CaptureWorker:
+    """캡처/OCR 작업 프로세스 관리 (CAPTURE_PROCESS=false면 같은 프로세스의 스레드로 실행)"""
+
+    def __init__(self, bindings, paused=False):
+        self.use_process = CAPTURE_PROCESS_ENABLED
+        # 슬롯 크기는 가장 큰 디스플레이 기준 (해상도 변경으로 bbox가 커져도 기록 가능)
+        slot_bytes = max(w * h for _, _, w, h in get_capture_backend().monitors()) * 3
+        self.ring = FrameRing.create(slot_bytes=slot_bytes, slots=CAPTURE_RING_SLOTS)
+        if self.use_process:
+            ctx = multiprocessing.get_context("spawn")
+            self.events = ctx.Queue()
+            self.commands = ctx.Queue()
+            self.worker = ctx.Process(
+                target=capture_worker_main,
+                args=(bindings, self.events, self.commands,
+                      self.ring.name, self.ring.slots, self.ring.slot_bytes, paused),
+                name="capture-worker",
+                daemon=True,
+            )
+        else:
+            self.events = queue.Queue()
+            self.commands = queue.Queue()
+            self.worker = threading.Thread(
+                target=capture_loop,
+                args=(bindings, self.events, self.commands, self.ring, paused),
+                name="capture-worker",
+                daemon=True,
+            )
+
+    def start(self):
+        self.worker.start()
+        mode = f"프로세스 pid={self.worker.pid}" if self.use_process else "스레드"
+        log(f"[CAPTURE] 캡처/OCR 작업 시작 ({mode}, 프레임 링 {self.ring.slots}슬롯)")
+
+    def is_alive(self):
+        return self.worker.is_alive()
+
+    def set_paused(self, paused):
+        self.commands.put(("pause", paused))
+
+    def stop(self):
+        self.commands.put(("stop",))
+        self.worker.join(CAPTURE_STOP_TIMEOUT)
+        if self.use_process and self.worker.is_alive():
+            log("[CAPTURE] 작업 프로세스 응답 없음 → 강제 종료")
+            self.worker.terminate()
+            self.worker.join(CAPTURE_STOP_TIMEOUT)
+        self.ring.close()
+
+def load_bay_bindings(config, coordinate_cache, default_brand=None):
+    """
+    config.json "bays" → 타석 목록 (한 PC에 시뮬레이터 화면이 여러 개인 매장)
+    
+    "bays": [
+        {"display": 0, "brand": "SGGOLF", "filename": "...json", "store_id": "...", "bay_number": "1"},
+        {"display": 1, "brand": "SGGOLF", "filename": "...json", "store_id": "...", "bay_number": "2"}
+    ]
+    store_id/bay_number를 생략하면 PC STATUS API 값 사용 (타석이 2개 이상이면 bay_number는 필수)
+    Returns: 타석 목록 (설정이 없으면 None, 좌표 파일을 못 받으면 예외)
+    """
+    entries = config.get("bays") or []
+    if not entries:
+        return None
+    bindings = []
+    for i, entry in enumerate(entries):
+        brand = entry.get("brand") or default_brand
+        filename = entry.get("filename")
+        if not brand or not filename:
+            raise ValueError(f"bays[{i}]: brand/filename이 없습니다")
+        if len(entries) > 1 and not entry.get("bay_number"):
+            raise ValueError(f"bays[{i}]: 타석이 2개 이상이면 bay_number가 필요합니다")
+        coordinate_data = coordinate_cache.get_file(brand, filename)
+        bindings.append({
+            "regions": coordinate_data.get("regions", {}),
+            "display": int(entry.get("display") or 0),
+            "store_id": entry.get("store_id"),
+            "bay_number": str(entry["bay_number"]) if entry.get("bay_number") else None,
+            "brand": brand,
+            "filename": filename,
+        })
+    return bindings
+
+def binding_ids(binding):
+    """타석의 (store_id, bay_number) - 설정에 없으면 PC STATUS API 값"""
+    store_id = binding.get("store_id") or get_store_id()
+    bay_number = binding.get("bay_number") or get_bay_id()  # 함수명은 bay_id지만 bay_number 반환
+    return store_id, bay_number
+
+def save_ocr_skip_frame(ring, frame_seq):
+    """무효 샷이 OCR한 프레임을 logs/ocr_skip에 저장 (현장 좌표/인식 문제 진단용, 최근 OCR_SKIP_FRAME_KEEP개)"""
+    result = ring.read(frame_seq)
+    if result is None:
+        return None
+    frame, ts = result
+    skip_dir = os.path.join(LOG_DIR, "ocr_skip")
+    try:
+        ensure_dir(skip_dir)
+        path = os.path.join(skip_dir, f"{datetime.fromtimestamp(ts).strftime('%Y%m%d_%H%M%S')}.png")
+        cv2.imencode(".png", frame)[1].tofile(path)  # 한글 경로에서도 저장되도록 (cv2.imwrite는 실패)
+        old_files = sorted(f for f in os.listdir(skip_dir) if f.endswith(".png"))[:-OCR_SKIP_FRAME_KEEP]
+        for name in old_files:
+            os.remove(os.path.join(skip_dir, name))
+        return path
+    except Exception as e:
+        log(f"⚠️ 무효 샷 프레임 저장 실패: {e}")
+        return None
+
+ocr_recorder = None
+
+def record_ocr_shot(shot, ring):
+    """OCR 녹화 모드: 샷의 지표 영역 이미지 + OCR 원문/값을 아카이브에 추가 (무효 샷 포함)"""
+    global ocr_recorder
+    layout, texts = shot.get("layout"), shot.get("texts")
+    result = ring.read(shot.get("frame_seq")) if ring is not None else None
+    if result is None or layout is None or not texts:
+        return None
+    if ocr_recorder is None:
+        ocr_recorder = OcrRecorder(os.path.join(LOG_DIR, "ocr_record"), keep_days=OCR_RECORD_KEEP_DAYS)
+    info = {key: shot.get(key) for key in ("bay", "read_at", "reappear_at")}
+    try:
+        return ocr_recorder.record(layout, result[0], shot["metrics"], texts, info)
+    except Exception as e:
+        log(f"⚠️ OCR 녹화 실패: {e}")
+        return None
+
+def handle_shot(shot, ring, binding):
+    """작업 프로세스가 OCR한 샷 확정 → 통계/음성/서버 전송 (GUI 프로세스)"""
+    global shot_count, global_last_shot_time
+    metrics = shot["metrics"]
+    if OCR_RECORD_ENABLED and record_ocr_shot(shot, ring):
+        log(f"[OCR RECORD] 샷 녹화 {ocr_recorder.recorded}개째")
+    
+    # 현재 활성 사용자 조회 (OCR 읽기 후 즉시)
+    # 타석 설정의 store_id/bay_number, 없으면 PC STATUS API 값
+    current_store_id, current_bay_number = binding_ids(binding)
+    
+    # store_id 또는 bay_number가 없으면 샷 저장 차단 (PC STATUS API 확인 필요)
+    if not current_store_id or not current_bay_number:
+        log(f"⚠️ 샷 저장 차단: store_id={current_store_id}, bay_number={current_bay_number} (PC STATUS API 확인 필요)")
+        return False
+    
+    # 활성 사용자 조회 (bays 테이블에서 user_id 확인)
+    with timings.time("active_user"):
+        active_user = get_active_user(current_store_id, current_bay_number)
+    
+    # user_id가 없으면 GUEST로 저장 (샷 저장 중단 안함)
+    if not active_user:
+        active_user = "GUEST"
+        log(f"👤 활성 사용자가 없어 게스트로 샷을 저장합니다. (store_id={current_store_id}, bay_number={current_bay_number})")
+    
+    # 의미 없는 샷 스킵 (None 방어)
+    ball_speed = safe_number(metrics.get("ball_speed") if metrics else None)
+    if ball_speed is None or ball_speed < 5:
+        log(f"⚠️ 의미 없는 샷 스킵: ball_speed={ball_speed} (ball_speed < 5 또는 None)")
+        if metrics:
+            log(f"📊 전체 OCR 값: {metrics}")
+        frame_path = save_ocr_skip_frame(ring, shot.get("frame_seq"))
+        if frame_path:
+            log(f"🖼️ OCR 프레임 저장: {frame_path}")
+        return False
+
+    # PC 고유번호 추출
+    try:
+        pc_info = get_pc_info()
+        pc_unique_id = pc_info.get("unique_id")
+    except Exception as e:
+        log(f"⚠️ PC 고유번호 추출 실패: {e}")
+        pc_unique_id = None
+    
+    payload = {
+        "store_id": current_store_id,
+        "bay_id": current_bay_number,  # bay_number 사용
+        "user_id": active_user,
+        "club_id": DEFAULT_CLUB_ID,
+        "pc_unique_id": pc_unique_id,  # 추가
+
+        "total_distance":   metrics["total_distance"],
+        "carry":            metrics["carry"],
+        "ball_speed":       metrics["ball_speed"],
+        "club_speed":       metrics["club_speed"],
+        "launch_angle":     metrics["launch_angle"],
+        "smash_factor":     metrics["smash_factor"],
+
+        "face_angle":       metrics["face_angle"],
+        "club_path":        metrics["club_path"],
+        "lateral_offset":   metrics["lateral_offset"],
+        "direction_angle":  metrics["direction_angle"],
+        "side_spin":        metrics["side_spin"],
+        "back_spin":        metrics["back_spin"],
+
+        "feedback": None,
+        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    }
+
+    # 중복 샷 차단
+    if is_same_shot(payload):
+        log("⚠️ 중복 샷 감지 → 스킵")
+        return False
+
+    # ===== 샷 확정 시점 =====
+    # 중요: send_to_server() 앞에 둬야 함
+    # → 서버 실패해도 "샷은 찍혔다"는 UX 보장
+    
+    # 1️⃣ 샷 통계 업데이트
+    with shot_stats_lock:
+        shot_count += 1
+        global_last_shot_time = datetime.now().strftime("%H:%M:%S")
+    
+    # (A) 샷 확정 시 로그 (운영용 - 문제 진단 핵심)
+    # GUI/트레이와 별도로 로그에 명확한 흔적 남기기
+    # → 나중에 현장 문제 생기면 이 한 줄이 생명줄임
+    log(f"[SHOT CONFIRMED] count={shot_count}, time={global_last_shot_time}, store_id={current_store_id}, bay_number={current_bay_number}, user={active_user}")
+    log(f"📊 OCR 값: ball_speed={metrics.get('ball_speed')}, club_speed={metrics.get('club_speed')}, launch_angle={metrics.get('launch_angle')}")
+    log("📦 전송:", payload)
+    
+    # 2️⃣ GUI / Tray 즉시 반영
+    # root.after() 사용 → run()이 백그라운드 스레드여도 GUI 안전
+    update_gui_stats()  # 내부에서 root.after() 사용
+    update_tray_stats()
+    
+    # (B) 샷 감지 음성 알림 (FEEDBACK_MESSAGES 사용)
+    msg = FEEDBACK_MESSAGES.get("shot_detected")
+    if msg:
+        speak(msg)
+    
+    # (C) 트레이 notify (선택이지만 강력 추천)
+    # 샷이 실제로 들어올 때 한 번만이라도 팝업
+    update_tray_notify()
+    
+    # 3️⃣ 서버 전송 (기존 로직 유지)
+    with timings.time("upload"):
+        shot_saved = send_to_server(payload)
+    if shot_saved and shot.get("reappear_at"):
+        # 런 텍스트 재등장 → 서버 전송 완료 (결과 화면 안정 대기 + OCR + 사용자 조회 + 전송)
+        timings.record("shot_total", (time.time() - shot["reappear_at"]) * 1000.0)
+    if shot_saved:
+        log(f"✅ Shot saved: store_id={current_store_id}, bay_number={current_bay_number}, user={active_user}")
+    else:
+        log(f"⚠️ Shot SKIPPED: store_id={current_store_id}, bay_number={current_bay_number}, user={active_user} (서버 전송 실패 또는 거부)")
+    
+    # 샷 평가 및 음성 안내 (GPT 피드백 우선)
+    if DEFAULT_CLUB_ID.lower() == "driver":
+        feedback = None
+        
+        # GPT 피드백 사용
+        if USE_GPT_FEEDBACK and gpt_client:
+            feedback = get_gpt_feedback(metrics, DEFAULT_CLUB_ID)
+        
+        # GPT 실패 시 기존 방식 사용
+        if not feedback:
+            evaluations = evaluate_shot(metrics, DEFAULT_CLUB_ID)
+            feedback = generate_voice_feedback(evaluations)
+        
+        if feedback:
+            speak(feedback)
+    
+    log("💡 상태: WAITING (다음 샷 대기 중)")
+    return True
+
+def auto_logout(binding, reason):
+    """자동 세션 종료 (작업 프로세스가 기준 도달을 알리면 활성 사용자가 있을 때만 종료)"""
+    current_store_id, current_bay_number = binding_ids(binding)
+    if not current_store_id or not current_bay_number:
+        return
+    active_user = get_active_user(current_store_id, current_bay_number)
+    if not active_user:
+        return
+    if reason == "no_screen":
+        log(f"⏰ {SESSION_AUTO_LOGOUT_NO_SCREEN//60}분 동안 연습 화면이 감지되지 않음 → 자동 세션 종료 (bay_number={current_bay_number})")
+    else:
+        log(f"⏰ {SESSION_AUTO_LOGOUT_NO_SHOT//60}분 동안 샷이 없음 → 자동 세션 종료 (bay_number={current_bay_number})")
+    clear_active_session(current_store_id, current_bay_number)
+
+def run(regions=None, bindings=None):
+    """
+    샷 수집 실행 (GUI 프로세스 쪽: 캡처/OCR 작업 시작 후 샷 확정/업로드/자동 세션 종료 담당)
     
     Args:
         regions: 좌표 데이터 딕셔너리 (GUI에서 전달). None이면 기본 좌표 파일 사용
+        bindings: 타석 목록 (load_bay_bindings() 결과, 한 PC에서 여러 타석 수집). None이면 regions로 타석 1개
     """
     global run_entered
     
@@ -2344,15 +2294,19 @@ def run(regions=None):
     log("[RUN] run() entered (first and only)")
     # early_log("run() function called")  # 최종 정리: 중복 로그 제거
     
+    capture = None
     try:
-        global REGIONS
-        
-        # GUI 모드 확인 (GUI 스레드 환경 또는 PyInstaller 빌드)
-        IS_GUI_MODE = sys.stdin is None or getattr(sys, "frozen", False)
+        global REGIONS, capture_stats, worker_timings
         
         # regions 처리: GUI에서 전달받았으면 사용, 아니면 전역 REGIONS 사용
         # (onefile 환경에서도 이미 load_json()에서 fallback(test.json)까지 로드됨)
-        if regions is not None:
+        if bindings:
+            REGIONS = bindings[0]["regions"]
+            log(f"✅ 타석 {len(bindings)}개 좌표 사용")
+            for binding in bindings:
+                log(f"   🖥️ 디스플레이 {binding['display']} → bay_number={binding.get('bay_number') or '(PC 설정)'} "
+                    f"({binding.get('filename', '')})")
+        elif regions is not None:
             REGIONS = regions
             log(f"✅ GUI에서 전달받은 좌표 사용")
         else:
@@ -2408,34 +2362,23 @@ def run(regions=None):
         
         last_pc_update_time = time.time()
         PC_UPDATE_INTERVAL = 5 * 60  # 5분마다 마지막 접속 시간 업데이트
+        last_timings_dump = time.time()
         
-        # 상태: WAITING (대기, 런 텍스트 있음) → COLLECTING (샷 진행 중, 런 텍스트 없음) → WAITING
-        state = "WAITING"
-        stable_count = 0
-        last_fire = 0.0
-        text_disappear_time = None  # 텍스트가 사라진 시간 기록
-        
-        # 빠른 샷 확정을 위한 상태 변수
-        shot_in_progress = False  # 샷 진행 중 여부 (텍스트 사라짐 → True)
-        pending_read_at = None    # OCR 읽기 예약 시간 (텍스트 재등장 시 now + 1.2 설정)
-
-        prev_bs = None
-        prev_cs = None
-        prev_run_detected = None
+        if not bindings:
+            bindings = [{"regions": REGIONS, "display": 0}]
         
-        # 자동 세션 종료를 위한 시간 추적
-        last_shot_time = time.time()  # 마지막 샷 시간
-        last_screen_detected_time = time.time()  # 마지막으로 연습 화면이 감지된 시간
-
-        log("🟢 텍스트 존재 여부 기반 샷 감지 시작")
-        log("💡 상태: WAITING (텍스트 대기 중)")
         log(f"⏰ 자동 세션 종료: {SESSION_AUTO_LOGOUT_NO_SHOT//60}분 동안 샷 없음 또는 {SESSION_AUTO_LOGOUT_NO_SCREEN//60}분 동안 연습 화면 아님")
         if TRAY_AVAILABLE:
             log("💡 최소화하면 시스템 트레이로 이동합니다.")
+        if OCR_RECORD_ENABLED:
+            log(f"🎞️ OCR 녹화 모드: 샷마다 지표 영역 이미지를 {os.path.join(LOG_DIR, 'ocr_record')}에 저장 ({OCR_RECORD_KEEP_DAYS}일 보관)")
+
+        # 캡처/OCR 작업 시작 (PC 승인 전에는 감지 중지 상태로 시작)
+        capture = CaptureWorker(bindings, paused=not pc_approved)
+        capture.start()
 
         # =========================
-        # 기존 while True 루프
-        # OCR / 샷 감지 로직
+        # 이벤트 루프: 샷 확정/업로드, PC 승인, 자동 세션 종료
         # =========================
         while True:
             try:
@@ -2444,6 +2387,31 @@ def run(regions=None):
                     log("프로그램 종료 중...")
                     break
                 
+                if not capture.is_alive():
+                    log("⚠️ 캡처/OCR 작업이 종료됨 → 다시 시작")
+                    capture.stop()
+                    capture = CaptureWorker(bindings, paused=not pc_approved)
+                    capture.start()
+                
+                # 작업 프로세스 이벤트 (샷이 없으면 CAPTURE_EVENT_WAIT초 대기)
+                try:
+                    kind, data = capture.events.get(timeout=CAPTURE_EVENT_WAIT)
+                except queue.Empty:
+                    kind, data = None, None
+                
+                if kind == "log":
+                    log(data)
+                elif kind == "stats":
+                    capture_stats = data
+                elif kind == "timings":
+                    worker_timings = data
+                    update_gui_latency()
+                elif kind == "shot":
+                    handle_shot(data, capture.ring, bindings[data["bay"]])
+                elif kind == "logout":
+                    bay_index, reason = data
+                    auto_logout(bindings[bay_index], reason)
+                
                 # PC 승인 상태 주기적 확인 (1분마다)
                 now = time.time()
                 if now - last_pc_check_time >= PC_CHECK_INTERVAL:
@@ -2452,293 +2420,33 @@ def run(regions=None):
                         # 승인 상태로 변경됨
                         log(f"✅ PC 승인 확인: {message}")
                         pc_approved = True
+                        capture.set_paused(False)
                     elif not approved and pc_approved:
                         # 승인 상태가 해제됨
                         log(f"⚠️ PC 승인 상태 변경: {message}")
                         pc_approved = False
+                        capture.set_paused(True)
                     last_pc_check_time = now
                 
-                # PC 승인 전에는 샷 수집 비활성화
-                if not pc_approved:
-                    time.sleep(POLL_INTERVAL)
-                    continue
-                
-                # =========================
-                # WAITING 상태: 텍스트 존재 여부 모니터링 (있으면 대기, 없으면 샷 시작)
-                # =========================
-                if state == "WAITING":
-                    has_text = detect_text_presence()
-                    now = time.time()
-                    
-                    # 연습 화면 감지 여부 업데이트
-                    if has_text is not None:
-                        if has_text:
-                            # 연습 화면이 감지됨
-                            last_screen_detected_time = now
-                    
-                    # 자동 세션 종료 체크 1: 연습 화면이 아닌 경우 (5분)
-                    if has_text is not None and not has_text:
-                        time_since_screen = now - last_screen_detected_time
-                        if time_since_screen >= SESSION_AUTO_LOGOUT_NO_SCREEN:
-                            current_store_id = get_store_id()
-                            current_bay_number = get_bay_id()  # 함수명은 bay_id지만 bay_number 반환
-                            if current_store_id and current_bay_number:
-                                active_user = get_active_user(current_store_id, current_bay_number)
-                                if active_user:
-                                    log(f"⏰ {SESSION_AUTO_LOGOUT_NO_SCREEN//60}분 동안 연습 화면이 감지되지 않음 → 자동 세션 종료")
-                                    clear_active_session(current_store_id, current_bay_number)
-                                    last_screen_detected_time = now  # 재체크 방지
-                    
-                    # 자동 세션 종료 체크 2: 20분 동안 샷이 없는 경우
-                    time_since_last_shot = now - last_shot_time
-                    if time_since_last_shot >= SESSION_AUTO_LOGOUT_NO_SHOT:
-                        current_store_id = get_store_id()
-                        current_bay_number = get_bay_id()  # 함수명은 bay_id지만 bay_number 반환
-                        if current_store_id and current_bay_number:
-                            active_user = get_active_user(current_store_id, current_bay_number)
-                            if active_user:
-                                log(f"⏰ {SESSION_AUTO_LOGOUT_NO_SHOT//60}분 동안 샷이 없음 → 자동 세션 종료")
-                                clear_active_session(current_store_id, current_bay_number)
-                                last_shot_time = now  # 재체크 방지
-                    
-                    if has_text is None:
-                        # 텍스트 영역이 없으면 기존 방식으로 동작
-                        log("⚠️ 텍스트 영역이 설정되지 않았습니다. 기존 방식으로 전환합니다.")
-                        state = "COLLECTING"
-                        prev_bs = None
-                        prev_cs = None
-                        continue
-                    
-                    if prev_run_detected is None:
-                        prev_run_detected = has_text
-                        time.sleep(WAITING_POLL_INTERVAL)
-                        continue
-
-                    # 텍스트가 사라지면 (샷 시작) - 시간 기록
-                    # prev_run_detected가 True이고 현재 has_text가 False일 때만 샷 시작으로 판단
-                    if prev_run_detected is True and has_text is False:
-                        log("🎯 텍스트 사라짐 → 샷 시작 감지")
-                        log("💡 상태: COLLECTING (샷 진행 중)")
-                        state = "COLLECTING"
-                        shot_in_progress = True  # 샷 진행 중 플래그 설정
-                        text_disappear_time = time.time()  # 텍스트가 사라진 시간 기록
-                        pending_read_at = None  # 이전 예약 시간 초기화
-                        prev_run_detected = False  # COLLECTING 상태에서는 텍스트가 없는 상태
-                        prev_bs = None
-                        prev_cs = None
-                        stable_count = 0
-                    else:
-                        # 상태 업데이트 (None이 아닐 때만)
-                        if prev_run_detected is not None:
-                            prev_run_detected = has_text
-                        time.sleep(WAITING_POLL_INTERVAL)
-
-                # =========================
-                # COLLECTING 상태: 텍스트 재감지 대기 (데이터 수집 안함)
-                # =========================
-                elif state == "COLLECTING":
-                    # 텍스트 상태만 확인 (데이터는 수집하지 않음)
-                    has_text = detect_text_presence()
-                    now = time.time()
-                    
-                    # 텍스트가 다시 나타났는지 확인 (샷 종료 이벤트)
-                    # prev_run_detected가 False이고 현재 has_text가 True일 때만 샷 종료로 판단
-                    if prev_run_detected is False and has_text is True:
-                        # Run Text 재등장 → 즉시 OCR 읽기 예약
-                        log("✅ 텍스트 재등장 → 샷 종료 감지")
-                        pending_read_at = now + 1.0  # 1.0초 후 OCR 읽기 예약
-                        shot_in_progress = False  # 샷 진행 종료
-                        state = "WAITING"  # WAITING 상태로 전환하여 pending_read_at 체크
-                        prev_run_detected = has_text
-                        log(f"⏳ 1.0초 후 OCR 읽기 예약됨 (pending_read_at={pending_read_at:.2f})")
-                        time.sleep(POLL_INTERVAL)
-                        continue
-                    else:
-                        # 상태 업데이트
-                        if prev_run_detected is not None:
-                            prev_run_detected = has_text
-                        time.sleep(POLL_INTERVAL)
-                        continue
-                
-                # =========================
-                # WAITING 상태: pending_read_at 체크 및 샷 확정
-                # =========================
-                if state == "WAITING" and pending_read_at is not None:
-                    now = time.time()
-                    if now >= pending_read_at:
-                        # 예약 시간 도달 → OCR 읽기 및 샷 확정
-                        log("📊 OCR 읽기 시작 (예약 시간 도달)")
-                        pending_read_at = None  # 예약 시간 초기화
-                        
-                        # OCR 읽기 (예약 시간 도달 후 단 1회) - 활성 사용자 조회보다 먼저
-                        metrics = read_metrics()
-                        
-                        # 현재 활성 사용자 조회 (OCR 읽기 후 즉시)
-                        # 동적으로 store_id와 bay_number 가져오기
-                        current_store_id = get_store_id()
-                        current_bay_number = get_bay_id()  # 함수명은 bay_id지만 bay_number 반환
-                        
-                        # store_id 또는 bay_number가 없으면 샷 저장 차단 (PC STATUS API 확인 필요)
-                        if not current_store_id or not current_bay_number:
-                            log(f"⚠️ 샷 저장 차단: store_id={current_store_id}, bay_number={current_bay_number} (PC STATUS API 확인 필요)")
-                            state = "WAITING"
-                            prev_run_detected = has_text
-                            text_disappear_time = None
-                            prev_bs = None
-                            prev_cs = None
-                            time.sleep(POLL_INTERVAL)
-                            continue
-                        
-                        # 활성 사용자 조회 (bays 테이블에서 user_id 확인)
-                        active_user = get_active_user(current_store_id, current_bay_number)
-                        
-                        # user_id가 없으면 GUEST로 저장 (샷 저장 중단 안함)
-                        if not active_user:
-                            active_user = "GUEST"
-                            log(f"👤 활성 사용자가 없어 게스트로 샷을 저장합니다. (store_id={current_store_id}, bay_number={current_bay_number})")
-                        
-                        # 의미 없는 샷 스킵 (None 방어)
-                        ball_speed = safe_number(metrics.get("ball_speed") if metrics else None)
-                        if ball_speed is None or ball_speed < 5:
-                            log(f"⚠️ 의미 없는 샷 스킵: ball_speed={ball_speed} (ball_speed < 5 또는 None)")
-                            if metrics:
-                                log(f"📊 전체 OCR 값: {metrics}")
-                            state = "WAITING"
-                            prev_run_detected = has_text
-                            text_disappear_time = None
-                            prev_bs = None
-                            prev_cs = None
-                            time.sleep(POLL_INTERVAL)
-                            continue
-                        
-
-                        # PC 고유번호 추출
-                        try:
-                            pc_info = get_pc_info()
-                            pc_unique_id = pc_info.get("unique_id")
-                        except Exception as e:
-                            log(f"⚠️ PC 고유번호 추출 실패: {e}")
-                            pc_unique_id = None
-                        
-                        payload = {
-                            "store_id": current_store_id,
-                            "bay_id": current_bay_number,  # bay_number 사용
-                            "user_id": active_user,
-                            "club_id": DEFAULT_CLUB_ID,
-                            "pc_unique_id": pc_unique_id,  # 추가
-
-                            "total_distance":   metrics["total_distance"],
-                            "carry":            metrics["carry"],
-                            "ball_speed":       metrics["ball_speed"],
-                            "club_speed":       metrics["club_speed"],
-                            "launch_angle":     metrics["launch_angle"],
-                            "smash_factor":     metrics["smash_factor"],
-
-                            "face_angle":       metrics["face_angle"],
-                            "club_path":        metrics["club_path"],
-                            "lateral_offset":   metrics["lateral_offset"],
-                            "direction_angle":  metrics["direction_angle"],
-                            "side_spin":        metrics["side_spin"],
-                            "back_spin":        metrics["back_spin"],
-
-                            "feedback": None,
-                            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                        }
-
-                        # 중복 샷 차단
-                        if is_same_shot(payload):
-                            log("⚠️ 중복 샷 감지 → 스킵")
-                            state = "WAITING"
-                            prev_run_detected = has_text
-                            text_disappear_time = None
-                            prev_bs = None
-                            prev_cs = None
-                            time.sleep(POLL_INTERVAL)
-                            continue
-
-                        # ===== 샷 확정 시점 =====
-                        # 중요: send_to_server() 앞에 둬야 함
-                        # → 서버 실패해도 "샷은 찍혔다"는 UX 보장
-                        
-                        # 1️⃣ 샷 통계 업데이트
-                        global shot_count, global_last_shot_time
-                        with shot_stats_lock:
-                            shot_count += 1
-                            global_last_shot_time = datetime.now().strftime("%H:%M:%S")
-                        
-                        # (A) 샷 확정 시 로그 (운영용 - 문제 진단 핵심)
-                        # GUI/트레이와 별도로 로그에 명확한 흔적 남기기
-                        # → 나중에 현장 문제 생기면 이 한 줄이 생명줄임
-                        log(f"[SHOT CONFIRMED] count={shot_count}, time={global_last_shot_time}, store_id={current_store_id}, bay_number={current_bay_number}, user={active_user}")
-                        log(f"📊 OCR 값: ball_speed={metrics.get('ball_speed')}, club_speed={metrics.get('club_speed')}, launch_angle={metrics.get('launch_angle')}")
-                        log("📦 전송:", payload)
-                        
-                        # 2️⃣ GUI / Tray 즉시 반영
-                        # root.after() 사용 → run()이 백그라운드 스레드여도 GUI 안전
-                        update_gui_stats()  # 내부에서 root.after() 사용
-                        update_tray_stats()
-                        
-                        # (B) 샷 감지 음성 알림 (FEEDBACK_MESSAGES 사용)
-                        msg = FEEDBACK_MESSAGES.get("shot_detected")
-                        if msg:
-                            speak(msg)
-                        
-                        # (C) 트레이 notify (선택이지만 강력 추천)
-                        # 샷이 실제로 들어올 때 한 번만이라도 팝업
-                        update_tray_notify()
-                        
-                        # 3️⃣ 서버 전송 (기존 로직 유지)
-                        shot_saved = send_to_server(payload)
-                        if shot_saved:
-                            log(f"✅ Shot saved: store_id={current_store_id}, bay_number={current_bay_number}, user={active_user}")
-                        else:
-                            log(f"⚠️ Shot SKIPPED: store_id={current_store_id}, bay_number={current_bay_number}, user={active_user} (서버 전송 실패 또는 거부)")
-                        
-                        # 마지막 샷 시간 업데이트 (기존 변수)
-                        last_screen_detected_time = time.time()
-                        
-                        # 샷 평가 및 음성 안내 (GPT 피드백 우선)
-                        if DEFAULT_CLUB_ID.lower() == "driver":
-                            feedback = None
-                            
-                            # GPT 피드백 사용
-                            if USE_GPT_FEEDBACK and gpt_client:
-                                feedback = get_gpt_feedback(metrics, DEFAULT_CLUB_ID)
-                            
-                            # GPT 실패 시 기존 방식 사용
-                            if not feedback:
-                                evaluations = evaluate_shot(metrics, DEFAULT_CLUB_ID)
-                                feedback = generate_voice_feedback(evaluations)
-                            
-                            if feedback:
-                                speak(feedback)
-                        
-                        last_fire = now
-                        log("💡 상태: WAITING (다음 샷 대기 중)")
-                        state = "WAITING"
-                        stable_count = 0
-                        text_disappear_time = None
-                        prev_run_detected = has_text
-                        prev_bs = None
-                        prev_cs = None
-                        time.sleep(POLL_INTERVAL)
-                        continue
-                
-                # PC 마지막 접속 시간 주기적 업데이트
-                if PC_REGISTRATION_ENABLED and (time.time() - last_pc_update_time) >= PC_UPDATE_INTERVAL:
+                # PC 마지막 접속 시간 주기적 업데이트 (승인된 PC만)
+                if pc_approved and PC_REGISTRATION_ENABLED and (time.time() - last_pc_update_time) >= PC_UPDATE_INTERVAL:
                     update_pc_last_seen()
                     last_pc_update_time = time.time()
                 
-                # 텍스트 재감지 대기 중
-                time.sleep(POLL_INTERVAL)
+                # 단계별 소요 시간 파일 저장 (logs/stage_timings.json)
+                if now - last_timings_dump >= STAGE_TIMINGS_DUMP_INTERVAL:
+                    dump_stage_timings()
+                    last_timings_dump = now
             except Exception as e:
-                # OCR 오류 등은 루프 내부에서 처리 (run()은 계속 살아있음)
+                # 서버 오류 등은 루프 내부에서 처리 (run()은 계속 살아있음)
                 log(f"[RUN] loop error: {e}")
                 time.sleep(0.5)
                 continue
     except Exception as e:
         log(f"[RUN] fatal error: {e}")
     finally:
+        if capture is not None:
+            capture.stop()
         log("[RUN] run() terminated")
 
 # =========================
@@ -2747,6 +2455,9 @@ def run(regions=None):
 gui_app = None  # GUI 인스턴스 (shot_collector_gui.py에서 설정)
 root = None     # Tk 루트 (shot_collector_gui.py에서 설정)
 shot_stats_lock = threading.Lock()  # 통계 업데이트용 락
+poller = None  # 샷 감지 루프의 AdaptivePoller (capture_loop()에서 생성)
+capture_stats = None  # 캡처/OCR 작업이 보낸 폴링 통계 문자열 (상태 보기용)
+worker_timings = None  # 캡처/OCR 작업이 보낸 단계별 소요 시간 스냅샷 (stage_snapshot()에서 합침)
 tray_thread = None
 main_thread = None
 should_exit = False
@@ -2812,6 +2523,39 @@ def update_gui_stats():
                 early_log(f"GUI 통계 업데이트 실패: {e}")
         root.after(0, _update)
 
+def stage_snapshot():
+    """단계별 소요 시간: 작업 프로세스(캡처/OCR/파싱) + 이 프로세스(사용자 조회/전송/샷 전체)"""
+    snapshot = dict(worker_timings or {})
+    snapshot.update(timings.snapshot())  # 스레드 모드면 같은 timings라 그대로 덮어씀
+    return snapshot
+
+def dump_stage_timings():
+    """단계별 소요 시간을 logs/stage_timings.json에 저장 (기록이 없으면 생략)"""
+    snapshot = stage_snapshot()
+    if not snapshot:
+        return
+    path = os.path.join(LOG_DIR, "stage_timings.json")
+    try:
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"updated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "stages": snapshot},
+                      f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        log(f"⚠️ 단계별 소요 시간 저장 실패: {e}")
+
+def update_gui_latency():
+    """GUI 지연 표시 업데이트 (단계별 p95)"""
+    if gui_app and root:
+        text = format_stages(stage_snapshot(), LATENCY_DISPLAY_STAGES)
+        def _update():
+            try:
+                if gui_app and hasattr(gui_app, 'latency_label'):
+                    gui_app.latency_label.config(text=f"지연 p95: {text or '-'}")
+            except Exception as e:
+                early_log(f"GUI 지연 표시 업데이트 실패: {e}")
+        root.after(0, _update)
+
 def update_tray_stats():
     """트레이 툴팁 업데이트"""
     global tray_icon, shot_count
@@ -2884,6 +2628,14 @@ def show_status(icon, item):
         kernel32.AllocConsole()
         print("\n골프 샷 트래커가 실행 중입니다.")
         print("최소화하면 다시 트레이로 이동합니다.")
+        if capture_stats:
+            print(f"폴링: {capture_stats}")
+        snapshot = stage_snapshot()
+        if snapshot:
+            print("단계별 소요 시간 (ms):")
+            for stage, stats in snapshot.items():
+                print(f"    {stage:<26} p50 {stats['p50']:>8.1f}  p95 {stats['p95']:>8.1f}  "
+                      f"p99 {stats['p99']:>8.1f}  ({stats['count']}회)")
     except:
         pass
 
@@ -3070,6 +2822,8 @@ def main():
     root.mainloop()
 
 if __name__ == "__main__":
+    # PyInstaller 빌드에서 캡처/OCR 작업 프로세스(spawn) 지원
+    multiprocessing.freeze_support()
     try:
         main()
     except Exception as e:
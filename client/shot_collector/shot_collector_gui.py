@@ -202,6 +202,12 @@ class ShotCollectorGUI:
         # API URL
         self.api_base_url = get_api_base_url()
         
+        # 좌표 파일 로컬 캐시 (디스크에서 즉시 시작, 서버 재검증은 백그라운드)
+        from client.core.coordinate_cache import CoordinateCache
+        from client.shot_collector.main import get_base_path, log
+        self.coordinate_cache = CoordinateCache(
+            self.api_base_url, os.path.join(get_base_path(), "regions", "cache"), log=log)
+        
         # 선택된 값
         self.selected_brand = None
         self.selected_filename = None
@@ -292,6 +298,16 @@ class ShotCollectorGUI:
         )
         self.last_shot_time_label.pack(side=tk.LEFT, padx=10, pady=5)
         
+        # 단계별 지연 (p95, 캡처/OCR 작업 통계가 올 때마다 갱신)
+        self.latency_label = tk.Label(
+            stats_frame,
+            text="지연 p95: -",
+            font=("맑은 고딕", 9),
+            bg="#f0f0f0",
+            fg="#666666"
+        )
+        self.latency_label.pack(side=tk.LEFT, padx=10, pady=5)
+        
         # 브랜드 선택
         brand_frame = tk.Frame(self.root, pady=10)
         brand_frame.pack(fill=tk.X, padx=20)
@@ -443,34 +459,18 @@ class ShotCollectorGUI:
         threading.Thread(target=self.load_coordinate_files, args=(brand_code,), daemon=True).start()
     
     def load_coordinate_files(self, brand_code):
-        """서버에서 좌표 파일 목록 가져오기"""
+        """좌표 파일 목록 가져오기 (캐시된 목록 즉시 표시, 서버 목록이 바뀌면 갱신)"""
+        def on_update(files):
+            if self.selected_brand == brand_code and not self.is_running:
+                self.coordinate_files = files
+                self.root.after(0, self.update_file_listbox, files)
+        
         try:
-            url = f"{self.api_base_url}/api/coordinates/{brand_code}"
-            response = requests.get(url, timeout=10)
+            files = self.coordinate_cache.list_files(brand_code, on_update=on_update)
+            self.coordinate_files = files
             
-            if response.status_code == 200:
-                data = response.json()
-                
-                if data.get("success"):
-                    files = data.get("files", [])
-                    self.coordinate_files = files
-                    
-                    # UI 업데이트 (메인 스레드)
-                    self.root.after(0, self.update_file_listbox, files)
-                    return
-                else:
-                    error_msg = data.get("error", "알 수 없는 오류")
-                    self.root.after(0, lambda: self.status_label.config(
-                        text=f"오류: {error_msg}",
-                        fg="red"
-                    ))
-                    return
-            else:
-                error_text = response.text[:100] if response.text else "알 수 없는 오류"
-                self.root.after(0, lambda: self.status_label.config(
-                    text=f"서버 오류 ({response.status_code}): {error_text}",
-                    fg="red"
-                ))
+            # UI 업데이트 (메인 스레드)
+            self.root.after(0, self.update_file_listbox, files)
         except Exception as e:
             self.root.after(0, lambda: self.status_label.config(
                 text=f"연결 오류: {str(e)}",
@@ -520,27 +520,25 @@ class ShotCollectorGUI:
     def start_collection(self):
         """샷 수집 시작 - 백업본과 동일한 로직"""
         try:
-            # 좌표 파일 다운로드
-            url = f"{self.api_base_url}/api/coordinates/{self.selected_brand}/{self.selected_filename}"
-            response = requests.get(url, timeout=10)
+            # 좌표 파일 (로컬 캐시 우선 - 서버 응답을 기다리지 않고 시작)
+            brand, filename = self.selected_brand, self.selected_filename
             
-            if response.status_code != 200:
-                data = response.json()
-                error = data.get("error", "다운로드 실패")
-                if root and root.winfo_viewable():
-                    self.root.after(0, lambda: messagebox.showerror("오류", f"좌표 파일 다운로드 실패: {error}"))
-                self.root.after(0, lambda: self.status_label.config(text="다운로드 실패", fg="red"))
-                return
+            def on_update(payload):
+                from client.shot_collector.main import log
+                log(f"[INFO] 서버 좌표 파일 변경 감지 ({filename} v{payload.get('version')}) - 다음 시작부터 적용")
             
-            data = response.json()
-            if not data.get("success"):
-                error = data.get("error", "다운로드 실패")
+            try:
+                coordinate_data = self.coordinate_cache.get_file(brand, filename, on_update=on_update)
+                # 한 PC 여러 타석 (config.json "bays") - 없으면 선택한 좌표 파일로 타석 1개
+                from client.shot_collector.main import load_bay_bindings
+                bindings = load_bay_bindings(load_config(), self.coordinate_cache, default_brand=brand)
+            except Exception as e:
+                error = str(e)
                 if root and root.winfo_viewable():
                     self.root.after(0, lambda: messagebox.showerror("오류", f"좌표 파일 다운로드 실패: {error}"))
                 self.root.after(0, lambda: self.status_label.config(text="다운로드 실패", fg="red"))
                 return
             
-            coordinate_data = data.get("data")
             regions = coordinate_data.get("regions", {})
             
             # 좌표를 메모리에 저장
@@ -572,7 +570,7 @@ class ShotCollectorGUI:
             self.is_running = True
             self.main_thread = threading.Thread(
                 target=main.run,
-                args=(regions,),
+                args=(regions, bindings),
                 daemon=False
             )
             self.main_thread.start()
@@ -722,24 +720,9 @@ class ShotCollectorGUI:
                     messagebox.showwarning("경고", "브랜드와 좌표 파일을 선택하세요.")
                 return
             
-            # 선택한 좌표 파일 다운로드
+            # 선택한 좌표 파일 (로컬 캐시 우선)
             try:
-                url = f"{self.api_base_url}/api/coordinates/{self.selected_brand}/{self.selected_filename}"
-                response = requests.get(url, timeout=10)
-                
-                if response.status_code != 200:
-                    if root and root.winfo_viewable():
-                        messagebox.showerror("오류", f"좌표 파일 다운로드 실패: {response.status_code}")
-                    return
-                
-                data = response.json()
-                if not data.get("success"):
-                    error = data.get("error", "다운로드 실패")
-                    if root and root.winfo_viewable():
-                        messagebox.showerror("오류", f"좌표 파일 다운로드 실패: {error}")
-                    return
-                
-                coordinate_data = data.get("data", {})
+                coordinate_data = self.coordinate_cache.get_file(self.selected_brand, self.selected_filename)
                 regions = coordinate_data.get("regions", {})
                 resolution = coordinate_data.get("resolution", "")
                 
@@ -910,4 +893,7 @@ def main():
     root.mainloop()
 
 if __name__ == "__main__":
+    # PyInstaller 빌드에서 캡처/OCR 작업 프로세스(spawn) 지원
+    import multiprocessing
+    multiprocessing.freeze_support()
     main()
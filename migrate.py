@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+DB 스키마 마이그레이션 CLI (shared/migrations/*.sql)
+
+서비스도 기동 시 같은 러너(shared.migrate)를 실행하지만,
+배포 전에 미리 적용하거나 적용 현황을 확인할 때 사용한다.
+(기존 run_migration*.py / run_migration*.bat / database_migration_final.sql 대체)
+
+사용법:
+    python migrate.py [DATABASE_URL]            # 미적용 버전 적용
+    python migrate.py [DATABASE_URL] --status   # 버전별 적용 현황만 출력
+"""
+import argparse
+import os
+import sys
+
+import psycopg2
+
+from shared.migrate import MigrationError, load_migrations, migrate, migration_status
+
+if sys.stdout.encoding != 'utf-8':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+
+def print_status(conn):
+    print(f"{'version':>8}  {'name':<32} applied_at")
+    for version, name, applied_at, checksum_ok in migration_status(conn):
+        mark = applied_at or "(미적용)"
+        if not checksum_ok:
+            mark += "  ⚠️ 적용 후 파일 변경됨"
+        print(f"{version:>8}  {name:<32} {mark}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DB 스키마 마이그레이션")
+    parser.add_argument("database_url", nargs="?", default=os.environ.get("DATABASE_URL"),
+                        help="PostgreSQL 연결 URL (기본: DATABASE_URL 환경 변수)")
+    parser.add_argument("--status", action="store_true", help="적용 현황만 출력")
+    args = parser.parse_args()
+
+    if not args.database_url:
+        print("❌ DATABASE_URL이 필요합니다. (인자 또는 환경 변수)")
+        sys.exit(1)
+
+    conn = psycopg2.connect(args.database_url, connect_timeout=30)
+    try:
+        print("=" * 80)
+        print("DB 스키마 마이그레이션")
+        print("=" * 80)
+        if not args.status:
+            applied = migrate(conn, load_migrations())
+            if not applied:
+                print("✅ 적용할 마이그레이션 없음 (스키마 최신)")
+        print_status(conn)
+        print("=" * 80)
+    except MigrationError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+OCR 녹화 재생 CLI (client/core/ocr_archive.py, client/core/metrics_ocr.py)
+
+수집 프로그램을 OCR_RECORD=true로 실행하면 샷마다 지표 영역 이미지와 OCR 결과가
+logs/ocr_record/YYYYMMDD.zip에 쌓인다. 이 아카이브를 현재 OCR 코드로 다시 읽어
+영역별 처리 시간(p50/p95/p99), tesseract 호출 수, 녹화 당시 값과의 일치율을 비교한다.
+ocr_text_region()/parse_value()를 바꿀 때마다 돌리는 회귀 벤치마크 (리눅스에서도 실행 가능, tesseract 필요).
+
+    python replay_ocr.py ocr_record/                       # 디렉터리의 모든 zip
+    python replay_ocr.py ocr_record/20261019.zip --keys back_spin,side_spin
+    python replay_ocr.py ocr_record/ --parse-only          # OCR 없이 녹화된 원문으로 parse_value만 재실행
+    python replay_ocr.py ocr_record/ --show-diff 20 --json
+"""
+import argparse
+import json
+import sys
+import time
+
+import pytesseract
+
+from client.core import metrics_ocr
+from client.core.metrics_ocr import METRIC_FIELDS, ocr_image, parse_value
+from client.core.ocr_archive import iter_shots
+from client.core.stage_timer import percentile
+
+if sys.stdout.encoding != 'utf-8':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+PARSE_ARGS = {key: (mode, parse_key) for key, mode, parse_key in METRIC_FIELDS}
+
+
+class TesseractCounter:
+    """pytesseract.image_to_string 호출 수 집계 (metrics_ocr가 모듈 속성으로 호출하므로 교체로 집계)"""
+
+    def __init__(self):
+        self.calls = 0
+        self._original = None
+
+    def __enter__(self):
+        self._original = pytesseract.image_to_string
+
+        def counted(*args, **kwargs):
+            self.calls += 1
+            return self._original(*args, **kwargs)
+
+        pytesseract.image_to_string = counted
+        return self
+
+    def __exit__(self, *exc):
+        pytesseract.image_to_string = self._original
+
+
+def _same_value(a, b):
+    if a is None or b is None:
+        return a is b
+    return abs(float(a) - float(b)) < 1e-6
+
+
+class KeyStats:
+    def __init__(self, key):
+        self.key = key
+        self.samples = 0
+        self.latencies = []     # ms
+        self.calls = 0
+        self.text_same = 0
+        self.value_same = 0
+        self.diffs = []         # (shot_id, 녹화 원문, 재생 원문, 녹화 값, 재생 값)
+
+    def as_dict(self):
+        n = max(1, self.samples)
+        return {
+            "key": self.key,
+            "samples": self.samples,
+            "p50_ms": _round(percentile(self.latencies, 50)),
+            "p95_ms": _round(percentile(self.latencies, 95)),
+            "p99_ms": _round(percentile(self.latencies, 99)),
+            "tesseract_calls": self.calls,
+            "calls_per_read": round(self.calls / n, 2),
+            "text_agree": round(self.text_same / n, 4),
+            "value_agree": round(self.value_same / n, 4),
+        }
+
+
+def _round(value):
+    return None if value is None else round(value, 1)
+
+
+def replay(paths, keys=None, parse_only=False, limit=None):
+    """아카이브 재생 → (지표별 KeyStats, 샷별 전체 OCR 시간 목록 ms, 샷 수)"""
+    stats = {}
+    shot_latencies = []
+    shots = 0
+    with TesseractCounter() as counter:
+        for shot in iter_shots(paths):
+            if limit and shots >= limit:
+                break
+            shots += 1
+            total = 0.0
+            for key in shot.keys:
+                if (keys and key not in keys) or key not in PARSE_ARGS:
+                    continue
+                recorded_text = shot.texts.get(key)
+                if parse_only:
+                    text = recorded_text
+                else:
+                    img = shot.crop(key)
+                    if img is None:
+                        continue
+                    calls = counter.calls
+                    started = time.perf_counter()
+                    text = ocr_image(key, img, shot.scales.get(key))
+                    elapsed = (time.perf_counter() - started) * 1000
+                    total += elapsed
+                mode, parse_key = PARSE_ARGS[key]
+                value = parse_value(text, mode=mode, key=parse_key)
+                recorded_value = shot.metrics.get(key)
+
+                s = stats.setdefault(key, KeyStats(key))
+                s.samples += 1
+                if not parse_only:
+                    s.latencies.append(elapsed)
+                    s.calls += counter.calls - calls
+                s.text_same += text == recorded_text
+                same_value = _same_value(value, recorded_value)
+                s.value_same += same_value
+                if not same_value or text != recorded_text:
+                    s.diffs.append((shot.shot_id, recorded_text, text, recorded_value, value))
+            if not parse_only:
+                shot_latencies.append(total)
+    return stats, shot_latencies, shots
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OCR 녹화 재생 (처리 시간 / tesseract 호출 수 / 일치율)")
+    parser.add_argument("paths", nargs="+", help="녹화 zip 파일 또는 디렉터리")
+    parser.add_argument("--keys", help="재생할 지표 (쉼표 구분, 기본: 전체)")
+    parser.add_argument("--limit", type=int, help="최대 샷 수")
+    parser.add_argument("--parse-only", action="store_true", help="OCR 없이 녹화된 원문으로 parse_value만 재실행")
+    parser.add_argument("--show-diff", type=int, default=0, metavar="N", help="지표별 불일치 예시 N개 출력")
+    parser.add_argument("--tesseract-cmd", help="tesseract 실행 파일 경로")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args()
+
+    if args.tesseract_cmd:
+        pytesseract.pytesseract.tesseract_cmd = args.tesseract_cmd
+    keys = set(k.strip() for k in args.keys.split(",")) if args.keys else None
+
+    started = time.perf_counter()
+    stats, shot_latencies, shots = replay(args.paths, keys=keys, parse_only=args.parse_only, limit=args.limit)
+    wall = time.perf_counter() - started
+    order = [key for key, _, _ in METRIC_FIELDS if key in stats]
+
+    if args.json:
+        print(json.dumps({
+            "shots": shots,
+            "wall_sec": round(wall, 2),
+            "ocr_timeout_sec": metrics_ocr.OCR_TIMEOUT_SEC,
+            "shot_p50_ms": _round(percentile(shot_latencies, 50)),
+            "shot_p95_ms": _round(percentile(shot_latencies, 95)),
+            "shot_p99_ms": _round(percentile(shot_latencies, 99)),
+            "keys": [stats[key].as_dict() for key in order],
+            "diffs": {key: stats[key].diffs[:args.show_diff] for key in order} if args.show_diff else {},
+        }, ensure_ascii=False, indent=2))
+        return
+
+    if not shots:
+        print("녹화된 샷이 없습니다.")
+        return
+    print(f"샷 {shots}개 재생 ({wall:.1f}초, {'파싱만' if args.parse_only else 'OCR + 파싱'})")
+    columns = ("samples", "p50_ms", "p95_ms", "p99_ms", "tesseract_calls", "calls_per_read",
+               "text_agree", "value_agree")
+    widths = [max(8, len(c)) + 2 for c in columns]
+    header = f"{'지표':<18}" + "".join(f"{c:>{w}}" for c, w in zip(columns, widths))
+    print(header)
+    print("-" * len(header))
+    for key in order:
+        row = stats[key].as_dict()
+        print(f"{key:<18}" + "".join(f"{str(row[c]):>{w}}" for c, w in zip(columns, widths)))
+    if shot_latencies:
+        print(f"샷당 OCR 시간: p50={_round(percentile(shot_latencies, 50))}ms, "
+              f"p95={_round(percentile(shot_latencies, 95))}ms, p99={_round(percentile(shot_latencies, 99))}ms")
+
+    if args.show_diff:
+        for key in order:
+            for shot_id, rec_text, text, rec_value, value in stats[key].diffs[:args.show_diff]:
+                print(f"[{key}] {shot_id}: {rec_text!r} → {text!r}, 값 {rec_value} → {value}")
+
+
+if __name__ == "__main__":
+    main()
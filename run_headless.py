@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+화면 없이 감지/OCR 파이프라인 실행 CLI (client/core/bay_capture.py + client/core/capture_backends.py)
+
+수집 프로그램과 같은 BayCapture(런 텍스트 감지 → 결과 화면 안정 대기 → OCR)를
+파일/합성 화면 캡처 백엔드로 실행한다. 리눅스 CI에서 파이프라인 동작 확인과 프로파일링용
+(GUI/트레이/서버 전송 없음, tesseract 필요).
+
+    python run_headless.py SGGOLF_1920x1080_v1.json --duration 60                       # 합성 화면 (기본)
+    python run_headless.py SGGOLF_1920x1080_v1.json --option shot_every=5 --option seed=3
+    python run_headless.py regions/test.json --backend files --option path=frames/ --option fps=20
+    python run_headless.py SGGOLF_1920x1080_v1.json --duration 120 --profile headless.prof
+
+합성 화면이면 감지된 샷의 OCR 값을 화면에 그린 정답 값과 비교한다.
+단계별 소요 시간(캡처/전처리/tesseract/파싱, client/core/stage_timer.py)도 함께 출력한다.
+"""
+import argparse
+import cProfile
+import json
+import pstats
+import queue
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from client.core.adaptive_poll import AdaptivePoller
+from client.core.bay_capture import METRIC_KEYS, BayCapture
+from client.core.capture_backends import create_backend
+from client.core.stage_timer import timings
+from client.core.synthetic_screens import load_coordinate_file
+
+if sys.stdout.encoding != 'utf-8':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+POLL_INTERVAL = 0.05        # main.py POLL_INTERVAL
+IDLE_POLL_INTERVAL = 1.0    # main.py IDLE_POLL_INTERVAL
+IDLE_AFTER_SEC = 30.0       # main.py IDLE_AFTER_SEC
+
+
+def _parse_options(items):
+    options = {}
+    for item in items or []:
+        key, _, value = item.partition("=")
+        if not value:
+            raise SystemExit(f"--option 형식: 이름=값 ({item})")
+        try:
+            options[key.strip()] = json.loads(value)
+        except ValueError:
+            options[key.strip()] = value.strip()
+    return options
+
+
+def _log(message):
+    print(f"[{time.strftime('%H:%M:%S')}] {message}")
+
+
+def _same_value(a, b):
+    if a is None or b is None:
+        return a is b
+    return abs(float(a) - float(b)) < 1e-6
+
+
+def run(bay, backend, duration, quiet=False):
+    """duration초 동안 감지 루프 실행 → 통계 dict"""
+    events = queue.Queue()
+    ocr_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ocr")
+    poller = AdaptivePoller(fast=POLL_INTERVAL, idle=IDLE_POLL_INTERVAL, idle_after=IDLE_AFTER_SEC)
+    expected = getattr(backend, "expected", None)
+    shots, matches, all_exact, logouts, latencies = 0, {}, 0, [], []
+    started = time.time()
+    try:
+        while time.time() - started < duration:
+            if bay.tick(events, ocr_pool, None):
+                poller.activity()
+            while True:
+                try:
+                    kind, data = events.get_nowait()
+                except queue.Empty:
+                    break
+                if kind == "logout":
+                    logouts.append(data[1])
+                    continue
+                shots += 1
+                metrics = data["metrics"]
+                if data.get("reappear_at"):
+                    latencies.append(data["read_at"] - data["reappear_at"])
+                if not quiet:
+                    _log(f"🎯 샷 {shots}: ball_speed={metrics.get('ball_speed')}, club_speed={metrics.get('club_speed')}, "
+                         f"carry={metrics.get('carry')}")
+                if expected is not None:
+                    truth = expected()
+                    exact = True
+                    for key, value in truth.items():
+                        same = _same_value(metrics.get(key), value)
+                        matches[key] = matches.get(key, 0) + same
+                        exact = exact and same
+                    all_exact += exact
+            poller.sleep()
+    finally:
+        ocr_pool.shutdown(wait=True)
+
+    report = {
+        "duration_sec": round(time.time() - started, 1),
+        "backend": backend.describe(),
+        "shots": shots,
+        "logouts": logouts,
+        "reappear_to_read_avg": round(sum(latencies) / len(latencies), 3) if latencies else None,
+        "poll": poller.format_stats(),
+        "run_text_skip_ratio": round(bay.text_detector.skip_ratio(), 3),
+        "ready_fired": bay.readiness.fired,
+        "ready_timeouts": bay.readiness.timeouts,
+        "stages": timings.snapshot(),
+    }
+    if expected is not None:
+        report["shots_shown"] = getattr(backend, "shots_shown", None)
+        report["all_exact"] = round(all_exact / shots, 4) if shots else None
+        report["exact"] = {key: round(matches.get(key, 0) / shots, 4) for key in METRIC_KEYS if key in matches} if shots else {}
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="화면 없이 감지/OCR 파이프라인 실행")
+    parser.add_argument("coordinates", help="좌표 파일 (예: SGGOLF_1920x1080_v1.json, regions/test.json)")
+    parser.add_argument("--backend", default="synthetic", help="캡처 백엔드 (synthetic / files / mss / pyautogui)")
+    parser.add_argument("--option", action="append", metavar="이름=값", help="백엔드 옵션 (여러 번 가능)")
+    parser.add_argument("--duration", type=float, default=60.0, help="실행 시간 (초)")
+    parser.add_argument("--profile", metavar="파일", help="cProfile 결과 저장 (감지 루프 스레드만, 상위 20개 함수 출력)")
+    parser.add_argument("--quiet", action="store_true", help="샷/감지 로그 생략")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args()
+
+    regions, _, _ = load_coordinate_file(args.coordinates)
+    config = dict(_parse_options(args.option), type=args.backend)
+    if args.backend == "synthetic":
+        config.setdefault("coordinates", args.coordinates)
+    try:
+        backend = create_backend(config, regions=regions)
+    except (ImportError, ValueError) as e:
+        raise SystemExit(f"캡처 백엔드 {args.backend} 사용 불가: {e}")
+
+    log = (lambda message: None) if args.quiet else _log
+    bay = BayCapture(0, {"regions": regions, "display": 0}, backend, log=log)
+    profiler = cProfile.Profile() if args.profile else None
+    if profiler:
+        profiler.enable()
+    try:
+        report = run(bay, backend, args.duration, quiet=args.quiet)
+    finally:
+        if profiler:
+            profiler.disable()
+        backend.close()
+
+    if profiler:
+        profiler.dump_stats(args.profile)
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print(f"{report['backend']}: {report['duration_sec']}초, 샷 {report['shots']}개"
+              + (f" (화면에 나온 샷 {report['shots_shown']}개)" if report.get("shots_shown") is not None else ""))
+        print(f"폴링: {report['poll']}, run_text 판정 생략 {report['run_text_skip_ratio'] * 100:.0f}%, "
+              f"재등장 → OCR 평균 {report['reappear_to_read_avg']}초")
+        if report.get("exact"):
+            print(f"전체 지표 일치 {report['all_exact'] * 100:.1f}%")
+            for key, rate in report["exact"].items():
+                print(f"    {key:<18}{rate * 100:6.1f}%")
+        if report["stages"]:
+            print("단계별 소요 시간 (ms):")
+            for stage, stats in report["stages"].items():
+                print(f"    {stage:<26} p50 {stats['p50']:>8.1f}  p95 {stats['p95']:>8.1f}  "
+                      f"p99 {stats['p99']:>8.1f}  ({stats['count']}회)")
+    if profiler and not args.json:
+        pstats.Stats(args.profile).sort_stats("cumulative").print_stats(20)
+
+
+if __name__ == "__main__":
+    main()
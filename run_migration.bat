@@ -28,7 +28,7 @@ echo 마이그레이션 실행 중...
 echo.
 
 set DATABASE_URL=%DATABASE_URL%
-python run_migration_direct.py
+python migrate.py
 
 if %ERRORLEVEL% NEQ 0 (
     echo.
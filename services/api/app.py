@@ -11,8 +11,11 @@ if project_root not in sys.path:
 
 # shared 모듈 import (sys.path 설정 직후)
 from shared import database
+from shared.cache_bus import bus_stats
+from shared.entity_cache import entity_cache
 
 from flask import Flask, request, jsonify
+import hashlib
 import json
 import re
 from datetime import datetime
@@ -42,14 +45,14 @@ def save_coordinate_file(brand: str, filename: str, payload: dict):
         """, (brand_val, resolution, version, filename, payload_json))
         
         conn.commit()
+        entity_cache.invalidate("coordinates", brand_val)
         return filename
     finally:
         cur.close()
         conn.close()
 
-def list_coordinate_files(brand: str):
-    """좌표 파일 목록 조회 (DB에서)"""
-    brand = brand.upper()
+def _load_coordinate_files(brand: str):
+    """좌표 파일 목록 조회 (응답 본문 캐시는 _coordinate_body, 업로드 시 브랜드 단위 무효화)"""
     conn = database.get_db_connection()
     cur = conn.cursor()
     
@@ -79,9 +82,8 @@ def list_coordinate_files(brand: str):
         cur.close()
         conn.close()
 
-def load_coordinate_file(brand: str, filename: str):
-    """좌표 파일 로드 (DB에서)"""
-    brand = brand.upper()
+def _load_coordinate_payload(brand: str, filename: str):
+    """좌표 파일 로드 (없으면 FileNotFoundError)"""
     conn = database.get_db_connection()
     cur = conn.cursor()
     
@@ -102,6 +104,18 @@ def load_coordinate_file(brand: str, filename: str):
         cur.close()
         conn.close()
 
+# 좌표 파일은 업로드 시에만 바뀜 → 내용 해시 ETag + 긴 캐시 (재검증은 If-None-Match → 304)
+# 같은 (brand, resolution, version)으로 재업로드하면 같은 URL의 내용이 바뀌므로 max-age는 1시간으로 제한
+COORDINATE_FILE_CACHE_CONTROL = "public, max-age=3600, stale-while-revalidate=604800"
+COORDINATE_LIST_CACHE_CONTROL = "public, max-age=60, stale-while-revalidate=86400"
+
+def _coordinate_body(key, build):
+    """응답 본문(JSON)과 내용 해시 ETag를 함께 캐시 (요청마다 직렬화/해시하지 않음)"""
+    def load():
+        body = json.dumps(build(), ensure_ascii=False, sort_keys=True, default=str)
+        return {"body": body, "etag": hashlib.sha256(body.encode("utf-8")).hexdigest()[:32]}
+    return entity_cache.get("coordinates", key, load)
+
 app = Flask(__name__)
 
 # 🔒 보안: Secret Key 환경 변수 필수
@@ -245,6 +259,60 @@ def get_store():
 # =========================
 # 매장 좌석 상태 조회 API (PC 등록 프로그램에서 사용)
 # =========================
+def _load_store_bay_assignments(store_id):
+    """매장 타석별 할당 상태 조회 (매장이 없으면 None)"""
+    from psycopg2.extras import RealDictCursor
+    conn = database.get_db_connection()
+    cur = conn.cursor(cursor_factory=RealDictCursor)
+    
+    # 매장 정보 조회
+    cur.execute("SELECT store_id, store_name, bays_count FROM stores WHERE store_id = %s", (store_id,))
+    store = cur.fetchone()
+    
+    if not store:
+        cur.close()
+        conn.close()
+        return None
+    
+    bays_count = store.get("bays_count", 0) or 0
+    
+    # 1..bays_count 타석별 할당 상태 (bays / store_pcs 모두 (store_id, bay_number) 인덱스 등가 조인)
+    # assigned=true 기준:
+    # 1. bays에 해당 bay_number가 존재하고 assigned_pc_unique_id가 있거나
+    # 2. store_pcs에 해당 bay_number로 active PC가 연결되어 있는 경우
+    cur.execute("""
+        SELECT
+            g.bay_number,
+            CASE WHEN b.bay_number IS NOT NULL THEN b.bay_name ELSE pc.bay_name END AS bay_name,
+            (NULLIF(b.assigned_pc_unique_id, '') IS NOT NULL OR pc.pc_unique_id IS NOT NULL) AS assigned
+        FROM generate_series(1, %s) AS g(bay_number)
+        LEFT JOIN bays b
+               ON b.store_id = %s AND b.bay_number = g.bay_number
+        LEFT JOIN LATERAL (
+            SELECT sp.pc_unique_id, sp.bay_name
+            FROM store_pcs sp
+            WHERE sp.store_id = %s
+              AND sp.bay_number = g.bay_number
+              AND sp.status = 'active'
+            LIMIT 1
+        ) pc ON TRUE
+        ORDER BY g.bay_number
+    """, (bays_count, store_id, store_id))
+    
+    bays = [
+        {"bay_number": row["bay_number"], "bay_name": row["bay_name"], "assigned": bool(row["assigned"])}
+        for row in cur.fetchall()
+    ]
+    
+    cur.close()
+    conn.close()
+    
+    return {
+        "store_id": store_id,
+        "bays_count": bays_count,
+        "bays": bays
+    }
+
 @app.route("/api/stores/<store_id>/bays", methods=["GET"])
 def get_store_bays(store_id):
     """
@@ -262,81 +330,12 @@ def get_store_bays(store_id):
     }
     """
     try:
-        from psycopg2.extras import RealDictCursor
-        conn = database.get_db_connection()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
-        
-        # 매장 정보 조회
-        cur.execute("SELECT store_id, store_name, bays_count FROM stores WHERE store_id = %s", (store_id,))
-        store = cur.fetchone()
-        
-        if not store:
-            cur.close()
-            conn.close()
+        # 엔티티 캐시 (bays namespace, 매장/타석/PC 변경 시 store_id 기준으로 함께 무효화)
+        result = entity_cache.get("bays", (store_id, "assigned"), lambda: _load_store_bay_assignments(store_id))
+        if result is None:
             return jsonify({"error": "매장을 찾을 수 없습니다."}), 404
         
-        bays_count = store.get("bays_count", 0) or 0
-        
-        # bays 테이블에서 할당된 타석 조회
-        cur.execute("""
-            SELECT 
-                b.bay_number,
-                b.bay_name,
-                b.assigned_pc_unique_id,
-                sp.pc_unique_id as pc_connected
-            FROM bays b
-            LEFT JOIN store_pcs sp ON sp.store_id = b.store_id 
-                AND sp.bay_id = CAST(b.bay_number AS TEXT)
-                AND sp.status = 'active'
-            WHERE b.store_id = %s
-            ORDER BY b.bay_number
-        """, (store_id,))
-        
-        assigned_bays = {row.get("bay_number"): row for row in cur.fetchall()}
-        
-        # store_pcs에서도 할당 상태 확인 (bay_id가 숫자인 경우 bay_number로 간주)
-        cur.execute("""
-            SELECT DISTINCT
-                CAST(bay_id AS INTEGER) as bay_number,
-                bay_name
-            FROM store_pcs
-            WHERE store_id = %s
-              AND status = 'active'
-              AND bay_id IS NOT NULL
-              AND bay_id ~ '^[0-9]+$'
-        """, (store_id,))
-        
-        pc_assigned_bays = {row.get("bay_number"): row for row in cur.fetchall()}
-        
-        # 모든 타석 목록 생성 (1..bays_count)
-        bays = []
-        for bay_num in range(1, bays_count + 1):
-            bay_info = assigned_bays.get(bay_num) or pc_assigned_bays.get(bay_num)
-            
-            # assigned=true 기준:
-            # 1. bays에 해당 bay_number가 존재하고 assigned_pc_unique_id가 있거나
-            # 2. store_pcs에서 해당 bay_id(숫자)가 연결되어 있는 경우
-            assigned = False
-            bay_name = None
-            
-            if bay_info:
-                assigned = bool(bay_info.get("assigned_pc_unique_id") or bay_info.get("pc_connected"))
-                bay_name = bay_info.get("bay_name")
-            
-            bays.append({
-                "bay_number": bay_num,
-                "bay_name": bay_name,
-                "assigned": assigned
-            })
-        
-        cur.close()
-        conn.close()
-        
-        return jsonify({
-            "store_id": store_id,
-            "bays_count": bays_count,
-            "bays": bays
-        })
+        return jsonify(result)
         
     except Exception as e:
         print(f"[ERROR] get_store_bays 오류: {e}")
@@ -721,6 +720,7 @@ def register_pc_new():
         print(f"[PC 등록 API] DB commit 시작")
         conn.commit()
         print(f"[PC 등록 API] DB commit 완료")
+        entity_cache.invalidate("bays", store_id)
         
         # commit 성공 확인
         cur.execute("SELECT status, store_name FROM store_pcs WHERE pc_unique_id = %s", (pc_unique_id,))
@@ -1259,6 +1259,16 @@ def upload_coordinates():
             "error": "Internal server error"
         }), 500
 
+def _conditional_json(cached, cache_control):
+    """캐시된 본문으로 응답, If-None-Match가 ETag와 같으면 본문 없이 304"""
+    if request.if_none_match.contains(cached["etag"]):
+        response = app.response_class(status=304)
+    else:
+        response = app.response_class(cached["body"], mimetype="application/json")
+    response.set_etag(cached["etag"])
+    response.headers["Cache-Control"] = cache_control
+    return response
+
 @app.route("/api/coordinates", methods=["GET"])
 @app.route("/api/coordinates/<brand>", methods=["GET"])
 def list_coordinates(brand=None):
@@ -1280,12 +1290,9 @@ def list_coordinates(brand=None):
             }), 400
         
         brand = brand.upper().strip()
-        files = list_coordinate_files(brand)
-        
-        return jsonify({
-            "success": True,
-            "files": files
-        }), 200
+        cached = _coordinate_body((brand, "list_body"),
+                                  lambda: {"success": True, "files": _load_coordinate_files(brand)})
+        return _conditional_json(cached, COORDINATE_LIST_CACHE_CONTROL)
         
     except Exception as e:
         import traceback
@@ -1297,15 +1304,12 @@ def list_coordinates(brand=None):
 
 @app.route("/api/coordinates/<brand>/<filename>", methods=["GET"])
 def download_coordinates(brand, filename):
-    """좌표 파일 다운로드 API"""
+    """좌표 파일 다운로드 API (ETag/If-None-Match 지원, 변경 없으면 304)"""
     try:
         brand = brand.upper().strip()
-        data = load_coordinate_file(brand, filename)
-        
-        return jsonify({
-            "success": True,
-            "data": data
-        }), 200
+        cached = _coordinate_body((brand, "file_body", filename),
+                                  lambda: {"success": True, "data": _load_coordinate_payload(brand, filename)})
+        return _conditional_json(cached, COORDINATE_FILE_CACHE_CONTROL)
         
     except FileNotFoundError:
         return jsonify({
@@ -1321,6 +1325,15 @@ def download_coordinates(brand, filename):
             "error": "Internal server error"
         }), 500
 
+@app.route("/api/cache/stats", methods=["GET"])
+def cache_stats():
+    """엔티티 캐시 통계 (이 워커 프로세스 기준, 슈퍼 관리자 인증)"""
+    username, password = extract_auth_from_header()
+    if not username or not password or not verify_admin_credentials(username, password):
+        return jsonify({"success": False, "error": "Unauthorized"}), 401
+    return jsonify({"success": True, "pid": os.getpid(), "cache": entity_cache.stats(),
+                    "bus": bus_stats()}), 200
+
 def _parse_coordinate_id(coordinate_id: str):
     """coordinate_id를 파싱하여 조회 기준을 반환"""
     if not coordinate_id:
@@ -1381,7 +1394,6 @@ def _assign_coordinate_to_bay(data: dict):
         }), 400
 
     store_id = str(store_id).strip().upper()
-    bay_id_str = str(bay_number)
 
     conn = database.get_db_connection()
     cur = conn.cursor()
@@ -1399,15 +1411,15 @@ def _assign_coordinate_to_bay(data: dict):
             FROM store_pcs 
             WHERE store_id = %s
               AND status IN ('active', 'pending')
-              AND (bay_id = %s OR bay_number = %s)
+              AND bay_number = %s
             LIMIT 1
         """
-        cur.execute(check_query, (store_id, bay_id_str, bay_number))
+        cur.execute(check_query, (store_id, bay_number))
         check_row = cur.fetchone()
         if not check_row:
             return jsonify({
                 "success": False,
-                "error": f"해당 매장(store_id: {store_id})의 타석(bay_id: {bay_id_str})에 등록된 PC를 찾을 수 없습니다. 먼저 PC를 타석에 등록하세요."
+                "error": f"해당 매장(store_id: {store_id})의 타석(bay_number: {bay_number})에 등록된 PC를 찾을 수 없습니다. 먼저 PC를 타석에 등록하세요."
             }), 404
 
         query = """
@@ -1415,9 +1427,9 @@ def _assign_coordinate_to_bay(data: dict):
             SET coordinate_filename = %s 
             WHERE store_id = %s
               AND status IN ('active', 'pending')
-              AND (bay_id = %s OR bay_number = %s)
+              AND bay_number = %s
         """
-        cur.execute(query, (filename, store_id, bay_id_str, bay_number))
+        cur.execute(query, (filename, store_id, bay_number))
         conn.commit()
 
         if cur.rowcount > 0:
@@ -1497,18 +1509,15 @@ def get_bay_coordinates(store_id, bay_number):
         conn = database.get_db_connection()
         cur = conn.cursor()
         
-        # bay_id는 문자열로 저장되므로 bay_number를 문자열로 변환
-        bay_id_str = str(bay_number)
-        
-        # store_pcs 테이블에서 해당 타석의 좌표 파일명 조회
+        # store_pcs 테이블에서 해당 타석의 좌표 파일명 조회 ((store_id, bay_number) 인덱스)
         cur.execute("""
             SELECT coordinate_filename
             FROM store_pcs
             WHERE store_id = %s
               AND status IN ('active', 'pending')
-              AND (bay_id = %s OR bay_number = %s)
+              AND bay_number = %s
             LIMIT 1
-        """, (store_id, bay_id_str, bay_number))
+        """, (store_id, bay_number))
         
         row = cur.fetchone()
         cur.close()
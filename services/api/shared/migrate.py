@@ -0,0 +1,211 @@
+# ===== shared/migrate.py (버전 기반 스키마 마이그레이션) =====
+"""
+버전 기반 스키마 마이그레이션 러너
+
+그동안 각 서비스가 import 시점에 init_db()로 수백 줄의 CREATE/ALTER를 매번 실행했고,
+일회성 변경은 run_migration*.py 스크립트로 따로 돌렸다.
+이제 스키마 변경은 shared/migrations/NNNN_이름.sql 파일로만 추가하고
+schema_version 테이블에 적용된 버전을 기록한다.
+
+- 기동 시: SELECT MAX(version) 1회로 최신 여부만 확인 (최신이면 DDL 실행 없음)
+- 미적용 버전이 있으면: pg_advisory_lock으로 한 프로세스만 마이그레이션,
+  나머지 워커는 락이 풀릴 때까지 기다린 뒤 이미 적용된 버전은 건너뜀
+- 파일 하나 = 트랜잭션 하나 (실패 시 해당 버전만 롤백하고 중단)
+- 적용된 파일 내용이 바뀌면 checksum 불일치 경고 (이미 적용된 파일은 수정하지 말고 새 버전 추가)
+- 파일 안의 RAISE WARNING은 [WARNING] 로그로 출력 (데이터 변환 건수 등)
+
+사용법:
+    from shared.migrate import run_migrations
+    run_migrations(get_db_connection)
+
+    python migrate.py            # 루트 CLI (미적용 버전 적용)
+    python migrate.py --status   # 버전별 적용 현황
+"""
+import hashlib
+import os
+import re
+import time
+from collections import namedtuple
+from datetime import datetime
+
+import psycopg2
+from psycopg2 import errors as psycopg2_errors
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+
+# pg_advisory_lock 키 (이 앱의 스키마 마이그레이션 전용)
+MIGRATION_LOCK_KEY = 7310032
+
+_FILE_RE = re.compile(r"^(\d{4})_([A-Za-z0-9_]+)\.sql$")
+
+Migration = namedtuple("Migration", ["version", "name", "sql", "checksum"])
+
+
+class MigrationError(Exception):
+    """마이그레이션 파일 구성 오류 또는 적용 실패"""
+
+
+def load_migrations(path=MIGRATIONS_DIR):
+    """migrations 디렉토리의 NNNN_이름.sql 파일을 버전 순으로 읽기"""
+    migrations = []
+    seen = {}
+    for filename in sorted(os.listdir(path)):
+        match = _FILE_RE.match(filename)
+        if not match:
+            continue
+        version = int(match.group(1))
+        if version in seen:
+            raise MigrationError(f"중복된 마이그레이션 버전 {version}: {seen[version]}, {filename}")
+        seen[version] = filename
+        with open(os.path.join(path, filename), "r", encoding="utf-8") as f:
+            sql = f.read()
+        checksum = hashlib.sha256(sql.encode("utf-8")).hexdigest()[:16]
+        migrations.append(Migration(version, match.group(2), sql, checksum))
+    return migrations
+
+
+def _scalar(cur):
+    row = cur.fetchone()
+    return next(iter(row.values())) if isinstance(row, dict) else row[0]
+
+
+def current_version(cur):
+    """적용된 최신 스키마 버전 (schema_version 테이블이 없으면 0)"""
+    try:
+        cur.execute("SELECT COALESCE(MAX(version), 0) AS version FROM schema_version")
+    except psycopg2_errors.UndefinedTable:
+        cur.connection.rollback()
+        return 0
+    return _scalar(cur)
+
+
+def _ensure_version_table(cur):
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version     INTEGER PRIMARY KEY,
+            name        TEXT NOT NULL,
+            checksum    TEXT,
+            applied_at  TEXT DEFAULT CURRENT_TIMESTAMP,
+            duration_ms INTEGER
+        )
+    """)
+
+
+def _applied_versions(cur):
+    cur.execute("SELECT version, checksum FROM schema_version")
+    rows = cur.fetchall()
+    if rows and isinstance(rows[0], dict):
+        return {r["version"]: r["checksum"] for r in rows}
+    return {r[0]: r[1] for r in rows}
+
+
+def migrate(conn, migrations=None, log=print):
+    """
+    미적용 마이그레이션 적용 (advisory lock 보유 중에만 실행)
+
+    Returns:
+        list: 이번에 적용한 버전 목록
+    """
+    migrations = load_migrations() if migrations is None else migrations
+    cur = conn.cursor()
+    applied_now = []
+    # 세션 단위 락: 다른 프로세스는 여기서 대기했다가 적용 완료 후 진행
+    cur.execute("SELECT pg_advisory_lock(%s)", (MIGRATION_LOCK_KEY,))
+    try:
+        _ensure_version_table(cur)
+        conn.commit()
+        applied = _applied_versions(cur)
+        conn.commit()
+
+        for m in migrations:
+            if m.version in applied:
+                if applied[m.version] and applied[m.version] != m.checksum:
+                    log(f"[WARNING] 마이그레이션 {m.version:04d}_{m.name} 파일이 적용 후 변경됨 "
+                        f"(checksum {applied[m.version]} → {m.checksum})")
+                continue
+            started = time.time()
+            try:
+                cur.execute(m.sql)
+                cur.execute("""
+                    INSERT INTO schema_version (version, name, checksum, applied_at, duration_ms)
+                    VALUES (%s, %s, %s, %s, %s)
+                """, (m.version, m.name, m.checksum,
+                      datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                      int((time.time() - started) * 1000)))
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                raise MigrationError(f"마이그레이션 {m.version:04d}_{m.name} 적용 실패: {e}") from e
+            applied_now.append(m.version)
+            # 마이그레이션 안의 RAISE WARNING (변환 건수 등)을 서비스 로그에 남김
+            # (IF NOT EXISTS의 "already exists, skipping" 같은 NOTICE는 생략)
+            for notice in conn.notices:
+                if notice.startswith("WARNING"):
+                    log(f"[WARNING] {m.version:04d}_{m.name}: {notice.split(':', 1)[-1].strip()}")
+            del conn.notices[:]
+            log(f"[MIGRATE] {m.version:04d}_{m.name} 적용 완료 ({time.time() - started:.2f}s)")
+    finally:
+        try:
+            conn.rollback()
+            cur.execute("SELECT pg_advisory_unlock(%s)", (MIGRATION_LOCK_KEY,))
+            conn.commit()
+        except psycopg2.Error:
+            pass
+        cur.close()
+    return applied_now
+
+
+def run_migrations(get_connection, log=print):
+    """
+    서비스 기동 시 호출: 스키마가 최신이면 버전 조회 1회로 끝낸다
+
+    Args:
+        get_connection: DB 연결 생성 함수 (database.get_db_connection)
+
+    Returns:
+        int: 적용 후 스키마 버전
+    """
+    migrations = load_migrations()
+    latest = migrations[-1].version if migrations else 0
+
+    conn = get_connection()
+    try:
+        cur = conn.cursor()
+        version = current_version(cur)
+        conn.commit()
+        cur.close()
+        if version >= latest:
+            log(f"[MIGRATE] 스키마 최신 (version {version})")
+            return version
+
+        log(f"[MIGRATE] 스키마 version {version} → {latest} 마이그레이션 시작")
+        migrate(conn, migrations, log=log)
+
+        cur = conn.cursor()
+        version = current_version(cur)
+        conn.commit()
+        cur.close()
+        return version
+    finally:
+        conn.close()
+
+
+def migration_status(conn, migrations=None):
+    """버전별 적용 현황 [(version, name, applied_at | None, checksum 일치 여부)]"""
+    migrations = load_migrations() if migrations is None else migrations
+    cur = conn.cursor()
+    applied = {}
+    if current_version(cur) > 0:
+        cur.execute("SELECT version, checksum, applied_at FROM schema_version")
+        for row in cur.fetchall():
+            if isinstance(row, dict):
+                row = (row["version"], row["checksum"], row["applied_at"])
+            applied[row[0]] = (row[1], row[2])
+    conn.commit()
+    cur.close()
+
+    status = []
+    for m in migrations:
+        checksum, applied_at = applied.get(m.version, (None, None))
+        status.append((m.version, m.name, applied_at, checksum in (None, m.checksum)))
+    return status
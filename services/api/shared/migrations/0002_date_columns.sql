@@ -0,0 +1,88 @@
+-- ============================================
+-- 0002 날짜 컬럼 DATE 변환 + PC 차단/샷 PC 컬럼
+-- ============================================
+-- 기존 database_migration_final.sql (run_migration*.py로 수동 실행하던 스크립트) 이관.
+-- TEXT 컬럼일 때만 변환하므로 이미 적용된 DB에서는 아무 것도 하지 않는다.
+-- 'YYYY-MM-DD'로 시작하는 값은 앞 10자를 날짜로, 날짜로 읽을 수 없는 값만 NULL로 변환한다 (건수 로그).
+
+-- 컬럼 타입 변경 전에 의존 뷰 제거 (0005_bay_number에서 다시 생성)
+DROP VIEW IF EXISTS store_bay_status;
+
+-- TEXT → DATE 변환 규칙 (이 마이그레이션 안에서만 사용)
+-- 이전 코드는 split(' ')로 앞부분만 날짜로 읽었으므로 'YYYY-MM-DD HH:MM:SS'도 앞 10자로 변환한다.
+-- 날짜로 읽을 수 없는 값만 NULL (usage_end_date NULL = 만료 없음이므로 건수를 WARNING으로 남김)
+CREATE OR REPLACE FUNCTION migration_text_to_date(p_value TEXT) RETURNS DATE
+LANGUAGE plpgsql IMMUTABLE AS $$
+BEGIN
+    IF p_value IS NULL OR btrim(p_value) !~ '^\d{4}-\d{2}-\d{2}' THEN
+        RETURN NULL;
+    END IF;
+    RETURN LEFT(btrim(p_value), 10)::DATE;
+EXCEPTION WHEN others THEN
+    RETURN NULL;  -- '2026-13-45' 같은 잘못된 날짜
+END
+$$;
+
+-- TEXT 컬럼일 때만 변환 (시간 부분을 잘라낸 행 / NULL이 된 행 수를 WARNING으로 출력)
+CREATE OR REPLACE FUNCTION migration_convert_date_column(p_table TEXT, p_column TEXT) RETURNS VOID
+LANGUAGE plpgsql AS $$
+DECLARE
+    v_truncated BIGINT;
+    v_lost BIGINT;
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1
+        FROM information_schema.columns
+        WHERE table_schema = 'public' AND table_name = p_table
+          AND column_name = p_column AND data_type = 'text'
+    ) THEN
+        RETURN;
+    END IF;
+
+    EXECUTE format(
+        'SELECT COUNT(*) FILTER (WHERE migration_text_to_date(%1$I) IS NOT NULL'
+        '                          AND btrim(%1$I) !~ %3$L),'
+        '       COUNT(*) FILTER (WHERE btrim(%1$I) <> %4$L AND migration_text_to_date(%1$I) IS NULL)'
+        ' FROM %2$I',
+        p_column, p_table, '^\d{4}-\d{2}-\d{2}$', ''
+    ) INTO v_truncated, v_lost;
+    IF v_truncated > 0 THEN
+        RAISE WARNING '%.%: 날짜 뒤 시간 등을 잘라 변환한 행 %개', p_table, p_column, v_truncated;
+    END IF;
+    IF v_lost > 0 THEN
+        RAISE WARNING '%.%: 날짜로 읽을 수 없어 NULL로 변환한 행 %개', p_table, p_column, v_lost;
+    END IF;
+
+    EXECUTE format('ALTER TABLE %1$I ALTER COLUMN %2$I TYPE DATE USING migration_text_to_date(%2$I)',
+                   p_table, p_column);
+END
+$$;
+
+-- store_pcs: usage_end_date / usage_start_date TEXT -> DATE
+SELECT migration_convert_date_column('store_pcs', 'usage_end_date');
+SELECT migration_convert_date_column('store_pcs', 'usage_start_date');
+
+-- users: birth_date TEXT -> DATE
+SELECT migration_convert_date_column('users', 'birth_date');
+
+-- stores: subscription_start_date / subscription_end_date TEXT -> DATE (권장)
+SELECT migration_convert_date_column('stores', 'subscription_end_date');
+SELECT migration_convert_date_column('stores', 'subscription_start_date');
+
+DROP FUNCTION migration_convert_date_column(TEXT, TEXT);
+DROP FUNCTION migration_text_to_date(TEXT);
+
+-- store_pcs 차단 사유
+ALTER TABLE store_pcs ADD COLUMN IF NOT EXISTS blocked_reason TEXT;
+
+-- shots 저장 PC
+ALTER TABLE shots ADD COLUMN IF NOT EXISTS pc_unique_id TEXT;
+
+CREATE INDEX IF NOT EXISTS idx_store_pcs_store_status_end
+ON store_pcs (store_id, status, usage_end_date);
+
+CREATE INDEX IF NOT EXISTS idx_shots_pc_unique_id
+ON shots (pc_unique_id);
+
+CREATE INDEX IF NOT EXISTS idx_shots_store_bay
+ON shots (store_id, bay_id);
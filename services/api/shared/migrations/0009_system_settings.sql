@@ -0,0 +1,17 @@
+-- ============================================
+-- 0009 시스템 설정 (워커 공용 플래그)
+-- ============================================
+-- 총책임자 Emergency 모드처럼 모든 워커/인스턴스가 같은 값을 봐야 하는 플래그.
+-- 이전에는 Flask 세션에 저장돼서 워커·브라우저마다 값이 달랐다.
+-- 읽기는 entity_cache("settings"), 변경은 cache_bus(LISTEN/NOTIFY)로 다른 워커에 즉시 전파.
+
+CREATE TABLE IF NOT EXISTS system_settings (
+    name        TEXT PRIMARY KEY,
+    value       TEXT,
+    updated_by  TEXT,
+    updated_at  TEXT
+);
+
+INSERT INTO system_settings (name, value)
+VALUES ('emergency_mode', 'false')
+ON CONFLICT (name) DO NOTHING;
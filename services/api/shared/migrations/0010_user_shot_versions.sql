@@ -0,0 +1,13 @@
+-- ============================================
+-- 0010 유저 샷 버전 (대시보드 캐시 무효화 기준)
+-- ============================================
+-- save_shot_to_db가 유저 샷을 저장할 때 같은 트랜잭션에서 version을 +1 한다.
+-- user_web /api/users/me/dashboard는 (유저, 버전, 날짜, 기준표 버전)으로 응답을 캐시하고
+-- 같은 값으로 ETag를 만들어 변경이 없으면 304를 돌려준다.
+-- users 행과 분리: 샷마다 users를 갱신하면 get_user 캐시와 행 잠금이 불필요하게 얽힌다.
+
+CREATE TABLE IF NOT EXISTS user_shot_versions (
+    user_id     TEXT PRIMARY KEY,
+    version     BIGINT NOT NULL DEFAULT 0,
+    updated_at  TEXT
+);
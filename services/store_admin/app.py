@@ -192,7 +192,7 @@ def store_admin_login():
 @require_role("store_admin")
 def store_admin_dashboard():
     try:
-        from utils import classify_by_criteria
+        from utils import apply_criteria_classes
         
         store_id = session.get("store_id")
         bays = database.get_bays(store_id)
@@ -216,29 +216,14 @@ def store_admin_dashboard():
         # 샷 데이터에 색상 클래스 추가
         shots = []
         for r in rows[:20]:  # 최근 20개만
-            s = dict(r)
-            club_id = s.get("club_id") or ""
-            bs = s.get("ball_speed")
-            sf = s.get("smash_factor")
-            s["ball_speed_class"] = classify_by_criteria(bs, club_id, "ball_speed", fallback_good=60)
-            s["smash_class"] = classify_by_criteria(sf, club_id, "smash_factor", fallback_good=1.45)
-            shots.append(s)
+            shots.append(apply_criteria_classes(dict(r), gender=r.get("owner_gender")))
 
-        # 타석별 활성 사용자 매핑
-        bay_active_users = {}
-        for session_info in active_sessions:
-            key = f"{session_info['store_id']}_{session_info['bay_id']}"
-            bay_active_users[key] = session_info
-        
-        # 각 타석에 활성 사용자 정보 추가
-        for bay in bays:
-            bay_key = f"{store_id}_{bay['bay_id']}"
-            if bay_key in bay_active_users:
-                bay['active_user'] = bay_active_users[bay_key].get('user_id')
-                bay['login_time'] = bay_active_users[bay_key].get('login_time')
-            else:
-                bay['active_user'] = None
-                bay['login_time'] = None
+        # 타석별 활성 사용자 매핑 (active_user/login_time은 get_bays()가 bay_number로 조인해 채움)
+        bay_active_users = {
+            f"{store_id}_{bay['bay_id']}": {"store_id": store_id, "bay_id": bay["bay_id"],
+                                            "user_id": bay["active_user"], "login_time": bay["login_time"]}
+            for bay in bays if bay.get("active_user")
+        }
 
         return render_template("store_admin_dashboard.html",
                              store_id=store_id,
@@ -261,34 +246,11 @@ def store_admin_dashboard():
 @require_role("store_admin")
 def bay_shots(store_id, bay_id):
     try:
-        from utils import classify_by_criteria
+        from utils import apply_criteria_classes
         
         rows = database.get_shots_by_bay(store_id, bay_id)
-        shots = []
-        for r in rows:
-            s = dict(r)
-            club_id = s.get("club_id") or ""
-            
-            # 색상 클래스 추가
-            bs = s.get("ball_speed")
-            sf = s.get("smash_factor")
-            fa = s.get("face_angle")
-            cp = s.get("club_path")
-            lo = s.get("lateral_offset")
-            da = s.get("direction_angle")
-            ss = s.get("side_spin")
-            bk = s.get("back_spin")
-            
-            s["ball_speed_class"] = classify_by_criteria(bs, club_id, "ball_speed", fallback_good=60)
-            s["smash_class"] = classify_by_criteria(sf, club_id, "smash_factor", fallback_good=1.45)
-            s["face_class"] = classify_by_criteria(fa, club_id, "face_angle", abs_value=True, fallback_good=2.0, fallback_warn=4.0)
-            s["path_class"] = classify_by_criteria(cp, club_id, "club_path", abs_value=True, fallback_good=2.0, fallback_warn=4.0)
-            s["lateral_class"] = classify_by_criteria(lo, club_id, "lateral_offset", abs_value=True, fallback_good=3.0, fallback_warn=6.0)
-            s["direction_class"] = classify_by_criteria(da, club_id, "direction_angle", abs_value=True, fallback_good=3.0, fallback_warn=6.0)
-            s["side_spin_class"] = classify_by_criteria(ss, club_id, "side_spin", abs_value=True, fallback_good=300, fallback_warn=600)
-            s["back_spin_class"] = classify_by_criteria(bk, club_id, "back_spin", abs_value=False, fallback_good=None)
-            
-            shots.append(s)
+        # 색상 클래스는 저장 시 계산된 criteria_classes 사용
+        shots = [apply_criteria_classes(dict(r), gender=r.get("owner_gender")) for r in rows]
         
         return render_template("bay_shots.html", 
                              store_id=store_id,
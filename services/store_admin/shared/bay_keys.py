@@ -0,0 +1,107 @@
+# ===== shared/bay_keys.py (정수 타석 키 bay_number) =====
+"""
+정수 타석 키 (bay_number) 공용 모듈
+
+타석은 그동안 bay_id TEXT("01", "1", UUID 일부), bay_number INTEGER, bay_name으로
+제각각 식별되어 CAST/정규식 조인과 Python int() 필터가 필요했다.
+bays / store_pcs / shots / active_sessions 4개 테이블 모두에 bay_number INTEGER를 두고
+(store_id, bay_number) 인덱스 등가 조인으로 조회한다.
+
+- 스키마: shared/migrations/0005_bay_number.sql (컬럼/bay_key()/트리거/인덱스/store_bay_status 뷰)
+  * 트리거가 INSERT 및 bay_id 변경 시 bay_number를 자동으로 채운다
+  * 작은 테이블(bays, store_pcs, active_sessions)은 마이그레이션에서 즉시 채운다
+- shots 기존 행: python backfill.py run shots_bay_number (shared/backfill.py 청크 백필)
+- bay_filter(cur, store_id, bay_id): 조회 시 WHERE 조건 생성 (bay_id "03"/UUID → bay_number)
+- shot_bay_filter(cur, store_id, bay_id): shots 조회용 - 백필 완료 전에는 bay_number가 빈 기존 샷도 bay_id로 매칭
+"""
+import re
+
+# shots.bay_number 백필 완료 여부 (완료 확인 후에는 프로세스 동안 다시 조회하지 않음)
+_shots_bay_number_ready = False
+
+# bay_key()와 동일 규칙: 1~6자리 숫자만 타석 번호로 인정 (UUID 일부 등은 제외)
+_BAY_NUMBER_RE = re.compile(r"^\s*([0-9]{1,6})\s*$")
+
+
+def to_bay_number(value):
+    """bay_id/bay_number 값을 정수 타석 번호로 변환 ("03" → 3, 숫자가 아니면 None)"""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    match = _BAY_NUMBER_RE.match(str(value))
+    return int(match.group(1)) if match else None
+
+
+def resolve_bay_number(cur, store_id, bay_id):
+    """
+    조회용 정수 타석 번호 결정
+
+    숫자 bay_id는 바로 변환하고, 숫자가 아닌 bay_id(UUID 형식 등)는
+    bays / store_pcs에 저장된 bay_number로 찾는다. 찾지 못하면 None.
+    """
+    bay_number = to_bay_number(bay_id)
+    if bay_number is not None or cur is None or not store_id or not bay_id:
+        return bay_number
+    cur.execute("""
+        SELECT bay_number FROM bays
+        WHERE store_id = %s AND bay_id = %s AND bay_number IS NOT NULL
+        UNION ALL
+        SELECT bay_number FROM store_pcs
+        WHERE store_id = %s AND bay_id = %s AND bay_number IS NOT NULL
+        LIMIT 1
+    """, (store_id, str(bay_id), store_id, str(bay_id)))
+    row = cur.fetchone()
+    if not row:
+        return None
+    return row["bay_number"] if isinstance(row, dict) else row[0]
+
+
+def bay_filter(cur, store_id, bay_id, prefix=""):
+    """
+    타석 WHERE 조건 조각과 파라미터 반환
+
+    정수 타석 번호를 알면 인덱스 등가 비교(bay_number = %s),
+    끝내 알 수 없으면 기존 방식(bay_id = %s)으로 비교한다.
+
+    사용법:
+        bay_cond, bay_value = bay_filter(cur, store_id, bay_id)
+        cur.execute(f"SELECT ... WHERE store_id = %s AND {bay_cond}", (store_id, bay_value))
+    """
+    bay_number = resolve_bay_number(cur, store_id, bay_id)
+    if bay_number is not None:
+        return f"{prefix}bay_number = %s", bay_number
+    return f"{prefix}bay_id = %s", bay_id
+
+
+def shots_bay_number_ready(cur):
+    """shots_bay_number 백필 작업이 끝났는지 (backfill_checkpoints.finished_at 기준)"""
+    global _shots_bay_number_ready
+    if not _shots_bay_number_ready:
+        cur.execute("""
+            SELECT 1 FROM backfill_checkpoints
+            WHERE job = 'shots_bay_number' AND finished_at IS NOT NULL
+        """)
+        _shots_bay_number_ready = cur.fetchone() is not None
+    return _shots_bay_number_ready
+
+
+def shot_bay_filter(cur, store_id, bay_id, prefix=""):
+    """
+    shots용 타석 WHERE 조건 조각과 파라미터 튜플 반환
+
+    마이그레이션 0005는 shots 기존 행의 bay_number를 채우지 않으므로
+    백필(python backfill.py run shots_bay_number)이 끝나기 전에는
+    bay_number가 빈 행을 기존 방식(bay_id = %s)으로도 찾는다.
+
+    사용법:
+        bay_cond, bay_params = shot_bay_filter(cur, store_id, bay_id)
+        cur.execute(f"SELECT ... FROM shots WHERE store_id = %s AND {bay_cond}", (store_id, *bay_params))
+    """
+    bay_number = resolve_bay_number(cur, store_id, bay_id)
+    if bay_number is None:
+        return f"{prefix}bay_id = %s", (bay_id,)
+    if shots_bay_number_ready(cur):
+        return f"{prefix}bay_number = %s", (bay_number,)
+    return (f"({prefix}bay_number = %s OR ({prefix}bay_number IS NULL AND {prefix}bay_id = %s))",
+            (bay_number, str(bay_id)))
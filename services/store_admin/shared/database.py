@@ -9,6 +9,12 @@ import string
 import secrets
 import hashlib
 
+from shared.bay_keys import bay_filter, shot_bay_filter
+from shared.cache_bus import start_invalidation_bus
+from shared.entity_cache import entity_cache
+from shared.migrate import run_migrations
+from shared.shot_partitions import ensure_partitions_at_startup
+
 # PostgreSQL 연결 정보 (Railway 환경 변수 필수)
 # 🔒 보안: 프로덕션에서는 DATABASE_URL 환경 변수가 반드시 설정되어야 함
 DATABASE_URL = os.environ.get("DATABASE_URL")
@@ -50,334 +56,18 @@ def get_db_connection():
 # DB 초기화
 # ------------------------------------------------
 def init_db():
-    conn = get_db_connection()
-    cur = conn.cursor()
-
-    # 1️⃣ 유저 테이블
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS users (
-        user_id TEXT PRIMARY KEY,
-        password TEXT NOT NULL,
-        name TEXT,
-        phone TEXT,
-        gender TEXT CHECK(gender IN ('남','여','M','F')) NOT NULL,
-        created_at TEXT DEFAULT CURRENT_TIMESTAMP
-    )
-    """)
-    
-    try:
-        cur.execute("ALTER TABLE users ADD COLUMN IF NOT EXISTS name TEXT")
-    except Exception:
-        pass
-    
-    try:
-        cur.execute("ALTER TABLE users ADD COLUMN IF NOT EXISTS phone TEXT")
-    except Exception:
-        pass
-
-    # 2️⃣ 샷 테이블
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS shots (
-        id SERIAL PRIMARY KEY,
-        store_id TEXT,
-        bay_id TEXT,
-        user_id TEXT,
-        club_id TEXT,
-        ball_speed REAL,
-        club_speed REAL,
-        launch_angle REAL,
-        smash_factor REAL,
-        face_angle REAL,
-        club_path REAL,
-        lateral_offset REAL,
-        direction_angle REAL,
-        side_spin INTEGER,
-        back_spin INTEGER,
-        total_distance REAL,
-        carry REAL,
-        feedback TEXT,
-        timestamp TEXT
-    )
-    """)
-
-    # shots 테이블 컬럼 추가
-    for col in ["side_spin", "back_spin", "lateral_offset", "direction_angle", "total_distance", "carry"]:
-        try:
-            if col in ["side_spin", "back_spin"]:
-                cur.execute(f"ALTER TABLE shots ADD COLUMN IF NOT EXISTS {col} INTEGER")
-            else:
-                cur.execute(f"ALTER TABLE shots ADD COLUMN IF NOT EXISTS {col} REAL")
-        except Exception:
-            pass
-
-    # 3️⃣ 매장 테이블 (확장)
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS stores (
-        store_id   TEXT PRIMARY KEY,
-        store_name TEXT,
-        admin_pw   TEXT,
-        bays_count INTEGER,
-        subscription_status TEXT DEFAULT 'active',
-        subscription_start_date TEXT,
-        subscription_end_date TEXT,
-        payment_plan TEXT,
-        created_at TEXT DEFAULT CURRENT_TIMESTAMP
-    )
-    """)
-    
-    # stores 테이블 컬럼 추가
-    for col in ["subscription_status", "subscription_start_date", "subscription_end_date", "payment_plan", "created_at"]:
-        try:
-            cur.execute(f"ALTER TABLE stores ADD COLUMN IF NOT EXISTS {col} TEXT")
-        except Exception:
-            pass
-    
-    # stores 테이블에 매장 정보 컬럼 추가
-    for col in ["contact", "business_number", "owner_name", "birth_date", "email", "address"]:
-        try:
-            cur.execute(f"ALTER TABLE stores ADD COLUMN IF NOT EXISTS {col} TEXT")
-        except Exception:
-            pass
-    
-    # stores 테이블에 status와 requested_at 컬럼 추가 (매장 등록 요청용)
-    for col in ["status", "requested_at"]:
-        try:
-            cur.execute(f"ALTER TABLE stores ADD COLUMN IF NOT EXISTS {col} TEXT")
-        except Exception:
-            pass
-
-    # 4️⃣ 타석 테이블 (코드 필드 추가)
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS bays (
-        store_id    TEXT,
-        bay_id      TEXT,
-        bay_number  INTEGER,
-        bay_name    TEXT,
-        status      TEXT,
-        user_id     TEXT,
-        last_update TEXT,
-        bay_code    TEXT UNIQUE,
-        assigned_pc_unique_id TEXT,
-        PRIMARY KEY (store_id, bay_id)
-    )
-    """)
-    
-    try:
-        cur.execute("ALTER TABLE bays ADD COLUMN IF NOT EXISTS bay_code TEXT")
-        cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_bay_code ON bays(bay_code)")
-    except Exception:
-        pass
-    
-    # bay_number 컬럼 추가 (마이그레이션)
-    try:
-        cur.execute("ALTER TABLE bays ADD COLUMN IF NOT EXISTS bay_number INTEGER")
-    except Exception:
-        pass
-    
-    try:
-        cur.execute("ALTER TABLE bays ADD COLUMN IF NOT EXISTS bay_name TEXT")
-    except Exception:
-        pass
-    
-    try:
-        cur.execute("ALTER TABLE bays ADD COLUMN IF NOT EXISTS assigned_pc_unique_id TEXT")
-    except Exception:
-        pass
-    
-    # ✅ UNIQUE 제약조건 (store_id, bay_number) 중복 방지
-    try:
-        cur.execute("""
-            CREATE UNIQUE INDEX IF NOT EXISTS ux_bays_store_baynumber
-            ON bays(store_id, bay_number)
-            WHERE bay_number IS NOT NULL
-        """)
-    except Exception:
-        pass
-
-    # 5️⃣ 활성 세션 테이블
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS active_sessions (
-        store_id    TEXT,
-        bay_id      TEXT,
-        user_id     TEXT,
-        login_time  TEXT DEFAULT CURRENT_TIMESTAMP,
-        PRIMARY KEY (store_id, bay_id)
-    )
-    """)
-
-    # 6️⃣ 결제 테이블 (신규)
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS payments (
-        id SERIAL PRIMARY KEY,
-        store_id TEXT,
-        amount REAL,
-        payment_date TEXT,
-        payment_method TEXT,
-        status TEXT DEFAULT 'pending',
-        created_at TEXT DEFAULT CURRENT_TIMESTAMP
-    )
-    """)
-
-    # 7️⃣ 구독 테이블 (신규)
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS subscriptions (
-        id SERIAL PRIMARY KEY,
-        store_id TEXT,
-        start_date TEXT,
-        end_date TEXT,
-        status TEXT DEFAULT 'active',
-        plan_type TEXT,
-        created_at TEXT DEFAULT CURRENT_TIMESTAMP
-    )
-    """)
-
-    # 8️⃣ 매장 PC 테이블 (신규)
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS store_pcs (
-        id SERIAL PRIMARY KEY,
-        store_id TEXT,
-        store_name TEXT NOT NULL,
-        bay_id TEXT,
-        bay_name TEXT NOT NULL,
-        pc_name TEXT NOT NULL,
-        pc_unique_id TEXT UNIQUE NOT NULL,
-        pc_uuid TEXT,
-        mac_address TEXT,
-        pc_hostname TEXT,
-        pc_platform TEXT,
-        pc_info JSONB,
-        pc_token TEXT UNIQUE,
-        registered_at TEXT DEFAULT CURRENT_TIMESTAMP,
-        last_seen_at TEXT,
-        status TEXT DEFAULT 'pending',
-        approved_at TEXT,
-        approved_by TEXT,
-        usage_start_date TEXT,
-        usage_end_date TEXT,
-        notes TEXT
-    )
-    """)
-    
-    # 기존 테이블에 새 컬럼 추가 (마이그레이션)
-    for col in ["store_id", "bay_id", "pc_uuid", "mac_address", "pc_token"]:
-        try:
-            cur.execute(f"ALTER TABLE store_pcs ADD COLUMN IF NOT EXISTS {col} TEXT")
-        except Exception:
-            pass
-    
-    # bay_number 컬럼 추가 (INTEGER)
-    try:
-        cur.execute("ALTER TABLE store_pcs ADD COLUMN IF NOT EXISTS bay_number INTEGER")
-        conn.commit()
-        print("[DB] store_pcs 테이블에 bay_number 컬럼 추가 완료")
-    except Exception as e:
-        print(f"[WARNING] store_pcs bay_number 컬럼 추가 실패 (이미 존재할 수 있음): {e}")
-        conn.rollback()
-    
-    try:
-        cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_pc_unique_id ON store_pcs(pc_unique_id)")
-        cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_pc_token ON store_pcs(pc_token) WHERE pc_token IS NOT NULL")
-    except Exception:
-        pass
-
-    # 9️⃣ PC 등록 코드 테이블 (신규)
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS pc_registration_codes (
-        id SERIAL PRIMARY KEY,
-        code TEXT UNIQUE NOT NULL,
-        status TEXT DEFAULT 'ACTIVE',
-        issued_by TEXT,
-        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-        revoked_at TEXT,
-        notes TEXT
-    )
-    """)
-    
-    try:
-        cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_registration_code ON pc_registration_codes(code)")
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_registration_code_status ON pc_registration_codes(status)")
-    except Exception:
-        pass
-    
-    # 🔟 PC 연장 요청 테이블 (CRITICAL 2: 요청 기반 봉합)
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS pc_extension_requests (
-        id SERIAL PRIMARY KEY,
-        pc_id TEXT NOT NULL,
-        pc_unique_id TEXT,
-        store_id TEXT NOT NULL,
-        requested_by TEXT NOT NULL,
-        requested_until DATE,
-        status TEXT DEFAULT 'REQUESTED' CHECK(status IN ('REQUESTED', 'APPROVED', 'REJECTED')),
-        decided_by TEXT,
-        decided_at TEXT,
-        reason TEXT,
-        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-        FOREIGN KEY (pc_unique_id) REFERENCES store_pcs(pc_unique_id) ON DELETE CASCADE
-    )
-    """)
-    
-    try:
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_extension_request_pc ON pc_extension_requests(pc_unique_id)")
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_extension_request_store ON pc_extension_requests(store_id)")
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_extension_request_status ON pc_extension_requests(status)")
-    except Exception:
-        pass
-    
-    # 1️⃣1️⃣ Audit 로그 테이블 (CRITICAL: 모든 중요 액션 기록)
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS audit_logs (
-        id SERIAL PRIMARY KEY,
-        actor_role TEXT NOT NULL,
-        actor_id TEXT NOT NULL,
-        action TEXT NOT NULL,
-        target_type TEXT,
-        target_id TEXT,
-        before_state JSONB,
-        after_state JSONB,
-        ip_address TEXT,
-        user_agent TEXT,
-        created_at TEXT DEFAULT CURRENT_TIMESTAMP
-    )
-    """)
-    
-    try:
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_audit_actor ON audit_logs(actor_role, actor_id)")
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_audit_action ON audit_logs(action)")
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_audit_target ON audit_logs(target_type, target_id)")
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_audit_created ON audit_logs(created_at)")
-    except Exception:
-        pass
-    
-    # 기존 테이블 마이그레이션 (pc_registration_keys → pc_registration_codes)
-    try:
-        cur.execute("""
-            INSERT INTO pc_registration_codes (code, status, issued_by, created_at, notes)
-            SELECT registration_key, 
-                   CASE 
-                       WHEN status = 'active' THEN 'ACTIVE'
-                       ELSE 'REVOKED'
-                   END,
-                   created_by,
-                   created_at,
-                   notes
-            FROM pc_registration_keys
-            WHERE NOT EXISTS (
-                SELECT 1 FROM pc_registration_codes WHERE code = pc_registration_keys.registration_key
-            )
-        """)
-        conn.commit()
-    except Exception:
-        pass  # 테이블이 없으면 스킵
-
-    # ⚠️ seed 데이터 생성 로직 제거됨
-    # 기본 매장/타석 생성은 seed_dev_data.py 스크립트로 분리
-    # 운영 환경에서는 절대 자동 실행되지 않음
+    """
+    DB 스키마 마이그레이션 (shared/migrations/*.sql)
 
-    conn.commit()
-    cur.close()
-    conn.close()
-    print("✅ DB 스키마 초기화 완료 (테이블/인덱스만 생성)")
+    schema_version이 최신이면 버전 조회 1회로 끝나고 (DDL 실행 없음),
+    미적용 버전이 있을 때만 advisory lock을 잡은 한 프로세스가 순서대로 적용한다.
+    이어서 다가올 달 shots 파티션이 없으면 미리 만든다 (있으면 쿼리 1회).
+    워커 간 캐시 무효화 버스(LISTEN/NOTIFY)는 DB가 아직 없어도 먼저 시작한다 (스스로 재연결).
+    """
+    start_invalidation_bus(get_db_connection)
+    version = run_migrations(get_db_connection)
+    ensure_partitions_at_startup(get_db_connection)
+    return version
 
 # ------------------------------------------------
 # 타석 코드 생성
@@ -468,6 +158,10 @@ def login_user(user_id, password):
     return dict(user) if user else None
 
 def get_user(user_id):
+    """유저 조회 (엔티티 캐시, create_user 후 무효화)"""
+    return entity_cache.get("user", user_id, lambda: _load_user(user_id))
+
+def _load_user(user_id):
     conn = get_db_connection()
     cur = conn.cursor(cursor_factory=RealDictCursor)
     cur.execute("SELECT * FROM users WHERE user_id=%s", (user_id,))
@@ -484,6 +178,7 @@ def create_user(user_id, password, name=None, phone=None, gender=None):
         (user_id, password, name, phone, gender)
     )
     conn.commit()
+    entity_cache.invalidate("user", user_id)
     cur.close()
     conn.close()
 
@@ -499,6 +194,14 @@ def check_user(user_id, password):
     conn.close()
     return dict(user) if user else None
 
+def _bump_shot_version(cur, user_id, now):
+    """유저 샷 버전 +1 (대시보드 캐시/ETag 기준, 샷 INSERT와 같은 트랜잭션에서 호출)"""
+    cur.execute("""
+        INSERT INTO user_shot_versions (user_id, version, updated_at) VALUES (%s, 1, %s)
+        ON CONFLICT (user_id) DO UPDATE
+        SET version = user_shot_versions.version + 1, updated_at = EXCLUDED.updated_at
+    """, (user_id, now))
+
 def save_shot_to_db(data):
     conn = get_db_connection()
     cur = conn.cursor()
@@ -533,9 +236,15 @@ INSERT INTO shots (
         data.get("feedback"),
         data.get("timestamp") or now
     ))
+    user_id = data.get("user_id")
+    if user_id:
+        _bump_shot_version(cur, user_id, now)
     conn.commit()
     cur.close()
     conn.close()
+    if user_id:
+        # 대시보드 캐시 무효화 (cache_bus로 user_web 워커까지 전파)
+        entity_cache.invalidate("dashboard", user_id)
 
 def get_last_shot(user_id):
     conn = get_db_connection()
@@ -588,9 +297,10 @@ def set_active_session(store_id, bay_id, user_id):
 def clear_active_session(store_id, bay_id):
     conn = get_db_connection()
     cur = conn.cursor()
-    cur.execute("""
-        DELETE FROM active_sessions WHERE store_id = %s AND bay_id = %s
-    """, (store_id, bay_id))
+    bay_cond, bay_value = bay_filter(cur, store_id, bay_id)
+    cur.execute(f"""
+        DELETE FROM active_sessions WHERE store_id = %s AND {bay_cond}
+    """, (store_id, bay_value))
     conn.commit()
     deleted_count = cur.rowcount
     cur.close()
@@ -600,9 +310,10 @@ def clear_active_session(store_id, bay_id):
 def get_active_user(store_id, bay_id):
     conn = get_db_connection()
     cur = conn.cursor(cursor_factory=RealDictCursor)
-    cur.execute("""
-        SELECT user_id, login_time FROM active_sessions WHERE store_id = %s AND bay_id = %s
-    """, (store_id, bay_id))
+    bay_cond, bay_value = bay_filter(cur, store_id, bay_id)
+    cur.execute(f"""
+        SELECT user_id, login_time FROM active_sessions WHERE store_id = %s AND {bay_cond}
+    """, (store_id, bay_value))
     row = cur.fetchone()
     cur.close()
     conn.close()
@@ -625,147 +336,26 @@ def check_store(store_id, password):
 
 def get_bays(store_id):
     """매장의 전체 타석 목록 조회 (PC 등록 상태 및 유효성 포함)"""
-    from datetime import date
     conn = get_db_connection()
     cur = conn.cursor(cursor_factory=RealDictCursor)
-    
-    # 매장 정보 조회
-    cur.execute("SELECT bays_count, store_name FROM stores WHERE store_id = %s", (store_id,))
-    store = cur.fetchone()
-    if not store:
-        return []
-    
-    bays_count = store["bays_count"]
-    store_name = store.get("store_name", "")
-    today = date.today()
-    
-    # 전체 타석 조회 (bays_count만큼)
-    all_bays = []
-    for i in range(1, bays_count + 1):
-        bay_id = f"{i:02d}"
-        bay_dict = {
-            "store_id": store_id,
-            "bay_id": bay_id,
-            "status": "READY",
-            "user_id": "",
-            "last_update": "",
-            "bay_code": None,
-            "has_pc": False,
-            "is_valid": False,
-            "pc_status": None,
-            "pc_name": None
-        }
-        all_bays.append(bay_dict)
-    
-    # DB에 저장된 타석 정보 조회
+    # store_bay_status 뷰: 1..bays_count 타석 × bays/store_pcs/active_sessions (bay_number 등가 조인)
     cur.execute("""
-        SELECT * FROM bays WHERE store_id = %s ORDER BY bay_id
+        SELECT * FROM store_bay_status WHERE store_id = %s ORDER BY bay_number
     """, (store_id,))
-    db_bays = cur.fetchall()
-    
-    # DB 타석 정보로 업데이트
-    # bay_id는 UUID 문자열이므로 int() 변환 없이 직접 비교
-    for db_bay in db_bays:
-        bay_id = db_bay["bay_id"]
-        # bay_number가 있으면 bay_number로 매칭, 없으면 bay_id로 매칭
-        bay_number = db_bay.get("bay_number")
-        if bay_number and bay_number <= bays_count:
-            # bay_number로 매칭
-            for bay in all_bays:
-                if bay.get("bay_number") == bay_number:
-                    bay.update(dict(db_bay))
-                    break
-        else:
-            # bay_id로 직접 매칭 (레거시 지원)
-            for bay in all_bays:
-                if bay["bay_id"] == bay_id:
-                    bay.update(dict(db_bay))
-                    break
-    
-    # 각 타석의 PC 등록 상태 및 유효성 확인 (bay_id 포함)
-    cur.execute("""
-        SELECT bay_id, bay_name, pc_name, status, usage_end_date, approved_at
-        FROM store_pcs
-        WHERE store_name = %s
-    """, (store_name,))
-    pcs = cur.fetchall()
-    
-    # 각 타석의 PC 등록 상태 및 유효성 확인 (bay_id 우선 사용)
-    import re
-    for pc in pcs:
-        # 1. bay_id가 있으면 우선 사용
-        pc_bay_id = pc.get("bay_id")
-        if pc_bay_id and str(pc_bay_id).strip().isdigit():
-            try:
-                pc_bay_num = int(pc_bay_id)
-                if 1 <= pc_bay_num <= bays_count:
-                    bay_id = f"{pc_bay_num:02d}"
-                    for bay in all_bays:
-                        if bay["bay_id"] == bay_id:
-                            bay["has_pc"] = True
-                            bay["pc_status"] = pc.get("status")
-                            bay["pc_name"] = pc.get("pc_name")
-                            # 유효성 판정: status='active'이고 사용 기간이 유효한 경우
-                            if pc.get("status") == "active":
-                                usage_end_date = pc.get("usage_end_date")
-                                if usage_end_date:
-                                    if isinstance(usage_end_date, str):
-                                        from datetime import datetime
-                                        try:
-                                            usage_end_date = datetime.strptime(usage_end_date, "%Y-%m-%d").date()
-                                        except:
-                                            usage_end_date = None
-                                    if usage_end_date and usage_end_date >= today:
-                                        bay["is_valid"] = True
-                                else:
-                                    # 사용 기간이 없으면 무제한으로 간주
-                                    bay["is_valid"] = True
-                            break
-                    continue  # bay_id로 매칭했으면 다음 PC로
-            except (ValueError, TypeError):
-                pass
-        
-        # 2. bay_id가 없으면 bay_name에서 추출
-        bay_name = pc.get("bay_name", "")
-        if bay_name:
-            # "1번룸", "01번 타석", "1타석", "테스트매장-1번룸-PC" 등에서 숫자 추출
-            # 패턴: 숫자 뒤에 "번" 또는 숫자만 있는 경우
-            match = re.search(r'(\d+)\s*번|^(\d+)(?=\s|$)', str(bay_name))
-            if match:
-                pc_bay_num = int(match.group(1) or match.group(2))
-                if 1 <= pc_bay_num <= bays_count:
-                    bay_id = f"{pc_bay_num:02d}"
-                    for bay in all_bays:
-                        if bay["bay_id"] == bay_id:
-                            bay["has_pc"] = True
-                            bay["pc_status"] = pc.get("status")
-                            bay["pc_name"] = pc.get("pc_name")
-                            # 유효성 판정: status='active'이고 사용 기간이 유효한 경우
-                            if pc.get("status") == "active":
-                                usage_end_date = pc.get("usage_end_date")
-                                if usage_end_date:
-                                    if isinstance(usage_end_date, str):
-                                        from datetime import datetime
-                                        try:
-                                            usage_end_date = datetime.strptime(usage_end_date, "%Y-%m-%d").date()
-                                        except:
-                                            usage_end_date = None
-                                    if usage_end_date and usage_end_date >= today:
-                                        bay["is_valid"] = True
-                                else:
-                                    # 사용 기간이 없으면 무제한으로 간주
-                                    bay["is_valid"] = True
-                            break
-    
+    rows = cur.fetchall()
     cur.close()
     conn.close()
-    return all_bays
+    return [dict(row) for row in rows]
 
 def get_all_shots_by_store(store_id):
     conn = get_db_connection()
     cur = conn.cursor(cursor_factory=RealDictCursor)
     cur.execute("""
-        SELECT * FROM shots WHERE store_id = %s ORDER BY timestamp DESC LIMIT 100
+        SELECT s.*, u.gender AS owner_gender
+        FROM shots s
+        LEFT JOIN users u ON u.user_id = s.user_id
+        WHERE s.store_id = %s
+        ORDER BY s.timestamp DESC LIMIT 100
     """, (store_id,))
     rows = cur.fetchall()
     cur.close()
@@ -775,9 +365,15 @@ def get_all_shots_by_store(store_id):
 def get_shots_by_bay(store_id, bay_id):
     conn = get_db_connection()
     cur = conn.cursor(cursor_factory=RealDictCursor)
-    cur.execute("""
-        SELECT * FROM shots WHERE store_id = %s AND bay_id = %s ORDER BY timestamp DESC LIMIT 100
-    """, (store_id, bay_id))
+    bay_cond, bay_params = shot_bay_filter(cur, store_id, bay_id, prefix="s.")
+    # owner_gender: 저장된 색상 코드가 없는 기존 샷을 성별 기준으로 분류할 때 사용
+    cur.execute(f"""
+        SELECT s.*, u.gender AS owner_gender
+        FROM shots s
+        LEFT JOIN users u ON u.user_id = s.user_id
+        WHERE s.store_id = %s AND {bay_cond}
+        ORDER BY s.timestamp DESC LIMIT 100
+    """, (store_id, *bay_params))
     rows = cur.fetchall()
     cur.close()
     conn.close()
@@ -939,6 +535,8 @@ def create_store(store_id, store_name, password, contact=None, business_number=N
         
         # 6단계: 커밋
         conn.commit()
+        entity_cache.invalidate("store", store_id)
+        entity_cache.invalidate("bays", store_id)
         print(f"[SUCCESS] 매장 등록 완료: {store_id}, 타석 {len(created_bays)}개 생성")
         return True
         
@@ -1082,6 +680,10 @@ def approve_pc(pc_unique_id, store_id, bay_id, approved_by):
         """, (store_id, bay_id, pc_token, approved_by, pc_unique_id))
         
         conn.commit()
+        # 이전 매장/새 매장 타석 목록 모두 무효화 (PC 이동 포함)
+        entity_cache.invalidate("bays", store_id)
+        if pc_dict.get("store_id") and pc_dict.get("store_id") != store_id:
+            entity_cache.invalidate("bays", pc_dict.get("store_id"))
         
         # 업데이트된 정보 반환
         cur.execute("SELECT * FROM store_pcs WHERE pc_unique_id = %s", (pc_unique_id,))
@@ -1151,48 +753,21 @@ def get_store_pcs_by_store(store_name):
     conn = get_db_connection()
     cur = conn.cursor(cursor_factory=RealDictCursor)
     try:
-        # store_pcs 테이블에서 모든 필드 조회 (단순 쿼리)
+        # 타석 번호(bay_number) 순 정렬은 DB에서 처리
         cur.execute("""
             SELECT sp.*
             FROM store_pcs sp
             WHERE sp.store_name = %s 
-            ORDER BY sp.registered_at DESC
+            ORDER BY sp.bay_number NULLS LAST, sp.registered_at DESC
         """, (store_name,))
-        rows = cur.fetchall()
-        
-        # bay_id가 없으면 bay_name에서 추출
-        import re
         result = []
-        for row in rows:
-            try:
-                pc = dict(row)
-                # bay_id가 없거나 숫자가 아니면 bay_name에서 추출
-                bay_id = pc.get("bay_id")
-                if not bay_id or not str(bay_id).strip().isdigit():
-                    bay_name = pc.get("bay_name", "")
-                    if bay_name:
-                        # "1번룸", "01번 타석", "1타석", "테스트매장-1번룸-PC" 등에서 숫자 추출
-                        # 패턴: 숫자 뒤에 "번" 또는 숫자만 있는 경우
-                        match = re.search(r'(\d+)\s*번|^(\d+)(?=\s|$)', str(bay_name))
-                        if match:
-                            bay_num = int(match.group(1) or match.group(2))
-                            pc["bay_id"] = f"{bay_num:02d}"
-                result.append(pc)
-            except Exception as e:
-                print(f"PC 데이터 처리 오류: {e}")
-                continue
-        
-        # Python에서 bay_id 기준으로 정렬
-        def sort_key(pc):
-            bay_id = pc.get("bay_id", "")
-            try:
-                if bay_id and str(bay_id).strip().isdigit():
-                    return int(bay_id)
-                return 999
-            except:
-                return 999
-        
-        result.sort(key=sort_key)
+        for row in cur.fetchall():
+            pc = dict(row)
+            # bay_id가 없거나 숫자가 아니면 bay_number로 표시용 bay_id 채움
+            bay_id = pc.get("bay_id")
+            if (not bay_id or not str(bay_id).strip().isdigit()) and pc.get("bay_number") is not None:
+                pc["bay_id"] = f"{pc['bay_number']:02d}"
+            result.append(pc)
         
         return result
     except Exception as e:
@@ -1214,14 +789,29 @@ def get_all_store_pcs():
     conn.close()
     return [dict(row) for row in rows]
 
-def update_pc_last_seen(pc_unique_id):
-    """PC 마지막 접속 시간 업데이트"""
+def update_pc_last_seen(pc_unique_id, latency=None):
+    """
+    PC 마지막 접속 시간 업데이트
+
+    latency: 샷 수집 프로그램의 단계별 소요 시간 요약 dict (있으면 latency_summary에 최신 값 저장)
+    """
     conn = get_db_connection()
     cur = conn.cursor()
-    cur.execute(
-        "UPDATE store_pcs SET last_seen_at = CURRENT_TIMESTAMP WHERE pc_unique_id = %s",
-        (pc_unique_id,)
-    )
+    if latency:
+        import json
+        cur.execute(
+            """
+            UPDATE store_pcs
+            SET last_seen_at = CURRENT_TIMESTAMP, latency_summary = %s, latency_updated_at = CURRENT_TIMESTAMP
+            WHERE pc_unique_id = %s
+            """,
+            (json.dumps(latency), pc_unique_id)
+        )
+    else:
+        cur.execute(
+            "UPDATE store_pcs SET last_seen_at = CURRENT_TIMESTAMP WHERE pc_unique_id = %s",
+            (pc_unique_id,)
+        )
     conn.commit()
     cur.close()
     conn.close()
@@ -1382,7 +972,10 @@ def register_pc_with_code(registration_code, store_name, bay_name, pc_name, pc_i
         return None, str(e)
 
 def get_store_by_id(store_id):
-    """매장코드로 매장 정보 조회"""
+    """매장코드로 매장 정보 조회 (엔티티 캐시, create_store 후 무효화)"""
+    return entity_cache.get("store", store_id, lambda: _load_store_by_id(store_id))
+
+def _load_store_by_id(store_id):
     conn = get_db_connection()
     cur = conn.cursor(cursor_factory=RealDictCursor)
     cur.execute("SELECT * FROM stores WHERE store_id = %s", (store_id,))
@@ -1553,6 +1146,7 @@ def approve_extension_request(request_id, decided_by, approved_until, reason=Non
         """, (decided_by, reason, request_id))
         
         conn.commit()
+        entity_cache.invalidate("bays", request.get("store_id"))
         cur.close()
         conn.close()
         return True, None
@@ -0,0 +1,282 @@
+-- ============================================
+-- 0001 기준 스키마 (기존 init_db DDL 통합)
+-- ============================================
+-- api / store_admin / super_admin / user_web 각 init_db()가 만들던
+-- 테이블/컬럼/인덱스의 합집합. 모두 IF NOT EXISTS라 기존 DB에는 빠진 것만 추가된다.
+
+-- 1️⃣ 유저 테이블
+CREATE TABLE IF NOT EXISTS users (
+    user_id TEXT PRIMARY KEY,
+    password TEXT NOT NULL,
+    name TEXT,
+    phone TEXT,
+    gender TEXT CHECK(gender IN ('남','여','M','F')) NOT NULL,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+ALTER TABLE users ADD COLUMN IF NOT EXISTS name TEXT;
+ALTER TABLE users ADD COLUMN IF NOT EXISTS phone TEXT;
+ALTER TABLE users ADD COLUMN IF NOT EXISTS birth_date TEXT;
+
+-- phone 컬럼에 UNIQUE 제약조건 추가 (중복 가입 방지)
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint
+        WHERE conname = 'users_phone_unique'
+    ) THEN
+        ALTER TABLE users ADD CONSTRAINT users_phone_unique UNIQUE (phone);
+    END IF;
+END $$;
+
+-- 2️⃣ 샷 테이블
+CREATE TABLE IF NOT EXISTS shots (
+    id SERIAL PRIMARY KEY,
+    store_id TEXT,
+    bay_id TEXT,
+    user_id TEXT,
+    club_id TEXT,
+    ball_speed REAL,
+    club_speed REAL,
+    launch_angle REAL,
+    smash_factor REAL,
+    face_angle REAL,
+    club_path REAL,
+    lateral_offset REAL,
+    direction_angle REAL,
+    side_spin INTEGER,
+    back_spin INTEGER,
+    total_distance REAL,
+    carry REAL,
+    feedback TEXT,
+    timestamp TEXT
+);
+
+ALTER TABLE shots ADD COLUMN IF NOT EXISTS side_spin INTEGER;
+ALTER TABLE shots ADD COLUMN IF NOT EXISTS back_spin INTEGER;
+ALTER TABLE shots ADD COLUMN IF NOT EXISTS lateral_offset REAL;
+ALTER TABLE shots ADD COLUMN IF NOT EXISTS direction_angle REAL;
+ALTER TABLE shots ADD COLUMN IF NOT EXISTS total_distance REAL;
+ALTER TABLE shots ADD COLUMN IF NOT EXISTS carry REAL;
+
+-- 3️⃣ 매장 테이블 (확장)
+CREATE TABLE IF NOT EXISTS stores (
+    store_id   TEXT PRIMARY KEY,
+    store_name TEXT,
+    admin_pw   TEXT,
+    bays_count INTEGER,
+    subscription_status TEXT DEFAULT 'active',
+    subscription_start_date TEXT,
+    subscription_end_date TEXT,
+    payment_plan TEXT,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+ALTER TABLE stores ADD COLUMN IF NOT EXISTS subscription_status TEXT;
+ALTER TABLE stores ADD COLUMN IF NOT EXISTS subscription_start_date TEXT;
+ALTER TABLE stores ADD COLUMN IF NOT EXISTS subscription_end_date TEXT;
+ALTER TABLE stores ADD COLUMN IF NOT EXISTS payment_plan TEXT;
+ALTER TABLE stores ADD COLUMN IF NOT EXISTS created_at TEXT;
+
+-- 매장 정보 컬럼
+ALTER TABLE stores ADD COLUMN IF NOT EXISTS contact TEXT;
+ALTER TABLE stores ADD COLUMN IF NOT EXISTS business_number TEXT;
+ALTER TABLE stores ADD COLUMN IF NOT EXISTS owner_name TEXT;
+ALTER TABLE stores ADD COLUMN IF NOT EXISTS birth_date TEXT;
+ALTER TABLE stores ADD COLUMN IF NOT EXISTS email TEXT;
+ALTER TABLE stores ADD COLUMN IF NOT EXISTS address TEXT;
+
+-- 매장 등록 요청/승인
+ALTER TABLE stores ADD COLUMN IF NOT EXISTS status TEXT DEFAULT 'pending';
+ALTER TABLE stores ADD COLUMN IF NOT EXISTS requested_at TEXT DEFAULT CURRENT_TIMESTAMP;
+ALTER TABLE stores ADD COLUMN IF NOT EXISTS approved_at TEXT;
+ALTER TABLE stores ADD COLUMN IF NOT EXISTS approved_by TEXT;
+
+-- 4️⃣ 타석 테이블
+CREATE TABLE IF NOT EXISTS bays (
+    store_id    TEXT,
+    bay_id      TEXT,
+    bay_number  INTEGER,
+    bay_name    TEXT,
+    status      TEXT,
+    user_id     TEXT,
+    last_update TEXT,
+    bay_code    TEXT UNIQUE,
+    assigned_pc_unique_id TEXT,
+    PRIMARY KEY (store_id, bay_id)
+);
+
+ALTER TABLE bays ADD COLUMN IF NOT EXISTS bay_code TEXT;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_bay_code ON bays(bay_code);
+ALTER TABLE bays ADD COLUMN IF NOT EXISTS bay_number INTEGER;
+ALTER TABLE bays ADD COLUMN IF NOT EXISTS bay_name TEXT;
+ALTER TABLE bays ADD COLUMN IF NOT EXISTS assigned_pc_unique_id TEXT;
+
+-- 유니크 제약조건 (store_id, bay_number) 중복 방지
+CREATE UNIQUE INDEX IF NOT EXISTS ux_bays_store_baynumber
+ON bays(store_id, bay_number)
+WHERE bay_number IS NOT NULL;
+
+-- 5️⃣ 활성 세션 테이블
+CREATE TABLE IF NOT EXISTS active_sessions (
+    store_id    TEXT,
+    bay_id      TEXT,
+    user_id     TEXT,
+    login_time  TEXT DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (store_id, bay_id)
+);
+
+-- 6️⃣ 결제 테이블
+CREATE TABLE IF NOT EXISTS payments (
+    id SERIAL PRIMARY KEY,
+    store_id TEXT,
+    amount REAL,
+    payment_date TEXT,
+    payment_method TEXT,
+    status TEXT DEFAULT 'pending',
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+-- 7️⃣ 구독 테이블
+CREATE TABLE IF NOT EXISTS subscriptions (
+    id SERIAL PRIMARY KEY,
+    store_id TEXT,
+    start_date TEXT,
+    end_date TEXT,
+    status TEXT DEFAULT 'active',
+    plan_type TEXT,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+-- 8️⃣ 매장 PC 테이블
+CREATE TABLE IF NOT EXISTS store_pcs (
+    id SERIAL PRIMARY KEY,
+    store_id TEXT,
+    store_name TEXT NOT NULL,
+    bay_id TEXT,
+    bay_name TEXT NOT NULL,
+    pc_name TEXT NOT NULL,
+    pc_unique_id TEXT UNIQUE NOT NULL,
+    pc_uuid TEXT,
+    mac_address TEXT,
+    pc_hostname TEXT,
+    pc_platform TEXT,
+    pc_info JSONB,
+    pc_token TEXT UNIQUE,
+    registered_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    last_seen_at TEXT,
+    status TEXT DEFAULT 'pending',
+    approved_at TEXT,
+    approved_by TEXT,
+    usage_start_date TEXT,
+    usage_end_date TEXT,
+    notes TEXT
+);
+
+ALTER TABLE store_pcs ADD COLUMN IF NOT EXISTS store_id TEXT;
+ALTER TABLE store_pcs ADD COLUMN IF NOT EXISTS bay_id TEXT;
+ALTER TABLE store_pcs ADD COLUMN IF NOT EXISTS pc_uuid TEXT;
+ALTER TABLE store_pcs ADD COLUMN IF NOT EXISTS mac_address TEXT;
+ALTER TABLE store_pcs ADD COLUMN IF NOT EXISTS pc_token TEXT;
+ALTER TABLE store_pcs ADD COLUMN IF NOT EXISTS bay_number INTEGER;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_pc_unique_id ON store_pcs(pc_unique_id);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_pc_token ON store_pcs(pc_token) WHERE pc_token IS NOT NULL;
+
+-- DB 레벨 보호: active 상태 PC는 매장 내 bay_id 중복 금지 (부분 인덱스)
+CREATE UNIQUE INDEX IF NOT EXISTS uq_store_bay_id_active
+ON store_pcs (store_id, bay_id)
+WHERE status = 'active' AND bay_id IS NOT NULL;
+
+-- 9️⃣ PC 등록 코드 테이블
+CREATE TABLE IF NOT EXISTS pc_registration_codes (
+    id SERIAL PRIMARY KEY,
+    code TEXT UNIQUE NOT NULL,
+    status TEXT DEFAULT 'ACTIVE',
+    issued_by TEXT,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    revoked_at TEXT,
+    notes TEXT
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_registration_code ON pc_registration_codes(code);
+CREATE INDEX IF NOT EXISTS idx_registration_code_status ON pc_registration_codes(status);
+
+-- 🔟 PC 연장 요청 테이블 (요청 기반 봉합)
+CREATE TABLE IF NOT EXISTS pc_extension_requests (
+    id SERIAL PRIMARY KEY,
+    pc_id TEXT NOT NULL,
+    pc_unique_id TEXT,
+    store_id TEXT NOT NULL,
+    requested_by TEXT NOT NULL,
+    requested_until DATE,
+    status TEXT DEFAULT 'REQUESTED' CHECK(status IN ('REQUESTED', 'APPROVED', 'REJECTED')),
+    decided_by TEXT,
+    decided_at TEXT,
+    reason TEXT,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (pc_unique_id) REFERENCES store_pcs(pc_unique_id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_extension_request_pc ON pc_extension_requests(pc_unique_id);
+CREATE INDEX IF NOT EXISTS idx_extension_request_store ON pc_extension_requests(store_id);
+CREATE INDEX IF NOT EXISTS idx_extension_request_status ON pc_extension_requests(status);
+
+-- 1️⃣1️⃣ Audit 로그 테이블 (모든 중요 액션 기록)
+CREATE TABLE IF NOT EXISTS audit_logs (
+    id SERIAL PRIMARY KEY,
+    actor_role TEXT NOT NULL,
+    actor_id TEXT NOT NULL,
+    action TEXT NOT NULL,
+    target_type TEXT,
+    target_id TEXT,
+    before_state JSONB,
+    after_state JSONB,
+    ip_address TEXT,
+    user_agent TEXT,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_audit_actor ON audit_logs(actor_role, actor_id);
+CREATE INDEX IF NOT EXISTS idx_audit_action ON audit_logs(action);
+CREATE INDEX IF NOT EXISTS idx_audit_target ON audit_logs(target_type, target_id);
+CREATE INDEX IF NOT EXISTS idx_audit_created ON audit_logs(created_at);
+
+-- 1️⃣2️⃣ 좌표 파일 테이블 (api 좌표 업로드/다운로드)
+CREATE TABLE IF NOT EXISTS coordinates (
+    id SERIAL PRIMARY KEY,
+    brand VARCHAR(50) NOT NULL,
+    resolution VARCHAR(20) NOT NULL,
+    version INTEGER NOT NULL,
+    filename VARCHAR(100) NOT NULL,
+    payload JSONB NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (brand, resolution, version)
+);
+
+CREATE INDEX IF NOT EXISTS idx_coordinates_brand ON coordinates(brand);
+CREATE INDEX IF NOT EXISTS idx_coordinates_brand_filename ON coordinates(brand, filename);
+
+-- 기존 테이블 데이터 이관 (pc_registration_keys → pc_registration_codes, 테이블이 있을 때만)
+DO $$
+BEGIN
+    IF to_regclass('public.pc_registration_keys') IS NOT NULL THEN
+        INSERT INTO pc_registration_codes (code, status, issued_by, created_at, notes)
+        SELECT registration_key,
+               CASE
+                   WHEN status = 'active' THEN 'ACTIVE'
+                   ELSE 'REVOKED'
+               END,
+               created_by,
+               created_at::text,
+               notes
+        FROM pc_registration_keys
+        WHERE NOT EXISTS (
+            SELECT 1 FROM pc_registration_codes WHERE code = pc_registration_keys.registration_key
+        );
+    END IF;
+EXCEPTION WHEN OTHERS THEN
+    RAISE NOTICE 'pc_registration_keys 이관 건너뜀: %', SQLERRM;
+END $$;
+
+-- ⚠️ seed 데이터 없음 (기본 매장/타석은 운영 환경에서 자동 생성하지 않음)
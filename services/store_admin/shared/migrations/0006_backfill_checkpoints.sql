@@ -0,0 +1,18 @@
+-- ============================================
+-- 0006 온라인 백필 체크포인트 (shared/backfill.py)
+-- ============================================
+-- 작업 이름별 진행 위치. 청크 UPDATE와 같은 트랜잭션에서 갱신되어 중단 후 그대로 재개한다.
+-- min_id: 작업 시작 시 처리 구간의 시작 id (MIN(id) - 1, 진행률 계산용)
+
+CREATE TABLE IF NOT EXISTS backfill_checkpoints (
+    job          TEXT PRIMARY KEY,
+    table_name   TEXT NOT NULL,
+    min_id       BIGINT,
+    last_id      BIGINT NOT NULL DEFAULT 0,
+    max_id       BIGINT,
+    rows_done    BIGINT NOT NULL DEFAULT 0,
+    rows_changed BIGINT NOT NULL DEFAULT 0,
+    started_at   TEXT DEFAULT CURRENT_TIMESTAMP,
+    updated_at   TEXT,
+    finished_at  TEXT
+);
@@ -1,25 +1,16 @@
 # ===== services/store_admin/utils.py (매장 관리자 서비스 유틸리티) =====
-import json
 import os
 
-# 기준값 로드
+from shared.criteria_engine import get_engine
+
+# 기준값 로드 (criteria.json 컴파일, 파일 변경 시 자동 재컴파일)
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 CRITERIA_PATH = os.path.join(BASE_DIR, "config", "criteria.json")
-
-try:
-    with open(CRITERIA_PATH, "r", encoding="utf-8") as f:
-        CRITERIA = json.load(f)
-except Exception:
-    CRITERIA = {}
+CRITERIA_ENGINE = get_engine(CRITERIA_PATH)
 
 def _get_rule(club_id, metric):
     """criteria.json에서 클럽/지표별 기준값 가져오기"""
-    cid = (club_id or "").lower()
-    club_cfg = CRITERIA.get(cid, {})
-    if metric in club_cfg:
-        return club_cfg[metric]
-    default_cfg = CRITERIA.get("default", {})
-    return default_cfg.get(metric)
+    return CRITERIA_ENGINE.current().raw_rule(club_id, metric)
 
 def score_class(value, good, warn=None):
     """기본 점수 분류"""
@@ -42,42 +33,11 @@ def score_class(value, good, warn=None):
 
 def classify_by_criteria(value, club_id, metric, *, fallback_good=None, fallback_warn=None, abs_value=False):
     """criteria.json 기반 색상 클래스 결정"""
-    if value is None:
-        return "bg-none"
-    try:
-        v = float(value)
-    except Exception:
-        return "bg-none"
-    if abs_value:
-        v = abs(v)
-    rule = _get_rule(club_id, metric)
-    if rule:
-        good = rule.get("good")
-        warn = rule.get("warn")
-        bad = rule.get("bad")
-        if isinstance(good, (list, tuple)) and len(good) == 2:
-            low, high = float(good[0]), float(good[1])
-            return "bg-good" if (low <= v <= high) else "bg-bad"
-        if good is not None and bad is not None:
-            g = float(good)
-            b = float(bad)
-            if v >= g:
-                return "bg-good"
-            if v <= b:
-                return "bg-bad"
-            return "bg-warn"
-        if good is not None and warn is not None:
-            g = float(good)
-            w = float(warn)
-            if v <= g:
-                return "bg-good"
-            elif v <= w:
-                return "bg-warn"
-            else:
-                return "bg-bad"
-        if good is not None:
-            g = float(good)
-            return "bg-good" if v >= g else "bg-bad"
-    if fallback_good is None:
-        return "bg-none"
-    return score_class(v, fallback_good, fallback_warn)
+    return CRITERIA_ENGINE.current().classify(
+        value, club_id, metric,
+        fallback_good=fallback_good, fallback_warn=fallback_warn, abs_value=abs_value,
+    )
+
+def apply_criteria_classes(shot, gender=None):
+    """샷 dict에 색상 클래스(*_class) 추가 (조회 시 사용, gender는 샷 주인 성별, 구현은 CompiledCriteria.apply_classes)"""
+    return CRITERIA_ENGINE.current().apply_classes(shot, gender=gender)
@@ -23,6 +23,7 @@ from datetime import datetime
 from shared.flask_utils import create_flask_app
 from shared import database
 from shared.auth import require_role
+from shared.bay_keys import bay_filter
 
 # Flask 앱 생성 (공통 설정 포함 - 보안 헤더, 세션 설정 등)
 app = create_flask_app('super_admin', __file__)
@@ -45,6 +46,19 @@ except Exception as e:
     print(f"[WARNING] Database initialization failed: {e}", flush=True)
     # 데이터베이스 초기화 실패해도 애플리케이션은 기동 가능
 
+# 중단된 매장 삭제 작업 재개 (대기 중인 작업이 없으면 조회 1회 후 종료)
+database.start_store_deletion_worker()
+
+# =========================
+# 매장 현황 캐시 무효화
+# =========================
+@app.after_request
+def invalidate_fleet_cache(response):
+    """변경 API(POST) 성공 시 매장 현황 캐시 무효화 - 승인/삭제/연장 결과가 즉시 보이도록"""
+    if request.method == "POST" and response.status_code < 400:
+        database.invalidate_fleet_overview()
+    return response
+
 # =========================
 # 타석 표시 형식 통일 헬퍼 함수
 # =========================
@@ -107,46 +121,12 @@ def super_admin_login():
 @require_role("super_admin")
 def super_admin_dashboard():
     try:
-        from datetime import date
-        from psycopg2.extras import RealDictCursor
-        conn = database.get_db_connection()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
-        cur.execute("SELECT * FROM stores ORDER BY requested_at DESC NULLS LAST, store_id")
-        stores = [dict(row) for row in cur.fetchall()]
-        
-        # 각 매장의 유효한 타석 수 계산
-        today = date.today()
-        for store in stores:
-            store_id = store.get("store_id")
-            total_bays = store.get("bays_count", 0)
-            
-            # 유효한 PC 개수 계산 (status='active'이고 사용 기간이 유효한 경우)
-            cur.execute("""
-                SELECT COUNT(*) as valid_count
-                FROM store_pcs
-                WHERE store_id = %s
-                  AND status = 'active'
-                  AND (usage_end_date IS NULL OR usage_end_date >= %s)
-            """, (store_id, today))
-            result = cur.fetchone()
-            valid_count = result['valid_count'] if result else 0
-            
-            store['valid_bays_count'] = valid_count
-            store['total_bays_count'] = total_bays
-        
-        cur.close()
-        conn.close()
-        
-        # 통계 정보
-        stats = {
-            "total_stores": len(stores),
-            "active_stores": len([s for s in stores if s.get("subscription_status") == "active"]),
-            "expired_stores": len([s for s in stores if s.get("subscription_status") == "expired"]),
-            "pending_stores": len([s for s in stores if s.get("status") == "pending"]),
-        }
+        # 매장별 타석/세션/오늘 샷 집계를 1회 쿼리로 조회 (짧은 TTL 캐시)
+        stores = database.get_fleet_overview()
+        stats = database.get_fleet_stats(stores)
         
-        # Emergency 모드 상태 전달
-        emergency_mode = session.get("emergency_mode", False)
+        # Emergency 모드 상태 전달 (system_settings - 모든 워커/세션 공통)
+        emergency_mode = database.get_emergency_mode()
         
         return render_template("super_admin_dashboard.html",
                              emergency_mode=emergency_mode,
@@ -165,152 +145,23 @@ def super_admin_dashboard():
 def store_bays_detail(store_id):
     """매장별 타석 현황 상세 페이지"""
     try:
-        from datetime import date
-        from psycopg2.extras import RealDictCursor
-        import re
-        
-        conn = database.get_db_connection()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
-        
-        # 매장 정보 조회
-        cur.execute("SELECT * FROM stores WHERE store_id = %s", (store_id,))
-        store = cur.fetchone()
+        # 매장 + 타석/PC/활성 세션 상태를 store_bay_status 뷰에서 1회 조회 (타석 번호순)
+        store, all_bays = database.get_store_bay_status(store_id)
         if not store:
             return "매장을 찾을 수 없습니다.", 404
         
-        store = dict(store)
-        total_bays_count = store.get("bays_count", 0)
-        store_name = store.get("store_name", "")
-        today = date.today()
-        
-        # 전체 타석 목록 생성
-        all_bays = []
-        for i in range(1, total_bays_count + 1):
-            bay_id = f"{i:02d}"
-            bay_dict = {
-                "store_id": store_id,
-                "bay_id": bay_id,
-                "status": "READY",
-                "user_id": "",
-                "last_update": "",
-                "bay_code": None,
-                "has_pc": False,
-                "is_valid": False,
-                "pc_status": None,
-                "pc_name": None,
-                "pc_unique_id": None,
-                "usage_start_date": None,
-                "usage_end_date": None,
-                "approved_at": None,
-                "approved_by": None,
-                "notes": None
-            }
-            all_bays.append(bay_dict)
-        
-        # DB에 저장된 타석 정보 조회
-        cur.execute("""
-            SELECT * FROM bays WHERE store_id = %s ORDER BY bay_id
-        """, (store_id,))
-        db_bays = cur.fetchall()
-        
-        # DB 타석 정보로 업데이트
-        for db_bay in db_bays:
-            bay_id = db_bay["bay_id"]
-            for bay in all_bays:
-                if bay["bay_id"] == bay_id:
-                    bay.update(dict(db_bay))
-                    break
-        
-        # 각 타석의 PC 등록 상태 및 유효성 확인 (store_id와 bay_id로 직접 매칭)
-        cur.execute("""
-            SELECT bay_id, bay_name, pc_name, pc_unique_id, status, usage_start_date, usage_end_date, 
-                   approved_at, approved_by, notes
-            FROM store_pcs
-            WHERE store_id = %s
-        """, (store_id,))
-        pcs = cur.fetchall()
+        total_bays_count = store.get("bays_count") or 0
+        valid_bays_count = sum(1 for bay in all_bays if bay["is_valid"])
         
-        # bay_id로 직접 매칭 (더 정확함)
-        for pc in pcs:
-            pc_bay_id = pc.get("bay_id")
-            if not pc_bay_id:
-                # bay_id가 없으면 bay_name에서 추출
-                bay_name = pc.get("bay_name", "")
-                match = re.search(r'(\d+)', str(bay_name))
-                if match:
-                    pc_bay_id = f"{int(match.group(1)):02d}"
-                else:
-                    continue
-            
-            # bay_id로 매칭
-            for bay in all_bays:
-                if bay["bay_id"] == pc_bay_id:
-                    bay["has_pc"] = True
-                    bay["pc_status"] = pc.get("status")
-                    bay["pc_name"] = pc.get("pc_name")
-                    bay["pc_unique_id"] = pc.get("pc_unique_id")
-                    bay["usage_start_date"] = pc.get("usage_start_date")
-                    bay["usage_end_date"] = pc.get("usage_end_date")
-                    bay["approved_at"] = pc.get("approved_at")
-                    bay["approved_by"] = pc.get("approved_by")
-                    bay["notes"] = pc.get("notes")
-                    
-                    # 유효성 판정
-                    if pc.get("status") == "active":
-                        usage_end_date = pc.get("usage_end_date")
-                        if usage_end_date:
-                            if isinstance(usage_end_date, str):
-                                from datetime import datetime
-                                try:
-                                    usage_end_date = datetime.strptime(usage_end_date, "%Y-%m-%d").date()
-                                except:
-                                    usage_end_date = None
-                            if usage_end_date and usage_end_date >= today:
-                                bay["is_valid"] = True
-                        else:
-                            bay["is_valid"] = True
-                    break
-        
-        # 유효한 타석 수 계산
-        valid_bays_count = sum(1 for bay in all_bays if bay.get("is_valid", False))
-        
-        # 모든 매장 목록 (드롭다운용)
-        cur.execute("SELECT store_id, store_name FROM stores ORDER BY store_name, store_id")
-        all_stores = [dict(row) for row in cur.fetchall()]
+        # 활성 세션 (템플릿 호환용 매핑)
+        active_sessions = [
+            {"store_id": store_id, "bay_id": bay["bay_id"], "user_id": bay["active_user"], "login_time": bay["login_time"]}
+            for bay in all_bays if bay["active_user"]
+        ]
+        bay_active_users = {f"{store_id}_{s['bay_id']}": s for s in active_sessions}
         
-        cur.close()
-        conn.close()
-        
-        # 슈퍼 관리자 대리 조회: 매장 관리자 대시보드 템플릿 재사용
-        # store_admin의 dashboard 로직과 동일하게 데이터 준비
-        from datetime import date
-        today = date.today()
-        
-        # 활성 세션 조회
-        active_sessions = database.get_all_active_sessions(store_id)
-        
-        # 샷 데이터 조회
-        rows = database.get_all_shots_by_store(store_id)
-        shots = []
-        for r in rows[:20]:  # 최근 20개만
-            s = dict(r)
-            shots.append(s)
-        
-        # 타석별 활성 사용자 매핑
-        bay_active_users = {}
-        for session_info in active_sessions:
-            key = f"{session_info['store_id']}_{session_info['bay_id']}"
-            bay_active_users[key] = session_info
-        
-        # 각 타석에 활성 사용자 정보 추가
-        for bay in all_bays:
-            bay_key = f"{store_id}_{bay['bay_id']}"
-            if bay_key in bay_active_users:
-                bay['active_user'] = bay_active_users[bay_key].get('user_id')
-                bay['login_time'] = bay_active_users[bay_key].get('login_time')
-            else:
-                bay['active_user'] = None
-                bay['login_time'] = None
+        # 샷 데이터 조회 (최근 20개만)
+        shots = [dict(r) for r in database.get_all_shots_by_store(store_id)[:20]]
         
         # 슈퍼 관리자 대리 조회: 매장 관리자 대시보드 템플릿 재사용
         return render_template("store_admin_dashboard_impersonate.html",
@@ -338,34 +189,11 @@ def bay_shots(store_id, bay_id):
         store_admin_dir = os.path.join(current_dir, '../store_admin')
         if store_admin_dir not in sys.path:
             sys.path.insert(0, store_admin_dir)
-        from utils import classify_by_criteria
+        from utils import apply_criteria_classes
         
         rows = database.get_shots_by_bay(store_id, bay_id)
-        shots = []
-        for r in rows:
-            s = dict(r)
-            club_id = s.get("club_id") or ""
-            
-            # 색상 클래스 추가
-            bs = s.get("ball_speed")
-            sf = s.get("smash_factor")
-            fa = s.get("face_angle")
-            cp = s.get("club_path")
-            lo = s.get("lateral_offset")
-            da = s.get("direction_angle")
-            ss = s.get("side_spin")
-            bk = s.get("back_spin")
-            
-            s["ball_speed_class"] = classify_by_criteria(bs, club_id, "ball_speed", fallback_good=60)
-            s["smash_class"] = classify_by_criteria(sf, club_id, "smash_factor", fallback_good=1.45)
-            s["face_class"] = classify_by_criteria(fa, club_id, "face_angle", abs_value=True, fallback_good=2.0, fallback_warn=4.0)
-            s["path_class"] = classify_by_criteria(cp, club_id, "club_path", abs_value=True, fallback_good=2.0, fallback_warn=4.0)
-            s["lateral_class"] = classify_by_criteria(lo, club_id, "lateral_offset", abs_value=True, fallback_good=3.0, fallback_warn=6.0)
-            s["direction_class"] = classify_by_criteria(da, club_id, "direction_angle", abs_value=True, fallback_good=3.0, fallback_warn=6.0)
-            s["side_spin_class"] = classify_by_criteria(ss, club_id, "side_spin", abs_value=True, fallback_good=300, fallback_warn=600)
-            s["back_spin_class"] = classify_by_criteria(bk, club_id, "back_spin", fallback_good=None)
-            
-            shots.append(s)
+        # 색상 클래스는 저장 시 계산된 criteria_classes 사용
+        shots = [apply_criteria_classes(dict(r), gender=r.get("owner_gender")) for r in rows]
         
         return render_template("bay_shots.html", 
                              store_id=store_id,
@@ -492,19 +320,19 @@ def get_all_extension_requests(store_id):
 def toggle_emergency():
     """Emergency 모드 토글"""
     try:
-        current_mode = session.get("emergency_mode", False)
+        current_mode = database.get_emergency_mode()
         new_mode = not current_mode
         
-        session["emergency_mode"] = new_mode
-        
         # Audit 로그
         from flask import request as flask_request
         actor_id = session.get("user_id", "super_admin")
+        database.set_emergency_mode(new_mode, updated_by=actor_id)
         database.log_audit(
             actor_role="super_admin",
             actor_id=actor_id,
             action="TOGGLE_EMERGENCY_MODE",
             target_type="system",
+            before_state={"emergency_mode": current_mode},
             after_state={"emergency_mode": new_mode},
             ip_address=flask_request.remote_addr,
             user_agent=flask_request.headers.get("User-Agent")
@@ -526,7 +354,7 @@ def update_bay_settings():
     """타석 설정 업데이트 (기간, 상태 등) - Emergency 모드에서만 허용 (CRITICAL 3)"""
     try:
         # Emergency 모드 체크
-        emergency_mode = session.get("emergency_mode", False)
+        emergency_mode = database.get_emergency_mode()
         if not emergency_mode:
             return jsonify({
                 "success": False, 
@@ -583,7 +411,8 @@ def update_bay_settings():
                 return jsonify({"success": False, "message": "등록된 PC를 찾을 수 없습니다."}), 404
         else:
             # PC가 등록되지 않은 타석인 경우: bays 테이블에 타석이 존재하는지 확인하고 생성
-            cur.execute("SELECT COUNT(*) as count FROM bays WHERE store_id = %s AND bay_id = %s", (store_id, bay_id))
+            bay_cond, bay_value = bay_filter(cur, store_id, bay_id)
+            cur.execute(f"SELECT COUNT(*) as count FROM bays WHERE store_id = %s AND {bay_cond}", (store_id, bay_value))
             bay_exists = cur.fetchone()
             bay_exists_count = bay_exists.get("count", 0) if bay_exists else 0
             if bay_exists_count == 0:
@@ -598,13 +427,15 @@ def update_bay_settings():
         
         # bays 테이블의 status 업데이트 (타석 사용 가능 여부)
         bay_status = "READY" if status == "active" else "BUSY" if status == "pending" else "UNAVAILABLE"
-        cur.execute("""
+        bay_cond, bay_value = bay_filter(cur, store_id, bay_id)
+        cur.execute(f"""
             UPDATE bays 
             SET status = %s
-            WHERE store_id = %s AND bay_id = %s
-        """, (bay_status, store_id, bay_id))
+            WHERE store_id = %s AND {bay_cond}
+        """, (bay_status, store_id, bay_value))
         
         conn.commit()
+        database.invalidate_store_entities(store_id)
         cur.close()
         conn.close()
         
@@ -618,37 +449,12 @@ def update_bay_settings():
 @require_role("super_admin")
 def manage_stores():
     try:
-        from datetime import date
-        from psycopg2.extras import RealDictCursor
-        conn = database.get_db_connection()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
-        cur.execute("SELECT * FROM stores ORDER BY requested_at DESC NULLS LAST, store_id")
-        stores = [dict(row) for row in cur.fetchall()]
-        
-        # 각 매장의 유효한 타석 수 계산
-        today = date.today()
-        for store in stores:
-            store_id = store.get("store_id")
-            total_bays = store.get("bays_count", 0)
-            
-            # 유효한 PC 개수 계산
-            cur.execute("""
-                SELECT COUNT(*) as valid_count
-                FROM store_pcs
-                WHERE store_id = %s
-                  AND status = 'active'
-                  AND (usage_end_date IS NULL OR usage_end_date >= %s)
-            """, (store_id, today))
-            result = cur.fetchone()
-            valid_count = result['valid_count'] if result else 0
-            
-            store['valid_bays_count'] = valid_count
-            store['total_bays_count'] = total_bays
+        stores = database.get_fleet_overview()
+        deletion_jobs = database.get_store_deletion_jobs()
+        deleting = {j["store_id"]: j for j in deletion_jobs if j["status"] in ("queued", "running")}
         
-        cur.close()
-        conn.close()
-        
-        return render_template("manage_stores.html", stores=stores)
+        return render_template("manage_stores.html", stores=stores,
+                               deletion_jobs=deletion_jobs, deleting=deleting)
     except Exception as e:
         import traceback
         traceback.print_exc()
@@ -662,21 +468,10 @@ def manage_stores():
 def store_requests():
     """매장 등록 요청 관리 (승인 대기 + 승인 완료)"""
     try:
-        # 승인 대기 중인 매장
-        pending_stores = database.get_pending_stores()
-        
-        # 승인 완료된 매장 (status가 'approved'이거나 NULL인 경우도 포함 - 대시보드와 동일하게)
-        from psycopg2.extras import RealDictCursor
-        conn = database.get_db_connection()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
-        # 대시보드와 동일하게 모든 매장 조회 (status 필터 제거)
-        cur.execute("""
-            SELECT * FROM stores 
-            ORDER BY requested_at DESC NULLS LAST, store_id
-        """)
-        approved_stores = [dict(row) for row in cur.fetchall()]
-        cur.close()
-        conn.close()
+        # 대시보드와 동일한 매장 현황 캐시 사용 (승인 완료 목록은 status 필터 없이 전체 매장)
+        approved_stores = database.get_fleet_overview()
+        # 승인 대기 중인 매장 (requested_at 최신순 유지)
+        pending_stores = [s for s in approved_stores if s.get("status") == "pending"]
         
         return render_template("store_requests.html", 
                              pending_stores=pending_stores,
@@ -731,17 +526,30 @@ def reject_store():
 @app.route("/api/delete_store", methods=["POST"])
 @require_role("super_admin")
 def delete_store():
-    """매장 삭제"""
+    """매장 삭제 (백그라운드 작업 등록 후 즉시 응답, 진행률은 /api/delete_store/<job_id>)"""
     data = request.get_json()
     store_id = data.get("store_id")
+    requested_by = session.get("user_id", "super_admin")
     
     if not store_id:
         return jsonify({"success": False, "message": "store_id 필요"}), 400
     
-    if database.delete_store(store_id):
-        return jsonify({"success": True, "message": "매장이 삭제되었습니다."})
-    else:
-        return jsonify({"success": False, "message": "매장 삭제 실패"}), 500
+    job_id, error = database.request_store_deletion(store_id, requested_by)
+    if job_id is None:
+        return jsonify({"success": False, "message": f"매장 삭제 실패: {error}"}), 500
+    
+    database.start_store_deletion_worker()
+    return jsonify({"success": True, "job_id": job_id,
+                    "message": "매장 삭제 작업이 시작되었습니다. 매장 관리 화면에서 진행률을 확인할 수 있습니다."}), 202
+
+@app.route("/api/delete_store/<int:job_id>", methods=["GET"])
+@require_role("super_admin")
+def delete_store_status(job_id):
+    """매장 삭제 작업 진행률"""
+    job = database.get_store_deletion_job(job_id)
+    if job is None:
+        return jsonify({"success": False, "message": "작업 없음"}), 404
+    return jsonify({"success": True, "job": job})
 
 # =========================
 # 결제 관리
@@ -825,6 +633,7 @@ def extend_subscription():
     )
     
     conn.commit()
+    database.invalidate_store_entities(store_id)
     cur.close()
     conn.close()
     
@@ -1055,6 +864,9 @@ def approve_pc():
               approved_at_value, session.get("user_id", "super_admin"), notes, pc_unique_id))
         
         conn.commit()
+        database.invalidate_store_entities(store_id)
+        if pc_data.get("store_id") and pc_data.get("store_id") != store_id:
+            database.invalidate_store_entities(pc_data.get("store_id"))
         
         # 승인된 PC 정보 조회
         cur.execute("SELECT * FROM store_pcs WHERE pc_unique_id = %s", (pc_unique_id,))
@@ -1142,8 +954,12 @@ def reject_pc():
             UPDATE store_pcs 
             SET status = 'blocked', notes = %s
             WHERE pc_unique_id = %s
+            RETURNING store_id
         """, (notes, pc_unique_id))
+        store_ids = {row[0] for row in cur.fetchall() if row[0]}
         conn.commit()
+        for store_id in store_ids:
+            database.invalidate_store_entities(store_id)
         cur.close()
         conn.close()
         return jsonify({"success": True, "message": "PC 거부 완료"})
@@ -1,15 +1,23 @@
 # ===== shared/database.py (공유 데이터베이스 모듈) =====
 import os
+import time
+import threading
 import psycopg2
 from psycopg2 import errors as psycopg2_errors
 from psycopg2.extras import RealDictCursor
-from datetime import datetime
+from datetime import datetime, date
 from urllib.parse import urlparse
 import random
 import string
 import secrets
 import hashlib
 
+from shared.bay_keys import bay_filter, shot_bay_filter
+from shared.cache_bus import on_invalidate, publish, start_invalidation_bus
+from shared.entity_cache import entity_cache
+from shared.migrate import run_migrations
+from shared.shot_partitions import ensure_partitions_at_startup
+
 # PostgreSQL 연결 정보 (Railway 환경 변수 필수)
 # 🔒 보안: 프로덕션에서는 DATABASE_URL 환경 변수가 반드시 설정되어야 함
 DATABASE_URL = os.environ.get("DATABASE_URL")
@@ -51,367 +59,54 @@ def get_db_connection():
 # DB 초기화
 # ------------------------------------------------
 def init_db():
-    conn = get_db_connection()
-    cur = conn.cursor()
-
-    # 1️⃣ 유저 테이블
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS users (
-        user_id TEXT PRIMARY KEY,
-        password TEXT NOT NULL,
-        name TEXT,
-        phone TEXT,
-        gender TEXT CHECK(gender IN ('남','여','M','F')) NOT NULL,
-        created_at TEXT DEFAULT CURRENT_TIMESTAMP
-    )
-    """)
-    
-    try:
-        cur.execute("ALTER TABLE users ADD COLUMN IF NOT EXISTS name TEXT")
-    except Exception:
-        pass
-    
-    try:
-        cur.execute("ALTER TABLE users ADD COLUMN IF NOT EXISTS phone TEXT")
-    except Exception:
-        pass
-
-    # 2️⃣ 샷 테이블
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS shots (
-        id SERIAL PRIMARY KEY,
-        store_id TEXT,
-        bay_id TEXT,
-        user_id TEXT,
-        club_id TEXT,
-        ball_speed REAL,
-        club_speed REAL,
-        launch_angle REAL,
-        smash_factor REAL,
-        face_angle REAL,
-        club_path REAL,
-        lateral_offset REAL,
-        direction_angle REAL,
-        side_spin INTEGER,
-        back_spin INTEGER,
-        total_distance REAL,
-        carry REAL,
-        feedback TEXT,
-        timestamp TEXT
-    )
-    """)
-
-    # shots 테이블 컬럼 추가
-    for col in ["side_spin", "back_spin", "lateral_offset", "direction_angle", "total_distance", "carry"]:
-        try:
-            if col in ["side_spin", "back_spin"]:
-                cur.execute(f"ALTER TABLE shots ADD COLUMN IF NOT EXISTS {col} INTEGER")
-            else:
-                cur.execute(f"ALTER TABLE shots ADD COLUMN IF NOT EXISTS {col} REAL")
-        except Exception:
-            pass
-
-    # 3️⃣ 매장 테이블 (확장)
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS stores (
-        store_id   TEXT PRIMARY KEY,
-        store_name TEXT,
-        admin_pw   TEXT,
-        bays_count INTEGER,
-        subscription_status TEXT DEFAULT 'active',
-        subscription_start_date TEXT,
-        subscription_end_date TEXT,
-        payment_plan TEXT,
-        created_at TEXT DEFAULT CURRENT_TIMESTAMP
-    )
-    """)
-    
-    # stores 테이블 컬럼 추가
-    for col in ["subscription_status", "subscription_start_date", "subscription_end_date", "payment_plan", "created_at"]:
-        try:
-            cur.execute(f"ALTER TABLE stores ADD COLUMN IF NOT EXISTS {col} TEXT")
-        except Exception:
-            pass
-
-    # stores 테이블 컬럼 추가
-    for col in ["subscription_status", "subscription_start_date", "subscription_end_date", "payment_plan", "created_at"]:
-        try:
-            cur.execute(f"ALTER TABLE stores ADD COLUMN IF NOT EXISTS {col} TEXT")
-        except Exception:
-            pass
-    
-    # stores 테이블에 status, requested_at, approved_at, approved_by 컬럼 추가
-    try:
-        cur.execute("ALTER TABLE stores ADD COLUMN IF NOT EXISTS status TEXT DEFAULT 'pending'")
-    except Exception:
-        pass
-    
-    try:
-        cur.execute("ALTER TABLE stores ADD COLUMN IF NOT EXISTS requested_at TEXT DEFAULT CURRENT_TIMESTAMP")
-    except Exception:
-        pass
-    
-    try:
-        cur.execute("ALTER TABLE stores ADD COLUMN IF NOT EXISTS approved_at TEXT")
-    except Exception:
-        pass
-    
-    try:
-        cur.execute("ALTER TABLE stores ADD COLUMN IF NOT EXISTS approved_by TEXT")
-    except Exception:
-        pass
-
-    # 4️⃣ 타석 테이블 (bay_number 추가, UNIQUE 제약조건)
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS bays (
-        store_id    TEXT,
-        bay_id      TEXT,
-        bay_number  INTEGER,
-        bay_name    TEXT,
-        status      TEXT,
-        user_id     TEXT,
-        last_update TEXT,
-        bay_code    TEXT UNIQUE,
-        assigned_pc_unique_id TEXT,
-        PRIMARY KEY (store_id, bay_id)
-    )
-    """)
-    
-    try:
-        cur.execute("ALTER TABLE bays ADD COLUMN IF NOT EXISTS bay_code TEXT")
-        cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_bay_code ON bays(bay_code)")
-    except Exception:
-        pass
-    
-    # bay_number 컬럼 추가 (마이그레이션)
-    try:
-        cur.execute("ALTER TABLE bays ADD COLUMN IF NOT EXISTS bay_number INTEGER")
-    except Exception:
-        pass
-    
-    try:
-        cur.execute("ALTER TABLE bays ADD COLUMN IF NOT EXISTS bay_name TEXT")
-    except Exception:
-        pass
-    
-    try:
-        cur.execute("ALTER TABLE bays ADD COLUMN IF NOT EXISTS assigned_pc_unique_id TEXT")
-    except Exception:
-        pass
-    
-    # ✅ 1-2. 유니크 제약조건 (store_id, bay_number) 중복 방지
-    try:
-        cur.execute("""
-            CREATE UNIQUE INDEX IF NOT EXISTS ux_bays_store_baynumber
-            ON bays(store_id, bay_number)
-            WHERE bay_number IS NOT NULL
-        """)
-        print("[DB] bays 테이블 UNIQUE INDEX 생성 완료 (store_id, bay_number)")
-    except Exception as e:
-        print(f"[WARNING] bays UNIQUE INDEX 생성 실패 (이미 존재할 수 있음): {e}")
-
-    # 5️⃣ 활성 세션 테이블
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS active_sessions (
-        store_id    TEXT,
-        bay_id      TEXT,
-        user_id     TEXT,
-        login_time  TEXT DEFAULT CURRENT_TIMESTAMP,
-        PRIMARY KEY (store_id, bay_id)
-    )
-    """)
-
-    # 6️⃣ 결제 테이블 (신규)
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS payments (
-        id SERIAL PRIMARY KEY,
-        store_id TEXT,
-        amount REAL,
-        payment_date TEXT,
-        payment_method TEXT,
-        status TEXT DEFAULT 'pending',
-        created_at TEXT DEFAULT CURRENT_TIMESTAMP
-    )
-    """)
+    """
+    DB 스키마 마이그레이션 (shared/migrations/*.sql)
 
-    # 7️⃣ 구독 테이블 (신규)
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS subscriptions (
-        id SERIAL PRIMARY KEY,
-        store_id TEXT,
-        start_date TEXT,
-        end_date TEXT,
-        status TEXT DEFAULT 'active',
-        plan_type TEXT,
-        created_at TEXT DEFAULT CURRENT_TIMESTAMP
-    )
-    """)
+    schema_version이 최신이면 버전 조회 1회로 끝나고 (DDL 실행 없음),
+    미적용 버전이 있을 때만 advisory lock을 잡은 한 프로세스가 순서대로 적용한다.
+    이어서 다가올 달 shots 파티션이 없으면 미리 만든다 (있으면 쿼리 1회).
+    워커 간 캐시 무효화 버스(LISTEN/NOTIFY)는 DB가 아직 없어도 먼저 시작한다 (스스로 재연결).
+    """
+    start_invalidation_bus(get_db_connection)
+    version = run_migrations(get_db_connection)
+    ensure_partitions_at_startup(get_db_connection)
+    return version
 
-    # 8️⃣ 매장 PC 테이블 (신규)
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS store_pcs (
-        id SERIAL PRIMARY KEY,
-        store_id TEXT,
-        store_name TEXT NOT NULL,
-        bay_id TEXT,
-        bay_name TEXT NOT NULL,
-        pc_name TEXT NOT NULL,
-        pc_unique_id TEXT UNIQUE NOT NULL,
-        pc_uuid TEXT,
-        mac_address TEXT,
-        pc_hostname TEXT,
-        pc_platform TEXT,
-        pc_info JSONB,
-        pc_token TEXT UNIQUE,
-        registered_at TEXT DEFAULT CURRENT_TIMESTAMP,
-        last_seen_at TEXT,
-        status TEXT DEFAULT 'pending',
-        approved_at TEXT,
-        approved_by TEXT,
-        usage_start_date TEXT,
-        usage_end_date TEXT,
-        notes TEXT
-    )
-    """)
-    
-    # 기존 테이블에 새 컬럼 추가 (마이그레이션)
-    for col in ["store_id", "bay_id", "pc_uuid", "mac_address", "pc_token"]:
-        try:
-            cur.execute(f"ALTER TABLE store_pcs ADD COLUMN IF NOT EXISTS {col} TEXT")
-        except Exception as e:
-            print(f"[WARNING] store_pcs {col} 컬럼 추가 실패 (이미 존재할 수 있음): {e}")
-            conn.rollback()
-    
-    # bay_number 컬럼 추가 (INTEGER)
-    try:
-        cur.execute("ALTER TABLE store_pcs ADD COLUMN IF NOT EXISTS bay_number INTEGER")
-        conn.commit()
-        print("[DB] store_pcs 테이블에 bay_number 컬럼 추가 완료")
-    except Exception as e:
-        print(f"[WARNING] store_pcs bay_number 컬럼 추가 실패 (이미 존재할 수 있음): {e}")
-        conn.rollback()
-    
-    try:
-        cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_pc_unique_id ON store_pcs(pc_unique_id)")
-        cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_pc_token ON store_pcs(pc_token) WHERE pc_token IS NOT NULL")
-    except Exception:
-        pass
-    
-    # ✅ 6. DB 레벨 보호: bay_id NOT NULL 및 중복 방지 인덱스
-    try:
-        # bay_id가 NULL인 경우를 허용하되, active 상태일 때는 NOT NULL 강제
-        # PostgreSQL에서는 부분 인덱스로 처리
-        cur.execute("""
-            CREATE UNIQUE INDEX IF NOT EXISTS uq_store_bay_id_active
-            ON store_pcs (store_id, bay_id)
-            WHERE status = 'active' AND bay_id IS NOT NULL
-        """)
-        print("[DB] bay_id 중복 방지 인덱스 생성 완료")
-    except Exception as e:
-        print(f"[WARNING] bay_id 인덱스 생성 실패 (이미 존재할 수 있음): {e}")
-    
-    # 주의: bay_id NOT NULL 제약조건은 기존 데이터가 NULL일 수 있으므로
-    # 마이그레이션 스크립트로 별도 처리 필요 (기존 데이터 정리 후)
+# ------------------------------------------------
+# 타석 현황 뷰 (store_bay_status, shared/bay_keys.py에서 생성)
+# ------------------------------------------------
+def get_store_bay_status(store_id):
+    """
+    매장 정보 + 타석 현황을 1회 쿼리로 조회 (store_bay_status 뷰)
 
-    # 9️⃣ PC 등록 코드 테이블 (신규)
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS pc_registration_codes (
-        id SERIAL PRIMARY KEY,
-        code TEXT UNIQUE NOT NULL,
-        status TEXT DEFAULT 'ACTIVE',
-        issued_by TEXT,
-        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-        revoked_at TEXT,
-        notes TEXT
-    )
-    """)
-    
-    try:
-        cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_registration_code ON pc_registration_codes(code)")
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_registration_code_status ON pc_registration_codes(status)")
-    except Exception:
-        pass
-    
-    # 🔟 PC 연장 요청 테이블 (CRITICAL 2: 요청 기반 봉합)
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS pc_extension_requests (
-        id SERIAL PRIMARY KEY,
-        pc_id TEXT NOT NULL,
-        pc_unique_id TEXT,
-        store_id TEXT NOT NULL,
-        requested_by TEXT NOT NULL,
-        requested_until DATE,
-        status TEXT DEFAULT 'REQUESTED' CHECK(status IN ('REQUESTED', 'APPROVED', 'REJECTED')),
-        decided_by TEXT,
-        decided_at TEXT,
-        reason TEXT,
-        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-        FOREIGN KEY (pc_unique_id) REFERENCES store_pcs(pc_unique_id) ON DELETE CASCADE
-    )
-    """)
-    
-    try:
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_extension_request_pc ON pc_extension_requests(pc_unique_id)")
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_extension_request_store ON pc_extension_requests(store_id)")
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_extension_request_status ON pc_extension_requests(status)")
-    except Exception:
-        pass
-    
-    # 1️⃣1️⃣ Audit 로그 테이블 (CRITICAL: 모든 중요 액션 기록)
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS audit_logs (
-        id SERIAL PRIMARY KEY,
-        actor_role TEXT NOT NULL,
-        actor_id TEXT NOT NULL,
-        action TEXT NOT NULL,
-        target_type TEXT,
-        target_id TEXT,
-        before_state JSONB,
-        after_state JSONB,
-        ip_address TEXT,
-        user_agent TEXT,
-        created_at TEXT DEFAULT CURRENT_TIMESTAMP
-    )
-    """)
-    
-    try:
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_audit_actor ON audit_logs(actor_role, actor_id)")
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_audit_action ON audit_logs(action)")
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_audit_target ON audit_logs(target_type, target_id)")
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_audit_created ON audit_logs(created_at)")
-    except Exception:
-        pass
-    
-    # 기존 테이블 마이그레이션 (pc_registration_keys → pc_registration_codes)
-    # 주의: 이 마이그레이션은 데이터 마이그레이션이므로 유지 (seed 데이터 아님)
+    Returns:
+        tuple: (store dict 또는 None, 타석 번호순 bay dict 리스트)
+    """
+    conn = get_db_connection()
+    cur = conn.cursor(cursor_factory=RealDictCursor)
     try:
         cur.execute("""
-            INSERT INTO pc_registration_codes (code, status, issued_by, created_at, notes)
-            SELECT registration_key, 
-                   CASE 
-                       WHEN status = 'active' THEN 'ACTIVE'
-                       ELSE 'REVOKED'
-                   END,
-                   created_by,
-                   created_at,
-                   notes
-            FROM pc_registration_keys
-            WHERE NOT EXISTS (
-                SELECT 1 FROM pc_registration_codes WHERE code = pc_registration_keys.registration_key
-            )
-        """)
-        conn.commit()
-    except Exception:
-        pass  # 테이블이 없으면 스킵
-
-    # ⚠️ seed 데이터 생성 로직 제거됨
-    # 기본 매장/타석 생성은 seed_dev_data.py 스크립트로 분리
-    # 운영 환경에서는 절대 자동 실행되지 않음
-
-    conn.commit()
-    cur.close()
-    conn.close()
-    print("✅ DB 스키마 초기화 완료 (테이블/인덱스만 생성)")
+            SELECT row_to_json(s.*) AS store, v.*
+            FROM stores s
+            LEFT JOIN store_bay_status v ON v.store_id = s.store_id
+            WHERE s.store_id = %s
+            ORDER BY v.bay_number
+        """, (store_id,))
+        rows = cur.fetchall()
+    finally:
+        cur.close()
+        conn.close()
+    if not rows:
+        return None, []
+    store = rows[0]["store"]
+    bays = []
+    for row in rows:
+        if row["bay_number"] is None:
+            continue
+        bay = dict(row)
+        del bay["store"]
+        bays.append(bay)
+    return store, bays
 
 # ------------------------------------------------
 # 타석 코드 생성
@@ -511,6 +206,10 @@ def login_user(user_id, password):
     return dict(user) if user else None
 
 def get_user(user_id):
+    """유저 조회 (엔티티 캐시, create_user 후 무효화)"""
+    return entity_cache.get("user", user_id, lambda: _load_user(user_id))
+
+def _load_user(user_id):
     conn = get_db_connection()
     cur = conn.cursor(cursor_factory=RealDictCursor)
     cur.execute("SELECT * FROM users WHERE user_id=%s", (user_id,))
@@ -527,6 +226,7 @@ def create_user(user_id, password, name=None, phone=None, gender=None):
         (user_id, password, name, phone, gender)
     )
     conn.commit()
+    entity_cache.invalidate("user", user_id)
     cur.close()
     conn.close()
 
@@ -542,6 +242,14 @@ def check_user(user_id, password):
     conn.close()
     return dict(user) if user else None
 
+def _bump_shot_version(cur, user_id, now):
+    """유저 샷 버전 +1 (대시보드 캐시/ETag 기준, 샷 INSERT와 같은 트랜잭션에서 호출)"""
+    cur.execute("""
+        INSERT INTO user_shot_versions (user_id, version, updated_at) VALUES (%s, 1, %s)
+        ON CONFLICT (user_id) DO UPDATE
+        SET version = user_shot_versions.version + 1, updated_at = EXCLUDED.updated_at
+    """, (user_id, now))
+
 def save_shot_to_db(data):
     conn = get_db_connection()
     cur = conn.cursor()
@@ -576,9 +284,15 @@ INSERT INTO shots (
         data.get("feedback"),
         data.get("timestamp") or now
     ))
+    user_id = data.get("user_id")
+    if user_id:
+        _bump_shot_version(cur, user_id, now)
     conn.commit()
     cur.close()
     conn.close()
+    if user_id:
+        # 대시보드 캐시 무효화 (cache_bus로 user_web 워커까지 전파)
+        entity_cache.invalidate("dashboard", user_id)
 
 def get_last_shot(user_id):
     conn = get_db_connection()
@@ -631,9 +345,10 @@ def set_active_session(store_id, bay_id, user_id):
 def clear_active_session(store_id, bay_id):
     conn = get_db_connection()
     cur = conn.cursor()
-    cur.execute("""
-        DELETE FROM active_sessions WHERE store_id = %s AND bay_id = %s
-    """, (store_id, bay_id))
+    bay_cond, bay_value = bay_filter(cur, store_id, bay_id)
+    cur.execute(f"""
+        DELETE FROM active_sessions WHERE store_id = %s AND {bay_cond}
+    """, (store_id, bay_value))
     conn.commit()
     deleted_count = cur.rowcount
     cur.close()
@@ -643,9 +358,10 @@ def clear_active_session(store_id, bay_id):
 def get_active_user(store_id, bay_id):
     conn = get_db_connection()
     cur = conn.cursor(cursor_factory=RealDictCursor)
-    cur.execute("""
-        SELECT user_id, login_time FROM active_sessions WHERE store_id = %s AND bay_id = %s
-    """, (store_id, bay_id))
+    bay_cond, bay_value = bay_filter(cur, store_id, bay_id)
+    cur.execute(f"""
+        SELECT user_id, login_time FROM active_sessions WHERE store_id = %s AND {bay_cond}
+    """, (store_id, bay_value))
     row = cur.fetchone()
     cur.close()
     conn.close()
@@ -669,23 +385,18 @@ def check_store(store_id, password):
 def get_bays(store_id):
     conn = get_db_connection()
     cur = conn.cursor(cursor_factory=RealDictCursor)
-    cur.execute("SELECT bays_count FROM stores WHERE store_id = %s", (store_id,))
-    store = cur.fetchone()
-    if not store:
-        return []
-    bays_count = store["bays_count"]
+    # 1..bays_count 범위의 타석만 ((store_id, bay_number) 인덱스 범위 조회)
     cur.execute("""
-        SELECT * FROM bays WHERE store_id = %s ORDER BY bay_id
+        SELECT b.* FROM bays b
+        JOIN stores s ON s.store_id = b.store_id
+        WHERE b.store_id = %s
+          AND b.bay_number BETWEEN 1 AND COALESCE(s.bays_count, 0)
+        ORDER BY b.bay_number
     """, (store_id,))
-    all_bays = cur.fetchall()
+    rows = cur.fetchall()
     cur.close()
     conn.close()
-    filtered_bays = []
-    for bay in all_bays:
-        bay_num = int(bay["bay_id"])
-        if bay_num <= bays_count:
-            filtered_bays.append(dict(bay))
-    return filtered_bays
+    return [dict(row) for row in rows]
 
 def get_all_shots_by_store(store_id):
     conn = get_db_connection()
@@ -701,9 +412,15 @@ def get_all_shots_by_store(store_id):
 def get_shots_by_bay(store_id, bay_id):
     conn = get_db_connection()
     cur = conn.cursor(cursor_factory=RealDictCursor)
-    cur.execute("""
-        SELECT * FROM shots WHERE store_id = %s AND bay_id = %s ORDER BY timestamp DESC LIMIT 100
-    """, (store_id, bay_id))
+    bay_cond, bay_params = shot_bay_filter(cur, store_id, bay_id, prefix="s.")
+    # owner_gender: 저장된 색상 코드가 없는 기존 샷을 성별 기준으로 분류할 때 사용
+    cur.execute(f"""
+        SELECT s.*, u.gender AS owner_gender
+        FROM shots s
+        LEFT JOIN users u ON u.user_id = s.user_id
+        WHERE s.store_id = %s AND {bay_cond}
+        ORDER BY s.timestamp DESC LIMIT 100
+    """, (store_id, *bay_params))
     rows = cur.fetchall()
     cur.close()
     conn.close()
@@ -730,6 +447,7 @@ def create_store(store_id, store_name, password, bays_count):
                 (store_id, bay_id, bay_code)
             )
         conn.commit()
+        invalidate_store_entities(store_id)
         return True
     except Exception as e:
         print(f"매장 등록 오류: {e}")
@@ -849,6 +567,10 @@ def approve_pc(pc_unique_id, store_id, bay_id, approved_by):
         """, (store_id, bay_id, pc_token, approved_by, pc_unique_id))
         
         conn.commit()
+        # 이전 매장/새 매장 타석 목록 모두 무효화 (PC 이동 포함)
+        entity_cache.invalidate("bays", store_id)
+        if pc_dict.get("store_id") and pc_dict.get("store_id") != store_id:
+            entity_cache.invalidate("bays", pc_dict.get("store_id"))
         
         # 업데이트된 정보 반환
         cur.execute("SELECT * FROM store_pcs WHERE pc_unique_id = %s", (pc_unique_id,))
@@ -933,14 +655,29 @@ def get_all_store_pcs():
     conn.close()
     return [dict(row) for row in rows]
 
-def update_pc_last_seen(pc_unique_id):
-    """PC 마지막 접속 시간 업데이트"""
+def update_pc_last_seen(pc_unique_id, latency=None):
+    """
+    PC 마지막 접속 시간 업데이트
+
+    latency: 샷 수집 프로그램의 단계별 소요 시간 요약 dict (있으면 latency_summary에 최신 값 저장)
+    """
     conn = get_db_connection()
     cur = conn.cursor()
-    cur.execute(
-        "UPDATE store_pcs SET last_seen_at = CURRENT_TIMESTAMP WHERE pc_unique_id = %s",
-        (pc_unique_id,)
-    )
+    if latency:
+        import json
+        cur.execute(
+            """
+            UPDATE store_pcs
+            SET last_seen_at = CURRENT_TIMESTAMP, latency_summary = %s, latency_updated_at = CURRENT_TIMESTAMP
+            WHERE pc_unique_id = %s
+            """,
+            (json.dumps(latency), pc_unique_id)
+        )
+    else:
+        cur.execute(
+            "UPDATE store_pcs SET last_seen_at = CURRENT_TIMESTAMP WHERE pc_unique_id = %s",
+            (pc_unique_id,)
+        )
     conn.commit()
     cur.close()
     conn.close()
@@ -1110,6 +847,113 @@ def get_all_stores():
     conn.close()
     return [dict(row) for row in rows]
 
+# ------------------------------------------------
+# 매장 현황 (총책임자 대시보드 / 매장 관리)
+# ------------------------------------------------
+FLEET_OVERVIEW_TTL = 15  # 초
+_fleet_cache = {"data": None, "expires_at": 0.0, "day": None}
+_fleet_lock = threading.Lock()
+
+def get_fleet_overview(force=False):
+    """
+    전체 매장 현황을 1회 집계 쿼리로 조회 (매장 수와 무관하게 DB 왕복 1회)
+
+    매장 컬럼(stores.*)에 아래 집계 값을 붙여 반환한다.
+    - valid_bays_count: 사용 가능한 타석 수 (status='active', 사용기간 유효)
+    - total_bays_count: 매장 타석 수 (bays_count)
+    - active_sessions_count: 현재 로그인 중인 타석 수
+    - today_shots_count: 오늘 저장된 샷 수
+    - subscription_expired: 구독 종료일이 지났는지 여부
+
+    결과는 FLEET_OVERVIEW_TTL초 동안 프로세스 메모리에 캐시된다.
+    (변경 API 호출 후에는 invalidate_fleet_overview()로 즉시 무효화)
+    """
+    today = date.today().isoformat()
+    now = time.monotonic()
+    with _fleet_lock:
+        cached = _fleet_cache["data"]
+        if (not force and cached is not None and now < _fleet_cache["expires_at"]
+                and _fleet_cache["day"] == today):
+            return [dict(row) for row in cached]
+
+    conn = get_db_connection()
+    cur = conn.cursor(cursor_factory=RealDictCursor)
+    try:
+        cur.execute("""
+            WITH pc AS (
+                SELECT store_id,
+                       COUNT(*) FILTER (
+                           WHERE status = 'active'
+                             AND (usage_end_date IS NULL OR usage_end_date >= %(today)s)
+                       ) AS valid_bays_count
+                FROM store_pcs
+                GROUP BY store_id
+            ),
+            sess AS (
+                SELECT store_id, COUNT(*) AS active_sessions_count
+                FROM active_sessions
+                WHERE user_id IS NOT NULL
+                GROUP BY store_id
+            ),
+            today_shots AS (
+                SELECT store_id, COUNT(*) AS today_shots_count
+                FROM shots
+                WHERE timestamp >= %(today)s
+                GROUP BY store_id
+            )
+            SELECT s.*,
+                   COALESCE(s.bays_count, 0) AS total_bays_count,
+                   COALESCE(pc.valid_bays_count, 0) AS valid_bays_count,
+                   COALESCE(sess.active_sessions_count, 0) AS active_sessions_count,
+                   COALESCE(today_shots.today_shots_count, 0) AS today_shots_count,
+                   (s.subscription_end_date IS NOT NULL
+                    AND s.subscription_end_date::text <> ''
+                    AND s.subscription_end_date::text < %(today)s) AS subscription_expired
+            FROM stores s
+            LEFT JOIN pc ON pc.store_id = s.store_id
+            LEFT JOIN sess ON sess.store_id = s.store_id
+            LEFT JOIN today_shots ON today_shots.store_id = s.store_id
+            ORDER BY s.requested_at DESC NULLS LAST, s.store_id
+        """, {"today": today})
+        rows = [dict(row) for row in cur.fetchall()]
+    finally:
+        cur.close()
+        conn.close()
+
+    with _fleet_lock:
+        _fleet_cache["data"] = rows
+        _fleet_cache["expires_at"] = time.monotonic() + FLEET_OVERVIEW_TTL
+        _fleet_cache["day"] = today
+    return [dict(row) for row in rows]
+
+def get_fleet_stats(stores):
+    """get_fleet_overview() 결과로 대시보드 통계 계산 (추가 쿼리 없음)"""
+    return {
+        "total_stores": len(stores),
+        "active_stores": len([s for s in stores if s.get("subscription_status") == "active"]),
+        "expired_stores": len([s for s in stores if s.get("subscription_status") == "expired"]),
+        "pending_stores": len([s for s in stores if s.get("status") == "pending"]),
+        "active_sessions": sum(s.get("active_sessions_count", 0) for s in stores),
+        "today_shots": sum(s.get("today_shots_count", 0) for s in stores),
+    }
+
+def _clear_fleet_overview(key=None):
+    with _fleet_lock:
+        _fleet_cache["data"] = None
+        _fleet_cache["expires_at"] = 0.0
+
+def invalidate_fleet_overview():
+    """매장 현황 캐시 무효화 (매장/PC/구독 변경 직후 호출, 다른 워커에도 전파)"""
+    _clear_fleet_overview()
+    publish("fleet")
+
+on_invalidate("fleet", _clear_fleet_overview)
+
+def invalidate_store_entities(store_id):
+    """매장/타석 엔티티 캐시 무효화 (매장 승인·거부·삭제, 타석 설정, 구독 변경 후 호출)"""
+    entity_cache.invalidate("store", store_id)
+    entity_cache.invalidate("bays", store_id)
+
 def get_pending_stores():
     """승인 대기 중인 매장 목록 조회"""
     conn = get_db_connection()
@@ -1333,6 +1177,7 @@ def approve_store(store_id, approved_by):
         # 8단계: 커밋
         try:
             conn.commit()
+            invalidate_store_entities(store_id)
             print(f"[SUCCESS] 매장 승인 완료: {store_id}, 타석 {len(created_bays)}개 생성")
             return True
         except Exception as e:
@@ -1387,6 +1232,7 @@ def reject_store(store_id, approved_by):
             WHERE store_id = %s
         """, (approved_by, store_id))
         conn.commit()
+        invalidate_store_entities(store_id)
         return True
     except Exception as e:
         print(f"매장 거부 오류: {e}")
@@ -1396,75 +1242,256 @@ def reject_store(store_id, approved_by):
         cur.close()
         conn.close()
 
-def delete_store(store_id):
-    """매장 삭제 (모든 관련 데이터 포함)"""
+# ------------------------------------------------
+# 매장 삭제 (백그라운드 작업)
+# ------------------------------------------------
+# 대형 매장은 샷이 수백만 건이라 요청 안에서 한 트랜잭션으로 지우면
+# 잠금이 길어지고 요청이 타임아웃된다. 삭제 요청은 store_deletion_jobs에 작업만 등록하고,
+# 백그라운드 스레드가 shots를 청크 단위 짧은 트랜잭션으로 지우며 진행률을 기록한다.
+STORE_DELETE_BATCH_SIZE = 5000
+STORE_DELETE_SLEEP = 0.05       # 청크 사이 대기 (초) - 다른 매장 샷 저장에 양보
+STORE_DELETE_LOCK_TIMEOUT = "2s"
+STORE_DELETE_STALE_SEC = 300    # heartbeat가 이보다 오래된 running 작업은 다른 워커가 이어서 실행
+STORE_DELETE_LOCK_RETRY_LIMIT = 10  # 한 청크의 잠금 대기 재시도 상한 (넘으면 작업 failed, 삭제 재요청 시 남은 샷부터)
+
+_deletion_worker = None
+_deletion_worker_lock = threading.Lock()
+
+def request_store_deletion(store_id, requested_by=None):
+    """
+    매장 삭제 작업 등록 (이미 진행 중이면 기존 작업 반환)
+
+    Returns:
+        tuple: (job_id, error_message)
+    """
     conn = get_db_connection()
     cur = conn.cursor()
-    
     try:
-        # 먼저 매장 정보 조회 (store_name 확인용)
-        cur.execute("SELECT store_id, store_name FROM stores WHERE store_id = %s", (store_id,))
-        store_info = cur.fetchone()
-        if not store_info:
+        cur.execute("SELECT store_name FROM stores WHERE store_id = %s", (store_id,))
+        row = cur.fetchone()
+        if not row:
             print(f"[WARNING] 매장 삭제 실패: store_id={store_id}가 존재하지 않습니다.")
-            return False
-        
-        store_name = store_info[1] if len(store_info) > 1 else None
-        print(f"[DEBUG] 매장 삭제 시작: store_id={store_id}, store_name={store_name}")
-        
-        # 관련 데이터 삭제 (순서 중요: 외래키 참조 제거)
+            return None, "존재하지 않는 매장입니다."
+
+        cur.execute("""
+            INSERT INTO store_deletion_jobs (store_id, store_name, status, requested_by, requested_at)
+            VALUES (%s, %s, 'queued', %s, %s)
+            ON CONFLICT (store_id) WHERE status IN ('queued', 'running') DO NOTHING
+            RETURNING id
+        """, (store_id, row[0], requested_by, datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
+        inserted = cur.fetchone()
+        if inserted is None:
+            cur.execute("""
+                SELECT id FROM store_deletion_jobs
+                WHERE store_id = %s AND status IN ('queued', 'running')
+            """, (store_id,))
+            inserted = cur.fetchone()
+        conn.commit()
+        print(f"[INFO] 매장 삭제 작업 등록: store_id={store_id}, job_id={inserted[0]}")
+        return inserted[0], None
+    except Exception as e:
+        print(f"[ERROR] 매장 삭제 작업 등록 오류: {e}")
+        conn.rollback()
+        return None, str(e)
+    finally:
+        cur.close()
+        conn.close()
+
+def get_store_deletion_job(job_id):
+    """매장 삭제 작업 상태 조회"""
+    conn = get_db_connection()
+    cur = conn.cursor(cursor_factory=RealDictCursor)
+    cur.execute("SELECT * FROM store_deletion_jobs WHERE id = %s", (job_id,))
+    row = cur.fetchone()
+    cur.close()
+    conn.close()
+    return dict(row) if row else None
+
+def get_store_deletion_jobs(limit=20):
+    """최근 매장 삭제 작업 목록 (진행 중인 작업 먼저)"""
+    conn = get_db_connection()
+    cur = conn.cursor(cursor_factory=RealDictCursor)
+    cur.execute("""
+        SELECT * FROM store_deletion_jobs
+        ORDER BY (status IN ('queued', 'running')) DESC, id DESC
+        LIMIT %s
+    """, (limit,))
+    rows = [dict(row) for row in cur.fetchall()]
+    cur.close()
+    conn.close()
+    return rows
+
+def _claim_store_deletion_job(cur):
+    """대기 중이거나 멈춘 작업 1건 선점 (여러 워커가 동시에 호출해도 한 곳만 가져감)"""
+    now = datetime.now()
+    stale = datetime.fromtimestamp(now.timestamp() - STORE_DELETE_STALE_SEC).strftime("%Y-%m-%d %H:%M:%S")
+    now = now.strftime("%Y-%m-%d %H:%M:%S")
+    cur.execute("""
+        UPDATE store_deletion_jobs
+        SET status = 'running', started_at = COALESCE(started_at, %s), heartbeat_at = %s
+        WHERE id = (
+            SELECT id FROM store_deletion_jobs
+            WHERE status = 'queued' OR (status = 'running' AND heartbeat_at < %s)
+            ORDER BY id
+            LIMIT 1
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING id, store_id, store_name, shots_deleted
+    """, (now, now, stale))
+    return cur.fetchone()
+
+def _estimate_store_shots(cur, store_id):
+    """매장 샷 수 추정 (플래너 통계 - 대형 매장도 COUNT(*) 전체 스캔 없이 진행률 분모로 사용)"""
+    cur.execute("EXPLAIN (FORMAT JSON) SELECT 1 FROM shots WHERE store_id = %s", (store_id,))
+    plan = cur.fetchone()[0]
+    if isinstance(plan, str):
+        import json
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+def _touch_store_deletion_job(cur, job_id):
+    cur.execute("UPDATE store_deletion_jobs SET heartbeat_at = %s WHERE id = %s",
+                (datetime.now().strftime("%Y-%m-%d %H:%M:%S"), job_id))
+
+def run_store_deletion_job(job_id, store_id, store_name, shots_deleted=0):
+    """
+    매장 삭제 실행 (중단된 작업은 남은 데이터만 이어서 삭제)
+
+    1) 세션/PC/타석 삭제 → 해당 매장 PC가 더 이상 샷을 저장하지 못함
+    2) shots를 STORE_DELETE_BATCH_SIZE개씩 삭제 (청크마다 커밋 + 진행률/heartbeat 기록)
+       잠금 대기로 청크가 실패해도 heartbeat는 갱신 (다른 워커가 멈춘 작업으로 보고 가져가지 않도록),
+       STORE_DELETE_LOCK_RETRY_LIMIT번 넘게 실패하면 작업은 failed
+    3) 남은 샷과 매장 행을 한 트랜잭션으로 삭제
+
+    shots_total은 플래너 추정값으로 시작하고, 실제 삭제 수가 넘으면 GREATEST로 따라감
+    """
+    conn = get_db_connection()
+    cur = conn.cursor()
+    try:
+        print(f"[INFO] 매장 삭제 시작: store_id={store_id}, store_name={store_name}, job_id={job_id}")
         # store_pcs는 store_id 또는 store_name으로 저장될 수 있으므로 둘 다 확인
         cur.execute("DELETE FROM active_sessions WHERE store_id = %s", (store_id,))
-        deleted_active_sessions = cur.rowcount
-        
         cur.execute("DELETE FROM bays WHERE store_id = %s", (store_id,))
-        deleted_bays = cur.rowcount
-        
-        cur.execute("DELETE FROM shots WHERE store_id = %s", (store_id,))
-        deleted_shots = cur.rowcount
-        
-        # store_pcs: store_id 또는 store_name으로 삭제
         cur.execute("DELETE FROM store_pcs WHERE store_id = %s", (store_id,))
-        deleted_pcs_by_id = cur.rowcount
         if store_name:
             cur.execute("DELETE FROM store_pcs WHERE store_name = %s", (store_name,))
-            deleted_pcs_by_name = cur.rowcount
-        else:
-            deleted_pcs_by_name = 0
-        
-        print(f"[DEBUG] 매장 관련 데이터 삭제: active_sessions={deleted_active_sessions}, bays={deleted_bays}, shots={deleted_shots}, store_pcs (by_id)={deleted_pcs_by_id}, store_pcs (by_name)={deleted_pcs_by_name}")
-        
-        # 매장 삭제
+        shots_total = shots_deleted + _estimate_store_shots(cur, store_id)
+        cur.execute("""
+            UPDATE store_deletion_jobs SET shots_total = %s, heartbeat_at = %s WHERE id = %s
+        """, (shots_total, datetime.now().strftime("%Y-%m-%d %H:%M:%S"), job_id))
+        conn.commit()
+
+        retries = 0
+        while True:
+            try:
+                cur.execute("SET LOCAL lock_timeout = %s", (STORE_DELETE_LOCK_TIMEOUT,))
+                cur.execute("""
+                    DELETE FROM shots
+                    WHERE store_id = %s
+                      AND id IN (SELECT id FROM shots WHERE store_id = %s LIMIT %s)
+                """, (store_id, store_id, STORE_DELETE_BATCH_SIZE))
+                deleted = cur.rowcount
+                shots_deleted += deleted
+                cur.execute("""
+                    UPDATE store_deletion_jobs
+                    SET shots_deleted = %s, shots_total = GREATEST(shots_total, %s), heartbeat_at = %s
+                    WHERE id = %s
+                """, (shots_deleted, shots_deleted, datetime.now().strftime("%Y-%m-%d %H:%M:%S"), job_id))
+                conn.commit()
+            except psycopg2_errors.LockNotAvailable:
+                # 샷 저장 등 다른 트랜잭션이 잡고 있는 행 → 양보 후 재시도 (heartbeat는 별도 트랜잭션으로 갱신)
+                conn.rollback()
+                retries += 1
+                if retries > STORE_DELETE_LOCK_RETRY_LIMIT:
+                    raise
+                _touch_store_deletion_job(cur, job_id)
+                conn.commit()
+                print(f"[WARNING] 매장 삭제 잠금 대기 초과: store_id={store_id}, 재시도 {retries}/{STORE_DELETE_LOCK_RETRY_LIMIT}")
+                time.sleep(retries)
+                continue
+            retries = 0
+            if deleted < STORE_DELETE_BATCH_SIZE:
+                break
+            time.sleep(STORE_DELETE_SLEEP)
+
+        # 마지막 청크 이후 들어온 샷까지 함께 정리하고 매장 삭제
+        cur.execute("DELETE FROM shots WHERE store_id = %s", (store_id,))
+        shots_deleted += cur.rowcount
+        cur.execute("DELETE FROM guest_shot_daily WHERE store_id = %s", (store_id,))
         cur.execute("DELETE FROM stores WHERE store_id = %s", (store_id,))
-        deleted_stores = cur.rowcount
-        
-        if deleted_stores == 0:
-            print(f"[WARNING] 매장 삭제 실패: store_id={store_id}가 존재하지 않습니다.")
-            conn.rollback()
-            return False
-        
+        cur.execute("""
+            UPDATE store_deletion_jobs
+            SET status = 'done', shots_deleted = %s, finished_at = %s, heartbeat_at = %s
+            WHERE id = %s
+        """, (shots_deleted, datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+              datetime.now().strftime("%Y-%m-%d %H:%M:%S"), job_id))
         conn.commit()
-        print(f"[DEBUG] 매장 삭제 완료: store_id={store_id}")
+        invalidate_store_entities(store_id)
+        print(f"[INFO] 매장 삭제 완료: store_id={store_id}, shots={shots_deleted}, job_id={job_id}")
         return True
     except Exception as e:
-        print(f"[ERROR] 매장 삭제 오류: {e}")
+        print(f"[ERROR] 매장 삭제 오류: store_id={store_id}, job_id={job_id}: {e}")
         import traceback
         traceback.print_exc()
         conn.rollback()
+        try:
+            cur.execute("""
+                UPDATE store_deletion_jobs SET status = 'failed', error = %s, finished_at = %s WHERE id = %s
+            """, (str(e), datetime.now().strftime("%Y-%m-%d %H:%M:%S"), job_id))
+            conn.commit()
+        except psycopg2.Error:
+            conn.rollback()  # 상태 기록 실패 시 heartbeat가 오래되면 다른 워커가 재시도
         return False
     finally:
         cur.close()
         conn.close()
 
+def _store_deletion_worker_loop():
+    """대기 중인 삭제 작업이 없을 때까지 순서대로 실행"""
+    while True:
+        try:
+            conn = get_db_connection()
+            cur = conn.cursor()
+            try:
+                job = _claim_store_deletion_job(cur)
+                conn.commit()
+            finally:
+                cur.close()
+                conn.close()
+        except Exception as e:
+            print(f"[WARNING] 매장 삭제 작업 조회 실패: {e}")
+            return
+        if job is None:
+            return
+        run_store_deletion_job(*job)
+        invalidate_fleet_overview()
+
+def start_store_deletion_worker():
+    """
+    삭제 작업 백그라운드 스레드 시작 (이미 실행 중이면 그대로)
+    삭제 요청 직후와 서비스 기동 시(중단된 작업 재개) 호출한다.
+    """
+    global _deletion_worker
+    with _deletion_worker_lock:
+        if _deletion_worker is not None and _deletion_worker.is_alive():
+            return False
+        _deletion_worker = threading.Thread(target=_store_deletion_worker_loop,
+                                            name="store-deletion", daemon=True)
+        _deletion_worker.start()
+        return True
+
 def delete_pc(pc_unique_id):
     """PC 삭제"""
     conn = get_db_connection()
     cur = conn.cursor()
     
     try:
-        cur.execute("DELETE FROM store_pcs WHERE pc_unique_id = %s", (pc_unique_id,))
+        cur.execute("DELETE FROM store_pcs WHERE pc_unique_id = %s RETURNING store_id", (pc_unique_id,))
+        deleted_stores = {row[0] for row in cur.fetchall() if row[0]}
         conn.commit()
         deleted_count = cur.rowcount
+        for store_id in deleted_stores:
+            entity_cache.invalidate("bays", store_id)
         cur.close()
         conn.close()
         return deleted_count > 0
@@ -1604,6 +1631,7 @@ def approve_extension_request(request_id, decided_by, approved_until, reason=Non
         """, (decided_by, reason, request_id))
         
         conn.commit()
+        entity_cache.invalidate("bays", request.get("store_id"))
         cur.close()
         conn.close()
         return True, None
@@ -1652,6 +1680,49 @@ def reject_extension_request(request_id, decided_by, reason=None):
         conn.close()
         return False, f"반려 실패: {str(e)}"
 
+# ------------------------------------------------
+# 시스템 설정 (Emergency 모드 등 워커 공용 플래그)
+# ------------------------------------------------
+def _load_system_setting(name):
+    conn = get_db_connection()
+    cur = conn.cursor()
+    try:
+        cur.execute("SELECT value FROM system_settings WHERE name = %s", (name,))
+        row = cur.fetchone()
+        return row[0] if row else None
+    finally:
+        cur.close()
+        conn.close()
+
+def get_system_setting(name, default=None):
+    """시스템 설정 조회 (entity_cache "settings", 변경 시 모든 워커에서 즉시 무효화)"""
+    value = entity_cache.get("settings", name, lambda: _load_system_setting(name))
+    return default if value is None else value
+
+def set_system_setting(name, value, updated_by=None):
+    """시스템 설정 저장 후 캐시 무효화 (cache_bus로 다른 워커에 전파)"""
+    conn = get_db_connection()
+    cur = conn.cursor()
+    try:
+        cur.execute("""
+            INSERT INTO system_settings (name, value, updated_by, updated_at)
+            VALUES (%s, %s, %s, %s)
+            ON CONFLICT (name) DO UPDATE
+            SET value = EXCLUDED.value, updated_by = EXCLUDED.updated_by, updated_at = EXCLUDED.updated_at
+        """, (name, str(value), updated_by, datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
+        conn.commit()
+    finally:
+        cur.close()
+        conn.close()
+    entity_cache.invalidate("settings", name)
+
+def get_emergency_mode():
+    """Emergency 모드 여부 (모든 워커/세션 공통)"""
+    return get_system_setting("emergency_mode", "false") == "true"
+
+def set_emergency_mode(enabled, updated_by=None):
+    set_system_setting("emergency_mode", "true" if enabled else "false", updated_by)
+
 # ------------------------------------------------
 # Audit 로그 관리 (CRITICAL) - store_admin과 동일
 # ------------------------------------------------
@@ -0,0 +1,18 @@
+-- ============================================
+-- 0003 샷 평가 결과 컬럼 (저장 시 criteria 평가)
+-- ============================================
+
+-- 게스트 샷 정책 명문화
+ALTER TABLE shots ADD COLUMN IF NOT EXISTS is_guest BOOLEAN DEFAULT FALSE;
+
+-- is_valid, score: 샷 데이터 분석 구조
+ALTER TABLE shots ADD COLUMN IF NOT EXISTS is_valid BOOLEAN DEFAULT FALSE;
+ALTER TABLE shots ADD COLUMN IF NOT EXISTS score INTEGER DEFAULT NULL;
+
+-- criteria_classes: 지표별 1글자 코드 (G/W/B/N), criteria_version: criteria.json 해시
+-- (화면 표시용 색상 클래스를 저장 시 미리 계산)
+ALTER TABLE shots ADD COLUMN IF NOT EXISTS criteria_classes VARCHAR(8) DEFAULT NULL;
+ALTER TABLE shots ADD COLUMN IF NOT EXISTS criteria_version VARCHAR(12) DEFAULT NULL;
+
+-- 7일 평균 계산 성능 향상
+CREATE INDEX IF NOT EXISTS idx_shots_user_timestamp ON shots(user_id, timestamp);
@@ -0,0 +1,253 @@
+-- ============================================
+-- 0007 shots 월별 파티션 (온라인 전환 준비)
+-- ============================================
+-- shots를 timestamp('YYYY-MM-DD HH:MM:SS' TEXT) 기준 월별 RANGE 파티션으로 전환한다.
+-- (shared/shot_partitions.py, 루트 shot_partitions.py CLI 참고)
+--
+-- 전환 순서 (운영 중 무중단):
+--   1) 이 마이그레이션: shots_partitioned 부모 테이블 + 기존 샷 가장 오래된 달부터 월 파티션 + 미러 트리거 생성
+--      → 이후 shots에 들어오는 INSERT/UPDATE/DELETE가 shots_partitioned에도 반영됨
+--   2) python shot_partitions.py copy   : 기존 샷을 id 청크로 복사 (backfill 프레임워크)
+--   3) python shot_partitions.py cutover: 짧은 잠금으로 테이블 이름 교체 (shots → shots_legacy)
+-- 샷이 하나도 없는 DB(신규 설치)는 이 마이그레이션에서 바로 전환한다.
+
+-- 월 파티션 이름: shots_y2026m01 (범위: '2026-01-01' 이상 '2026-02-01' 미만)
+CREATE OR REPLACE FUNCTION shot_partition_name(p_month DATE) RETURNS TEXT
+LANGUAGE sql IMMUTABLE AS $$
+    SELECT 'shots_y' || to_char(p_month, 'YYYY') || 'm' || to_char(p_month, 'MM')
+$$;
+
+-- 현재 파티션 부모 테이블 (전환 전: shots_partitioned, 전환 후: shots)
+CREATE OR REPLACE FUNCTION shot_partition_parent() RETURNS TEXT
+LANGUAGE sql STABLE AS $$
+    SELECT c.relname::text
+    FROM pg_class c
+    WHERE c.relkind = 'p' AND c.relname IN ('shots', 'shots_partitioned')
+      AND c.relnamespace = 'public'::regnamespace
+    ORDER BY (c.relname = 'shots') DESC
+    LIMIT 1
+$$;
+
+-- p_from_month부터 이번 달 + p_months_ahead까지 월 파티션 생성 (이미 있으면 건너뜀)
+-- 형식이 다른 timestamp 값이나 아직 파티션이 없는 달의 샷은 기본 파티션(shots_default)으로 들어간다.
+-- 기본 파티션에 해당 달 행이 있으면 PARTITION OF가 실패하므로
+-- 새 테이블로 옮긴 뒤 ATTACH한다 (같은 트랜잭션, 옮긴 행 수는 NOTICE로 출력).
+CREATE OR REPLACE FUNCTION ensure_shot_partitions(p_months_ahead INTEGER DEFAULT 3, p_from_month DATE DEFAULT NULL)
+RETURNS INTEGER
+LANGUAGE plpgsql AS $$
+DECLARE
+    v_parent TEXT := shot_partition_parent();
+    v_month DATE := date_trunc('month', COALESCE(p_from_month, CURRENT_DATE))::date;
+    v_last DATE := (date_trunc('month', CURRENT_DATE) + make_interval(months => p_months_ahead))::date;
+    v_name TEXT;
+    v_from TEXT;
+    v_to TEXT;
+    v_moved BIGINT;
+    v_created INTEGER := 0;
+BEGIN
+    IF v_parent IS NULL THEN
+        RETURN 0;
+    END IF;
+    IF to_regclass('public.shots_default') IS NULL THEN
+        EXECUTE format('CREATE TABLE shots_default PARTITION OF %I DEFAULT', v_parent);
+    END IF;
+    WHILE v_month <= v_last LOOP
+        v_name := shot_partition_name(v_month);
+        v_from := to_char(v_month, 'YYYY-MM-DD');
+        v_to := to_char((v_month + interval '1 month')::date, 'YYYY-MM-DD');
+        IF to_regclass('public.' || v_name) IS NULL
+           AND NOT EXISTS (SELECT 1 FROM shot_partition_log l WHERE l.partition_name = v_name
+                                                           AND l.archived_at IS NOT NULL) THEN
+            IF EXISTS (SELECT 1 FROM shots_default WHERE timestamp >= v_from AND timestamp < v_to) THEN
+                EXECUTE format('CREATE TABLE %I (LIKE %I INCLUDING DEFAULTS INCLUDING CONSTRAINTS)',
+                               v_name, v_parent);
+                EXECUTE format(
+                    'WITH moved AS (DELETE FROM shots_default WHERE timestamp >= %L AND timestamp < %L RETURNING *) '
+                    'INSERT INTO %I SELECT * FROM moved',
+                    v_from, v_to, v_name
+                );
+                GET DIAGNOSTICS v_moved = ROW_COUNT;
+                EXECUTE format('ALTER TABLE %I ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                               v_parent, v_name, v_from, v_to);
+                RAISE NOTICE '%: shots_default에서 %행 이동', v_name, v_moved;
+            ELSE
+                EXECUTE format('CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                               v_name, v_parent, v_from, v_to);
+            END IF;
+            v_created := v_created + 1;
+        END IF;
+        v_month := (v_month + interval '1 month')::date;
+    END LOOP;
+    RETURN v_created;
+END
+$$;
+
+-- 파티션 보존/보관 이력 (게스트 샷 집계, 분리+보관 파일)
+CREATE TABLE IF NOT EXISTS shot_partition_log (
+    partition_name   TEXT PRIMARY KEY,
+    range_from       TEXT NOT NULL,
+    range_to         TEXT NOT NULL,
+    guest_shots      BIGINT,
+    guest_purged_at  TEXT,
+    archived_rows    BIGINT,
+    archive_path     TEXT,
+    archived_at      TEXT
+);
+
+-- 게스트 샷 일별 집계 (원본 게스트 샷은 보존 기간 후 삭제)
+-- 청크 단위로 누적하므로 평균 대신 합계/건수 저장 (평균 = *_sum / *_n)
+CREATE TABLE IF NOT EXISTS guest_shot_daily (
+    store_id            TEXT NOT NULL,
+    bay_number          INTEGER NOT NULL DEFAULT 0,
+    day                 TEXT NOT NULL,
+    club_id             TEXT NOT NULL DEFAULT '',
+    shot_count          INTEGER NOT NULL DEFAULT 0,
+    valid_count         INTEGER NOT NULL DEFAULT 0,
+    score_sum           DOUBLE PRECISION NOT NULL DEFAULT 0,
+    score_n             INTEGER NOT NULL DEFAULT 0,
+    carry_sum           DOUBLE PRECISION NOT NULL DEFAULT 0,
+    carry_n             INTEGER NOT NULL DEFAULT 0,
+    total_distance_sum  DOUBLE PRECISION NOT NULL DEFAULT 0,
+    total_distance_n    INTEGER NOT NULL DEFAULT 0,
+    ball_speed_sum      DOUBLE PRECISION NOT NULL DEFAULT 0,
+    ball_speed_n        INTEGER NOT NULL DEFAULT 0,
+    club_speed_sum      DOUBLE PRECISION NOT NULL DEFAULT 0,
+    club_speed_n        INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (store_id, bay_number, day, club_id)
+);
+
+-- 파티션 부모 테이블 (컬럼은 현재 shots와 동일, id 시퀀스 공유)
+-- 파티션 키(timestamp)는 PK에 포함되어야 하므로 PK는 (id, timestamp)
+DO $$
+BEGIN
+    IF shot_partition_parent() IS NULL THEN
+        CREATE TABLE shots_partitioned (LIKE shots INCLUDING DEFAULTS)
+            PARTITION BY RANGE (timestamp);
+        ALTER TABLE shots_partitioned ALTER COLUMN timestamp SET NOT NULL;
+        ALTER TABLE shots_partitioned ALTER COLUMN timestamp
+            SET DEFAULT to_char(now(), 'YYYY-MM-DD HH24:MI:SS');
+        ALTER TABLE shots_partitioned ADD CONSTRAINT shots_partitioned_pkey PRIMARY KEY (id, timestamp);
+
+        -- 부모에 만든 인덱스는 모든 파티션에 자동 생성 (전환 시 기존 이름으로 교체)
+        CREATE INDEX idx_shots_p_user_timestamp ON shots_partitioned(user_id, timestamp);
+        CREATE INDEX idx_shots_p_timestamp_store ON shots_partitioned(timestamp, store_id);
+        CREATE INDEX idx_shots_p_store_bay_number ON shots_partitioned(store_id, bay_number, timestamp);
+        CREATE INDEX idx_shots_p_store_bay ON shots_partitioned(store_id, bay_id);
+        CREATE INDEX idx_shots_p_pc_unique_id ON shots_partitioned(pc_unique_id);
+    END IF;
+END $$;
+
+-- 기존 샷의 가장 오래된 달부터 파티션 생성 (미러 트리거 설치 전)
+-- 복사 전에 백필/재채점이 과거 샷을 UPDATE해도 미러 행이 기본 파티션에 쌓이지 않도록 한다
+SELECT ensure_shot_partitions(3, (
+    SELECT to_date(LEFT(MIN(timestamp), 7) || '-01', 'YYYY-MM-DD')
+    FROM shots
+    WHERE timestamp >= '2000-01-01' AND timestamp ~ '^[0-9]{4}-(0[1-9]|1[0-2])-[0-9]{2}'
+));
+
+-- shots 행 → shots_partitioned 행 (컬럼 이름 기준 매핑, timestamp NULL은 기본 파티션으로)
+CREATE OR REPLACE FUNCTION shots_to_partitioned_row(r shots) RETURNS shots_partitioned
+LANGUAGE sql STABLE AS $$
+    SELECT * FROM jsonb_populate_record(
+        NULL::shots_partitioned,
+        to_jsonb(r) || jsonb_build_object('timestamp', COALESCE(r.timestamp, '1970-01-01 00:00:00'))
+    )
+$$;
+
+-- 전환 전 이중 기록: shots 변경을 shots_partitioned에 그대로 반영
+-- (AFTER 트리거라 bay_number 등 BEFORE 트리거 결과까지 포함)
+CREATE OR REPLACE FUNCTION mirror_shots_to_partitioned() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        DELETE FROM shots_partitioned WHERE id = OLD.id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO shots_partitioned SELECT * FROM shots_to_partitioned_row(NEW)
+        ON CONFLICT DO NOTHING;
+    END IF;
+    RETURN NULL;
+END
+$$;
+
+DO $$
+BEGIN
+    IF to_regclass('public.shots_partitioned') IS NOT NULL AND NOT EXISTS (
+        SELECT 1 FROM pg_trigger
+        WHERE tgname = 'trg_shots_mirror_partitioned' AND tgrelid = 'shots'::regclass
+    ) THEN
+        CREATE TRIGGER trg_shots_mirror_partitioned
+        AFTER INSERT OR UPDATE OR DELETE ON shots
+        FOR EACH ROW EXECUTE FUNCTION mirror_shots_to_partitioned();
+    END IF;
+END $$;
+
+-- 전환: shots → shots_legacy, shots_partitioned → shots (ACCESS EXCLUSIVE 잠금은 이름 교체 동안만)
+-- p_force가 아니면 복사 작업(backfill: shots_partition_copy) 완료 또는 빈 테이블일 때만 진행
+CREATE OR REPLACE FUNCTION shots_partition_cutover(p_force BOOLEAN DEFAULT FALSE) RETURNS TEXT
+LANGUAGE plpgsql AS $$
+DECLARE
+    v_idx TEXT;
+    v_missing BIGINT;
+BEGIN
+    IF to_regclass('public.shots_partitioned') IS NULL THEN
+        RETURN 'already';
+    END IF;
+
+    LOCK TABLE shots IN ACCESS EXCLUSIVE MODE;
+    LOCK TABLE shots_partitioned IN ACCESS EXCLUSIVE MODE;
+
+    IF NOT p_force AND EXISTS (SELECT 1 FROM shots LIMIT 1) AND NOT EXISTS (
+        SELECT 1 FROM backfill_checkpoints
+        WHERE job = 'shots_partition_copy' AND finished_at IS NOT NULL
+    ) THEN
+        RAISE EXCEPTION 'shots_partition_copy 복사 작업이 아직 완료되지 않았습니다';
+    END IF;
+
+    -- 복사 완료 후 트리거가 놓친 행이 없는지 id 기준으로 마지막 확인 (최근 구간만)
+    SELECT COUNT(*) INTO v_missing
+    FROM shots s
+    WHERE s.id > COALESCE((SELECT max_id FROM backfill_checkpoints WHERE job = 'shots_partition_copy'), 0)
+      AND NOT EXISTS (SELECT 1 FROM shots_partitioned p WHERE p.id = s.id);
+    IF v_missing > 0 THEN
+        INSERT INTO shots_partitioned
+        SELECT p.*
+        FROM shots s
+        CROSS JOIN LATERAL shots_to_partitioned_row(s) p
+        WHERE s.id > COALESCE((SELECT max_id FROM backfill_checkpoints WHERE job = 'shots_partition_copy'), 0)
+          AND NOT EXISTS (SELECT 1 FROM shots_partitioned p WHERE p.id = s.id)
+        ON CONFLICT DO NOTHING;
+    END IF;
+
+    DROP TRIGGER IF EXISTS trg_shots_mirror_partitioned ON shots;
+    DROP TRIGGER IF EXISTS trg_shots_bay_number ON shots;
+
+    ALTER TABLE shots RENAME TO shots_legacy;
+    ALTER TABLE shots_legacy RENAME CONSTRAINT shots_pkey TO shots_legacy_pkey;
+    ALTER TABLE shots_partitioned RENAME TO shots;
+    ALTER TABLE shots RENAME CONSTRAINT shots_partitioned_pkey TO shots_pkey;
+    ALTER SEQUENCE shots_id_seq OWNED BY shots.id;
+
+    -- 기존 인덱스 이름을 새 테이블로 넘김
+    FOREACH v_idx IN ARRAY ARRAY['user_timestamp', 'timestamp_store', 'store_bay_number', 'store_bay', 'pc_unique_id'] LOOP
+        IF to_regclass('public.idx_shots_' || v_idx) IS NOT NULL THEN
+            EXECUTE format('ALTER INDEX %I RENAME TO %I', 'idx_shots_' || v_idx, 'idx_shots_legacy_' || v_idx);
+        END IF;
+        EXECUTE format('ALTER INDEX %I RENAME TO %I', 'idx_shots_p_' || v_idx, 'idx_shots_' || v_idx);
+    END LOOP;
+
+    CREATE TRIGGER trg_shots_bay_number
+    BEFORE INSERT OR UPDATE OF bay_id ON shots
+    FOR EACH ROW EXECUTE FUNCTION set_bay_number();
+
+    RETURN 'done';
+END
+$$;
+
+-- 신규 설치 등 샷이 없으면 바로 전환
+DO $$
+BEGIN
+    IF to_regclass('public.shots_partitioned') IS NOT NULL AND NOT EXISTS (SELECT 1 FROM shots LIMIT 1) THEN
+        PERFORM shots_partition_cutover(TRUE);
+    END IF;
+END $$;
@@ -1,4 +1,5 @@
 # ===== services/user_web/app.py (유저 웹 서비스) =====
+import hashlib
 import os
 import sys
 
@@ -15,6 +16,7 @@ from flask import render_template, request, jsonify, session, redirect, url_for
 from shared.flask_utils import create_flask_app
 from shared import database
 from shared.auth import require_login
+from shared.entity_cache import entity_cache
 
 # Flask 앱 생성 (공통 설정 포함)
 app = create_flask_app('user_web', __file__)
@@ -233,36 +235,15 @@ def user_main():
 @app.route("/shots")
 @require_login
 def user_shots():
-    from .utils import classify_by_criteria
+    from .utils import apply_criteria_classes
     
     uid = session["user_id"]
     rows = database.get_all_shots(uid)
+    user = database.get_user(uid)
+    gender = user.get("gender") if user else None
 
-    shots = []
-    for r in rows:
-        s = dict(r)
-        club_id = s.get("club_id") or ""
-        
-        # 색상 클래스 추가
-        bs = s.get("ball_speed")
-        sf = s.get("smash_factor")
-        fa = s.get("face_angle")
-        cp = s.get("club_path")
-        lo = s.get("lateral_offset")
-        da = s.get("direction_angle")
-        ss = s.get("side_spin")
-        bk = s.get("back_spin")
-        
-        s["ball_speed_class"] = classify_by_criteria(bs, club_id, "ball_speed", fallback_good=60)
-        s["smash_class"] = classify_by_criteria(sf, club_id, "smash_factor", fallback_good=1.45)
-        s["face_class"] = classify_by_criteria(fa, club_id, "face_angle", abs_value=True, fallback_good=2.0, fallback_warn=4.0)
-        s["path_class"] = classify_by_criteria(cp, club_id, "club_path", abs_value=True, fallback_good=2.0, fallback_warn=4.0)
-        s["lateral_class"] = classify_by_criteria(lo, club_id, "lateral_offset", abs_value=True, fallback_good=3.0, fallback_warn=6.0)
-        s["direction_class"] = classify_by_criteria(da, club_id, "direction_angle", abs_value=True, fallback_good=3.0, fallback_warn=6.0)
-        s["side_spin_class"] = classify_by_criteria(ss, club_id, "side_spin", abs_value=True, fallback_good=300, fallback_warn=600)
-        s["back_spin_class"] = classify_by_criteria(bk, club_id, "back_spin", abs_value=False, fallback_good=None)
-        
-        shots.append(s)
+    # 색상 클래스는 저장 시 계산된 criteria_classes 사용 (없는 기존 샷만 성별 기준으로 분류)
+    shots = [apply_criteria_classes(dict(r), gender=gender) for r in rows]
 
     return render_template("shots_all.html", shots=shots)
 
@@ -329,6 +310,116 @@ def get_current_user_shots():
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
 
+def _build_user_dashboard(uid, club):
+    """대시보드 응답 계산 (캐시 미스일 때만 호출 - 샷 버전이 바뀌었거나 날짜가 바뀐 경우)"""
+    # 유저 성별 조회 (로그용)
+    user = database.get_user(uid)
+    gender = user.get("gender") if user else None
+    
+    # 유효 샷 개수 조회 (로그용)
+    from datetime import datetime
+    from psycopg2.extras import RealDictCursor
+    today = datetime.now().strftime("%Y-%m-%d")
+    conn = database.get_db_connection()
+    cur = conn.cursor(cursor_factory=RealDictCursor)
+    cur.execute("""
+        SELECT COUNT(*) as count
+        FROM shots
+        WHERE user_id = %s AND club_id = 'DRIVER' 
+          AND is_valid = TRUE AND is_guest = FALSE 
+          AND timestamp >= %s AND timestamp < %s
+    """, (uid, *database.day_bounds(today)))
+    valid_shots_row = cur.fetchone()
+    valid_shots_count = valid_shots_row.get("count", 0) if valid_shots_row else 0
+    cur.close()
+    conn.close()
+    
+    # criteria 키 결정 로그 (초기 점검용)
+    try:
+        import sys
+        import os
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        if current_dir not in sys.path:
+            sys.path.insert(0, current_dir)
+        from utils import get_criteria_key
+        criteria_key = get_criteria_key("DRIVER", gender)
+        print(f"[DASHBOARD] user_id={uid}, club={club}, gender={gender}, criteria_key={criteria_key}, valid_shots={valid_shots_count}")
+    except Exception as e:
+        print(f"[WARNING] criteria key 로그 실패: {e}")
+    
+    # 1️⃣ 오늘 요약
+    today_summary = database.get_today_summary_driver(uid)
+    
+    # 2️⃣ 최근 샷 (기본 20개)
+    recent_shots = database.get_recent_shots_driver(uid, limit=20)
+    
+    # 3️⃣ 7일 평균 그래프
+    last_7_days = database.get_7days_average_driver(uid)
+    
+    # 4️⃣ 기준값 비교 (최근 7일 평균 vs criteria.json)
+    criteria_compare = database.get_criteria_compare_driver(uid)
+    
+    return {
+        "today_summary": {
+            "available_metrics": [
+                "shot_count",
+                "avg_carry",
+                "avg_total_distance",
+                "avg_smash_factor",
+                "avg_face_angle",
+                "avg_club_path",
+                "avg_ball_speed",
+                "avg_club_speed",
+                "avg_back_spin",
+                "avg_side_spin"
+            ],
+            "values": today_summary
+        },
+        "recent_shots": {
+            "available_metrics": [
+                "carry",
+                "total_distance",
+                "smash_factor",
+                "face_angle",
+                "club_path",
+                "ball_speed",
+                "club_speed",
+                "back_spin",
+                "side_spin",
+                "launch_angle"
+            ],
+            "shots": recent_shots
+        },
+        "last_7_days": {
+            "available_metrics": [
+                "avg_carry",
+                "avg_total_distance",
+                "avg_smash_factor",
+                "avg_face_angle",
+                "avg_club_path",
+                "avg_ball_speed",
+                "avg_club_speed",
+                "avg_back_spin",
+                "avg_side_spin"
+            ],
+            "data": last_7_days
+        },
+        "criteria_compare": {
+            "available_metrics": [
+                "carry",
+                "total_distance",
+                "smash_factor",
+                "face_angle",
+                "club_path",
+                "ball_speed",
+                "club_speed",
+                "back_spin",
+                "side_spin"
+            ],
+            "result": criteria_compare
+        }
+    }
+
 # =========================
 # 보안: USER role이 다른 userId로 접근 시 차단
 # =========================
@@ -340,6 +431,9 @@ def get_user_dashboard():
     
     Query Parameters:
         club: DRIVER (기본값), IRON_7, WEDGE (현재는 DRIVER만 구현)
+    
+    응답은 유저 샷 버전(save_shot_to_db에서 +1) 기준으로 캐시되고 ETag가 붙는다.
+    샷 사이 반복 조회는 If-None-Match → 304 (DB 조회 없음).
     """
     try:
         uid = session["user_id"]
@@ -352,113 +446,28 @@ def get_user_dashboard():
         if club != "DRIVER":
             return jsonify({"error": "현재는 DRIVER만 지원합니다."}), 400
         
-        # 유저 성별 조회 (로그용)
-        user = database.get_user(uid)
-        gender = user.get("gender") if user else None
-        
-        # 유효 샷 개수 조회 (로그용)
+        # 샷 버전/날짜/기준표 버전이 같으면 응답도 같음 → ETag 비교, 캐시된 응답 사용
         from datetime import datetime
-        from psycopg2.extras import RealDictCursor
+        if current_dir not in sys.path:
+            sys.path.insert(0, current_dir)
+        from utils import CRITERIA_ENGINE
         today = datetime.now().strftime("%Y-%m-%d")
-        conn = database.get_db_connection()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
-        cur.execute("""
-            SELECT COUNT(*) as count
-            FROM shots
-            WHERE user_id = %s AND club_id = 'DRIVER' 
-              AND is_valid = TRUE AND is_guest = FALSE 
-              AND DATE(timestamp) = %s
-        """, (uid, today))
-        valid_shots_row = cur.fetchone()
-        valid_shots_count = valid_shots_row.get("count", 0) if valid_shots_row else 0
-        cur.close()
-        conn.close()
-        
-        # criteria 키 결정 로그 (초기 점검용)
-        try:
-            import sys
-            import os
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            if current_dir not in sys.path:
-                sys.path.insert(0, current_dir)
-            from utils import get_criteria_key
-            criteria_key = get_criteria_key("DRIVER", gender)
-            print(f"[DASHBOARD] user_id={uid}, club={club}, gender={gender}, criteria_key={criteria_key}, valid_shots={valid_shots_count}")
-        except Exception as e:
-            print(f"[WARNING] criteria key 로그 실패: {e}")
-        
-        # 1️⃣ 오늘 요약
-        today_summary = database.get_today_summary_driver(uid)
-        
-        # 2️⃣ 최근 샷 (기본 20개)
-        recent_shots = database.get_recent_shots_driver(uid, limit=20)
+        version = database.get_dashboard_version(uid)
+        criteria_version = CRITERIA_ENGINE.current().version
+        etag = hashlib.sha1(f"{uid}:{club}:{today}:{version}:{criteria_version}".encode("utf-8")).hexdigest()[:20]
         
-        # 3️⃣ 7일 평균 그래프
-        last_7_days = database.get_7days_average_driver(uid)
-        
-        # 4️⃣ 기준값 비교 (최근 7일 평균 vs criteria.json)
-        criteria_compare = database.get_criteria_compare_driver(uid)
-        
-        return jsonify({
-            "today_summary": {
-                "available_metrics": [
-                    "shot_count",
-                    "avg_carry",
-                    "avg_total_distance",
-                    "avg_smash_factor",
-                    "avg_face_angle",
-                    "avg_club_path",
-                    "avg_ball_speed",
-                    "avg_club_speed",
-                    "avg_back_spin",
-                    "avg_side_spin"
-                ],
-                "values": today_summary
-            },
-            "recent_shots": {
-                "available_metrics": [
-                    "carry",
-                    "total_distance",
-                    "smash_factor",
-                    "face_angle",
-                    "club_path",
-                    "ball_speed",
-                    "club_speed",
-                    "back_spin",
-                    "side_spin",
-                    "launch_angle"
-                ],
-                "shots": recent_shots
-            },
-            "last_7_days": {
-                "available_metrics": [
-                    "avg_carry",
-                    "avg_total_distance",
-                    "avg_smash_factor",
-                    "avg_face_angle",
-                    "avg_club_path",
-                    "avg_ball_speed",
-                    "avg_club_speed",
-                    "avg_back_spin",
-                    "avg_side_spin"
-                ],
-                "data": last_7_days
-            },
-            "criteria_compare": {
-                "available_metrics": [
-                    "carry",
-                    "total_distance",
-                    "smash_factor",
-                    "face_angle",
-                    "club_path",
-                    "ball_speed",
-                    "club_speed",
-                    "back_spin",
-                    "side_spin"
-                ],
-                "result": criteria_compare
-            }
-        })
+        if request.if_none_match.contains(etag):
+            response = app.response_class(status=304)
+        else:
+            dashboard = entity_cache.get(
+                "dashboard", (uid, club, today, version, criteria_version),
+                lambda: _build_user_dashboard(uid, club))
+            response = jsonify(dashboard)
+        response.set_etag(etag)
+        # 브라우저만 저장, 매번 ETag로 재검증 (다른 유저 로그인 시 uid가 달라 ETag 불일치)
+        response.headers["Cache-Control"] = "private, no-cache"
+        response.headers["Vary"] = "Cookie"
+        return response
     except KeyError:
         return jsonify({"error": "로그인이 필요합니다."}), 401
     except Exception as e:
@@ -626,6 +635,45 @@ def register_pc():
             "message": "PC 등록 실패"
         }), 500
 
+# 샷 수집 프로그램 heartbeat 단계별 소요 시간 요약 (client/core/stage_timer.py summarize)
+# 인증 없는 API라 알려진 단계/숫자 값만 저장 (슈퍼 관리자 PC 관리 화면이 그대로 표시)
+LATENCY_STAGES = ("capture.full", "capture.text", "ocr", "parse", "active_user", "upload", "shot_total")
+LATENCY_STAT_KEYS = ("p50", "p95", "p99", "count")
+LATENCY_MAX_MS = 10 ** 7
+LATENCY_MAX_SLOW_REGIONS = 5
+LATENCY_MAX_REGION_LEN = 40
+
+def _latency_number(value):
+    """유한한 0 이상 숫자만 (bool/문자열/NaN 제외)"""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    if value != value or value < 0 or value > LATENCY_MAX_MS:
+        return None
+    return value
+
+def clean_latency_summary(latency):
+    """heartbeat latency → 저장할 dict (형식이 맞는 단계/영역만, 남는 게 없으면 None)"""
+    if not isinstance(latency, dict):
+        return None
+    cleaned = {}
+    for stage in LATENCY_STAGES:
+        stats = latency.get(stage)
+        if not isinstance(stats, dict):
+            continue
+        values = {key: _latency_number(stats.get(key)) for key in LATENCY_STAT_KEYS}
+        if all(value is not None for value in values.values()):
+            cleaned[stage] = values
+    regions = latency.get("slow_regions")
+    if isinstance(regions, list):
+        slow = []
+        for item in regions[:LATENCY_MAX_SLOW_REGIONS]:
+            if (isinstance(item, list) and len(item) == 2 and isinstance(item[0], str)
+                    and 0 < len(item[0]) <= LATENCY_MAX_REGION_LEN and _latency_number(item[1]) is not None):
+                slow.append([item[0], item[1]])
+        if slow:
+            cleaned["slow_regions"] = slow
+    return cleaned or None
+
 @app.route("/api/update_pc_last_seen", methods=["POST"])
 def update_pc_last_seen():
     """PC 마지막 접속 시간 업데이트 API"""
@@ -635,7 +683,10 @@ def update_pc_last_seen():
     if not pc_unique_id:
         return jsonify({"success": False, "message": "pc_unique_id 필요"}), 400
     
-    database.update_pc_last_seen(pc_unique_id)
+    # 단계별 소요 시간 요약 (선택, 이전 버전 수집 프로그램은 보내지 않음)
+    latency = clean_latency_summary(data.get("latency"))
+    
+    database.update_pc_last_seen(pc_unique_id, latency=latency)
     return jsonify({"success": True})
 
 @app.route("/api/check_pc_approval", methods=["GET"])
@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+과거 샷 일괄 재채점 스크립트 (criteria.json 변경 후 실행)
+
+shots 테이블을 id 범위 청크로 훑으면서
+is_valid / score / criteria_classes / criteria_version을 현재 criteria.json 기준으로 다시 계산한다.
+
+- 평가: shared.criteria_engine.CompiledCriteria.evaluate_batch (NumPy 벡터 연산, 청크 단위 1회 호출)
+- 실행: shared/backfill.py run_backfill (청크마다 짧은 트랜잭션, 잠금 대기 재시도, rows/s·ETA 출력)
+- 기록: 청크마다 UPDATE ... FROM (VALUES ...) 1회 (결과나 버전이 바뀐 샷만)
+- 재개: backfill_checkpoints의 shots_rescore_<criteria_version> 작업 (python backfill.py status로 확인)
+
+사용법:
+    python rescore_shots.py                      # 현재 criteria.json 버전으로 재채점 (중단 지점부터 재개)
+    python rescore_shots.py --batch-size 20000 --sleep 0.05
+    python rescore_shots.py --reset              # 체크포인트 무시하고 처음부터
+    python rescore_shots.py --dry-run            # DB에 쓰지 않고 속도/변경 건수만 확인
+"""
+
+import argparse
+import os
+import sys
+
+# 공유 모듈 경로 추가 (services/user_web/)
+current_dir = os.path.dirname(os.path.abspath(__file__))
+if current_dir not in sys.path:
+    sys.path.insert(0, current_dir)
+
+import numpy as np
+from psycopg2.extras import execute_values
+
+from shared.backfill import DEFAULT_BATCH_SIZE, DEFAULT_LOCK_TIMEOUT, BackfillJob, run_backfill
+from shared.database import get_db_connection
+from shared.criteria_engine import CompiledCriteria, VALUE_METRICS
+from shared.migrate import load_migrations, migrate
+from utils import CRITERIA_ENGINE
+
+
+def rescore_job(compiled):
+    """기준표 버전별 재채점 백필 작업 (체크포인트도 버전별 - 기준표가 바뀌면 처음부터)"""
+    criteria_version = compiled.version
+    metric_cols = ", ".join(f"s.{m}" for m in VALUE_METRICS)
+    n_metrics = len(VALUE_METRICS)
+
+    def chunk(cur, lo, hi):
+        cur.execute(f"""
+            SELECT s.id, s.club_id, u.gender, {metric_cols},
+                   s.is_valid, s.score, s.criteria_classes, s.criteria_version
+            FROM shots s
+            LEFT JOIN users u ON u.user_id = s.user_id
+            WHERE s.id > %s AND s.id <= %s
+            ORDER BY s.id
+        """, (lo, hi))
+        rows = cur.fetchall()
+        if not rows:
+            return 0
+
+        key_idx = compiled.key_indices([r[1] or "" for r in rows], [r[2] for r in rows])
+        is_driver = np.fromiter(((r[1] or "").lower() == "driver" for r in rows), dtype=bool, count=len(rows))
+        values = np.array([r[3:3 + n_metrics] for r in rows], dtype=np.float64)
+
+        is_valid, score, codes = compiled.evaluate_batch(values, key_idx, is_driver)
+        classes = CompiledCriteria.encode_classes(codes)
+
+        # 결과나 버전이 바뀐 샷만 UPDATE (불필요한 row 버전 생성 방지)
+        updates = []
+        for i, r in enumerate(rows):
+            old_valid, old_score, old_classes, old_version = r[3 + n_metrics:]
+            new_valid, new_score = bool(is_valid[i]), int(score[i])
+            if (old_valid is new_valid and old_score == new_score
+                    and old_classes == classes[i] and old_version == criteria_version):
+                continue
+            updates.append((r[0], new_valid, new_score, classes[i], criteria_version))
+
+        if updates:
+            execute_values(cur, """
+                UPDATE shots AS s
+                SET is_valid = v.is_valid,
+                    score = v.score,
+                    criteria_classes = v.criteria_classes,
+                    criteria_version = v.criteria_version
+                FROM (VALUES %s) AS v(id, is_valid, score, criteria_classes, criteria_version)
+                WHERE s.id = v.id
+            """,
+                updates, page_size=len(updates))
+        return len(updates)
+
+    return BackfillJob(
+        name=f"shots_rescore_{criteria_version}",
+        table="shots",
+        description=f"shots 재채점 (criteria_version={criteria_version})",
+        chunk_sql=None,
+        chunk=chunk,
+    )
+
+
+def rescore_shots(batch_size=DEFAULT_BATCH_SIZE, sleep_sec=0.0, reset=False, dry_run=False,
+                  lock_timeout=DEFAULT_LOCK_TIMEOUT):
+    """현재 criteria.json 기준으로 전체 샷 재채점"""
+    # 실행 중 기준표가 바뀌어도 한 번의 실행은 같은 버전으로 끝까지 처리
+    compiled = CRITERIA_ENGINE.current()
+    if not compiled.criteria or not compiled.version:
+        print("❌ criteria.json을 불러오지 못했습니다. 재채점을 중단합니다.")
+        sys.exit(1)
+
+    job = rescore_job(compiled)
+    print("=" * 80)
+    print(f"[RESCORE] criteria_version={compiled.version} (기준 키 {len(compiled.keys)}개)"
+          f"{' (dry-run)' if dry_run else ''}")
+    print("=" * 80)
+
+    conn = get_db_connection()
+    try:
+        # backfill_checkpoints/재채점 컬럼이 아직 없으면 먼저 적용 (서비스 배포 전에 실행하는 경우)
+        migrate(conn, load_migrations())
+        changed = run_backfill(conn, job, batch_size=batch_size, sleep_sec=sleep_sec, reset=reset,
+                               lock_timeout=lock_timeout, dry_run=dry_run)
+    except Exception as e:
+        conn.rollback()
+        print(f"[RESCORE] ❌ 오류 발생: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+    finally:
+        conn.close()
+
+    print("=" * 80)
+    print(f"[RESCORE] ✅ 완료: 변경 {changed}개{' (dry-run, 롤백됨)' if dry_run else ''}")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="criteria.json 변경 후 과거 샷 일괄 재채점")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"id 범위 청크 크기 (기본 {DEFAULT_BATCH_SIZE})")
+    parser.add_argument("--sleep", type=float, default=0.0, help="청크 사이 대기 시간(초) - 피크 시간대 부하 완화")
+    parser.add_argument("--lock-timeout", default=DEFAULT_LOCK_TIMEOUT,
+                        help=f"청크별 잠금 대기 한도 (기본 {DEFAULT_LOCK_TIMEOUT}, 초과 시 양보 후 재시도)")
+    parser.add_argument("--reset", action="store_true", help="체크포인트 무시하고 처음부터 재채점")
+    parser.add_argument("--dry-run", action="store_true", help="DB에 쓰지 않고 평가만 수행")
+    args = parser.parse_args()
+    rescore_shots(batch_size=args.batch_size, sleep_sec=args.sleep, reset=args.reset,
+                  dry_run=args.dry_run, lock_timeout=args.lock_timeout)
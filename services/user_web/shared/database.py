@@ -9,6 +9,12 @@ import string
 import secrets
 import hashlib
 
+from shared.bay_keys import bay_filter, shot_bay_filter
+from shared.cache_bus import start_invalidation_bus
+from shared.entity_cache import entity_cache
+from shared.migrate import run_migrations
+from shared.shot_partitions import ensure_partitions_at_startup
+
 # PostgreSQL 연결 정보 (Railway 환경 변수 필수)
 # 🔒 보안: 프로덕션에서는 DATABASE_URL 환경 변수가 반드시 설정되어야 함
 DATABASE_URL = os.environ.get("DATABASE_URL")
@@ -50,314 +56,18 @@ def get_db_connection():
 # DB 초기화
 # ------------------------------------------------
 def init_db():
-    conn = get_db_connection()
-    cur = conn.cursor()
-
-    # 1️⃣ 유저 테이블
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS users (
-        user_id TEXT PRIMARY KEY,
-        password TEXT NOT NULL,
-        name TEXT,
-        phone TEXT,
-        gender TEXT CHECK(gender IN ('남','여','M','F')) NOT NULL,
-        created_at TEXT DEFAULT CURRENT_TIMESTAMP
-    )
-    """)
-    
-    try:
-        cur.execute("ALTER TABLE users ADD COLUMN IF NOT EXISTS name TEXT")
-    except Exception:
-        pass
-    
-    try:
-        cur.execute("ALTER TABLE users ADD COLUMN IF NOT EXISTS phone TEXT")
-    except Exception:
-        pass
-    
-    try:
-        cur.execute("ALTER TABLE users ADD COLUMN IF NOT EXISTS birth_date TEXT")
-    except Exception:
-        pass
-    
-    # phone 컬럼에 UNIQUE 제약조건 추가 (중복 가입 방지)
-    try:
-        cur.execute("""
-            DO $$ 
-            BEGIN
-                IF NOT EXISTS (
-                    SELECT 1 FROM pg_constraint 
-                    WHERE conname = 'users_phone_unique'
-                ) THEN
-                    ALTER TABLE users ADD CONSTRAINT users_phone_unique UNIQUE (phone);
-                END IF;
-            END $$;
-        """)
-    except Exception:
-        pass
-
-    # 2️⃣ 샷 테이블
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS shots (
-        id SERIAL PRIMARY KEY,
-        store_id TEXT,
-        bay_id TEXT,
-        user_id TEXT,
-        club_id TEXT,
-        ball_speed REAL,
-        club_speed REAL,
-        launch_angle REAL,
-        smash_factor REAL,
-        face_angle REAL,
-        club_path REAL,
-        lateral_offset REAL,
-        direction_angle REAL,
-        side_spin INTEGER,
-        back_spin INTEGER,
-        total_distance REAL,
-        carry REAL,
-        feedback TEXT,
-        timestamp TEXT
-    )
-    """)
-
-    # shots 테이블 컬럼 추가
-    for col in ["side_spin", "back_spin", "lateral_offset", "direction_angle", "total_distance", "carry"]:
-        try:
-            if col in ["side_spin", "back_spin"]:
-                cur.execute(f"ALTER TABLE shots ADD COLUMN IF NOT EXISTS {col} INTEGER")
-            else:
-                cur.execute(f"ALTER TABLE shots ADD COLUMN IF NOT EXISTS {col} REAL")
-        except Exception:
-            pass
-    
-    # is_guest 컬럼 추가 (게스트 샷 정책 명문화)
-    try:
-        cur.execute("ALTER TABLE shots ADD COLUMN IF NOT EXISTS is_guest BOOLEAN DEFAULT FALSE")
-    except Exception:
-        pass
-    
-    # is_valid, score 컬럼 추가 (샷 데이터 분석 구조)
-    try:
-        cur.execute("ALTER TABLE shots ADD COLUMN IF NOT EXISTS is_valid BOOLEAN DEFAULT FALSE")
-    except Exception:
-        pass
-    try:
-        cur.execute("ALTER TABLE shots ADD COLUMN IF NOT EXISTS score INTEGER DEFAULT NULL")
-    except Exception:
-        pass
-    
-    # shots 테이블 인덱스 추가 (7일 평균 계산 성능 향상)
-    try:
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_shots_user_timestamp ON shots(user_id, timestamp)")
-    except Exception:
-        pass
-
-    # 3️⃣ 매장 테이블 (확장)
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS stores (
-        store_id   TEXT PRIMARY KEY,
-        store_name TEXT,
-        admin_pw   TEXT,
-        bays_count INTEGER,
-        subscription_status TEXT DEFAULT 'active',
-        subscription_start_date TEXT,
-        subscription_end_date TEXT,
-        payment_plan TEXT,
-        created_at TEXT DEFAULT CURRENT_TIMESTAMP
-    )
-    """)
-    
-    # stores 테이블 컬럼 추가
-    for col in ["subscription_status", "subscription_start_date", "subscription_end_date", "payment_plan", "created_at"]:
-        try:
-            cur.execute(f"ALTER TABLE stores ADD COLUMN IF NOT EXISTS {col} TEXT")
-        except Exception:
-            pass
-
-    # 4️⃣ 타석 테이블 (코드 필드 추가)
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS bays (
-        store_id    TEXT,
-        bay_id      TEXT,
-        bay_number  INTEGER,
-        bay_name    TEXT,
-        status      TEXT,
-        user_id     TEXT,
-        last_update TEXT,
-        bay_code    TEXT UNIQUE,
-        assigned_pc_unique_id TEXT,
-        PRIMARY KEY (store_id, bay_id)
-    )
-    """)
-    
-    try:
-        cur.execute("ALTER TABLE bays ADD COLUMN IF NOT EXISTS bay_code TEXT")
-        cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_bay_code ON bays(bay_code)")
-    except Exception:
-        pass
-    
-    # bay_number 컬럼 추가 (마이그레이션)
-    try:
-        cur.execute("ALTER TABLE bays ADD COLUMN IF NOT EXISTS bay_number INTEGER")
-    except Exception:
-        pass
-    
-    try:
-        cur.execute("ALTER TABLE bays ADD COLUMN IF NOT EXISTS bay_name TEXT")
-    except Exception:
-        pass
-    
-    try:
-        cur.execute("ALTER TABLE bays ADD COLUMN IF NOT EXISTS assigned_pc_unique_id TEXT")
-    except Exception:
-        pass
-    
-    # ✅ UNIQUE 제약조건 (store_id, bay_number) 중복 방지
-    try:
-        cur.execute("""
-            CREATE UNIQUE INDEX IF NOT EXISTS ux_bays_store_baynumber
-            ON bays(store_id, bay_number)
-            WHERE bay_number IS NOT NULL
-        """)
-    except Exception:
-        pass
-
-    # 5️⃣ 활성 세션 테이블
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS active_sessions (
-        store_id    TEXT,
-        bay_id      TEXT,
-        user_id     TEXT,
-        login_time  TEXT DEFAULT CURRENT_TIMESTAMP,
-        PRIMARY KEY (store_id, bay_id)
-    )
-    """)
-
-    # 6️⃣ 결제 테이블 (신규)
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS payments (
-        id SERIAL PRIMARY KEY,
-        store_id TEXT,
-        amount REAL,
-        payment_date TEXT,
-        payment_method TEXT,
-        status TEXT DEFAULT 'pending',
-        created_at TEXT DEFAULT CURRENT_TIMESTAMP
-    )
-    """)
-
-    # 7️⃣ 구독 테이블 (신규)
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS subscriptions (
-        id SERIAL PRIMARY KEY,
-        store_id TEXT,
-        start_date TEXT,
-        end_date TEXT,
-        status TEXT DEFAULT 'active',
-        plan_type TEXT,
-        created_at TEXT DEFAULT CURRENT_TIMESTAMP
-    )
-    """)
-
-    # 8️⃣ 매장 PC 테이블 (신규)
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS store_pcs (
-        id SERIAL PRIMARY KEY,
-        store_id TEXT,
-        store_name TEXT NOT NULL,
-        bay_id TEXT,
-        bay_name TEXT NOT NULL,
-        pc_name TEXT NOT NULL,
-        pc_unique_id TEXT UNIQUE NOT NULL,
-        pc_uuid TEXT,
-        mac_address TEXT,
-        pc_hostname TEXT,
-        pc_platform TEXT,
-        pc_info JSONB,
-        pc_token TEXT UNIQUE,
-        registered_at TEXT DEFAULT CURRENT_TIMESTAMP,
-        last_seen_at TEXT,
-        status TEXT DEFAULT 'pending',
-        approved_at TEXT,
-        approved_by TEXT,
-        usage_start_date TEXT,
-        usage_end_date TEXT,
-        notes TEXT
-    )
-    """)
-    
-    # 기존 테이블에 새 컬럼 추가 (마이그레이션)
-    for col in ["store_id", "bay_id", "pc_uuid", "mac_address", "pc_token"]:
-        try:
-            cur.execute(f"ALTER TABLE store_pcs ADD COLUMN IF NOT EXISTS {col} TEXT")
-        except Exception as e:
-            print(f"[WARNING] store_pcs {col} 컬럼 추가 실패 (이미 존재할 수 있음): {e}")
-            conn.rollback()
-    
-    # bay_number 컬럼 추가 (INTEGER)
-    try:
-        cur.execute("ALTER TABLE store_pcs ADD COLUMN IF NOT EXISTS bay_number INTEGER")
-        conn.commit()
-        print("[DB] store_pcs 테이블에 bay_number 컬럼 추가 완료")
-    except Exception as e:
-        print(f"[WARNING] store_pcs bay_number 컬럼 추가 실패 (이미 존재할 수 있음): {e}")
-        conn.rollback()
-    
-    try:
-        cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_pc_unique_id ON store_pcs(pc_unique_id)")
-        cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_pc_token ON store_pcs(pc_token) WHERE pc_token IS NOT NULL")
-    except Exception:
-        pass
-
-    # 9️⃣ PC 등록 코드 테이블 (신규)
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS pc_registration_codes (
-        id SERIAL PRIMARY KEY,
-        code TEXT UNIQUE NOT NULL,
-        status TEXT DEFAULT 'ACTIVE',
-        issued_by TEXT,
-        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-        revoked_at TEXT,
-        notes TEXT
-    )
-    """)
-    
-    try:
-        cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_registration_code ON pc_registration_codes(code)")
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_registration_code_status ON pc_registration_codes(status)")
-    except Exception:
-        pass
-    
-    # 기존 테이블 마이그레이션 (pc_registration_keys → pc_registration_codes)
-    try:
-        cur.execute("""
-            INSERT INTO pc_registration_codes (code, status, issued_by, created_at, notes)
-            SELECT registration_key, 
-                   CASE 
-                       WHEN status = 'active' THEN 'ACTIVE'
-                       ELSE 'REVOKED'
-                   END,
-                   created_by,
-                   created_at,
-                   notes
-            FROM pc_registration_keys
-            WHERE NOT EXISTS (
-                SELECT 1 FROM pc_registration_codes WHERE code = pc_registration_keys.registration_key
-            )
-        """)
-        conn.commit()
-    except Exception:
-        pass  # 테이블이 없으면 스킵
-
-    # ⚠️ seed 데이터 생성 로직 제거됨
-    # 기본 매장/타석 생성은 seed_dev_data.py 스크립트로 분리
-    # 운영 환경에서는 절대 자동 실행되지 않음
+    """
+    DB 스키마 마이그레이션 (shared/migrations/*.sql)
 
-    conn.commit()
-    cur.close()
-    conn.close()
-    print("✅ DB 스키마 초기화 완료 (테이블/인덱스만 생성)")
+    schema_version이 최신이면 버전 조회 1회로 끝나고 (DDL 실행 없음),
+    미적용 버전이 있을 때만 advisory lock을 잡은 한 프로세스가 순서대로 적용한다.
+    이어서 다가올 달 shots 파티션이 없으면 미리 만든다 (있으면 쿼리 1회).
+    워커 간 캐시 무효화 버스(LISTEN/NOTIFY)는 DB가 아직 없어도 먼저 시작한다 (스스로 재연결).
+    """
+    start_invalidation_bus(get_db_connection)
+    version = run_migrations(get_db_connection)
+    ensure_partitions_at_startup(get_db_connection)
+    return version
 
 # ------------------------------------------------
 # 타석 코드 생성
@@ -448,6 +158,10 @@ def login_user(user_id, password):
     return dict(user) if user else None
 
 def get_user(user_id):
+    """유저 조회 (엔티티 캐시, create_user 후 무효화)"""
+    return entity_cache.get("user", user_id, lambda: _load_user(user_id))
+
+def _load_user(user_id):
     conn = get_db_connection()
     cur = conn.cursor(cursor_factory=RealDictCursor)
     cur.execute("SELECT * FROM users WHERE user_id=%s", (user_id,))
@@ -477,6 +191,7 @@ def create_user(user_id, password, name=None, phone=None, gender=None, birth_dat
             (user_id, password, name, phone, gender, birth_date)
         )
         conn.commit()
+        entity_cache.invalidate("user", user_id)
         cur.close()
         conn.close()
     except psycopg2.IntegrityError as e:
@@ -499,6 +214,14 @@ def check_user(user_id, password):
     conn.close()
     return dict(user) if user else None
 
+def _bump_shot_version(cur, user_id, now):
+    """유저 샷 버전 +1 (대시보드 캐시/ETag 기준, 샷 INSERT와 같은 트랜잭션에서 호출)"""
+    cur.execute("""
+        INSERT INTO user_shot_versions (user_id, version, updated_at) VALUES (%s, 1, %s)
+        ON CONFLICT (user_id) DO UPDATE
+        SET version = user_shot_versions.version + 1, updated_at = EXCLUDED.updated_at
+    """, (user_id, now))
+
 def save_shot_to_db(data):
     """
     샷 데이터 저장 (최근 샷 10분 기준 active_user 판단)
@@ -513,6 +236,8 @@ def save_shot_to_db(data):
     
     store_id = data.get("store_id")
     bay_id = data.get("bay_id")
+    bay_cond, bay_value = bay_filter(cur, store_id, bay_id)
+    shot_bay_cond, shot_bay_params = shot_bay_filter(cur, store_id, bay_id)
     
     # 최근 샷 10분 기준으로 active_user 유효성 확인
     from datetime import timedelta
@@ -521,25 +246,25 @@ def save_shot_to_db(data):
     ttl_time_str = ttl_time.strftime("%Y-%m-%d %H:%M:%S")
     
     # 해당 타석의 최근 샷 시간 확인 (user_id가 있고 게스트가 아닌 샷)
-    cur.execute("""
+    cur.execute(f"""
         SELECT MAX(timestamp) as last_shot_time
         FROM shots
         WHERE store_id = %s 
-          AND bay_id = %s
+          AND {shot_bay_cond}
           AND user_id IS NOT NULL 
           AND user_id != '' 
           AND (is_guest = FALSE OR is_guest IS NULL)
-    """, (store_id, bay_id))
+    """, (store_id, *shot_bay_params))
     
     last_shot_row = cur.fetchone()
     last_shot_time = last_shot_row.get("last_shot_time") if last_shot_row else None
     
     # active_user 확인 (bays 테이블)
-    cur.execute("""
+    cur.execute(f"""
         SELECT user_id, last_update as login_time 
         FROM bays 
-        WHERE store_id = %s AND bay_id = %s AND user_id IS NOT NULL AND user_id != ''
-    """, (store_id, bay_id))
+        WHERE store_id = %s AND {bay_cond} AND user_id IS NOT NULL AND user_id != ''
+    """, (store_id, bay_value))
     active_user_row = cur.fetchone()
     active_user_id = active_user_row.get("user_id") if active_user_row else None
     
@@ -556,21 +281,21 @@ def save_shot_to_db(data):
             print(f"[INFO] 개인 샷 저장: store_id={store_id}, bay_id={bay_id}, user_id={user_id} (최근 샷 {last_shot_time} 기준)")
         else:
             # 최근 샷이 10분 초과면 active_user 해제하고 게스트 샷으로 저장
-            cur.execute("""
+            cur.execute(f"""
                 UPDATE bays SET user_id = '', last_update = CURRENT_TIMESTAMP
-                WHERE store_id = %s AND bay_id = %s
-            """, (store_id, bay_id))
-            cur.execute("DELETE FROM active_sessions WHERE store_id = %s AND bay_id = %s", (store_id, bay_id))
+                WHERE store_id = %s AND {bay_cond}
+            """, (store_id, bay_value))
+            cur.execute(f"DELETE FROM active_sessions WHERE store_id = %s AND {bay_cond}", (store_id, bay_value))
             user_id = None
             is_guest = True
             print(f"[INFO] active_user 자동 해제 후 게스트 샷 저장: store_id={store_id}, bay_id={bay_id} (최근 샷 {last_shot_time}, {ttl_minutes}분 초과)")
     elif active_user_id and not last_shot_time:
         # active_user는 있지만 최근 샷이 없으면 해제하고 게스트 샷
-        cur.execute("""
+        cur.execute(f"""
             UPDATE bays SET user_id = '', last_update = CURRENT_TIMESTAMP
-            WHERE store_id = %s AND bay_id = %s
-        """, (store_id, bay_id))
-        cur.execute("DELETE FROM active_sessions WHERE store_id = %s AND bay_id = %s", (store_id, bay_id))
+            WHERE store_id = %s AND {bay_cond}
+        """, (store_id, bay_value))
+        cur.execute(f"DELETE FROM active_sessions WHERE store_id = %s AND {bay_cond}", (store_id, bay_value))
         user_id = None
         is_guest = True
         print(f"[INFO] active_user 자동 해제 후 게스트 샷 저장: store_id={store_id}, bay_id={bay_id} (최근 샷 없음)")
@@ -589,7 +314,7 @@ def save_shot_to_db(data):
         user_dir = os.path.dirname(current_dir)  # services/user_web/
         if user_dir not in sys.path:
             sys.path.insert(0, user_dir)
-        from utils import evaluate_shot_by_criteria, get_criteria_key
+        from utils import CRITERIA_ENGINE
         
         # 유저 성별 조회 (성별 없으면 male 기준)
         gender = None
@@ -599,17 +324,24 @@ def save_shot_to_db(data):
                 gender = user.get("gender")
         
         club_id = data.get("club_id") or ""
+        # 평가/색상 클래스/버전은 같은 컴파일 결과로 계산 (저장 중 기준표 변경 대비)
+        criteria = CRITERIA_ENGINE.current()
         # criteria 키 결정 로그 (초기 점검용)
-        criteria_key = get_criteria_key(club_id, gender)
+        criteria_key = criteria.key_for(club_id, gender)
         print(f"[CRITERIA] club={club_id}, gender={gender} → key={criteria_key}")
         
-        is_valid, score = evaluate_shot_by_criteria(data, club_id, gender=gender)
+        is_valid, score = criteria.evaluate(data, club_id, gender)
+        # 화면 표시용 색상 클래스 (조회 시 재분류하지 않도록 저장 시 계산)
+        criteria_classes = criteria.display_codes(data, club_id, gender)
+        criteria_version = criteria.version
     except Exception as e:
         print(f"[WARNING] 샷 평가 실패: {e}")
         import traceback
         traceback.print_exc()
         is_valid = False
         score = 0
+        criteria_classes = None
+        criteria_version = None
     
     cur.execute("""
 INSERT INTO shots (
@@ -619,8 +351,9 @@ INSERT INTO shots (
     smash_factor, face_angle, club_path,
     lateral_offset, direction_angle,
     side_spin, back_spin,
-    feedback, timestamp, is_guest, is_valid, score
-) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    feedback, timestamp, is_guest, is_valid, score,
+    criteria_classes, criteria_version
+) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
 """, (
         store_id,
         bay_id,
@@ -642,11 +375,18 @@ INSERT INTO shots (
         data.get("timestamp") or now,
         is_guest,  # 게스트 샷 표시
         is_valid,  # 기준 충족 여부
-        score  # 점수 (0-100)
+        score,  # 점수 (0-100)
+        criteria_classes,  # 지표별 색상 클래스 코드
+        criteria_version  # 평가에 사용한 criteria.json 버전
     ))
+    if user_id:
+        _bump_shot_version(cur, user_id, now)
     conn.commit()
     cur.close()
     conn.close()
+    if user_id:
+        # 대시보드 캐시 무효화 (cache_bus로 다른 워커까지 전파)
+        entity_cache.invalidate("dashboard", user_id)
 
 def get_last_shot(user_id):
     """개인 유저의 마지막 샷 조회 (게스트 샷 절대 제외)"""
@@ -705,6 +445,7 @@ def set_active_session(store_id, bay_id, user_id):
     """타석에 활성 사용자 등록 (active_sessions + bays 테이블 모두 업데이트)"""
     conn = get_db_connection()
     cur = conn.cursor()
+    bay_cond, bay_value = bay_filter(cur, store_id, bay_id)
     now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
     try:
@@ -718,11 +459,11 @@ def set_active_session(store_id, bay_id, user_id):
         """, (store_id, bay_id, user_id, now))
         
         # 2. bays 테이블에도 활성 사용자 등록 (샷 수집 프로그램이 조회할 수 있도록)
-        cur.execute("""
+        cur.execute(f"""
             UPDATE bays 
             SET user_id = %s, last_update = %s
-            WHERE store_id = %s AND bay_id = %s
-        """, (user_id, now, store_id, bay_id))
+            WHERE store_id = %s AND {bay_cond}
+        """, (user_id, now, store_id, bay_value))
         
         conn.commit()
         print(f"[DEBUG] 활성 사용자 등록: store_id={store_id}, bay_id={bay_id}, user_id={user_id}")
@@ -743,20 +484,21 @@ def clear_active_session(store_id, bay_id):
     
     conn = get_db_connection()
     cur = conn.cursor()
+    bay_cond, bay_value = bay_filter(cur, store_id, bay_id)
     
     try:
         # 1. active_sessions 테이블에서 제거
-        cur.execute("""
-            DELETE FROM active_sessions WHERE store_id = %s AND bay_id = %s
-        """, (store_id, bay_id))
+        cur.execute(f"""
+            DELETE FROM active_sessions WHERE store_id = %s AND {bay_cond}
+        """, (store_id, bay_value))
         deleted_count = cur.rowcount
         
         # 2. bays 테이블에서도 활성 사용자 제거 (NULL로 설정)
-        cur.execute("""
+        cur.execute(f"""
             UPDATE bays 
             SET user_id = NULL, last_update = CURRENT_TIMESTAMP
-            WHERE store_id = %s AND bay_id = %s
-        """, (store_id, bay_id))
+            WHERE store_id = %s AND {bay_cond}
+        """, (store_id, bay_value))
         
         conn.commit()
         return deleted_count
@@ -774,14 +516,15 @@ def get_active_user(store_id, bay_id):
     """타석의 활성 사용자 조회 (bays 테이블 우선, 없으면 active_sessions 확인)"""
     conn = get_db_connection()
     cur = conn.cursor(cursor_factory=RealDictCursor)
+    bay_cond, bay_value = bay_filter(cur, store_id, bay_id)
     
     try:
         # 1. bays 테이블에서 조회 (샷 수집 프로그램이 조회하는 방식)
-        cur.execute("""
+        cur.execute(f"""
             SELECT user_id, last_update as login_time 
             FROM bays 
-            WHERE store_id = %s AND bay_id = %s AND user_id IS NOT NULL AND user_id != ''
-        """, (store_id, bay_id))
+            WHERE store_id = %s AND {bay_cond} AND user_id IS NOT NULL AND user_id != ''
+        """, (store_id, bay_value))
         row = cur.fetchone()
         
         if row and row.get("user_id"):
@@ -791,18 +534,18 @@ def get_active_user(store_id, bay_id):
             return result
         
         # 2. bays 테이블에 없으면 active_sessions 테이블 확인 (하위 호환)
-        cur.execute("""
-            SELECT user_id, login_time FROM active_sessions WHERE store_id = %s AND bay_id = %s
-        """, (store_id, bay_id))
+        cur.execute(f"""
+            SELECT user_id, login_time FROM active_sessions WHERE store_id = %s AND {bay_cond}
+        """, (store_id, bay_value))
         row = cur.fetchone()
         
         # active_sessions에 있으면 bays 테이블에도 동기화
         if row and row.get("user_id"):
-            cur.execute("""
+            cur.execute(f"""
                 UPDATE bays 
                 SET user_id = %s, last_update = %s
-                WHERE store_id = %s AND bay_id = %s
-            """, (row["user_id"], row.get("login_time", datetime.now().strftime("%Y-%m-%d %H:%M:%S")), store_id, bay_id))
+                WHERE store_id = %s AND {bay_cond}
+            """, (row["user_id"], row.get("login_time", datetime.now().strftime("%Y-%m-%d %H:%M:%S")), store_id, bay_value))
             conn.commit()
             return dict(row)
         
@@ -835,21 +578,23 @@ def cleanup_expired_active_users_by_last_shot(ttl_minutes=10):
         
         # 1. shots 테이블에서 각 타석의 최근 샷 시간 확인
         # user_id가 있고 게스트가 아닌 최근 샷만 확인
+        # 타석 키: bay_number (백필 전 빈 행은 숫자 bay_id로, 그래도 없으면 bay_id) - "01"/"1" 표기가 달라도 같은 타석으로 매칭
         cur.execute("""
-            SELECT store_id, bay_id, MAX(timestamp) as last_shot_time
+            SELECT store_id, COALESCE(COALESCE(bay_number, bay_key(NULL, bay_id, NULL))::text, bay_id),
+                   MAX(timestamp) as last_shot_time
             FROM shots
             WHERE user_id IS NOT NULL 
               AND user_id != '' 
               AND (is_guest = FALSE OR is_guest IS NULL)
               AND timestamp >= %s
-            GROUP BY store_id, bay_id
+            GROUP BY 1, 2
         """, (ttl_time_str,))
         
         active_bays = {f"{row[0]}_{row[1]}": row[2] for row in cur.fetchall()}
         
         # 2. bays 테이블에서 active_user가 있는 타석 확인
         cur.execute("""
-            SELECT store_id, bay_id, user_id
+            SELECT store_id, bay_id, bay_number, user_id
             FROM bays
             WHERE user_id IS NOT NULL AND user_id != ''
         """)
@@ -857,8 +602,8 @@ def cleanup_expired_active_users_by_last_shot(ttl_minutes=10):
         bays_with_active_user = cur.fetchall()
         cleaned_count = 0
         
-        for store_id, bay_id, user_id in bays_with_active_user:
-            bay_key = f"{store_id}_{bay_id}"
+        for store_id, bay_id, bay_number, user_id in bays_with_active_user:
+            bay_key = f"{store_id}_{bay_number if bay_number is not None else bay_id}"
             last_shot_time = active_bays.get(bay_key)
             
             # 최근 샷이 없거나 10분 이상 지났으면 해제
@@ -871,10 +616,11 @@ def cleanup_expired_active_users_by_last_shot(ttl_minutes=10):
                 """, (store_id, bay_id))
                 
                 # active_sessions도 제거
-                cur.execute("""
+                bay_cond, bay_value = ("bay_number = %s", bay_number) if bay_number is not None else ("bay_id = %s", bay_id)
+                cur.execute(f"""
                     DELETE FROM active_sessions 
-                    WHERE store_id = %s AND bay_id = %s
-                """, (store_id, bay_id))
+                    WHERE store_id = %s AND {bay_cond}
+                """, (store_id, bay_value))
                 
                 cleaned_count += 1
                 print(f"[INFO] active_user 자동 해제: store_id={store_id}, bay_id={bay_id}, user_id={user_id} (최근 샷 없음 또는 {ttl_minutes}분 초과)")
@@ -955,6 +701,10 @@ def get_all_stores():
     return [dict(row) for row in rows]
 
 def get_bays(store_id):
+    """매장의 승인된 타석 목록 (엔티티 캐시, 매장/PC 승인 변경 후 무효화)"""
+    return entity_cache.get("bays", store_id, lambda: _load_bays(store_id)) or []
+
+def _load_bays(store_id):
     """
     매장의 승인된 타석 목록만 반환 (store_pcs 기준, 100% 단순화)
     
@@ -990,7 +740,7 @@ def get_bays(store_id):
             FROM bays b
             INNER JOIN store_pcs sp ON (
                 sp.store_id = b.store_id 
-                AND (sp.bay_id = b.bay_id OR sp.bay_id = CAST(b.bay_number AS TEXT))
+                AND sp.bay_number = b.bay_number
                 AND sp.status = 'active'
                 AND (sp.usage_end_date IS NULL OR sp.usage_end_date::date >= %s::date)
             )
@@ -1020,7 +770,7 @@ def get_bays(store_id):
             cur.close()
         if conn:
             conn.close()
-        return []
+        return None  # 오류 결과는 캐시하지 않음
 
 def get_all_shots_by_store(store_id):
     conn = get_db_connection()
@@ -1036,9 +786,10 @@ def get_all_shots_by_store(store_id):
 def get_shots_by_bay(store_id, bay_id):
     conn = get_db_connection()
     cur = conn.cursor(cursor_factory=RealDictCursor)
-    cur.execute("""
-        SELECT * FROM shots WHERE store_id = %s AND bay_id = %s ORDER BY timestamp DESC LIMIT 100
-    """, (store_id, bay_id))
+    bay_cond, bay_params = shot_bay_filter(cur, store_id, bay_id)
+    cur.execute(f"""
+        SELECT * FROM shots WHERE store_id = %s AND {bay_cond} ORDER BY timestamp DESC LIMIT 100
+    """, (store_id, *bay_params))
     rows = cur.fetchall()
     cur.close()
     conn.close()
@@ -1065,6 +816,7 @@ def create_store(store_id, store_name, password, bays_count):
                 (store_id, bay_id, bay_code)
             )
         conn.commit()
+        entity_cache.invalidate("bays", store_id)
         return True
     except Exception as e:
         print(f"매장 등록 오류: {e}")
@@ -1184,6 +936,10 @@ def approve_pc(pc_unique_id, store_id, bay_id, approved_by):
         """, (store_id, bay_id, pc_token, approved_by, pc_unique_id))
         
         conn.commit()
+        # 이전 매장/새 매장 타석 목록 모두 무효화 (PC 이동 포함)
+        entity_cache.invalidate("bays", store_id)
+        if pc_dict.get("store_id") and pc_dict.get("store_id") != store_id:
+            entity_cache.invalidate("bays", pc_dict.get("store_id"))
         
         # 업데이트된 정보 반환
         cur.execute("SELECT * FROM store_pcs WHERE pc_unique_id = %s", (pc_unique_id,))
@@ -1268,14 +1024,29 @@ def get_all_store_pcs():
     conn.close()
     return [dict(row) for row in rows]
 
-def update_pc_last_seen(pc_unique_id):
-    """PC 마지막 접속 시간 업데이트"""
+def update_pc_last_seen(pc_unique_id, latency=None):
+    """
+    PC 마지막 접속 시간 업데이트
+
+    latency: 샷 수집 프로그램의 단계별 소요 시간 요약 dict (있으면 latency_summary에 최신 값 저장)
+    """
     conn = get_db_connection()
     cur = conn.cursor()
-    cur.execute(
-        "UPDATE store_pcs SET last_seen_at = CURRENT_TIMESTAMP WHERE pc_unique_id = %s",
-        (pc_unique_id,)
-    )
+    if latency:
+        import json
+        cur.execute(
+            """
+            UPDATE store_pcs
+            SET last_seen_at = CURRENT_TIMESTAMP, latency_summary = %s, latency_updated_at = CURRENT_TIMESTAMP
+            WHERE pc_unique_id = %s
+            """,
+            (json.dumps(latency), pc_unique_id)
+        )
+    else:
+        cur.execute(
+            "UPDATE store_pcs SET last_seen_at = CURRENT_TIMESTAMP WHERE pc_unique_id = %s",
+            (pc_unique_id,)
+        )
     conn.commit()
     cur.close()
     conn.close()
@@ -1439,6 +1210,37 @@ def register_pc_with_code(registration_code, store_name, bay_name, pc_name, pc_i
 # 유저 대시보드 v3 (DRIVER 기준, is_valid=TRUE만)
 # =========================
 
+def day_bounds(day, days=1):
+    """
+    날짜 → timestamp 범위 조건 값 ('YYYY-MM-DD' 이상, days일 뒤 미만)
+
+    shots는 timestamp 월별 파티션이라 DATE(timestamp) = %s 대신
+    timestamp >= %s AND timestamp < %s 로 조회해야 해당 월 파티션만 읽는다.
+    """
+    from datetime import timedelta
+    start = datetime.strptime(day, "%Y-%m-%d")
+    return start.strftime("%Y-%m-%d"), (start + timedelta(days=days)).strftime("%Y-%m-%d")
+
+def get_dashboard_version(user_id):
+    """
+    유저 샷 버전 조회 (샷이 저장될 때마다 save_shot_to_db가 +1)
+
+    entity_cache "dashboard"에 캐시되고 샷 저장 시 cache_bus로 모든 워커에서 무효화되므로,
+    샷 사이에 대시보드를 반복 조회해도 DB 조회가 없다.
+    """
+    return entity_cache.get("dashboard", (user_id, "version"), lambda: _load_dashboard_version(user_id))
+
+def _load_dashboard_version(user_id):
+    conn = get_db_connection()
+    cur = conn.cursor()
+    try:
+        cur.execute("SELECT version FROM user_shot_versions WHERE user_id = %s", (user_id,))
+        row = cur.fetchone()
+        return row[0] if row else 0
+    finally:
+        cur.close()
+        conn.close()
+
 def get_today_summary_driver(user_id):
     """오늘 요약 데이터 (DRIVER, is_valid=TRUE만)"""
     from datetime import datetime
@@ -1463,8 +1265,8 @@ def get_today_summary_driver(user_id):
           AND club_id = 'DRIVER'
           AND is_valid = TRUE
           AND is_guest = FALSE
-          AND DATE(timestamp) = %s
-    """, (user_id, today))
+          AND timestamp >= %s AND timestamp < %s
+    """, (user_id, *day_bounds(today)))
     
     row = cur.fetchone()
     cur.close()
@@ -1538,33 +1340,35 @@ def get_7days_average_driver(user_id):
     # 최근 7일 날짜 목록
     dates = [(datetime.now() - timedelta(days=i)).strftime("%Y-%m-%d") for i in range(6, -1, -1)]
     
+    # 7일을 쿼리 1회로 (timestamp 범위 조건 → 해당 월 파티션만 조회)
+    cur.execute("""
+        SELECT 
+            LEFT(timestamp, 10) as date,
+            AVG(carry) as avg_carry,
+            AVG(total_distance) as avg_total_distance,
+            AVG(smash_factor) as avg_smash_factor,
+            AVG(ABS(face_angle)) as avg_face_angle,
+            AVG(ABS(club_path)) as avg_club_path,
+            AVG(ball_speed) as avg_ball_speed,
+            AVG(club_speed) as avg_club_speed,
+            AVG(back_spin) as avg_back_spin,
+            AVG(ABS(side_spin)) as avg_side_spin
+        FROM shots
+        WHERE user_id = %s
+          AND club_id = 'DRIVER'
+          AND is_valid = TRUE
+          AND is_guest = FALSE
+          AND timestamp >= %s AND timestamp < %s
+        GROUP BY LEFT(timestamp, 10)
+    """, (user_id, *day_bounds(dates[0], days=7)))
+    rows_by_date = {row["date"]: row for row in cur.fetchall()}
+    
     results = []
     for date_str in dates:
-        cur.execute("""
-            SELECT 
-                DATE(timestamp) as date,
-                AVG(carry) as avg_carry,
-                AVG(total_distance) as avg_total_distance,
-                AVG(smash_factor) as avg_smash_factor,
-                AVG(ABS(face_angle)) as avg_face_angle,
-                AVG(ABS(club_path)) as avg_club_path,
-                AVG(ball_speed) as avg_ball_speed,
-                AVG(club_speed) as avg_club_speed,
-                AVG(back_spin) as avg_back_spin,
-                AVG(ABS(side_spin)) as avg_side_spin
-            FROM shots
-            WHERE user_id = %s
-              AND club_id = 'DRIVER'
-              AND is_valid = TRUE
-              AND is_guest = FALSE
-              AND DATE(timestamp) = %s
-            GROUP BY DATE(timestamp)
-        """, (user_id, date_str))
-        
-        row = cur.fetchone()
+        row = rows_by_date.get(date_str)
         if row:
             results.append({
-                "date": row.get("date"),
+                "date": date_str,
                 "avg_carry": round(float(row.get("avg_carry") or 0), 1),
                 "avg_total_distance": round(float(row.get("avg_total_distance") or 0), 1),
                 "avg_smash_factor": round(float(row.get("avg_smash_factor") or 0), 2),
@@ -1640,71 +1444,30 @@ def get_criteria_compare_driver(user_id):
         user_dir = os.path.dirname(current_dir)
         if user_dir not in sys.path:
             sys.path.insert(0, user_dir)
-        from utils import _get_rule, get_criteria_key
+        from utils import CRITERIA_ENGINE
     except Exception as e:
         print(f"[WARNING] utils import 실패: {e}")
         return {}
     
     # criteria 키 결정 로그 (초기 점검용)
     club_id = "driver"
-    criteria_key = get_criteria_key(club_id, gender)
+    criteria = CRITERIA_ENGINE.current()
+    criteria_key = criteria.key_for(club_id, gender)
     print(f"[CRITERIA] club={club_id}, gender={gender} → key={criteria_key}")
     
     # criteria.json 기준으로 비교 (성별 기준 적용)
     result = {}
+    status_map = {"bg-good": "GOOD", "bg-warn": "WARN", "bg-bad": "BAD"}
     
-    metrics_map = {
-        "smash_factor": "smash_factor",
-        "face_angle": "face_angle",
-        "club_path": "club_path",
-        "back_spin": "back_spin",
-        "side_spin": "side_spin"
-    }
-    
-    for metric_key, rule_key in metrics_map.items():
+    for metric_key in ["smash_factor", "face_angle", "club_path", "back_spin", "side_spin"]:
         avg_value = row.get(f"avg_{metric_key}")
         if avg_value is None:
             continue
         
-        rule = _get_rule(club_id, rule_key, gender=gender)
-        if not rule:
-            continue
-        
-        good = rule.get("good")
-        warn = rule.get("warn")
-        bad = rule.get("bad")
-        
-        try:
-            v = float(avg_value)
-        except (ValueError, TypeError):
-            continue
-        
         # face_angle, club_path, side_spin은 절댓값 사용
-        if metric_key in ["face_angle", "club_path", "side_spin"]:
-            v = abs(v)
-        
-        # 기준 충족 여부 확인
-        if isinstance(good, (list, tuple)) and len(good) == 2:
-            low, high = float(good[0]), float(good[1])
-            result[metric_key] = "GOOD" if (low <= v <= high) else "BAD"
-        elif good is not None and bad is not None:
-            g, b = float(good), float(bad)
-            if v >= g:
-                result[metric_key] = "GOOD"
-            elif v <= b:
-                result[metric_key] = "BAD"
-            else:
-                result[metric_key] = "WARN"
-        elif good is not None and warn is not None:
-            g, w = float(good), float(warn)
-            if v <= g:
-                result[metric_key] = "GOOD"
-            elif v <= w:
-                result[metric_key] = "WARN"
-            else:
-                result[metric_key] = "BAD"
-        elif good is not None:
-            g = float(good)
-            result[metric_key] = "GOOD" if v >= g else "BAD"
+        status = criteria.classify(avg_value, club_id, metric_key, gender=gender,
+                                   abs_value=metric_key in ["face_angle", "club_path", "side_spin"])
+        if status in status_map:
+            result[metric_key] = status_map[status]
     
     return result
@@ -0,0 +1,174 @@
+# ===== shared/entity_cache.py (프로세스 내 엔티티 캐시) =====
+"""
+자주 읽고 드물게 바뀌는 행(매장, 타석 목록, 유저, 좌표 파일)의 read-through 캐시
+
+요청마다 같은 stores/bays/users/coordinates 행을 다시 조회하던 경로를 프로세스 메모리에서 처리한다.
+
+- 엔티티(namespace)별 TTL과 최대 개수 (초과 시 가장 오래 안 쓴 키부터 제거, LRU)
+- 쓰기 함수는 커밋 후 invalidate(namespace, key) 호출 → 같은 프로세스에서는 즉시 반영
+- 로딩 중에 무효화가 들어오면 로딩 결과는 캐시에 넣지 않음 (세대 번호 비교)
+- 반환값은 복사본 (호출자가 dict를 수정해도 캐시는 그대로)
+- None(행 없음)은 캐시하지 않음
+- stats(): namespace별 hit/miss/evict 건수와 hit rate
+
+사용법:
+    from shared.entity_cache import entity_cache
+
+    def get_user(user_id):
+        return entity_cache.get("user", user_id, lambda: _load_user(user_id))
+
+    entity_cache.invalidate("user", user_id)   # 쓰기 후
+    entity_cache.invalidate("coordinates", brand)  # (brand, ...) 튜플 키까지 함께 제거
+
+ENTITY_CACHE_DISABLED=1 이면 캐시 없이 항상 loader를 호출한다.
+"""
+import copy
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# namespace: (TTL 초, 최대 키 개수)
+DEFAULT_NAMESPACES = {
+    "store": (300, 1000),
+    "bays": (30, 1000),
+    "user": (300, 10000),
+    "coordinates": (600, 500),
+    "settings": (60, 100),
+    "dashboard": (300, 2000),
+}
+
+CACHE_DISABLED = os.environ.get("ENTITY_CACHE_DISABLED", "").lower() in ("1", "true", "yes")
+
+
+class _Namespace:
+    __slots__ = ("ttl", "maxsize", "entries", "generation",
+                 "hits", "misses", "evictions", "expirations", "invalidations")
+
+    def __init__(self, ttl, maxsize):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.entries = OrderedDict()  # key → (expires_at, value), 뒤쪽이 최근 사용
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+
+class EntityCache:
+    """namespace별 TTL + LRU 캐시 (스레드 안전)"""
+
+    def __init__(self, namespaces=None, disabled=False):
+        self._lock = threading.Lock()
+        self._namespaces = {}
+        self._listeners = []
+        self.disabled = disabled
+        for name, (ttl, maxsize) in (namespaces or {}).items():
+            self.register(name, ttl, maxsize)
+
+    def register(self, namespace, ttl, maxsize):
+        """namespace 등록 (이미 있으면 TTL/최대 개수만 변경)"""
+        with self._lock:
+            ns = self._namespaces.get(namespace)
+            if ns is None:
+                self._namespaces[namespace] = _Namespace(ttl, maxsize)
+            else:
+                ns.ttl, ns.maxsize = ttl, maxsize
+
+    def add_listener(self, listener):
+        """무효화 리스너 등록: listener(namespace, key) - 다른 워커로 전파할 때 사용"""
+        self._listeners.append(listener)
+
+    def get(self, namespace, key, loader):
+        """캐시 조회, 없거나 만료됐으면 loader()로 읽어서 저장 (read-through)"""
+        if self.disabled:
+            return loader()
+        now = time.monotonic()
+        with self._lock:
+            ns = self._namespaces[namespace]
+            entry = ns.entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    ns.entries.move_to_end(key)
+                    ns.hits += 1
+                    return copy.deepcopy(entry[1])
+                del ns.entries[key]
+                ns.expirations += 1
+            ns.misses += 1
+            generation = ns.generation
+
+        value = loader()
+        if value is None:
+            return None
+
+        with self._lock:
+            # 로딩 중 무효화됐으면 오래된 값일 수 있으므로 저장하지 않음
+            if ns.generation == generation:
+                ns.entries[key] = (time.monotonic() + ns.ttl, copy.deepcopy(value))
+                ns.entries.move_to_end(key)
+                while len(ns.entries) > ns.maxsize:
+                    ns.entries.popitem(last=False)
+                    ns.evictions += 1
+        return value
+
+    def _evict(self, namespace, key):
+        ns = self._namespaces.get(namespace)
+        if ns is None:
+            return 0
+        if key is None:
+            removed = len(ns.entries)
+            ns.entries.clear()
+        else:
+            keys = [k for k in ns.entries
+                    if k == key or (isinstance(k, tuple) and k and k[0] == key)]
+            for k in keys:
+                del ns.entries[k]
+            removed = len(keys)
+        ns.generation += 1
+        ns.invalidations += 1
+        return removed
+
+    def invalidate(self, namespace, key=None, notify=True):
+        """
+        캐시 무효화 (key=None이면 namespace 전체, key가 튜플 키의 첫 요소면 해당 키들 전부)
+        notify=False: 리스너 호출 생략 (다른 워커에서 받은 무효화를 적용할 때)
+        """
+        with self._lock:
+            removed = self._evict(namespace, key)
+        if notify:
+            for listener in self._listeners:
+                try:
+                    listener(namespace, key)
+                except Exception as e:
+                    print(f"[WARNING] 캐시 무효화 리스너 오류: {e}")
+        return removed
+
+    def clear(self):
+        """전체 캐시 비우기 (통계는 유지)"""
+        with self._lock:
+            for namespace in self._namespaces:
+                self._evict(namespace, None)
+
+    def stats(self):
+        """namespace별 통계 {namespace: {size, hits, misses, hit_rate, ...}}"""
+        with self._lock:
+            result = {}
+            for name, ns in self._namespaces.items():
+                lookups = ns.hits + ns.misses
+                result[name] = {
+                    "size": len(ns.entries),
+                    "maxsize": ns.maxsize,
+                    "ttl": ns.ttl,
+                    "hits": ns.hits,
+                    "misses": ns.misses,
+                    "hit_rate": round(ns.hits / lookups, 4) if lookups else 0.0,
+                    "evictions": ns.evictions,
+                    "expirations": ns.expirations,
+                    "invalidations": ns.invalidations,
+                }
+            return result
+
+
+entity_cache = EntityCache(DEFAULT_NAMESPACES, disabled=CACHE_DISABLED)
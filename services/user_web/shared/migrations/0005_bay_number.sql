@@ -0,0 +1,169 @@
+-- ============================================
+-- 0005 정수 타석 키 (bay_number)
+-- ============================================
+-- bays / store_pcs / shots / active_sessions 모두 bay_number INTEGER를 두고
+-- (store_id, bay_number) 등가 조인으로 조회한다. (shared/bay_keys.py 참고)
+-- shots 기존 행과 shots 인덱스는 python backfill.py run shots_bay_number로 청크 처리 (대용량 테이블 잠금 방지)
+
+-- NULL 기본값 컬럼 추가는 메타데이터만 변경 (테이블 재작성 없음)
+ALTER TABLE bays ADD COLUMN IF NOT EXISTS bay_number INTEGER;
+ALTER TABLE store_pcs ADD COLUMN IF NOT EXISTS bay_number INTEGER;
+ALTER TABLE shots ADD COLUMN IF NOT EXISTS bay_number INTEGER;
+ALTER TABLE active_sessions ADD COLUMN IF NOT EXISTS bay_number INTEGER;
+
+-- 이전 표현식 인덱스 정리 (bay_number 컬럼 인덱스로 대체)
+DROP INDEX IF EXISTS idx_bays_store_bay_key;
+DROP INDEX IF EXISTS idx_store_pcs_store_bay_key;
+DROP INDEX IF EXISTS idx_active_sessions_store_bay_key;
+
+-- bay_id(숫자) → bay_name(첫 숫자) 순으로 정수 타석 번호 결정
+CREATE OR REPLACE FUNCTION bay_key(p_bay_number INTEGER, p_bay_id TEXT, p_bay_name TEXT)
+RETURNS INTEGER
+LANGUAGE sql IMMUTABLE AS $$
+    SELECT COALESCE(
+        p_bay_number,
+        CASE WHEN btrim(p_bay_id) ~ '^[0-9]{1,6}$' THEN btrim(p_bay_id)::integer END,
+        NULLIF(substring(COALESCE(p_bay_name, '') from '([0-9]{1,6})'), '')::integer
+    )
+$$;
+
+-- INSERT / bay_id 변경 시 bay_number 자동 설정 (명시적으로 넣은 bay_number는 유지)
+-- 숫자 bay_id → 같은 매장 bays.bay_id 매핑 → store_pcs는 bay_name 숫자 순
+-- bays는 (store_id, bay_number) UNIQUE라 다른 행이 이미 쓰는 번호면 비워 둔다
+CREATE OR REPLACE FUNCTION set_bay_number() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' THEN
+        IF NEW.bay_id IS NOT DISTINCT FROM OLD.bay_id
+           OR NEW.bay_number IS DISTINCT FROM OLD.bay_number THEN
+            RETURN NEW;
+        END IF;
+        NEW.bay_number := NULL;
+    END IF;
+    IF NEW.bay_number IS NOT NULL THEN
+        RETURN NEW;
+    END IF;
+
+    NEW.bay_number := bay_key(NULL, NEW.bay_id, NULL);
+    IF NEW.bay_number IS NULL AND NEW.bay_id IS NOT NULL AND TG_TABLE_NAME <> 'bays' THEN
+        SELECT b.bay_number INTO NEW.bay_number
+        FROM bays b
+        WHERE b.store_id = NEW.store_id AND b.bay_id = NEW.bay_id AND b.bay_number IS NOT NULL
+        LIMIT 1;
+    END IF;
+    IF NEW.bay_number IS NULL AND TG_TABLE_NAME = 'store_pcs' THEN
+        NEW.bay_number := bay_key(NULL, NULL, NEW.bay_name);
+    END IF;
+    IF TG_TABLE_NAME = 'bays' AND NEW.bay_number IS NOT NULL AND EXISTS (
+        SELECT 1 FROM bays b
+        WHERE b.store_id = NEW.store_id AND b.bay_number = NEW.bay_number
+          AND b.bay_id IS DISTINCT FROM NEW.bay_id
+    ) THEN
+        NEW.bay_number := NULL;
+    END IF;
+    IF TG_OP = 'UPDATE' AND NEW.bay_number IS NULL THEN
+        NEW.bay_number := OLD.bay_number;
+    END IF;
+    RETURN NEW;
+END
+$$;
+
+-- bay_id가 바뀌는 UPDATE에서만 실행 (점수 재계산 등 다른 UPDATE는 영향 없음)
+-- 이전 init_db가 이미 만든 트리거는 그대로 둔다
+DO $$
+DECLARE
+    t TEXT;
+BEGIN
+    FOREACH t IN ARRAY ARRAY['bays', 'store_pcs', 'shots', 'active_sessions'] LOOP
+        IF NOT EXISTS (
+            SELECT 1 FROM pg_trigger
+            WHERE tgname = 'trg_' || t || '_bay_number' AND tgrelid = t::regclass
+        ) THEN
+            EXECUTE format(
+                'CREATE TRIGGER %I BEFORE INSERT OR UPDATE OF bay_id ON %I '
+                'FOR EACH ROW EXECUTE FUNCTION set_bay_number()',
+                'trg_' || t || '_bay_number', t
+            );
+        END IF;
+    END LOOP;
+END $$;
+
+-- 작은 테이블은 바로 채움 (shots는 python backfill.py run shots_bay_number로 청크 처리)
+-- bays: 같은 번호로 해석되는 행("01"/"1")이 여럿이면 하나만, 이미 쓰인 번호는 건너뜀 (UNIQUE 보호)
+UPDATE bays b SET bay_number = c.bay_number
+FROM (
+    SELECT DISTINCT ON (store_id, bay_key(NULL, bay_id, NULL))
+           store_id, bay_id, bay_key(NULL, bay_id, NULL) AS bay_number
+    FROM bays
+    WHERE bay_number IS NULL AND bay_key(NULL, bay_id, NULL) IS NOT NULL
+    ORDER BY store_id, bay_key(NULL, bay_id, NULL), bay_id
+) c
+WHERE b.store_id = c.store_id AND b.bay_id = c.bay_id
+  AND NOT EXISTS (
+      SELECT 1 FROM bays x WHERE x.store_id = c.store_id AND x.bay_number = c.bay_number
+  );
+
+UPDATE store_pcs SET bay_number = bay_key(NULL, bay_id, bay_name)
+WHERE bay_number IS NULL AND bay_key(NULL, bay_id, bay_name) IS NOT NULL;
+
+UPDATE active_sessions a
+SET bay_number = COALESCE(
+    bay_key(NULL, a.bay_id, NULL),
+    (SELECT b.bay_number FROM bays b
+     WHERE b.store_id = a.store_id AND b.bay_id = a.bay_id AND b.bay_number IS NOT NULL
+     LIMIT 1)
+)
+WHERE a.bay_number IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_bays_store_bay_number ON bays(store_id, bay_number);
+CREATE INDEX IF NOT EXISTS idx_store_pcs_store_bay_number ON store_pcs(store_id, bay_number);
+CREATE INDEX IF NOT EXISTS idx_active_sessions_store_bay_number ON active_sessions(store_id, bay_number);
+
+-- store_bay_status 뷰 (매장별 1..bays_count 타석 × 타석/PC/세션 상태)
+-- - 한 타석에 PC가 여러 대면 유효한 PC → 최근 승인 PC 순으로 1대 선택
+-- - 유효성(is_valid): status='active'이고 usage_end_date가 비었거나 오늘 이후
+CREATE OR REPLACE VIEW store_bay_status AS
+SELECT s.store_id,
+       g.bay_number,
+       COALESCE(b.bay_id, lpad(g.bay_number::text, 2, '0')) AS bay_id,
+       b.bay_name,
+       COALESCE(b.status, 'READY') AS status,
+       COALESCE(b.user_id, '') AS user_id,
+       COALESCE(b.last_update, '') AS last_update,
+       b.bay_code,
+       (pc.pc_unique_id IS NOT NULL) AS has_pc,
+       COALESCE(pc.is_valid, FALSE) AS is_valid,
+       pc.status AS pc_status,
+       pc.pc_name,
+       pc.pc_unique_id,
+       pc.usage_start_date,
+       pc.usage_end_date,
+       pc.approved_at,
+       pc.approved_by,
+       pc.notes,
+       a.user_id AS active_user,
+       a.login_time
+FROM stores s
+CROSS JOIN LATERAL generate_series(1, COALESCE(s.bays_count, 0)) AS g(bay_number)
+LEFT JOIN bays b
+       ON b.store_id = s.store_id AND b.bay_number = g.bay_number
+LEFT JOIN LATERAL (
+    SELECT p.status, p.pc_name, p.pc_unique_id, p.usage_start_date, p.usage_end_date,
+           p.approved_at, p.approved_by, p.notes,
+           (p.status = 'active' AND (
+               COALESCE(p.usage_end_date::text, '') = ''
+               OR (p.usage_end_date::text ~ '^[0-9]{4}-[0-9]{2}-[0-9]{2}$'
+                   AND p.usage_end_date::text >= to_char(CURRENT_DATE, 'YYYY-MM-DD'))
+           )) AS is_valid
+    FROM store_pcs p
+    WHERE p.store_id = s.store_id AND p.bay_number = g.bay_number
+    ORDER BY is_valid DESC NULLS LAST, p.approved_at DESC NULLS LAST
+    LIMIT 1
+) pc ON TRUE
+LEFT JOIN LATERAL (
+    SELECT se.user_id, se.login_time
+    FROM active_sessions se
+    WHERE se.store_id = s.store_id AND se.bay_number = g.bay_number
+    ORDER BY se.login_time DESC NULLS LAST
+    LIMIT 1
+) a ON TRUE;
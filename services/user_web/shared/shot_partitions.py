@@ -0,0 +1,448 @@
+# ===== shared/shot_partitions.py (shots 월별 파티션 관리 / 보존 정책) =====
+"""
+shots 월별 파티션 관리
+
+shots는 timestamp('YYYY-MM-DD HH:MM:SS') 기준 월별 RANGE 파티션이다 (마이그레이션 0007).
+오래된 데이터 정리를 대량 DELETE 대신 파티션 단위로 처리한다.
+
+- 파티션 생성: ensure_shot_partitions() SQL 함수 (서비스 기동 시 + CLI ensure)
+  이번 달 + MONTHS_AHEAD개월까지 미리 생성, 형식이 다른 timestamp와 파티션이 아직 없는 달은 shots_default
+  (나중에 그 달 파티션을 만들 때 shots_default의 해당 행을 새 파티션으로 옮긴다)
+- 게스트 샷: GUEST_SHOTS_RETENTION_MONTHS가 지난 달은 guest_shot_daily(매장/타석/일/클럽별 합계)로
+  집계 후 원본 삭제 (id 청크마다 DELETE ... RETURNING → 집계 INSERT를 한 문장으로 커밋)
+- 보관: SHOTS_RETENTION_MONTHS가 지난 달은 DETACH → 파일로 내보내기 → 행 수 확인 → DROP
+  (pyarrow가 있으면 Parquet(zstd), 없으면 COPY CSV를 gzip으로 저장)
+- 이력: shot_partition_log (게스트 집계 건수, 보관 파일 경로/행 수)
+
+조회 쿼리는 DATE(timestamp) 같은 함수 대신 timestamp >= %s AND timestamp < %s 범위 조건을 써야
+해당 월 파티션만 읽는다 (파티션 프루닝).
+
+사용법:
+    python shot_partitions.py status | ensure | copy | cutover | retention [--dry-run] | vacuum
+"""
+import csv
+import gzip
+import os
+import re
+import time
+from collections import namedtuple
+from datetime import date, datetime
+
+import psycopg2
+from psycopg2 import errors as psycopg2_errors
+from psycopg2 import sql
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pa_parquet
+except ImportError:
+    pa = None  # pyarrow 없으면 보관 파일은 CSV(gzip)
+
+# 보존 기간 (개월, 이번 달 제외) - 환경 변수로 조정
+SHOTS_RETENTION_MONTHS = int(os.environ.get("SHOTS_RETENTION_MONTHS", "24"))
+GUEST_SHOTS_RETENTION_MONTHS = int(os.environ.get("GUEST_SHOTS_RETENTION_MONTHS", "3"))
+ARCHIVE_DIR = os.environ.get("SHOTS_ARCHIVE_DIR", os.path.join("archive", "shots"))
+MONTHS_AHEAD = 3
+
+DEFAULT_BATCH_SIZE = 10000
+DEFAULT_LOCK_TIMEOUT = "3s"
+
+Partition = namedtuple("Partition", ["name", "range_from", "range_to", "est_rows",
+                                     "guest_purged_at", "archived_at"])
+
+_BOUND_RE = re.compile(r"FROM \('([^']*)'\) TO \('([^']*)'\)")
+
+# 게스트 샷 = is_guest 또는 user_id 없음 (is_guest 백필 전 데이터 포함)
+_GUEST_CONDITION = "(is_guest IS TRUE OR COALESCE(user_id, '') = '')"
+
+# 게스트 샷 삭제 + 일별 집계 누적 (한 문장 = 한 트랜잭션, 삭제한 행 수 반환)
+_PURGE_GUEST_SQL = """
+    WITH moved AS (
+        DELETE FROM {partition}
+        WHERE id > %(lo)s AND id <= %(hi)s AND """ + _GUEST_CONDITION + """
+        RETURNING store_id, bay_number, timestamp, club_id, is_valid,
+                  score, carry, total_distance, ball_speed, club_speed
+    ), merged AS (
+        INSERT INTO guest_shot_daily AS g (
+            store_id, bay_number, day, club_id, shot_count, valid_count,
+            score_sum, score_n, carry_sum, carry_n, total_distance_sum, total_distance_n,
+            ball_speed_sum, ball_speed_n, club_speed_sum, club_speed_n
+        )
+        SELECT COALESCE(store_id, ''), COALESCE(bay_number, 0), LEFT(timestamp, 10), COALESCE(club_id, ''),
+               COUNT(*), COUNT(*) FILTER (WHERE is_valid IS TRUE),
+               COALESCE(SUM(score), 0), COUNT(score),
+               COALESCE(SUM(carry), 0), COUNT(carry),
+               COALESCE(SUM(total_distance), 0), COUNT(total_distance),
+               COALESCE(SUM(ball_speed), 0), COUNT(ball_speed),
+               COALESCE(SUM(club_speed), 0), COUNT(club_speed)
+        FROM moved
+        GROUP BY 1, 2, 3, 4
+        ON CONFLICT (store_id, bay_number, day, club_id) DO UPDATE SET
+            shot_count = g.shot_count + EXCLUDED.shot_count,
+            valid_count = g.valid_count + EXCLUDED.valid_count,
+            score_sum = g.score_sum + EXCLUDED.score_sum,
+            score_n = g.score_n + EXCLUDED.score_n,
+            carry_sum = g.carry_sum + EXCLUDED.carry_sum,
+            carry_n = g.carry_n + EXCLUDED.carry_n,
+            total_distance_sum = g.total_distance_sum + EXCLUDED.total_distance_sum,
+            total_distance_n = g.total_distance_n + EXCLUDED.total_distance_n,
+            ball_speed_sum = g.ball_speed_sum + EXCLUDED.ball_speed_sum,
+            ball_speed_n = g.ball_speed_n + EXCLUDED.ball_speed_n,
+            club_speed_sum = g.club_speed_sum + EXCLUDED.club_speed_sum,
+            club_speed_n = g.club_speed_n + EXCLUDED.club_speed_n
+        RETURNING 1
+    )
+    SELECT COUNT(*) FROM moved
+"""
+
+
+def _now():
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def month_start(months_back=0, today=None):
+    """이번 달 1일에서 months_back개월 전 1일 ('YYYY-MM-DD')"""
+    today = today or date.today()
+    index = today.year * 12 + (today.month - 1) - months_back
+    return date(index // 12, index % 12 + 1, 1).strftime("%Y-%m-%d")
+
+
+def partition_parent(cur):
+    """파티션 부모 테이블 이름 (전환 전 shots_partitioned, 전환 후 shots, 0007 미적용이면 None)"""
+    cur.execute("SELECT to_regprocedure('shot_partition_parent()') IS NOT NULL")
+    if not cur.fetchone()[0]:
+        return None
+    cur.execute("SELECT shot_partition_parent()")
+    return cur.fetchone()[0]
+
+
+def ensure_partitions(conn, months_ahead=MONTHS_AHEAD, from_month=None, lock_timeout=DEFAULT_LOCK_TIMEOUT):
+    """
+    월 파티션 생성 (from_month부터 이번 달 + months_ahead까지, 이미 있으면 건너뜀)
+    shots_default에 그 달 행이 있으면 새 파티션으로 옮긴 뒤 붙인다 (한 트랜잭션)
+
+    Returns:
+        int: 새로 만든 파티션 수
+    """
+    cur = conn.cursor()
+    try:
+        cur.execute("SET LOCAL lock_timeout = %s", (lock_timeout,))
+        cur.execute("SELECT ensure_shot_partitions(%s, %s)", (months_ahead, from_month))
+        created = cur.fetchone()[0]
+        conn.commit()
+        return created
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+
+
+def ensure_partitions_at_startup(get_connection, log=print):
+    """
+    서비스 기동 시 호출: 다가올 달 파티션 미리 생성 (이미 있으면 쿼리 1회)
+    잠금을 못 잡거나 실패해도 기동은 계속 (다음 기동 또는 CLI ensure에서 재시도)
+    """
+    conn = get_connection()
+    try:
+        cur = conn.cursor()
+        parent = partition_parent(cur)
+        conn.commit()
+        cur.close()
+        if parent is None:
+            return 0
+        created = ensure_partitions(conn)
+        if created:
+            log(f"[INFO] shots 월 파티션 {created}개 생성")
+        return created
+    except psycopg2.Error as e:
+        log(f"[WARNING] shots 파티션 생성 실패 (다음 기동 시 재시도): {e}")
+        return 0
+    finally:
+        conn.close()
+
+
+def list_partitions(conn):
+    """파티션 목록 (이름순, est_rows는 통계 기반 추정치, 기본 파티션은 range_from/range_to None)"""
+    cur = conn.cursor()
+    parent = partition_parent(cur)
+    if parent is None:
+        conn.commit()
+        cur.close()
+        return []
+    cur.execute("""
+        SELECT c.relname, pg_get_expr(c.relpartbound, c.oid), GREATEST(c.reltuples, 0)::bigint,
+               l.guest_purged_at, l.archived_at
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        LEFT JOIN shot_partition_log l ON l.partition_name = c.relname
+        WHERE i.inhparent = to_regclass(%s)
+        ORDER BY c.relname
+    """, (parent,))
+    partitions = []
+    for name, bound, est_rows, guest_purged_at, archived_at in cur.fetchall():
+        match = _BOUND_RE.search(bound or "")
+        range_from, range_to = match.groups() if match else (None, None)
+        partitions.append(Partition(name, range_from, range_to, est_rows, guest_purged_at, archived_at))
+    conn.commit()
+    cur.close()
+    return partitions
+
+
+def list_archived(conn):
+    """보관 후 삭제된 파티션 이력 [(partition_name, range_from, archived_rows, archive_path, archived_at)]"""
+    cur = conn.cursor()
+    cur.execute("""
+        SELECT partition_name, range_from, archived_rows, archive_path, archived_at
+        FROM shot_partition_log
+        WHERE archived_at IS NOT NULL
+        ORDER BY partition_name
+    """)
+    rows = cur.fetchall()
+    conn.commit()
+    cur.close()
+    return rows
+
+
+def _detached_partitions(conn):
+    """보관 도중 실패해 분리된 채 남은 월 파티션 (다음 retention 실행에서 이어서 보관)"""
+    cur = conn.cursor()
+    cur.execute("""
+        SELECT c.relname FROM pg_class c
+        WHERE c.relnamespace = 'public'::regnamespace AND c.relkind = 'r' AND NOT c.relispartition
+          AND c.relname ~ '^shots_y[0-9]{4}m[0-9]{2}$'
+        ORDER BY c.relname
+    """)
+    partitions = []
+    for (name,) in cur.fetchall():
+        first = date(int(name[7:11]), int(name[12:14]), 1)
+        next_month = date(first.year + first.month // 12, first.month % 12 + 1, 1)
+        partitions.append(Partition(name, first.strftime("%Y-%m-%d"), next_month.strftime("%Y-%m-%d"),
+                                    None, None, None))
+    conn.commit()
+    cur.close()
+    return partitions
+
+
+def _log_partition(cur, partition, **fields):
+    columns = ["partition_name", "range_from", "range_to"] + list(fields)
+    values = [partition.name, partition.range_from, partition.range_to] + list(fields.values())
+    updates = sql.SQL(", ").join(
+        sql.SQL("{0} = EXCLUDED.{0}").format(sql.Identifier(c)) for c in fields
+    )
+    cur.execute(sql.SQL("""
+        INSERT INTO shot_partition_log ({columns}) VALUES ({values})
+        ON CONFLICT (partition_name) DO UPDATE SET {updates}
+    """).format(
+        columns=sql.SQL(", ").join(map(sql.Identifier, columns)),
+        values=sql.SQL(", ").join(sql.Placeholder() * len(values)),
+        updates=updates,
+    ), values)
+
+
+def purge_guest_shots(conn, partition, batch_size=DEFAULT_BATCH_SIZE, lock_timeout=DEFAULT_LOCK_TIMEOUT,
+                      sleep_sec=0.0, log=print):
+    """
+    파티션의 게스트 샷을 guest_shot_daily로 집계하고 삭제 (id 청크마다 커밋, 중단 후 재실행 가능)
+
+    Returns:
+        int: 삭제한 게스트 샷 수
+    """
+    cur = conn.cursor()
+    table = sql.Identifier(partition.name)
+    cur.execute(sql.SQL("SELECT COALESCE(MIN(id), 1) - 1, COALESCE(MAX(id), 0) FROM {}").format(table))
+    last_id, max_id = cur.fetchone()
+    conn.commit()
+
+    statement = sql.SQL(_PURGE_GUEST_SQL).format(partition=table)
+    purged = 0
+    started = time.time()
+    try:
+        while last_id < max_id:
+            hi = min(last_id + batch_size, max_id)
+            try:
+                cur.execute("SET LOCAL lock_timeout = %s", (lock_timeout,))
+                cur.execute(statement, {"lo": last_id, "hi": hi})
+                purged += cur.fetchone()[0]
+                conn.commit()
+            except psycopg2_errors.LockNotAvailable:
+                conn.rollback()
+                log(f"[RETENTION] {partition.name}: id {last_id}~{hi} 잠금 대기 초과, 재시도")
+                time.sleep(max(sleep_sec, 0.5))
+                continue
+            last_id = hi
+            if sleep_sec > 0:
+                time.sleep(sleep_sec)
+
+        _log_partition(cur, partition, guest_shots=purged, guest_purged_at=_now())
+        conn.commit()
+    finally:
+        cur.close()
+    log(f"[RETENTION] {partition.name}: 게스트 샷 {purged}개 집계 후 삭제 ({time.time() - started:,.1f}s)")
+    return purged
+
+
+def _arrow_type(data_type):
+    return {
+        "integer": pa.int32(), "bigint": pa.int64(), "smallint": pa.int16(),
+        "real": pa.float32(), "double precision": pa.float64(), "boolean": pa.bool_(),
+    }.get(data_type, pa.string())
+
+
+def _csv_to_parquet(cur, table_name, csv_path, parquet_path):
+    """COPY CSV(gzip) → Parquet(zstd) 스트리밍 변환 (컬럼 타입은 DB 스키마 기준)"""
+    cur.execute("""
+        SELECT column_name, data_type FROM information_schema.columns
+        WHERE table_schema = 'public' AND table_name = %s
+    """, (table_name,))
+    column_types = {name: _arrow_type(data_type) for name, data_type in cur.fetchall()}
+    reader = pa_csv.open_csv(
+        csv_path,
+        convert_options=pa_csv.ConvertOptions(
+            column_types=column_types, true_values=["t"], false_values=["f"],
+            null_values=[""], strings_can_be_null=True, quoted_strings_can_be_null=False,
+        ),
+    )
+    rows = 0
+    with pa_parquet.ParquetWriter(parquet_path, reader.schema, compression="zstd") as writer:
+        for batch in reader:
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    return rows
+
+
+def archive_partition(conn, partition, archive_dir=ARCHIVE_DIR, lock_timeout=DEFAULT_LOCK_TIMEOUT, log=print):
+    """
+    파티션 보관: DETACH → 파일로 내보내기 → 행 수 확인 → DROP
+
+    DETACH 후 실패하면 테이블은 분리된 채 남아 있으므로 다시 실행하면 내보내기부터 이어서 진행한다.
+
+    Returns:
+        str: 보관 파일 경로
+    """
+    cur = conn.cursor()
+    table = sql.Identifier(partition.name)
+    parent = partition_parent(cur)
+    cur.execute("""
+        SELECT 1 FROM pg_inherits WHERE inhrelid = to_regclass(%s) AND inhparent = to_regclass(%s)
+    """, (partition.name, parent))
+    if cur.fetchone():
+        cur.execute("SET LOCAL lock_timeout = %s", (lock_timeout,))
+        cur.execute(sql.SQL("ALTER TABLE {} DETACH PARTITION {}").format(sql.Identifier(parent), table))
+    conn.commit()
+    log(f"[RETENTION] {partition.name}: 파티션 분리 완료")
+
+    os.makedirs(archive_dir, exist_ok=True)
+    csv_path = os.path.join(archive_dir, f"{partition.name}.csv.gz")
+    cur.execute(sql.SQL("SELECT COUNT(*) FROM {}").format(table))
+    expected = cur.fetchone()[0]
+    with gzip.open(csv_path, "wb") as f:
+        cur.copy_expert(sql.SQL("COPY {} TO STDOUT WITH (FORMAT csv, HEADER)").format(table).as_string(conn), f)
+    conn.commit()
+
+    with gzip.open(csv_path, "rt", encoding="utf-8", newline="") as f:
+        exported = sum(1 for _ in csv.reader(f)) - 1
+    archive_path = csv_path
+    if pa is not None:
+        parquet_path = os.path.join(archive_dir, f"{partition.name}.parquet")
+        exported = _csv_to_parquet(cur, partition.name, csv_path, parquet_path)
+        conn.commit()
+        os.remove(csv_path)
+        archive_path = parquet_path
+
+    if exported != expected:
+        raise RuntimeError(f"{partition.name}: 보관 파일 행 수 불일치 (DB {expected}, 파일 {exported}) - 테이블 유지")
+
+    _log_partition(cur, partition, archived_rows=expected, archive_path=archive_path, archived_at=_now())
+    cur.execute(sql.SQL("DROP TABLE {}").format(table))
+    conn.commit()
+    cur.close()
+    log(f"[RETENTION] {partition.name}: {expected}행 보관 → {archive_path}, 테이블 삭제")
+    return archive_path
+
+
+def apply_retention(conn, keep_months=SHOTS_RETENTION_MONTHS, guest_months=GUEST_SHOTS_RETENTION_MONTHS,
+                    archive_dir=ARCHIVE_DIR, dry_run=False, batch_size=DEFAULT_BATCH_SIZE, log=print):
+    """
+    보존 정책 적용 (전환 완료 후 shots 파티션 대상)
+    - range_to <= guest_months개월 전 1일: 게스트 샷 집계 후 삭제 (파티션당 1회)
+    - range_to <= keep_months개월 전 1일: 보관 후 파티션 삭제
+
+    Returns:
+        dict: {"guest_purged": 삭제한 게스트 샷 수, "archived": 보관한 파티션 이름 목록}
+    """
+    cur = conn.cursor()
+    parent = partition_parent(cur)
+    conn.commit()
+    cur.close()
+    if parent != "shots":
+        log("[RETENTION] shots가 아직 파티션 테이블이 아님 - copy/cutover 후 실행하세요")
+        return {"guest_purged": 0, "archived": []}
+
+    guest_cutoff = month_start(guest_months)
+    archive_cutoff = month_start(keep_months)
+    log(f"[RETENTION] 게스트 샷 집계: {guest_cutoff} 이전, 보관: {archive_cutoff} 이전"
+        f"{' (dry-run)' if dry_run else ''}")
+
+    result = {"guest_purged": 0, "archived": []}
+    for partition in _detached_partitions(conn) + list_partitions(conn):
+        if partition.range_to is None:
+            continue  # 기본 파티션은 수동 정리
+        if partition.range_to <= archive_cutoff:
+            log(f"[RETENTION] {partition.name}: 보관 대상 (약 {partition.est_rows or 0}행)")
+            if not dry_run:
+                archive_partition(conn, partition, archive_dir=archive_dir, log=log)
+                result["archived"].append(partition.name)
+        elif partition.range_to <= guest_cutoff and not partition.guest_purged_at:
+            log(f"[RETENTION] {partition.name}: 게스트 샷 집계 대상")
+            if not dry_run:
+                result["guest_purged"] += purge_guest_shots(conn, partition, batch_size=batch_size, log=log)
+    return result
+
+
+def vacuum_recent(conn, months=2, log=print):
+    """최근 months개월 파티션만 VACUUM ANALYZE (전체 테이블 대신 쓰기가 몰리는 파티션만)"""
+    names = [p.name for p in list_partitions(conn)
+             if p.range_to is None or p.range_to > month_start(months - 1)]
+    old_autocommit = conn.autocommit
+    conn.autocommit = True
+    try:
+        cur = conn.cursor()
+        for name in names:
+            started = time.time()
+            cur.execute(sql.SQL("VACUUM (ANALYZE) {}").format(sql.Identifier(name)))
+            log(f"[VACUUM] {name} ({time.time() - started:,.1f}s)")
+        cur.close()
+    finally:
+        conn.autocommit = old_autocommit
+    return names
+
+
+def cutover(conn, force=False, lock_timeout=DEFAULT_LOCK_TIMEOUT):
+    """shots_partition_cutover() 실행 (이름 교체 동안만 ACCESS EXCLUSIVE, 잠금 대기는 lock_timeout까지)"""
+    cur = conn.cursor()
+    try:
+        cur.execute("SET LOCAL lock_timeout = %s", (lock_timeout,))
+        cur.execute("SELECT shots_partition_cutover(%s)", (force,))
+        result = cur.fetchone()[0]
+        conn.commit()
+        return result
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+
+
+def drop_legacy(conn, log=print):
+    """전환 후 남은 shots_legacy(전환 전 원본) 삭제 - 새 shots 확인 후 수동 실행"""
+    cur = conn.cursor()
+    if partition_parent(cur) != "shots":
+        conn.commit()
+        cur.close()
+        raise RuntimeError("shots가 아직 파티션 테이블이 아님 - cutover 후 실행하세요")
+    cur.execute("DROP TABLE IF EXISTS shots_legacy")
+    conn.commit()
+    cur.close()
+    log("[INFO] shots_legacy 삭제 완료")
@@ -0,0 +1,317 @@
+# ===== shared/backfill.py (대용량 테이블 온라인 청크 백필) =====
+"""
+대용량 테이블 온라인 백필 프레임워크
+
+한 번의 큰 UPDATE나 행 단위 루프는 shots 같은 테이블에서 긴 잠금과 샷 저장 지연을 만든다.
+백필 작업은 PK(id) 범위 청크로 테이블을 훑으며 청크마다 짧은 트랜잭션으로 커밋한다.
+
+- 청크: id > lo AND id <= hi 범위 UPDATE 1회 + 체크포인트 저장 → 같은 트랜잭션에서 커밋
+  (데이터와 진행 위치가 항상 함께 반영되므로 어느 시점에 중단해도 그대로 재개 가능)
+- 잠금 대기: 청크마다 SET LOCAL lock_timeout, 잠금을 못 잡으면 롤백 후 잠시 쉬고 같은 청크 재시도
+- 체크포인트: backfill_checkpoints 테이블 (작업 이름별 min_id / last_id / max_id / 처리 건수)
+- 진행률: 청크마다 실제 훑은 행 수 기준 rows/s와 id 범위 기준 예상 남은 시간(ETA) 출력
+  (id가 듬성듬성한 테이블은 청크의 id 폭보다 행이 훨씬 적으므로 행 수는 청크마다 COUNT로 셈)
+- 작업 등록: JOBS 딕셔너리 (register_job), 실행은 루트의 backfill.py CLI
+- SQL 한 문장으로 안 되는 작업(파이썬 계산 필요)은 chunk 함수로 (예: services/user_web/rescore_shots.py)
+- dry_run: 청크를 실행한 뒤 롤백 (체크포인트도 저장하지 않음) → 속도/변경 건수만 확인
+
+작업 추가:
+    register_job(BackfillJob(
+        name="shots_xxx", table="shots", description="...",
+        chunk_sql="UPDATE shots SET ... WHERE id > %(lo)s AND id <= %(hi)s AND ...",
+    ))
+    job = BackfillJob(name="shots_yyy", table="shots", description="...", chunk_sql=None,
+                      chunk=lambda cur, lo, hi: changed_count)
+"""
+import time
+from collections import namedtuple
+from datetime import datetime
+
+from psycopg2 import errors as psycopg2_errors
+
+# chunk_sql: %(lo)s < id <= %(hi)s 범위를 처리하는 SQL (rowcount = 변경 건수)
+# finish: 모든 청크 완료 후 호출 (conn, log) - 예: CREATE INDEX CONCURRENTLY
+# chunk: chunk_sql 대신 (cur, lo, hi) → 변경 건수 함수 (같은 트랜잭션에서 실행, 커밋은 run_backfill이)
+BackfillJob = namedtuple("BackfillJob", ["name", "table", "description", "chunk_sql", "finish", "chunk"])
+BackfillJob.__new__.__defaults__ = (None, None)
+
+JOBS = {}
+
+DEFAULT_BATCH_SIZE = 10000
+DEFAULT_LOCK_TIMEOUT = "2s"
+LOCK_RETRY_LIMIT = 10
+
+
+def register_job(job):
+    """백필 작업 등록 (이름 중복 시 덮어씀)"""
+    JOBS[job.name] = job
+    return job
+
+
+def _now():
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def load_checkpoint(cur, job_name):
+    """체크포인트 조회 (없으면 None) → (last_id, max_id, rows_done, rows_changed, finished_at)"""
+    cur.execute("""
+        SELECT last_id, max_id, rows_done, rows_changed, finished_at
+        FROM backfill_checkpoints
+        WHERE job = %s
+    """, (job_name,))
+    row = cur.fetchone()
+    if row is None:
+        return None
+    if isinstance(row, dict):
+        return (row["last_id"], row["max_id"], row["rows_done"], row["rows_changed"], row["finished_at"])
+    return tuple(row)
+
+
+def _save_checkpoint(cur, job, min_id, last_id, max_id, rows_done, rows_changed, finished=False):
+    # min_id는 처음 기록한 값 유지 (재개해도 진행률은 작업 시작 구간 기준)
+    cur.execute("""
+        INSERT INTO backfill_checkpoints
+            (job, table_name, min_id, last_id, max_id, rows_done, rows_changed, started_at, updated_at, finished_at)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        ON CONFLICT (job) DO UPDATE SET
+            min_id = COALESCE(backfill_checkpoints.min_id, EXCLUDED.min_id),
+            last_id = EXCLUDED.last_id,
+            max_id = EXCLUDED.max_id,
+            rows_done = EXCLUDED.rows_done,
+            rows_changed = EXCLUDED.rows_changed,
+            updated_at = EXCLUDED.updated_at,
+            finished_at = EXCLUDED.finished_at
+    """, (job.name, job.table, min_id, last_id, max_id, rows_done, rows_changed,
+          _now(), _now(), _now() if finished else None))
+
+
+def list_checkpoints(conn):
+    """전체 작업 체크포인트 목록 (CLI status용)"""
+    cur = conn.cursor()
+    cur.execute("""
+        SELECT job, table_name, min_id, last_id, max_id, rows_done, rows_changed,
+               started_at, updated_at, finished_at
+        FROM backfill_checkpoints
+        ORDER BY job
+    """)
+    rows = cur.fetchall()
+    conn.commit()
+    cur.close()
+    return rows
+
+
+def run_backfill(conn, job, batch_size=DEFAULT_BATCH_SIZE, sleep_sec=0.0, reset=False,
+                 lock_timeout=DEFAULT_LOCK_TIMEOUT, log=print, dry_run=False):
+    """
+    백필 작업 실행 (중단 지점부터 재개)
+
+    시작 시점의 MAX(id)까지만 처리한다. 이후에 들어오는 행은
+    트리거/저장 로직이 채우는 것을 전제로 한다.
+    dry_run=True면 청크마다 롤백 (체크포인트/finish 없음, reset은 이번 실행에서만 처음부터)
+
+    Returns:
+        int: 이번 실행에서 변경한 행 수
+    """
+    cur = conn.cursor()
+    if reset and not dry_run:
+        cur.execute("DELETE FROM backfill_checkpoints WHERE job = %s", (job.name,))
+    checkpoint = None if reset else load_checkpoint(cur, job.name)
+    if checkpoint and checkpoint[4]:
+        conn.commit()
+        cur.close()
+        log(f"[BACKFILL] {job.name}: 이미 완료됨 ({checkpoint[4]}) - 다시 실행하려면 --reset")
+        return 0
+
+    cur.execute(f"SELECT COALESCE(MIN(id), 1) - 1, COALESCE(MAX(id), 0) FROM {job.table}")
+    min_id, max_id = cur.fetchone()
+    if checkpoint:
+        last_id, _, rows_done, rows_changed, _ = checkpoint
+    else:
+        last_id, rows_done, rows_changed = min_id, 0, 0
+    if not dry_run:
+        _save_checkpoint(cur, job, min_id, last_id, max_id, rows_done, rows_changed)
+    conn.commit()
+
+    start_id = last_id
+    log(f"[BACKFILL] {job.name} ({job.table}): id {start_id} → {max_id}, "
+        f"청크 {batch_size}, lock_timeout {lock_timeout}{' (dry-run)' if dry_run else ''}")
+
+    changed_now = 0
+    scanned_rows = 0
+    started = time.time()
+    retries = 0
+    try:
+        while last_id < max_id:
+            hi = min(last_id + batch_size, max_id)
+            try:
+                cur.execute("SET LOCAL lock_timeout = %s", (lock_timeout,))
+                if job.chunk is not None:
+                    changed = job.chunk(cur, last_id, hi)
+                else:
+                    cur.execute(job.chunk_sql, {"lo": last_id, "hi": hi})
+                    changed = max(cur.rowcount, 0)
+                # 청크에 실제로 있는 행 수 (PK 인덱스 범위 조회)
+                cur.execute(f"SELECT COUNT(*) FROM {job.table} WHERE id > %s AND id <= %s", (last_id, hi))
+                rows = cur.fetchone()[0]
+                if dry_run:
+                    conn.rollback()
+                else:
+                    _save_checkpoint(cur, job, min_id, hi, max_id, rows_done + rows, rows_changed + changed)
+                    conn.commit()
+            except (psycopg2_errors.LockNotAvailable, psycopg2_errors.DeadlockDetected):
+                # 샷 저장 등 다른 트랜잭션이 잡고 있는 행 → 이 청크만 양보하고 재시도
+                conn.rollback()
+                retries += 1
+                if retries > LOCK_RETRY_LIMIT:
+                    raise
+                log(f"[BACKFILL] {job.name}: id {last_id}~{hi} 잠금 대기 초과, 재시도 {retries}/{LOCK_RETRY_LIMIT}")
+                time.sleep(max(sleep_sec, 0.5) * retries)
+                continue
+            retries = 0
+
+            rows_done += rows
+            rows_changed += changed
+            changed_now += changed
+            scanned_rows += rows
+            last_id = hi
+
+            # ETA는 남은 행 수를 모르므로 id 범위 진행 비율로 계산
+            elapsed = max(time.time() - started, 1e-6)
+            rate = scanned_rows / elapsed
+            id_done = last_id - start_id
+            eta = elapsed * (max_id - last_id) / id_done if id_done > 0 else 0
+            percent = 100.0 * id_done / max(max_id - start_id, 1)
+            log(f"[BACKFILL] {job.name} id≤{last_id}/{max_id} ({percent:.1f}% of id range): "
+                f"행 {rows}, 변경 {changed} (누적 {rows_changed}), {rate:,.0f} rows/s, ETA {eta:,.0f}s")
+
+            if sleep_sec > 0:
+                time.sleep(sleep_sec)
+
+        if not dry_run:
+            if job.finish:
+                job.finish(conn, log)
+            _save_checkpoint(cur, job, min_id, last_id, max_id, rows_done, rows_changed, finished=True)
+            conn.commit()
+    except KeyboardInterrupt:
+        conn.rollback()
+        log(f"\n[BACKFILL] {job.name}: 중단됨 - 다음 실행 시 id > {last_id}부터 재개합니다.")
+    finally:
+        cur.close()
+
+    elapsed = max(time.time() - started, 1e-6)
+    log(f"[BACKFILL] {job.name}: 이번 실행 {changed_now}개 변경, {elapsed:,.1f}s")
+    return changed_now
+
+
+# =========================
+# 등록된 백필 작업
+# =========================
+def _create_shots_bay_number_index(conn, log):
+    """
+    shots(store_id, bay_number, timestamp) 인덱스를 트랜잭션 밖에서 CONCURRENTLY 생성
+
+    파티션 전환(0007 cutover) 후의 shots는 CONCURRENTLY를 쓸 수 없는데,
+    같은 인덱스가 부모 테이블 인덱스로 이미 모든 파티션에 있으므로 건너뛴다.
+    """
+    cur = conn.cursor()
+    cur.execute("SELECT relkind FROM pg_class WHERE oid = 'shots'::regclass")
+    partitioned = cur.fetchone()[0] == "p"
+    cur.close()
+    if partitioned:
+        conn.commit()
+        log("[BACKFILL] shots가 파티션 테이블 - idx_shots_store_bay_number는 파티션 인덱스로 이미 존재 (생성 건너뜀)")
+        return
+    old_autocommit = conn.autocommit
+    conn.commit()
+    conn.autocommit = True
+    try:
+        cur = conn.cursor()
+        log("[BACKFILL] idx_shots_store_bay_number 인덱스 생성 (CONCURRENTLY)")
+        cur.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_shots_store_bay_number
+            ON shots(store_id, bay_number, timestamp)
+        """)
+        cur.close()
+    finally:
+        conn.autocommit = old_autocommit
+
+
+register_job(BackfillJob(
+    name="shots_bay_number",
+    table="shots",
+    description="shots.bay_number 채우기 (정수 타석 키, 완료 후 인덱스 생성)",
+    chunk_sql="""
+        UPDATE shots s
+        SET bay_number = COALESCE(
+            bay_key(NULL, s.bay_id, NULL),
+            (SELECT b.bay_number FROM bays b
+             WHERE b.store_id = s.store_id AND b.bay_id = s.bay_id AND b.bay_number IS NOT NULL
+             LIMIT 1)
+        )
+        WHERE s.id > %(lo)s AND s.id <= %(hi)s
+          AND s.bay_number IS NULL
+          AND s.bay_id IS NOT NULL
+    """,
+    finish=_create_shots_bay_number_index,
+))
+
+register_job(BackfillJob(
+    name="shots_guest_flag",
+    table="shots",
+    description="shots.is_guest 채우기 (user_id 없는 샷 = 게스트)",
+    chunk_sql="""
+        UPDATE shots
+        SET is_guest = TRUE
+        WHERE id > %(lo)s AND id <= %(hi)s
+          AND (user_id IS NULL OR user_id = '')
+          AND is_guest IS DISTINCT FROM TRUE
+    """,
+))
+
+register_job(BackfillJob(
+    name="store_pcs_bay_id_unpad",
+    table="store_pcs",
+    description="active PC bay_id 앞자리 0 제거 ('03' → '3', 같은 번호가 이미 있으면 건너뜀)",
+    # 같은 청크에 '03'과 '003'이 함께 있으면 둘 다 '3'이 되어 uq_store_bay_id_active 위반
+    # → (매장, 번호)마다 id가 가장 작은 행 1개만 바꾸고 나머지는 건너뜀
+    # (이후 청크의 같은 번호는 NOT EXISTS가 이미 바뀐 행을 보고 건너뜀)
+    chunk_sql="""
+        UPDATE store_pcs p
+        SET bay_id = c.new_bay_id
+        FROM (
+            SELECT DISTINCT ON (store_id, CAST(bay_id AS INTEGER))
+                   id, CAST(bay_id AS INTEGER)::TEXT AS new_bay_id
+            FROM store_pcs
+            WHERE id > %(lo)s AND id <= %(hi)s
+              AND status = 'active'
+              AND bay_id ~ '^0+[0-9]{1,6}$'
+            ORDER BY store_id, CAST(bay_id AS INTEGER), id
+        ) c
+        WHERE p.id = c.id
+          AND NOT EXISTS (
+              SELECT 1 FROM store_pcs x
+              WHERE x.store_id = p.store_id
+                AND x.status = 'active'
+                AND x.bay_id = c.new_bay_id
+          )
+    """,
+))
+
+# shots 월별 파티션 전환용 복사 (0007, shot_partitions.py copy)
+# FOR SHARE: 복사 중인 행의 동시 UPDATE/DELETE는 청크 커밋까지 기다린 뒤 미러 트리거로 반영
+register_job(BackfillJob(
+    name="shots_partition_copy",
+    table="shots",
+    description="shots → shots_partitioned 복사 (월별 파티션 전환, 완료 후 cutover)",
+    chunk_sql="""
+        INSERT INTO shots_partitioned
+        SELECT p.*
+        FROM (
+            SELECT sh AS r FROM shots sh
+            WHERE sh.id > %(lo)s AND sh.id <= %(hi)s
+            FOR SHARE
+        ) s
+        CROSS JOIN LATERAL shots_to_partitioned_row(s.r) p
+        ON CONFLICT DO NOTHING
+    """,
+))
@@ -0,0 +1,200 @@
+# ===== shared/cache_bus.py (워커 간 캐시 무효화 버스) =====
+"""
+PostgreSQL LISTEN/NOTIFY 기반 캐시 무효화 버스
+
+gunicorn 워커가 여러 개이거나 서비스 인스턴스가 여러 대면 entity_cache는 워커마다 따로 있어서,
+한 워커에서 PC를 승인해도 다른 워커는 TTL이 끝날 때까지 이전 값을 보여준다.
+
+- 발행: entity_cache.invalidate() 리스너로 등록 → pg_notify(채널, {"ns", "key", "origin"})
+- 구독: 워커마다 백그라운드 스레드 1개가 LISTEN, 받은 키를 entity_cache에서 제거
+  (자기 워커가 보낸 메시지는 origin으로 걸러냄 - 이미 로컬에서 무효화됨)
+- 연결이 끊기면 재연결 (1초 → 최대 30초 백오프), 재연결 직후 캐시 전체 비우기
+  (끊겨 있던 동안 놓친 무효화가 있을 수 있으므로)
+- fork 이후(gunicorn preload 등) 첫 호출에서 새 프로세스용 스레드를 다시 시작
+- entity_cache 밖의 프로세스 캐시/플래그는 on_invalidate(namespace, handler)로 받고
+  publish(namespace)로 알린다 (예: super_admin 매장 현황 캐시)
+
+사용법 (각 서비스 database.init_db):
+    from shared.cache_bus import start_invalidation_bus
+    start_invalidation_bus(get_db_connection)
+
+CACHE_BUS_DISABLED=1 이면 시작하지 않는다 (단일 워커 개발 환경 등).
+"""
+import json
+import os
+import select
+import socket
+import threading
+import time
+import uuid
+
+import psycopg2
+
+from shared.entity_cache import entity_cache
+
+CHANNEL = "entity_cache_invalidate"
+BUS_DISABLED = os.environ.get("CACHE_BUS_DISABLED", "").lower() in ("1", "true", "yes")
+
+POLL_TIMEOUT = 5.0       # select() 대기 (초) - 이 간격으로 연결 상태 확인
+RECONNECT_MIN = 1.0
+RECONNECT_MAX = 30.0
+
+_state = {
+    "pid": None,
+    "origin": None,
+    "thread": None,
+    "get_connection": None,
+    "publisher": None,
+    "connected": False,
+    "received": 0,
+    "published": 0,
+    "reconnects": 0,
+}
+_handlers = {}  # namespace → [handler(key)]
+_lock = threading.Lock()
+_publish_lock = threading.Lock()
+
+
+def _encode_key(key):
+    return list(key) if isinstance(key, tuple) else key
+
+
+def _decode_key(key):
+    return tuple(key) if isinstance(key, list) else key
+
+
+def on_invalidate(namespace, handler):
+    """다른 워커에서 namespace 무효화를 받았을 때 호출할 handler(key) 등록"""
+    _handlers.setdefault(namespace, []).append(handler)
+
+
+def publish(namespace, key=None):
+    """
+    다른 워커로 무효화 전파 (entity_cache 무효화 리스너로도 등록됨)
+    버스가 시작되지 않았거나 DB 오류면 경고만 남김 - 로컬 무효화는 호출자가 이미 끝낸 상태
+    """
+    if _state["pid"] != os.getpid():
+        return
+    payload = json.dumps({"ns": namespace, "key": _encode_key(key), "origin": _state["origin"]},
+                         ensure_ascii=False, default=str)
+    with _publish_lock:
+        for attempt in range(2):
+            conn = _state["publisher"]
+            try:
+                if conn is None or conn.closed:
+                    conn = _state["get_connection"]()
+                    conn.autocommit = True
+                    _state["publisher"] = conn
+                cur = conn.cursor()
+                cur.execute("SELECT pg_notify(%s, %s)", (CHANNEL, payload))
+                cur.close()
+                _state["published"] += 1
+                return
+            except psycopg2.Error as e:
+                _state["publisher"] = None
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+                if attempt == 1:
+                    print(f"[WARNING] 캐시 무효화 발행 실패 ({namespace}, {key}): {e}")
+
+
+def _apply(payload):
+    try:
+        message = json.loads(payload)
+    except ValueError:
+        return
+    if message.get("origin") == _state["origin"]:
+        return
+    _state["received"] += 1
+    namespace, key = message.get("ns"), _decode_key(message.get("key"))
+    entity_cache.invalidate(namespace, key, notify=False)
+    _run_handlers(namespace, key)
+
+
+def _run_handlers(namespace, key):
+    for handler in _handlers.get(namespace, ()):
+        try:
+            handler(key)
+        except Exception as e:
+            print(f"[WARNING] 캐시 무효화 핸들러 오류 ({namespace}): {e}")
+
+
+def _listen_loop(pid):
+    delay = RECONNECT_MIN
+    while _state["pid"] == pid:
+        conn = None
+        try:
+            conn = _state["get_connection"]()
+            conn.autocommit = True
+            cur = conn.cursor()
+            cur.execute(f"LISTEN {CHANNEL}")
+            cur.close()
+            if _state["reconnects"] > 0:
+                # 끊겨 있던 동안 놓친 무효화가 있을 수 있음
+                entity_cache.clear()
+                for namespace in list(_handlers):
+                    _run_handlers(namespace, None)
+            _state["connected"] = True
+            delay = RECONNECT_MIN
+            print(f"[INFO] 캐시 무효화 버스 연결 (pid={pid})")
+
+            while _state["pid"] == pid:
+                readable, _, _ = select.select([conn], [], [], POLL_TIMEOUT)
+                if not readable:
+                    # 유휴 상태에서도 끊긴 연결을 감지하도록 가벼운 쿼리
+                    cur = conn.cursor()
+                    cur.execute("SELECT 1")
+                    cur.close()
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    _apply(conn.notifies.pop(0).payload)
+        except Exception as e:
+            print(f"[WARNING] 캐시 무효화 버스 연결 끊김, {delay:.0f}초 후 재연결: {e}")
+        finally:
+            _state["connected"] = False
+            if conn is not None:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+        _state["reconnects"] += 1
+        time.sleep(delay)
+        delay = min(delay * 2, RECONNECT_MAX)
+
+
+def start_invalidation_bus(get_connection):
+    """
+    무효화 버스 시작 (프로세스당 1회, 이미 실행 중이면 그대로)
+
+    Args:
+        get_connection: DB 연결 생성 함수 (database.get_db_connection)
+    """
+    if BUS_DISABLED:
+        return False
+    pid = os.getpid()
+    with _lock:
+        if _state["pid"] == pid and _state["thread"] is not None and _state["thread"].is_alive():
+            return False
+        first_start = _state["get_connection"] is None
+        _state.update(pid=pid, origin=f"{socket.gethostname()}:{pid}:{uuid.uuid4().hex[:8]}",
+                      get_connection=get_connection, publisher=None, connected=False, reconnects=0)
+        if first_start:
+            entity_cache.add_listener(publish)
+        thread = threading.Thread(target=_listen_loop, args=(pid,), name="cache-bus", daemon=True)
+        _state["thread"] = thread
+        thread.start()
+        return True
+
+
+def bus_stats():
+    """버스 상태 (캐시 통계와 함께 노출)"""
+    return {
+        "connected": _state["connected"],
+        "origin": _state["origin"],
+        "published": _state["published"],
+        "received": _state["received"],
+        "reconnects": _state["reconnects"],
+    }
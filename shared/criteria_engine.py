@@ -0,0 +1,454 @@
+# ===== shared/criteria_engine.py (criteria.json 컴파일/평가 엔진) =====
+"""
+criteria.json 평가 엔진 (서버 서비스 + 샷 수집 프로그램 공용)
+
+criteria.json을 로드 시 한 번만 컴파일한다.
+- 기준 키별 지표 규칙을 (kind, a, b) 튜플로 평탄화 (default 병합, list/scalar 분기 제거)
+- 같은 규칙을 NumPy 배열로도 보관하여 샷 여러 개를 한 번의 벡터 연산으로 평가
+
+파일이 바뀌면 (mtime/size 변경) 다음 조회 시 자동으로 다시 컴파일한다.
+
+사용법:
+    engine = get_engine(CRITERIA_PATH)
+    criteria = engine.current()          # 최신 컴파일 결과 (불변 스냅샷)
+    is_valid, score = criteria.evaluate(shot, club_id, gender)
+    classes = criteria.display_codes(shot, club_id, gender)
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # 단건 평가는 numpy 없이 동작, 일괄 평가(*_batch)만 numpy 필요
+
+# 규칙 종류 (규칙 dict 분기 순서와 동일)
+KIND_NONE = 0       # 규칙 없음
+KIND_RANGE = 1      # good: [low, high]
+KIND_GOOD_BAD = 2   # good/bad: 클수록 좋음 (a=good, b=bad)
+KIND_GOOD_WARN = 3  # good/warn: 작을수록 좋음 (a=good, b=warn)
+KIND_GOOD_MIN = 4   # good만: 클수록 좋음 (a=good)
+
+# 저장 시 평가 지표 (is_valid / score)
+SCORE_METRICS = ["smash_factor", "launch_angle", "face_angle", "club_path",
+                 "lateral_offset", "direction_angle", "side_spin", "back_spin"]
+DRIVER_SCORE_METRICS = ["smash_factor", "face_angle", "club_path"]
+ABS_SCORE_METRICS = ["face_angle", "club_path", "lateral_offset", "direction_angle"]
+
+# 화면 표시용 색상 클래스 지표 (순서 고정: shots.criteria_classes 컬럼 인코딩 순서)
+# (metric, 템플릿 키, classify 옵션)
+DISPLAY_CLASS_METRICS = [
+    ("ball_speed", "ball_speed_class", {"fallback_good": 60}),
+    ("smash_factor", "smash_class", {"fallback_good": 1.45}),
+    ("face_angle", "face_class", {"abs_value": True, "fallback_good": 2.0, "fallback_warn": 4.0}),
+    ("club_path", "path_class", {"abs_value": True, "fallback_good": 2.0, "fallback_warn": 4.0}),
+    ("lateral_offset", "lateral_class", {"abs_value": True, "fallback_good": 3.0, "fallback_warn": 6.0}),
+    ("direction_angle", "direction_class", {"abs_value": True, "fallback_good": 3.0, "fallback_warn": 6.0}),
+    ("side_spin", "side_spin_class", {"abs_value": True, "fallback_good": 300, "fallback_warn": 600}),
+    ("back_spin", "back_spin_class", {"abs_value": False, "fallback_good": None}),
+]
+
+# 일괄 평가 입력 배열 컬럼 순서 (평가 지표 + 표시 지표 합집합)
+VALUE_METRICS = ["ball_speed"] + SCORE_METRICS
+
+# 색상 클래스 ↔ 1글자 코드 (criteria_classes 컬럼 저장용)
+CLASS_CODES = {"bg-good": "G", "bg-warn": "W", "bg-bad": "B", "bg-none": "N"}
+CODE_CLASSES = {code: cls for cls, code in CLASS_CODES.items()}
+
+# 일괄 평가 코드 (class_codes 배열 값)
+CODE_NONE, CODE_GOOD, CODE_WARN, CODE_BAD = 0, 1, 2, 3
+_CODE_CHARS = ["N", "G", "W", "B"]
+_CODE_TO_CLASS = ["bg-none", "bg-good", "bg-warn", "bg-bad"]
+
+# 파일 변경 확인 최소 간격 (초) - 매 호출마다 stat하지 않도록
+RELOAD_CHECK_INTERVAL = 2.0
+
+_FEMALE = ("여", "F", "female")
+
+
+def compile_rule(rule):
+    """단일 규칙 dict → (kind, a, b)"""
+    if not rule:
+        return KIND_NONE, None, None
+    good = rule.get("good")
+    warn = rule.get("warn")
+    bad = rule.get("bad")
+    if isinstance(good, (list, tuple)) and len(good) == 2:
+        return KIND_RANGE, float(good[0]), float(good[1])
+    if good is not None and bad is not None:
+        return KIND_GOOD_BAD, float(good), float(bad)
+    if good is not None and warn is not None:
+        return KIND_GOOD_WARN, float(good), float(warn)
+    if good is not None:
+        return KIND_GOOD_MIN, float(good), None
+    return KIND_NONE, None, None
+
+
+def _classify_code(kind, a, b, v):
+    """컴파일된 규칙으로 값 하나 분류 → CODE_*"""
+    if kind == KIND_RANGE:
+        return CODE_GOOD if a <= v <= b else CODE_BAD
+    if kind == KIND_GOOD_BAD:
+        if v >= a:
+            return CODE_GOOD
+        return CODE_BAD if v <= b else CODE_WARN
+    if kind == KIND_GOOD_WARN:
+        if v <= a:
+            return CODE_GOOD
+        return CODE_WARN if v <= b else CODE_BAD
+    if kind == KIND_GOOD_MIN:
+        return CODE_GOOD if v >= a else CODE_BAD
+    return CODE_NONE
+
+
+def _to_float(value):
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+class CompiledCriteria:
+    """
+    criteria.json 컴파일 결과 (불변 스냅샷)
+
+    - criteria: 원본 dict
+    - version: 파일 내용 해시 (shots.criteria_version, 파일이 없으면 None)
+    - keys / key_index: 기준 키 목록 (배열 행 인덱스)
+    """
+
+    def __init__(self, criteria, version=None):
+        self.criteria = criteria or {}
+        self.version = version
+
+        self.keys = list(self.criteria.keys())
+        if "default" not in self.criteria:
+            self.keys.append("default")
+        self.key_index = {k: i for i, k in enumerate(self.keys)}
+        self._key_cache = {}
+
+        default_cfg = self.criteria.get("default", {})
+        all_metrics = set(VALUE_METRICS)
+        for cfg in self.criteria.values():
+            all_metrics.update(cfg.keys())
+
+        # rules[key][metric] = (kind, a, b) (default 병합 완료)
+        self.rules = {}
+        for key in self.keys:
+            cfg = self.criteria.get(key, {})
+            compiled = {}
+            for metric in all_metrics:
+                rule = cfg[metric] if metric in cfg else default_cfg.get(metric)
+                compiled[metric] = compile_rule(rule)
+            self.rules[key] = compiled
+
+        # 표시용 규칙 (규칙 없으면 fallback_good/fallback_warn 반영)
+        self.display_rules = {}
+        for key in self.keys:
+            row = []
+            for metric, _, opts in DISPLAY_CLASS_METRICS:
+                kind, a, b = self.rules[key][metric]
+                if kind == KIND_NONE and opts.get("fallback_good") is not None:
+                    if opts.get("fallback_warn") is None:
+                        kind, a, b = KIND_GOOD_MIN, float(opts["fallback_good"]), None
+                    else:
+                        kind, a, b = KIND_GOOD_WARN, float(opts["fallback_good"]), float(opts["fallback_warn"])
+                row.append((kind, a, b, bool(opts.get("abs_value"))))
+            self.display_rules[key] = row
+
+        if np is not None:
+            self._build_tables()
+
+    # ------------------------------------------------
+    # 기준 키 / 규칙 조회
+    # ------------------------------------------------
+    def key_for(self, club_id, gender=None):
+        """
+        성별 기준으로 criteria.json 키 결정
+
+        우선순위: club_female (여성) → club_male → club → default
+        """
+        cache_key = (club_id, gender)
+        key = self._key_cache.get(cache_key)
+        if key is not None:
+            return key
+        cid = (club_id or "").lower()
+        key = "default"
+        if gender in _FEMALE and f"{cid}_female" in self.criteria:
+            key = f"{cid}_female"
+        elif f"{cid}_male" in self.criteria:
+            key = f"{cid}_male"
+        elif cid in self.criteria:
+            key = cid
+        self._key_cache[cache_key] = key
+        return key
+
+    def raw_rule(self, club_id, metric, gender=None):
+        """원본 규칙 dict (클럽/성별 키 → default 순)"""
+        cfg = self.criteria.get(self.key_for(club_id, gender), {})
+        if metric in cfg:
+            return cfg[metric]
+        return self.criteria.get("default", {}).get(metric)
+
+    def rule(self, club_id, metric, gender=None):
+        """컴파일된 규칙 (kind, a, b)"""
+        return self.rules[self.key_for(club_id, gender)].get(metric, (KIND_NONE, None, None))
+
+    # ------------------------------------------------
+    # 단건 평가
+    # ------------------------------------------------
+    def classify(self, value, club_id, metric, *, gender=None, fallback_good=None, fallback_warn=None, abs_value=False):
+        """색상 클래스 결정 ("bg-good" / "bg-warn" / "bg-bad" / "bg-none")"""
+        v = _to_float(value)
+        if v is None:
+            return "bg-none"
+        if abs_value:
+            v = abs(v)
+        kind, a, b = self.rule(club_id, metric, gender)
+        if kind != KIND_NONE:
+            return _CODE_TO_CLASS[_classify_code(kind, a, b, v)]
+        if fallback_good is None:
+            return "bg-none"
+        if fallback_warn is None:
+            return "bg-good" if v >= fallback_good else "bg-bad"
+        if v <= fallback_good:
+            return "bg-good"
+        return "bg-warn" if v <= fallback_warn else "bg-bad"
+
+    def display_codes(self, shot, club_id, gender=None):
+        """화면 표시용 색상 클래스 코드 문자열 (DISPLAY_CLASS_METRICS 순서, 예: "GGWBNGGN")"""
+        out = []
+        for (metric, _, _), (kind, a, b, use_abs) in zip(DISPLAY_CLASS_METRICS, self.display_rules[self.key_for(club_id, gender)]):
+            v = _to_float(shot.get(metric))
+            if v is None:
+                out.append("N")
+                continue
+            out.append(_CODE_CHARS[_classify_code(kind, a, b, abs(v) if use_abs else v)])
+        return "".join(out)
+
+    def apply_classes(self, shot, gender=None):
+        """
+        샷 dict에 색상 클래스(*_class) 추가 (조회 시 사용, 모든 서비스 공용)
+
+        저장 시 계산된 criteria_classes가 있으면 디코딩만 하고,
+        컬럼이 비어 있는 기존 샷만 이 기준표로 즉석 분류한다.
+        gender: 샷 주인 성별 - 저장 시와 같은 성별 기준 키로 분류 (없으면 남성/공용 기준)
+        """
+        codes = shot.get("criteria_classes")
+        if codes and len(codes) == len(DISPLAY_CLASS_METRICS):
+            for (_, class_key, _), code in zip(DISPLAY_CLASS_METRICS, codes):
+                shot[class_key] = CODE_CLASSES.get(code, "bg-none")
+            return shot
+        club_id = shot.get("club_id") or ""
+        for metric, class_key, opts in DISPLAY_CLASS_METRICS:
+            shot[class_key] = self.classify(shot.get(metric), club_id, metric, gender=gender, **opts)
+        return shot
+
+    def evaluate(self, shot, club_id, gender=None):
+        """
+        저장 시 샷 평가
+
+        Returns:
+            tuple: (is_valid: bool, score: int)
+            - is_valid: 평가 지표의 70% 이상이 good 기준 충족
+            - score: 0-100 (good 기준 충족 비율 * 100)
+        """
+        if not self.criteria:
+            return False, 0
+        metrics = DRIVER_SCORE_METRICS if (club_id or "").lower() == "driver" else SCORE_METRICS
+        rules = self.rules[self.key_for(club_id, gender)]
+        good_count = 0
+        total_count = 0
+        for metric in metrics:
+            v = _to_float(shot.get(metric))
+            if v is None:
+                continue
+            kind, a, b = rules[metric]
+            if kind == KIND_NONE:
+                continue
+            total_count += 1
+            if metric in ABS_SCORE_METRICS:
+                v = abs(v)
+            if kind == KIND_RANGE:
+                is_good = a <= v <= b
+            elif kind == KIND_GOOD_WARN:
+                is_good = v <= a  # 작을수록 좋은 경우 (lateral_offset, direction_angle 등)
+            else:
+                is_good = v >= a
+            if is_good:
+                good_count += 1
+        is_valid = (total_count > 0) and (good_count / total_count >= 0.7)
+        score = int((good_count / total_count * 100)) if total_count > 0 else 0
+        return is_valid, score
+
+    # ------------------------------------------------
+    # 일괄 평가 (NumPy)
+    # ------------------------------------------------
+    def _build_tables(self):
+        n_keys = len(self.keys)
+        self._score_kind = np.zeros((n_keys, len(SCORE_METRICS)), dtype=np.int8)
+        self._score_a = np.full((n_keys, len(SCORE_METRICS)), np.nan)
+        self._score_b = np.full((n_keys, len(SCORE_METRICS)), np.nan)
+        self._display_kind = np.zeros((n_keys, len(DISPLAY_CLASS_METRICS)), dtype=np.int8)
+        self._display_a = np.full((n_keys, len(DISPLAY_CLASS_METRICS)), np.nan)
+        self._display_b = np.full((n_keys, len(DISPLAY_CLASS_METRICS)), np.nan)
+        for ki, key in enumerate(self.keys):
+            for mi, metric in enumerate(SCORE_METRICS):
+                kind, a, b = self.rules[key][metric]
+                self._score_kind[ki, mi] = kind
+                self._score_a[ki, mi] = np.nan if a is None else a
+                self._score_b[ki, mi] = np.nan if b is None else b
+            for mi, (kind, a, b, _) in enumerate(self.display_rules[key]):
+                self._display_kind[ki, mi] = kind
+                self._display_a[ki, mi] = np.nan if a is None else a
+                self._display_b[ki, mi] = np.nan if b is None else b
+        self._score_cols = [VALUE_METRICS.index(m) for m in SCORE_METRICS]
+        self._display_cols = [VALUE_METRICS.index(m) for m, _, _ in DISPLAY_CLASS_METRICS]
+        self._score_abs = np.array([m in ABS_SCORE_METRICS for m in SCORE_METRICS])
+        self._display_abs = np.array([bool(opts.get("abs_value")) for _, _, opts in DISPLAY_CLASS_METRICS])
+        self._driver_mask = np.array([m in DRIVER_SCORE_METRICS for m in SCORE_METRICS])
+
+    @staticmethod
+    def _select_codes(kind, a, b, v):
+        with np.errstate(invalid="ignore"):
+            codes = np.select(
+                [kind == KIND_RANGE, kind == KIND_GOOD_BAD, kind == KIND_GOOD_WARN, kind == KIND_GOOD_MIN],
+                [
+                    np.where((a <= v) & (v <= b), CODE_GOOD, CODE_BAD),
+                    np.where(v >= a, CODE_GOOD, np.where(v <= b, CODE_BAD, CODE_WARN)),
+                    np.where(v <= a, CODE_GOOD, np.where(v <= b, CODE_WARN, CODE_BAD)),
+                    np.where(v >= a, CODE_GOOD, CODE_BAD),
+                ],
+                default=CODE_NONE,
+            ).astype(np.int8)
+        codes[np.isnan(v)] = CODE_NONE
+        return codes
+
+    def key_indices(self, club_ids, genders=None):
+        """(club_id, gender) 목록 → 기준 키 인덱스 배열"""
+        if genders is None:
+            genders = [None] * len(club_ids)
+        return np.fromiter(
+            (self.key_index[self.key_for(c, g)] for c, g in zip(club_ids, genders)),
+            dtype=np.intp, count=len(club_ids),
+        )
+
+    def evaluate_batch(self, values, key_idx, is_driver):
+        """
+        샷 N개 일괄 평가 (evaluate / display_codes와 동일한 결과)
+
+        Args:
+            values: float 배열 [N, len(VALUE_METRICS)] (값 없음 = NaN)
+            key_idx: int 배열 [N] (key_indices 결과)
+            is_driver: bool 배열 [N] (club_id가 driver인 샷)
+
+        Returns:
+            tuple: (is_valid[N] bool, score[N] int, class_codes[N, len(DISPLAY_CLASS_METRICS)] int8)
+        """
+        if np is None:
+            raise RuntimeError("evaluate_batch에는 numpy가 필요합니다.")
+        values = np.asarray(values, dtype=np.float64)
+        key_idx = np.asarray(key_idx, dtype=np.intp)
+        is_driver = np.asarray(is_driver, dtype=bool)
+
+        # --- is_valid / score ---
+        v = values[:, self._score_cols]
+        v = np.where(self._score_abs, np.abs(v), v)
+        kind = self._score_kind[key_idx]
+        is_good = self._select_codes(kind, self._score_a[key_idx], self._score_b[key_idx], v) == CODE_GOOD
+        counted = ~np.isnan(v) & (kind != KIND_NONE)
+        counted &= np.where(is_driver[:, None], self._driver_mask, True)
+        total = counted.sum(axis=1)
+        good = (is_good & counted).sum(axis=1)
+        ratio = good / np.maximum(total, 1)
+        is_valid = (total > 0) & (ratio >= 0.7)
+        score = np.where(total > 0, np.floor(ratio * 100), 0).astype(np.int64)
+
+        # --- 표시용 색상 클래스 ---
+        v = values[:, self._display_cols]
+        v = np.where(self._display_abs, np.abs(v), v)
+        codes = self._select_codes(self._display_kind[key_idx], self._display_a[key_idx], self._display_b[key_idx], v)
+        return is_valid, score, codes
+
+    @staticmethod
+    def encode_classes(codes):
+        """class_codes[N, M] → criteria_classes 문자열 리스트"""
+        return ["".join(_CODE_CHARS[c] for c in row) for row in codes.tolist()]
+
+
+class CriteriaEngine:
+    """criteria.json 파일 하나에 대한 컴파일 캐시 (파일 변경 시 자동 재컴파일)"""
+
+    def __init__(self, path, check_interval=RELOAD_CHECK_INTERVAL):
+        self.path = path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._compiled = CompiledCriteria({})
+        self._stat = None
+        self._checked_at = 0.0
+        self._reload(force=True)
+
+    def _file_stat(self):
+        try:
+            st = os.stat(self.path)
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def _reload(self, force=False):
+        stat = self._file_stat()
+        if not force and stat == self._stat:
+            return
+        with self._lock:
+            if not force and stat == self._stat:
+                return
+            try:
+                with open(self.path, "rb") as f:
+                    raw = f.read()
+                compiled = CompiledCriteria(json.loads(raw.decode("utf-8")),
+                                            version=hashlib.sha1(raw).hexdigest()[:12])
+            except FileNotFoundError:
+                if force:
+                    print(f"[CRITERIA] ⚠️ 기준표 파일 없음: {self.path}", flush=True)
+                    compiled = CompiledCriteria({})
+                else:
+                    return
+            except Exception as e:
+                # 잘못된 파일로 교체된 경우 기존 컴파일 결과 유지
+                print(f"[CRITERIA] ❌ 기준표 컴파일 실패 (기존 기준 유지): {e}", flush=True)
+                self._stat = stat
+                return
+            if not force:
+                print(f"[CRITERIA] 기준표 변경 감지 → 재컴파일 (version={compiled.version})", flush=True)
+            self._compiled = compiled
+            self._stat = stat
+
+    def current(self):
+        """최신 컴파일 결과 (check_interval마다 파일 변경 확인)"""
+        now = time.monotonic()
+        if now - self._checked_at >= self.check_interval:
+            self._checked_at = now
+            self._reload()
+        return self._compiled
+
+
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def get_engine(path):
+    """경로별 CriteriaEngine (프로세스 내 공유)"""
+    path = os.path.abspath(path)
+    engine = _engines.get(path)
+    if engine is None:
+        with _engines_lock:
+            engine = _engines.get(path)
+            if engine is None:
+                engine = CriteriaEngine(path)
+                _engines[path] = engine
+    return engine
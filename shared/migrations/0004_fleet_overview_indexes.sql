@@ -0,0 +1,6 @@
+-- ============================================
+-- 0004 매장 현황(get_fleet_overview) 집계용 인덱스
+-- ============================================
+
+CREATE INDEX IF NOT EXISTS idx_store_pcs_store_status ON store_pcs(store_id, status);
+CREATE INDEX IF NOT EXISTS idx_shots_timestamp_store ON shots(timestamp, store_id);
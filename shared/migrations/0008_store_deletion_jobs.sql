@@ -0,0 +1,29 @@
+-- ============================================
+-- 0008 매장 삭제 백그라운드 작업
+-- ============================================
+-- 매장 삭제를 HTTP 요청 안의 단일 트랜잭션 대신 백그라운드 작업으로 처리한다.
+-- (super_admin shared/database.py: request_store_deletion / run_store_deletion_job)
+-- shots는 청크 단위 짧은 트랜잭션으로 삭제하고 진행률을 여기에 기록한다.
+
+CREATE TABLE IF NOT EXISTS store_deletion_jobs (
+    id             SERIAL PRIMARY KEY,
+    store_id       TEXT NOT NULL,
+    store_name     TEXT,
+    status         TEXT NOT NULL DEFAULT 'queued',  -- queued / running / done / failed
+    requested_by   TEXT,
+    shots_total    BIGINT NOT NULL DEFAULT 0,
+    shots_deleted  BIGINT NOT NULL DEFAULT 0,
+    error          TEXT,
+    requested_at   TEXT,
+    started_at     TEXT,
+    heartbeat_at   TEXT,  -- 청크마다 갱신 (오래 멈춘 running 작업은 다른 워커가 이어서 실행)
+    finished_at    TEXT
+);
+
+-- 매장당 진행 중인 삭제 작업은 하나만
+CREATE UNIQUE INDEX IF NOT EXISTS idx_store_deletion_jobs_active
+ON store_deletion_jobs(store_id) WHERE status IN ('queued', 'running');
+
+CREATE INDEX IF NOT EXISTS idx_store_deletion_jobs_status ON store_deletion_jobs(status, id);
+
+-- 샷 청크 삭제는 기존 idx_shots_store_bay(store_id, bay_id) 인덱스로 매장 샷만 조회
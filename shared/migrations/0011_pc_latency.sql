@@ -0,0 +1,10 @@
+-- ============================================
+-- 0011 PC 단계별 지연 요약 (샷 수집 프로그램 heartbeat)
+-- ============================================
+-- 샷 수집 프로그램이 /api/update_pc_last_seen으로 5분마다 보내는 단계별 소요 시간 요약
+-- ({"ocr": {"p50", "p95", "p99", "count"}, ..., "slow_regions": [["back_spin", 812.4], ...]}, ms).
+-- 슈퍼 관리자 PC 관리 화면에서 느린 타석을 찾는 용도. 최신 값만 보관 (이력 없음).
+-- NULL 기본값 컬럼 추가는 메타데이터만 변경 (테이블 재작성 없음)
+
+ALTER TABLE store_pcs ADD COLUMN IF NOT EXISTS latency_summary JSONB;
+ALTER TABLE store_pcs ADD COLUMN IF NOT EXISTS latency_updated_at TEXT;
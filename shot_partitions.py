@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+shots 월별 파티션 관리 CLI (shared/shot_partitions.py)
+
+전환 (마이그레이션 0007 적용 후, 운영 중 실행 가능):
+    python shot_partitions.py copy                  # 기존 샷을 파티션 테이블로 복사 (중단 후 재개 가능)
+    python shot_partitions.py cutover               # 이름 교체 (shots → shots_legacy), 잠금은 수 초 이내
+    python shot_partitions.py drop-legacy           # 새 shots 확인 후 shots_legacy 삭제
+
+운영:
+    python shot_partitions.py status                # 파티션별 행 수(추정), 게스트 집계/보관 이력
+    python shot_partitions.py ensure --months-ahead 6
+    python shot_partitions.py retention --dry-run   # 보존 정책 대상만 출력
+    python shot_partitions.py retention             # 게스트 샷 집계 + 오래된 파티션 보관/삭제
+    python shot_partitions.py vacuum                # 최근 파티션만 VACUUM ANALYZE
+
+DB 연결은 shared.database(DATABASE_URL 환경 변수)를 사용한다.
+"""
+import argparse
+import sys
+
+from shared import database
+from shared import shot_partitions as sp
+from shared.backfill import JOBS, DEFAULT_BATCH_SIZE, run_backfill
+from shared.migrate import load_migrations, migrate
+
+if sys.stdout.encoding != 'utf-8':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+
+def _connect():
+    conn = database.get_db_connection()
+    # 0007(파티션 함수/테이블)이 아직 없으면 먼저 적용
+    migrate(conn, load_migrations())
+    return conn
+
+
+def cmd_status(args):
+    conn = _connect()
+    try:
+        cur = conn.cursor()
+        parent = sp.partition_parent(cur)
+        conn.commit()
+        cur.close()
+        state = "전환 완료" if parent == "shots" else f"전환 전 (부모: {parent})"
+        print(f"shots 파티션: {state}")
+        print(f"{'partition':<20} {'range':<25} {'rows(est)':>12}  게스트 집계")
+        for p in sp.list_partitions(conn):
+            bounds = f"{p.range_from} ~ {p.range_to}" if p.range_from else "DEFAULT"
+            print(f"{p.name:<20} {bounds:<25} {p.est_rows:>12,}  {p.guest_purged_at or '-'}")
+        archived = sp.list_archived(conn)
+        if archived:
+            print("\n보관 후 삭제된 파티션:")
+            for name, range_from, rows, path, archived_at in archived:
+                print(f"{name:<20} {rows:>12,}행  {archived_at}  {path}")
+    finally:
+        conn.close()
+
+
+def cmd_ensure(args):
+    conn = _connect()
+    try:
+        created = sp.ensure_partitions(conn, months_ahead=args.months_ahead)
+        print(f"✅ 월 파티션 {created}개 생성")
+    finally:
+        conn.close()
+
+
+def cmd_copy(args):
+    conn = _connect()
+    try:
+        cur = conn.cursor()
+        if sp.partition_parent(cur) != "shots_partitioned":
+            print("✅ 이미 전환 완료 (복사할 필요 없음)")
+            return
+        # 기존 데이터의 가장 오래된 달부터 파티션 생성 (형식이 다른 값은 기본 파티션)
+        cur.execute("""
+            SELECT MIN(timestamp) FROM shots
+            WHERE timestamp >= '2000-01-01' AND timestamp ~ '^[0-9]{4}-[0-9]{2}-[0-9]{2}'
+        """)
+        oldest = cur.fetchone()[0]
+        conn.commit()
+        cur.close()
+        if oldest:
+            created = sp.ensure_partitions(conn, from_month=oldest[:7] + "-01")
+            print(f"[INFO] {oldest[:7]}부터 월 파티션 준비 ({created}개 생성)")
+
+        changed = run_backfill(conn, JOBS["shots_partition_copy"], batch_size=args.batch_size,
+                               sleep_sec=args.sleep, reset=args.reset)
+        print(f"✅ {changed}개 복사 - 다음 단계: python shot_partitions.py cutover")
+    finally:
+        conn.close()
+
+
+def cmd_cutover(args):
+    conn = _connect()
+    try:
+        result = sp.cutover(conn, force=args.force, lock_timeout=args.lock_timeout)
+        if result == "already":
+            print("✅ 이미 전환 완료")
+        else:
+            print("✅ 전환 완료: shots = 월별 파티션, 기존 테이블 = shots_legacy")
+    except Exception as e:
+        print(f"❌ 전환 실패 (변경 없음): {e}")
+        sys.exit(1)
+    finally:
+        conn.close()
+
+
+def cmd_drop_legacy(args):
+    conn = _connect()
+    try:
+        sp.drop_legacy(conn)
+    finally:
+        conn.close()
+
+
+def cmd_retention(args):
+    conn = _connect()
+    try:
+        result = sp.apply_retention(conn, keep_months=args.keep_months, guest_months=args.guest_months,
+                                    archive_dir=args.archive_dir, dry_run=args.dry_run,
+                                    batch_size=args.batch_size)
+        print(f"✅ 게스트 샷 {result['guest_purged']}개 집계, 파티션 {len(result['archived'])}개 보관")
+    finally:
+        conn.close()
+
+
+def cmd_vacuum(args):
+    conn = _connect()
+    try:
+        sp.vacuum_recent(conn, months=args.months)
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="shots 월별 파티션 관리")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("status", help="파티션 현황").set_defaults(func=cmd_status)
+
+    ensure = sub.add_parser("ensure", help="다가올 달 파티션 미리 생성")
+    ensure.add_argument("--months-ahead", type=int, default=sp.MONTHS_AHEAD)
+    ensure.set_defaults(func=cmd_ensure)
+
+    copy = sub.add_parser("copy", help="기존 샷을 파티션 테이블로 복사 (전환 1단계)")
+    copy.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    copy.add_argument("--sleep", type=float, default=0.0, help="청크 사이 대기 시간(초)")
+    copy.add_argument("--reset", action="store_true", help="체크포인트 무시하고 처음부터")
+    copy.set_defaults(func=cmd_copy)
+
+    cut = sub.add_parser("cutover", help="shots ↔ 파티션 테이블 이름 교체 (전환 2단계)")
+    cut.add_argument("--force", action="store_true", help="복사 작업 완료 확인 생략")
+    cut.add_argument("--lock-timeout", default=sp.DEFAULT_LOCK_TIMEOUT)
+    cut.set_defaults(func=cmd_cutover)
+
+    sub.add_parser("drop-legacy", help="전환 후 shots_legacy 삭제").set_defaults(func=cmd_drop_legacy)
+
+    retention = sub.add_parser("retention", help="보존 정책 적용 (게스트 샷 집계, 오래된 파티션 보관)")
+    retention.add_argument("--keep-months", type=int, default=sp.SHOTS_RETENTION_MONTHS,
+                           help=f"샷 보존 개월 수 (기본 {sp.SHOTS_RETENTION_MONTHS})")
+    retention.add_argument("--guest-months", type=int, default=sp.GUEST_SHOTS_RETENTION_MONTHS,
+                           help=f"게스트 샷 원본 보존 개월 수 (기본 {sp.GUEST_SHOTS_RETENTION_MONTHS})")
+    retention.add_argument("--archive-dir", default=sp.ARCHIVE_DIR)
+    retention.add_argument("--batch-size", type=int, default=sp.DEFAULT_BATCH_SIZE)
+    retention.add_argument("--dry-run", action="store_true", help="대상만 출력")
+    retention.set_defaults(func=cmd_retention)
+
+    vacuum = sub.add_parser("vacuum", help="최근 파티션 VACUUM ANALYZE")
+    vacuum.add_argument("--months", type=int, default=2)
+    vacuum.set_defaults(func=cmd_vacuum)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
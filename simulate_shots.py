@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+샷 감지 타이밍 시뮬레이션 CLI (client/core/shot_simulation.py)
+
+실제 화면 없이 가상 시계로 샷 감지 상태 머신을 재생해 감지 지연/누락/CPU 사용량을 비교한다.
+
+    python simulate_shots.py                                   # 현재 설정, 무작위 1시간
+    python simulate_shots.py --hours 8 --shots-per-hour 60 --seed 3
+    python simulate_shots.py --set max_wait=2.0 --set stable_frames=3
+    python simulate_shots.py --sweep stable_frames=2,3,4,6     # 설정 하나를 바꿔 가며 비교
+    python simulate_shots.py --save-timeline day.json          # 타임라인 저장 (같은 조건으로 재실행)
+    python simulate_shots.py --timeline day.json --json
+
+설정 이름은 SimSettings 참고 (fast, idle, idle_after, stable_frames, tolerance, min_wait, max_wait,
+fixed_delay, logout_no_screen, logout_no_shot, cost_grab_text, cost_grab_full, cost_ocr).
+"""
+import argparse
+import json
+import sys
+import time
+
+from client.core.shot_simulation import SimSettings, Timeline, simulate
+
+if sys.stdout.encoding != 'utf-8':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+COLUMNS = ("detected", "missed", "wrong_values", "latency_p50", "latency_p95", "latency_max",
+           "ocr_calls", "cpu_sec", "duty", "idle_tick_ratio")
+
+
+def _parse_sets(items):
+    overrides = {}
+    for item in items or []:
+        key, _, value = item.partition("=")
+        if not value:
+            raise SystemExit(f"--set 형식: 이름=값 ({item})")
+        overrides[key.strip()] = value.strip()
+    return overrides
+
+
+def _print_table(rows):
+    widths = [max(10, len(c)) + 2 for c in COLUMNS]
+    header = f"{'설정':<24}" + "".join(f"{c:>{w}}" for c, w in zip(COLUMNS, widths))
+    print(header)
+    print("-" * len(header))
+    for label, report in rows:
+        print(f"{label:<24}" + "".join(f"{str(report[c]):>{w}}" for c, w in zip(COLUMNS, widths)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="샷 감지 타이밍 시뮬레이션")
+    parser.add_argument("--hours", type=float, default=1.0, help="무작위 타임라인 길이 (시간)")
+    parser.add_argument("--shots-per-hour", type=float, default=40)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeline", help="저장한 타임라인 JSON으로 재생")
+    parser.add_argument("--save-timeline", help="사용한 타임라인을 JSON으로 저장")
+    parser.add_argument("--set", action="append", metavar="이름=값", help="설정 변경 (여러 번 가능)")
+    parser.add_argument("--sweep", metavar="이름=값1,값2,...", help="설정 하나를 바꿔 가며 비교")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args()
+
+    if args.timeline:
+        timeline = Timeline.load(args.timeline)
+    else:
+        timeline = Timeline.generate(hours=args.hours, shots_per_hour=args.shots_per_hour, seed=args.seed)
+    if args.save_timeline:
+        timeline.save(args.save_timeline)
+
+    overrides = _parse_sets(args.set)
+    runs = [("현재 설정" if not overrides else ",".join(args.set), overrides)]
+    if args.sweep:
+        key, _, values = args.sweep.partition("=")
+        runs = [(f"{key}={v}", dict(overrides, **{key: v})) for v in values.split(",") if v]
+
+    rows = []
+    for label, run_overrides in runs:
+        try:
+            settings = SimSettings(**run_overrides)
+        except KeyError as e:
+            raise SystemExit(str(e))
+        started = time.perf_counter()
+        report = simulate(timeline, settings)
+        report["wall_sec"] = round(time.perf_counter() - started, 2)
+        report["speedup"] = round(report["duration_sec"] / max(report["wall_sec"], 1e-6))
+        rows.append((label, report))
+
+    if args.json:
+        print(json.dumps([{"label": label, **report} for label, report in rows], ensure_ascii=False, indent=2))
+        return
+
+    print(f"타임라인: {timeline.duration / 3600:.1f}시간, 샷 {len(timeline.shots)}개, "
+          f"연습 화면 아님 {len(timeline.off_screen)}구간")
+    _print_table(rows)
+    for label, report in rows:
+        logouts = ", ".join(f"{t:.0f}s {reason}" for t, reason in report["logouts"][:5])
+        more = f" 외 {len(report['logouts']) - 5}건" if len(report["logouts"]) > 5 else ""
+        print(f"[{label}] 재생 {report['wall_sec']}초 (x{report['speedup']}), "
+              f"자동 세션 종료 {len(report['logouts'])}건{': ' + logouts + more if logouts else ''}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+합성 결과 화면 OCR 벤치마크 CLI (client/core/synthetic_screens.py)
+
+좌표 파일 영역마다 정답 값을 그린 화면을 만들어 OCR 파이프라인(metrics_ocr.read_metrics)을 실행하고
+처리량(샷/초)과 지표별 정확 일치율을 출력한다. 타석 캡처 없이 리눅스에서 실행 가능 (tesseract 필요).
+
+    python synth_screens.py SGGOLF_1920x1080_v1.json --count 200
+    python synth_screens.py regions/test.json --resolution 2560x1440 --set noise=8 --set blur=3
+    python synth_screens.py SGGOLF_1920x1080_v1.json --sweep render_scale=1.0,0.75,0.5
+    python synth_screens.py SGGOLF_1920x1080_v1.json --count 1000 --no-ocr --out synth/   # 데이터셋만 생성
+    python synth_screens.py SGGOLF_1920x1080_v1.json --save-screens 5 --out synth/         # 화면 PNG 확인용
+
+--out 디렉터리에는 OCR 녹화와 같은 형식(zip)으로 저장되므로 replay_ocr.py로 다시 재생할 수 있다
+(원문 = 그린 문자열, 값 = 정답). 스타일 이름은 ScreenStyle 참고 (background, panel, text_color, font,
+thickness, fill, jitter, units, thousands, rl, blur, noise, render_scale).
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import cv2
+
+from client.core.ocr_archive import OcrRecorder
+from client.core.synthetic_screens import ScreenStyle, SyntheticScreens, load_coordinate_file
+
+if sys.stdout.encoding != 'utf-8':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+
+def _parse_sets(items):
+    overrides = {}
+    for item in items or []:
+        key, _, value = item.partition("=")
+        if not value:
+            raise SystemExit(f"--set 형식: 이름=값 ({item})")
+        overrides[key.strip()] = value.strip()
+    return overrides
+
+
+def _same_value(a, b):
+    if a is None or b is None:
+        return a is b
+    return abs(float(a) - float(b)) < 1e-6
+
+
+def run(screens, count, read_metrics=None, recorder=None, label=""):
+    """합성 샷 count개 생성 (+ OCR) → 통계 dict"""
+    matches = {key: 0 for key in screens.keys}
+    all_exact = 0
+    render_sec = ocr_sec = 0.0
+    for i in range(count):
+        started = time.perf_counter()
+        layout, frame, truth, texts = screens.shot()
+        render_sec += time.perf_counter() - started
+        if recorder is not None:
+            recorder.record(layout, frame, truth, texts, {"shot_id": f"{label}{i:06d}", "synthetic": True})
+        if read_metrics is None:
+            continue
+        started = time.perf_counter()
+        metrics = read_metrics(layout, frame)
+        ocr_sec += time.perf_counter() - started
+        exact = True
+        for key in screens.keys:
+            same = _same_value(metrics.get(key), truth[key])
+            matches[key] += same
+            exact = exact and same
+        all_exact += exact
+
+    report = {"shots": count, "render_sec": round(render_sec, 2)}
+    if read_metrics is not None and count:
+        report.update({
+            "ocr_sec": round(ocr_sec, 2),
+            "shots_per_sec": round(count / max(ocr_sec, 1e-6), 2),
+            "all_exact": round(all_exact / count, 4),
+            "exact": {key: round(n / count, 4) for key, n in matches.items()},
+        })
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="합성 결과 화면 OCR 벤치마크")
+    parser.add_argument("coordinates", help="좌표 파일 (예: SGGOLF_1920x1080_v1.json, regions/test.json)")
+    parser.add_argument("--count", type=int, default=100, help="생성할 샷 수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--resolution", help="화면 해상도 WxH (기본: 좌표 파일 resolution, 없으면 1920x1080)")
+    parser.add_argument("--brand", help="스타일 브랜드 (기본: 좌표 파일 brand)")
+    parser.add_argument("--set", action="append", metavar="이름=값", help="스타일 변경 (여러 번 가능)")
+    parser.add_argument("--sweep", metavar="이름=값1,값2,...", help="스타일 하나를 바꿔 가며 비교")
+    parser.add_argument("--out", help="데이터셋 저장 디렉터리 (OCR 녹화 zip 형식)")
+    parser.add_argument("--save-screens", type=int, default=0, metavar="N", help="전체 화면 PNG N장 저장 (--out 필요)")
+    parser.add_argument("--no-ocr", action="store_true", help="OCR 없이 데이터셋만 생성")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args()
+
+    regions, size, brand = load_coordinate_file(args.coordinates)
+    if args.resolution:
+        w, _, h = args.resolution.lower().partition("x")
+        size = (int(w), int(h))
+    brand = args.brand or brand
+
+    overrides = _parse_sets(args.set)
+    runs = [("기본 스타일" if not overrides else ",".join(args.set), overrides)]
+    if args.sweep:
+        key, _, values = args.sweep.partition("=")
+        runs = [(f"{key}={v}", dict(overrides, **{key: v})) for v in values.split(",") if v]
+
+    read_metrics = None
+    if not args.no_ocr:
+        from client.core.metrics_ocr import read_metrics  # pytesseract는 OCR할 때만 필요
+
+    rows = []
+    for n, (label, run_overrides) in enumerate(runs):
+        try:
+            style = ScreenStyle.for_brand(brand, **run_overrides)
+        except KeyError as e:
+            raise SystemExit(str(e))
+        screens = SyntheticScreens(regions, size, style, seed=args.seed)
+        if not screens.keys:
+            raise SystemExit(f"좌표 파일에 지표 영역이 없습니다: {args.coordinates}")
+
+        recorder = None
+        if args.out:
+            os.makedirs(args.out, exist_ok=True)
+            recorder = OcrRecorder(args.out, keep_days=0)
+            for i in range(args.save_screens if n == 0 else 0):
+                screen, _ = screens.screen()
+                cv2.imencode(".png", screen)[1].tofile(os.path.join(args.out, f"screen_{i:03d}.png"))
+        prefix = f"s{args.seed}_" + (f"r{n}_" if len(runs) > 1 else "")  # 같은 zip에 다른 seed/스윕 추가 시 shot_id 충돌 방지
+        report = run(screens, args.count, read_metrics, recorder, label=prefix)
+        rows.append((label, report))
+
+    if args.json:
+        print(json.dumps({
+            "coordinates": args.coordinates, "screen_size": list(size), "brand": brand,
+            "runs": [{"label": label, **report} for label, report in rows],
+        }, ensure_ascii=False, indent=2))
+        return
+
+    print(f"좌표 파일: {args.coordinates} ({size[0]}x{size[1]}, 브랜드 {brand or '-'}), 샷 {args.count}개")
+    if args.out:
+        print(f"데이터셋: {args.out} (replay_ocr.py {args.out} 로 재생)")
+    for label, report in rows:
+        if "exact" not in report:
+            print(f"[{label}] 생성 {report['render_sec']}초")
+            continue
+        print(f"[{label}] {report['shots_per_sec']} 샷/초 (OCR {report['ocr_sec']}초, 생성 {report['render_sec']}초), "
+              f"전체 지표 일치 {report['all_exact'] * 100:.1f}%")
+        for key, rate in report["exact"].items():
+            print(f"    {key:<18}{rate * 100:6.1f}%")
+
+
+if __name__ == "__main__":
+    main()